@@ -5,12 +5,42 @@ Deployment Orchestrator for LTV Protocol Contracts
 import subprocess
 import sys
 import argparse
+import atexit
+import glob
 import os
 import json
 import re
+import threading
 import time
 from enum import Enum
 
+from deploy_utils.anvil import (
+    AnvilError,
+    AnvilNode,
+    StateCache,
+    evm_snapshot,
+    get_state_key,
+)
+from deploy_utils.create2 import (
+    ArtifactNotFoundError,
+    Create2AddressEngine,
+    are_artifacts_up_to_date,
+    get_contract_artifact,
+)
+from deploy_utils.batch import (
+    generate_batch_script,
+    get_receipt_libraries,
+    get_receipt_transactions_by_address,
+)
+from deploy_utils.fleet import build_fleet_graph, get_fleet_step_name
+from deploy_utils.journal import DeploymentJournal, atomic_write
+from deploy_utils.plan import DeploymentPlan, PlanStep
+from deploy_utils.probe import DeploymentStatus, find_drift
+from deploy_utils.rpc import JsonRpcClient, RpcError
+from deploy_utils.storage_layout import find_layout_incompatibilities
+from deploy_utils.scheduler import DeploymentScheduler, NonceManager
+from deploy_utils.telemetry import Telemetry
+
 TEST_USER_ADDRESS = "0xF39FD6E51AAD88F6F4CE6AB8827279CFFFB92266"
 TEST_USER_PRIVATE_KEY = (
     "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
@@ -37,9 +67,81 @@ class CONTRACTS(Enum):
     UPGRADE = "UPGRADE"
     GENERAL_TEST = "GENERAL_TEST"
     LIDO_TEST = "LIDO_TEST"
+    BATCH = "BATCH"
     NONE = "NONE"
 
 
+# Dependencies of the LTV implementation deployment, used by the concurrent scheduler
+LTV_IMPLEMENTATION_GRAPH = {
+    CONTRACTS.ERC20_MODULE: [],
+    CONTRACTS.BORROW_VAULT_MODULE: [],
+    CONTRACTS.COLLATERAL_VAULT_MODULE: [],
+    CONTRACTS.LOW_LEVEL_REBALANCE_MODULE: [],
+    CONTRACTS.AUCTION_MODULE: [],
+    CONTRACTS.ADMINISTRATION_MODULE: [],
+    CONTRACTS.INITIALIZE_MODULE: [],
+    CONTRACTS.MODULES_PROVIDER: [
+        CONTRACTS.ERC20_MODULE,
+        CONTRACTS.BORROW_VAULT_MODULE,
+        CONTRACTS.COLLATERAL_VAULT_MODULE,
+        CONTRACTS.LOW_LEVEL_REBALANCE_MODULE,
+        CONTRACTS.AUCTION_MODULE,
+        CONTRACTS.ADMINISTRATION_MODULE,
+        CONTRACTS.INITIALIZE_MODULE,
+    ],
+    CONTRACTS.LTV: [CONTRACTS.MODULES_PROVIDER],
+}
+
+# Every contract of a full deployment, in deployment order
+FULL_DEPLOY_CONTRACTS = list(LTV_IMPLEMENTATION_GRAPH) + [
+    CONTRACTS.BEACON,
+    CONTRACTS.WHITELIST_REGISTRY,
+    CONTRACTS.VAULT_BALANCE_AS_LENDING_CONNECTOR,
+    CONTRACTS.SLIPPAGE_CONNECTOR,
+    CONTRACTS.ORACLE_CONNECTOR,
+    CONTRACTS.LENDING_CONNECTOR,
+    CONTRACTS.LTV_BEACON_PROXY,
+]
+
+# Dependencies of a full deployment, connectors only need to exist before the proxy
+FULL_DEPLOY_GRAPH = dict(LTV_IMPLEMENTATION_GRAPH)
+FULL_DEPLOY_GRAPH.update(
+    {
+        CONTRACTS.BEACON: [CONTRACTS.LTV],
+        CONTRACTS.WHITELIST_REGISTRY: [],
+        CONTRACTS.VAULT_BALANCE_AS_LENDING_CONNECTOR: [],
+        CONTRACTS.SLIPPAGE_CONNECTOR: [],
+        CONTRACTS.ORACLE_CONNECTOR: [],
+        CONTRACTS.LENDING_CONNECTOR: [],
+        CONTRACTS.LTV_BEACON_PROXY: [
+            CONTRACTS.BEACON,
+            CONTRACTS.WHITELIST_REGISTRY,
+            CONTRACTS.VAULT_BALANCE_AS_LENDING_CONNECTOR,
+            CONTRACTS.SLIPPAGE_CONNECTOR,
+            CONTRACTS.ORACLE_CONNECTOR,
+            CONTRACTS.LENDING_CONNECTOR,
+        ],
+    }
+)
+
+# Contracts running on the LTV proxy's storage, their LTVState layout must stay compatible
+PROXY_STORAGE_CONTRACTS = [
+    contract
+    for contract in LTV_IMPLEMENTATION_GRAPH
+    if contract != CONTRACTS.MODULES_PROVIDER
+]
+
+UPGRADE_LTV_CONTRACTS = list(LTV_IMPLEMENTATION_GRAPH) + [
+    CONTRACTS.WHITELIST_REGISTRY,
+    CONTRACTS.VAULT_BALANCE_AS_LENDING_CONNECTOR,
+    CONTRACTS.SLIPPAGE_CONNECTOR,
+    CONTRACTS.ORACLE_CONNECTOR,
+    CONTRACTS.LENDING_CONNECTOR,
+]
+
+DEPLOY_FILE_LOCK = threading.Lock()
+
+
 CHAIN_TO_CHAIN_ID = {
     "mainnet": 1,
     "sepolia": 11155111,
@@ -48,6 +150,14 @@ CHAIN_TO_CHAIN_ID = {
     "local": 31337,
 }
 
+ANVIL_PORT = 8545
+
+# chain: (fork RPC url environment variable, fork block number)
+LOCAL_FORKS = {
+    "local_fork_mainnet": ("RPC_MAINNET", 24461204),
+    "local_fork_sepolia": ("RPC_SEPOLIA", 9532361),
+}
+
 
 def get_contract_to_deploy_file(lending_protocol, contract):
     """Returns the deployment file for a specific contract based on the lending protocol"""
@@ -69,6 +179,7 @@ def get_contract_to_deploy_file(lending_protocol, contract):
         CONTRACTS.UPGRADE: "script/UpgradeLtv.s.sol:UpgradeLtv",
         CONTRACTS.GENERAL_TEST: "script/ltv_elements/TestGeneralDeployedLTVBeaconProxy.s.sol",
         CONTRACTS.LIDO_TEST: "script/ltv_elements/TestLidoDeployedLtvBeaconProxy.s.sol",
+        CONTRACTS.BATCH: "script/generated/BatchDeploy.s.sol:BatchDeploy",
     }
 
     # Handle protocol-specific connectors
@@ -109,7 +220,7 @@ def get_rpc_url(chain):
         or chain == "local"
         or chain == "local_fork_sepolia"
     ):
-        return "localhost:8545"
+        return f"localhost:{ANVIL_PORT}"
     else:
         print(f"ERROR Invalid chain: {chain}")
         sys.exit(1)
@@ -126,7 +237,7 @@ def handle_script_result(result):
 
 def get_latest_receipt_file(lending_protocol, contract, chain):
     deploy_file = get_contract_to_deploy_file(lending_protocol, contract)
-    deploy_file_name = deploy_file.split("/")[-1]
+    deploy_file_name = deploy_file.split(":")[0].split("/")[-1]
     return f"broadcast/{deploy_file_name}/{CHAIN_TO_CHAIN_ID[chain]}/run-latest.json"
 
 
@@ -138,7 +249,54 @@ def get_latest_receipt_contract_address(chain, contract, lending_protocol):
         return data["transactions"][-1]["contractAddress"]
 
 
+ADDRESS_ENGINE = Create2AddressEngine()
+ARTIFACTS_BUILT = False
+# out/ is rebuilt when any of these changed after its newest artifact
+ARTIFACT_SOURCES = ["src", "script", "foundry.toml"]
+TELEMETRY = Telemetry()
+
+
+def run_subprocess(kind, name, command, env=None):
+    """Runs a forge or cast command, recording its wall time and forge compile time"""
+    with TELEMETRY.span(kind, name):
+        result = subprocess.run(command, env=env, text=True, capture_output=True)
+    TELEMETRY.record_forge_output(name, result.stdout)
+    return result
+
+
+def ensure_artifacts_built():
+    """Builds the out/ artifacts once per run, so expected addresses match current sources"""
+    global ARTIFACTS_BUILT
+    if ARTIFACTS_BUILT:
+        return
+    if are_artifacts_up_to_date(ADDRESS_ENGINE.out_dir, ARTIFACT_SOURCES):
+        ARTIFACTS_BUILT = True
+        return
+    result = run_subprocess(
+        "forge_build", "build", ["forge", "build", "--skip", "test"]
+    )
+    handle_script_result(result)
+    ARTIFACTS_BUILT = True
+
+
 def get_expected_address(chain, contract, lending_protocol, args={}):
+    ensure_artifacts_built()
+    try:
+        with TELEMETRY.span("expected_address", contract.value):
+            expected_address = ADDRESS_ENGINE.expected_address(
+                contract.value, lending_protocol, CHAIN_TO_CHAIN_ID[chain], args
+            )
+    except ArtifactNotFoundError as e:
+        print(f"WARNING {e}, falling back to forge simulation")
+        return get_expected_address_from_script(chain, contract, lending_protocol, args)
+    except ValueError as e:
+        print(f"ERROR Could not compute expected address of {contract.value}: {e}")
+        sys.exit(1)
+    ADDRESS_ENGINE.save_cache()
+    return expected_address
+
+
+def get_expected_address_from_script(chain, contract, lending_protocol, args={}):
     res = run_script(chain, contract, lending_protocol, {}, args)
 
     # Look for the line with "Expected address:  0x..."
@@ -167,29 +325,115 @@ def get_args_file_path(chain, lending_protocol, args_filename):
     return f"deploy/{chain}/{lending_protocol}/{args_filename}"
 
 
+RPC_CLIENTS = {}
+DEPLOYMENT_STATUSES = {}
+PROBED_DEPLOYMENTS = set()
+
+
+def get_rpc_client(chain):
+    if chain not in RPC_CLIENTS:
+        RPC_CLIENTS[chain] = JsonRpcClient(
+            get_rpc_url(chain), on_request=TELEMETRY.record_rpc
+        )
+    return RPC_CLIENTS[chain]
+
+
+def get_deployment_status(chain):
+    """On-chain code status shared by every deploy, upgrade and test command"""
+    if chain not in DEPLOYMENT_STATUSES:
+        DEPLOYMENT_STATUSES[chain] = DeploymentStatus(get_rpc_client(chain))
+    return DEPLOYMENT_STATUSES[chain]
+
+
+def get_expected_addresses(chain, lending_protocol, args_filename):
+    """
+    Returns ({contract: expected address}, {library: address}) for the full deployment.
+    Addresses of contracts not recorded yet are fed forward into their dependants.
+    Contracts whose address cannot be computed yet are left out.
+    """
+    ensure_artifacts_built()
+    data = read_data(chain, lending_protocol, args_filename)
+    expected_addresses = {}
+    libraries = {}
+    for contract in FULL_DEPLOY_CONTRACTS:
+        try:
+            expected_address = ADDRESS_ENGINE.expected_address(
+                contract.value, lending_protocol, CHAIN_TO_CHAIN_ID[chain], data
+            )
+            libraries.update(
+                ADDRESS_ENGINE.get_linked_libraries(
+                    *get_contract_artifact(lending_protocol, contract.value)
+                )
+            )
+        except (ValueError, ArtifactNotFoundError):
+            continue
+        expected_addresses[contract] = expected_address
+        if not data.get(contract.value):
+            data[contract.value] = expected_address
+    ADDRESS_ENGINE.save_cache()
+    return expected_addresses, libraries
+
+
+def probe_deployment(chain, lending_protocol, args_filename):
+    """Checks every expected address of the deployment with one eth_getCode batch"""
+    expected_addresses, libraries = get_expected_addresses(
+        chain, lending_protocol, args_filename
+    )
+    status = get_deployment_status(chain)
+    try:
+        status.probe(list(expected_addresses.values()) + list(libraries.values()))
+    except (RpcError, OSError) as e:
+        print(f"ERROR Could not probe deployment: {e}")
+        sys.exit(1)
+    PROBED_DEPLOYMENTS.add((chain, lending_protocol, args_filename))
+
+    recorded_addresses = get_recorded_contracts(chain, lending_protocol, args_filename)
+
+    for name, description in find_drift(
+        {contract.value: address for contract, address in expected_addresses.items()},
+        recorded_addresses,
+        status,
+    ):
+        print(f"WARNING {name} {description}")
+
+    return {
+        contract.value: {
+            "expected_address": address,
+            "recorded_address": recorded_addresses.get(contract.value),
+            "deployed": status.is_deployed(address),
+        }
+        for contract, address in expected_addresses.items()
+    }
+
+
 def get_contract_is_deployed(chain, contract, lending_protocol, args_filename, args={}):
     if contract == CONTRACTS.NONE:
         return True
+    if (chain, lending_protocol, args_filename) not in PROBED_DEPLOYMENTS:
+        probe_deployment(chain, lending_protocol, args_filename)
     expected_address = get_expected_address(chain, contract, lending_protocol, args)
-    deployed_contracts_file_path = get_deployed_contracts_file_path(
-        chain, lending_protocol, args_filename
-    )
-    if not os.path.exists(deployed_contracts_file_path):
+    data = get_recorded_contracts(chain, lending_protocol, args_filename)
+    if not (
+        contract.value in data
+        and data[contract.value].lower() == expected_address.lower()
+    ):
         return False
-
-    with open(deployed_contracts_file_path, "r") as f:
-        data = json.load(f)
-        return (
-            contract.value in data
-            and data[contract.value].lower() == expected_address.lower()
+    if not get_code_is_deployed(chain, expected_address):
+        print(
+            f"WARNING {contract.value} is recorded at {expected_address} but has no code on chain"
         )
+        return False
+    return True
 
 
-def run_script(chain, contract, lending_protocol, private_key={}, args={}):
+def run_script(chain, contract, lending_protocol, private_key={}, args={}, nonce=None):
     deploy_file = get_contract_to_deploy_file(lending_protocol, contract)
     env = os.environ.copy()
     for k, v in args.items():
         env[str(k)] = str(v)
+    if nonce is not None:
+        env["DEPLOY_NONCE"] = str(nonce)
+        env["DEPLOYER"] = get_deployer_address(private_key)
 
     private_key_part = []
     if private_key:
@@ -201,19 +445,21 @@ def run_script(chain, contract, lending_protocol, private_key={}, args={}):
         env["DEPLOY"] = "false"
 
     rpc_url = get_rpc_url(chain)
-    result = subprocess.run(
+    result = run_subprocess(
+        "forge_script_broadcast" if private_key else "forge_script_simulation",
+        contract.value,
         ["forge", "script", deploy_file, "--rpc-url", rpc_url, "-vv"]
         + private_key_part,
-        env=env,
-        text=True,
-        capture_output=True,
+        env,
     )
 
     return handle_script_result(result)
 
 
-def deploy_contract(chain, contract, lending_protocol, private_key, args={}):
-    res = run_script(chain, contract, lending_protocol, private_key, args)
+def deploy_contract(
+    chain, contract, lending_protocol, private_key, args={}, nonce=None
+):
+    res = run_script(chain, contract, lending_protocol, private_key, args, nonce)
 
     match = re.search(r"Contract already deployed at:\s+(0x[a-fA-F0-9]{40})", res)
     if match:
@@ -222,37 +468,57 @@ def deploy_contract(chain, contract, lending_protocol, private_key, args={}):
         return get_latest_receipt_contract_address(chain, contract, lending_protocol)
 
 
-def ensure_file_exists(filename, is_json=True):
-    if not os.path.exists(filename):
-        # Create the deploy directory if it doesn't exist
-        deploy_dir = os.path.dirname(filename)
-        os.makedirs(deploy_dir, exist_ok=True)
-        if not is_json:
-            return
-        # Write a simple deploy.json file as a placeholder
-        with open(filename, "w") as f:
-            json.dump({}, f)
+def get_deploy_journal_path(chain, lending_protocol, args_filename):
+    args_filename = args_filename.replace(".json", "")
+    return f"deploy_out/{chain}/{lending_protocol}/deploy_journal_{args_filename}.jsonl"
 
 
-def write_to_deploy_file(
-    contract, chain, lending_protocol, deployed_address, args_filename, args={}
-):
-    deploy_file_path = get_deployed_contracts_file_path(
-        chain, lending_protocol, args_filename
+def get_deploy_journal(chain, lending_protocol, args_filename):
+    journal = DeploymentJournal(
+        get_deploy_journal_path(chain, lending_protocol, args_filename)
     )
-    verify_addresses_helper_file_path = get_verify_addresses_helper_file_path(
+    deployed_contracts_file_path = get_deployed_contracts_file_path(
         chain, lending_protocol, args_filename
     )
-    ensure_file_exists(deploy_file_path)
-    ensure_file_exists(verify_addresses_helper_file_path, is_json=False)
+    if not os.path.exists(journal.journal_path) and os.path.exists(
+        deployed_contracts_file_path
+    ):
+        with open(deployed_contracts_file_path, "r") as f:
+            journal.import_existing(json.load(f))
+    return journal
+
+
+def get_recorded_contracts(chain, lending_protocol, args_filename):
+    return get_deploy_journal(chain, lending_protocol, args_filename).get_contracts()
 
+
+def compact_deploy_files(chain, lending_protocol, args_filename, journal):
+    """Rewrites the deployed contracts and verify helper views from the journal"""
     deployed_contracts_file_path = get_deployed_contracts_file_path(
         chain, lending_protocol, args_filename
     )
-    with open(deployed_contracts_file_path, "r") as f:
-        data = json.load(f)
-        data[contract.value] = deployed_address
+    verify_addresses_helper_file_path = get_verify_addresses_helper_file_path(
+        chain, lending_protocol, args_filename
+    )
+    with journal.lock():
+        data = journal.get_contracts()
+        atomic_write(deployed_contracts_file_path, json.dumps(data, indent=4))
+        verify_addresses_helper = f'tail +2 {verify_addresses_helper_file_path} | xargs -I {{}} sh -c "forge verify-contract --etherscan-api-key $ETHERSCAN_API_KEY --rpc-url {get_rpc_url(chain)} {{}}"\n'
+        for value in data.values():
+            verify_addresses_helper += f"{value}\n"
+        atomic_write(verify_addresses_helper_file_path, verify_addresses_helper)
 
+
+def write_to_deploy_file(
+    contract,
+    chain,
+    lending_protocol,
+    deployed_address,
+    args_filename,
+    args={},
+    latest_receipt_file=None,
+    linked_library_addresses=None,
+):
     expected_address = get_expected_address(chain, contract, lending_protocol, args)
     if not deployed_address.lower() == expected_address.lower():
         print(
@@ -260,28 +526,73 @@ def write_to_deploy_file(
         )
         sys.exit(1)
 
-    latest_receipt_file = get_latest_receipt_file(lending_protocol, contract, chain)
+    record = {
+        "step": contract.value,
+        "address": deployed_address,
+        "creation_code_hash": get_creation_code_hash(
+            chain, contract, lending_protocol, args
+        ),
+        "tx_hash": None,
+        "libraries": {},
+        "additional_contracts": {},
+    }
+    if latest_receipt_file is None:
+        latest_receipt_file = get_latest_receipt_file(lending_protocol, contract, chain)
     if os.path.exists(latest_receipt_file):
         with open(latest_receipt_file, "r") as f:
             latest_data = json.load(f)
-        for library in latest_data["libraries"]:
-            temp = library.split(":")
-            library_name = temp[1]
-            library_address = temp[2]
-            data[library_name] = library_address
+        record["libraries"] = get_receipt_libraries(
+            latest_data["libraries"], linked_library_addresses
+        )
+
+        transaction = latest_data["transactions"][0]
+        for receipt_transaction in latest_data["transactions"]:
+            contract_address = receipt_transaction.get("contractAddress") or ""
+            if contract_address.lower() == deployed_address.lower():
+                transaction = receipt_transaction
+                record["tx_hash"] = receipt_transaction.get("hash")
+                break
+        for additional_contract in transaction["additionalContracts"]:
+            record["additional_contracts"][additional_contract["contractName"]] = (
+                additional_contract["address"]
+            )
 
-        for additional_contract in latest_data["transactions"][0]["additionalContracts"]:
-            data[additional_contract["contractName"]] = additional_contract["address"]
+    journal = get_deploy_journal(chain, lending_protocol, args_filename)
+    journal.append(record)
+    get_deployment_status(chain).mark_deployed(deployed_address)
+    compact_deploy_files(chain, lending_protocol, args_filename, journal)
+    if contract == CONTRACTS.LTV:
+        record_storage_layout(chain, lending_protocol, args_filename)
 
-    with open(deployed_contracts_file_path, "w") as f:
-        json.dump(data, f, indent=4)
 
-    with open(verify_addresses_helper_file_path, "w") as f:
-        f.write(
-            f'tail +2 {verify_addresses_helper_file_path} | xargs -I {{}} sh -c "forge verify-contract --etherscan-api-key $ETHERSCAN_API_KEY --rpc-url {get_rpc_url(chain)} {{}}"\n'
+def get_creation_code_hash(chain, contract, lending_protocol, args):
+    """Hash of the init code the contract's CREATE2 address is derived from"""
+    try:
+        init_code = ADDRESS_ENGINE.get_init_code(
+            contract.value, lending_protocol, CHAIN_TO_CHAIN_ID[chain], args
         )
-        for value in data.values():
-            f.write(f"{value}\n")
+    except (ValueError, ArtifactNotFoundError):
+        return None
+    return "0x" + ADDRESS_ENGINE.hash_init_code(init_code).hex()
+
+
+def get_storage_layout_file_path(chain, lending_protocol, args_filename):
+    return f"deploy_out/{chain}/{lending_protocol}/storage_layout_{args_filename}"
+
+
+def record_storage_layout(chain, lending_protocol, args_filename):
+    """Keeps the storage layout of the deployed LTV as baseline for upgrade checks"""
+    try:
+        layout = ADDRESS_ENGINE.get_storage_layout(
+            *get_contract_artifact(lending_protocol, CONTRACTS.LTV.value)
+        )
+    except ArtifactNotFoundError as e:
+        print(f"WARNING Could not record storage layout: {e}")
+        return
+    atomic_write(
+        get_storage_layout_file_path(chain, lending_protocol, args_filename),
+        json.dumps(layout, indent=4),
+    )
 
 
 def process_deployment(
@@ -291,6 +602,7 @@ def process_deployment(
     args_filename,
     current_contract,
     previous_contract=CONTRACTS.NONE,
+    nonce=None,
 ):
     data = read_data(chain, lending_protocol, args_filename)
 
@@ -306,17 +618,25 @@ def process_deployment(
         print(f"SUCCESS {current_contract.value} already deployed")
         return
 
-    deployed_address = deploy_contract(
-        chain, current_contract, lending_protocol, private_key, data
-    )
-    write_to_deploy_file(
-        current_contract,
-        chain,
-        lending_protocol,
-        deployed_address,
-        args_filename,
-        data,
-    )
+    step_started_at = time.time()
+    with TELEMETRY.span("step", current_contract.value):
+        deployed_address = deploy_contract(
+            chain, current_contract, lending_protocol, private_key, data, nonce
+        )
+    TELEMETRY.record_receipts(
+        current_contract.value,
+        get_latest_receipt_file(lending_protocol, current_contract, chain),
+        since=step_started_at,
+    )
+    with DEPLOY_FILE_LOCK:
+        write_to_deploy_file(
+            current_contract,
+            chain,
+            lending_protocol,
+            deployed_address,
+            args_filename,
+            data,
+        )
     print(f"SUCCESS {current_contract.value} deployed at {deployed_address}")
 
 
@@ -517,7 +837,327 @@ def deploy_ltv_beacon_proxy(chain, lending_protocol, private_key, args_filename)
     )
 
 
+def get_deployer_address(private_key):
+    result = run_subprocess(
+        "cast",
+        "wallet address",
+        ["cast", "wallet", "address", "--private-key", private_key],
+    )
+    return handle_script_result(result).strip()
+
+
+def get_chain_nonce(chain, address, block="pending"):
+    try:
+        nonce = get_rpc_client(chain).call("eth_getTransactionCount", [address, block])
+    except (RpcError, OSError) as e:
+        print(f"ERROR Could not get nonce of {address}: {e}")
+        sys.exit(1)
+    return int(nonce, 16)
+
+
+def cancel_nonce(chain, private_key, address, nonce):
+    """Sends a zero value transfer to itself at nonce, so later nonces can be mined"""
+    print(f"Filling unused nonce {nonce} of {address}")
+    result = run_subprocess(
+        "cast_send",
+        f"cancel nonce {nonce}",
+        [
+            "cast",
+            "send",
+            "--rpc-url",
+            get_rpc_url(chain),
+            "--private-key",
+            private_key,
+            "--nonce",
+            str(nonce),
+            address,
+        ],
+    )
+    if result.returncode != 0:
+        # a transaction of the failed step took the nonce in the meantime
+        print(f"WARNING Could not fill nonce {nonce}: {result.stderr.strip()}")
+        return
+    print(f"SUCCESS Filled nonce {nonce}")
+
+
+def get_nonce_manager(chain, private_key):
+    deployer = get_deployer_address(private_key)
+    return NonceManager(
+        lambda: get_chain_nonce(chain, deployer),
+        get_mined_nonce=lambda: get_chain_nonce(chain, deployer, "latest"),
+        cancel_nonce=lambda nonce: cancel_nonce(chain, private_key, deployer, nonce),
+    )
+
+
+def get_code_is_deployed(chain, address):
+    try:
+        return get_deployment_status(chain).is_deployed(address)
+    except (RpcError, OSError) as e:
+        print(f"ERROR Could not get code of {address}: {e}")
+        sys.exit(1)
+
+
+def get_contract_needs_exclusive_broadcast(chain, contract, lending_protocol, data):
+    """
+    A step can only get a single explicit nonce if it sends exactly one transaction:
+    no linked library is missing on chain and the contract itself is not there yet
+    """
+    source_path, contract_name = get_contract_artifact(lending_protocol, contract.value)
+    libraries = ADDRESS_ENGINE.get_linked_libraries(source_path, contract_name)
+    for library_address in libraries.values():
+        if not get_code_is_deployed(chain, library_address):
+            return True
+    expected_address = get_expected_address(chain, contract, lending_protocol, data)
+    return get_code_is_deployed(chain, expected_address)
+
+
+def deploy_ltv_implementation_concurrently(args):
+    ensure_artifacts_built()
+    nonce_manager = get_nonce_manager(args.chain, args.private_key)
+
+    def run_step(contract, nonce):
+        process_deployment(
+            args.chain,
+            args.lending_protocol,
+            args.private_key,
+            args.args_filename,
+            contract,
+            nonce=nonce,
+        )
+
+    def is_done(contract):
+        with DEPLOY_FILE_LOCK:
+            data = read_data(args.chain, args.lending_protocol, args.args_filename)
+        return get_contract_is_deployed(
+            args.chain, contract, args.lending_protocol, args.args_filename, data
+        )
+
+    def is_exclusive(contract):
+        with DEPLOY_FILE_LOCK:
+            data = read_data(args.chain, args.lending_protocol, args.args_filename)
+        return get_contract_needs_exclusive_broadcast(
+            args.chain, contract, args.lending_protocol, data
+        )
+
+    DeploymentScheduler(
+        LTV_IMPLEMENTATION_GRAPH,
+        run_step,
+        nonce_manager,
+        max_workers=args.max_workers,
+        is_done=is_done,
+        is_exclusive=is_exclusive,
+        step_name=lambda contract: contract.value,
+    ).run()
+
+
+def get_linked_library_addresses(contract, lending_protocol):
+    """Addresses of the libraries linked into the contract, per its artifact's linkReferences"""
+    source_path, contract_name = get_contract_artifact(lending_protocol, contract.value)
+    return list(
+        ADDRESS_ENGINE.get_linked_libraries(source_path, contract_name).values()
+    )
+
+
+def batch_deploy(args, contracts=FULL_DEPLOY_CONTRACTS):
+    """Deploys every missing contract through one generated script and one broadcast"""
+    ensure_artifacts_built()
+    data = read_data(args.chain, args.lending_protocol, args.args_filename)
+
+    missing = []
+    for contract in contracts:
+        if get_contract_is_deployed(
+            args.chain, contract, args.lending_protocol, args.args_filename, data
+        ):
+            print(f"SUCCESS {contract.value} already deployed")
+            continue
+        expected_address = get_expected_address(
+            args.chain, contract, args.lending_protocol, data
+        )
+        # Later contracts read their dependencies' addresses from the environment
+        data[contract.value] = expected_address
+        missing.append((contract, expected_address))
+
+    if not missing:
+        return
+
+    to_broadcast = [
+        (contract, expected_address)
+        for contract, expected_address in missing
+        if not get_code_is_deployed(args.chain, expected_address)
+    ]
+    if to_broadcast:
+        generate_batch_script(
+            [
+                get_contract_to_deploy_file(args.lending_protocol, contract)
+                for contract, _ in to_broadcast
+            ]
+        )
+        print(f"Deploying {len(to_broadcast)} contracts in a single broadcast")
+        step_started_at = time.time()
+        with TELEMETRY.span("step", CONTRACTS.BATCH.value):
+            run_script(
+                args.chain,
+                CONTRACTS.BATCH,
+                args.lending_protocol,
+                args.private_key,
+                data,
+            )
+        TELEMETRY.record_receipts(
+            CONTRACTS.BATCH.value,
+            get_latest_receipt_file(args.lending_protocol, CONTRACTS.BATCH, args.chain),
+            since=step_started_at,
+        )
+
+    latest_receipt_file = get_latest_receipt_file(
+        args.lending_protocol, CONTRACTS.BATCH, args.chain
+    )
+    transactions = {}
+    if to_broadcast and os.path.exists(latest_receipt_file):
+        transactions = get_receipt_transactions_by_address(latest_receipt_file)
+
+    for contract, expected_address in missing:
+        if expected_address.lower() not in transactions and not get_code_is_deployed(
+            args.chain, expected_address
+        ):
+            print(f"ERROR {contract.value} was not deployed at {expected_address}")
+            sys.exit(1)
+        write_to_deploy_file(
+            contract,
+            args.chain,
+            args.lending_protocol,
+            expected_address,
+            args.args_filename,
+            data,
+            latest_receipt_file,
+            get_linked_library_addresses(contract, args.lending_protocol),
+        )
+        print(f"SUCCESS {contract.value} deployed at {expected_address}")
+
+
+def get_creation_code_hashes(chain, lending_protocol, args_filename):
+    """Returns {contract: creation code hash} of the full deployment of an args file"""
+    data = read_data(chain, lending_protocol, args_filename)
+    chain_id = CHAIN_TO_CHAIN_ID[chain]
+    hashes = {}
+    for contract in FULL_DEPLOY_CONTRACTS:
+        try:
+            address = ADDRESS_ENGINE.expected_address(
+                contract.value, lending_protocol, chain_id, data
+            )
+            if get_contract_is_preset(contract, address, data):
+                hashes[contract] = "preset:" + address.lower()
+            else:
+                init_code = ADDRESS_ENGINE.get_init_code(
+                    contract.value, lending_protocol, chain_id, data
+                )
+                hashes[contract] = ADDRESS_ENGINE.hash_init_code(init_code).hex()
+        except (ValueError, ArtifactNotFoundError) as e:
+            print(f"ERROR Could not resolve {contract.value} of {args_filename}: {e}")
+            sys.exit(1)
+        if not data.get(contract.value):
+            data[contract.value] = address
+    return hashes
+
+
+def record_shared_deployment(chain, lending_protocol, args_filename, contract):
+    """Records a contract deployed for another args file with identical creation code"""
+    with DEPLOY_FILE_LOCK:
+        data = read_data(chain, lending_protocol, args_filename)
+    if get_contract_is_deployed(chain, contract, lending_protocol, args_filename, data):
+        return
+    expected_address = get_expected_address(chain, contract, lending_protocol, data)
+    if not get_code_is_deployed(chain, expected_address):
+        print(f"ERROR {contract.value} was not deployed at {expected_address}")
+        sys.exit(1)
+    with DEPLOY_FILE_LOCK:
+        write_to_deploy_file(
+            contract, chain, lending_protocol, expected_address, args_filename, data
+        )
+    print(
+        f"SUCCESS {contract.value} of {args_filename} shares deployment at {expected_address}"
+    )
+
+
+def get_fleet_args_filenames(chain, lending_protocol, pattern):
+    args_dir = os.path.dirname(get_args_file_path(chain, lending_protocol, "x"))
+    paths = sorted(glob.glob(os.path.join(args_dir, pattern)))
+    if not paths:
+        print(f"ERROR No args files in {args_dir} match {pattern}")
+        sys.exit(1)
+    return [os.path.basename(path) for path in paths]
+
+
+def deploy_fleet(args):
+    """Runs the full deployment of every matching args file, deploying shared contracts once"""
+    ensure_artifacts_built()
+    args_filenames = get_fleet_args_filenames(
+        args.chain, args.lending_protocol, args.fleet
+    )
+    hashes_by_args_file = {
+        args_filename: get_creation_code_hashes(
+            args.chain, args.lending_protocol, args_filename
+        )
+        for args_filename in args_filenames
+    }
+    ADDRESS_ENGINE.save_cache()
+    fleet_graph, members = build_fleet_graph(FULL_DEPLOY_GRAPH, hashes_by_args_file)
+    print(
+        f"Deploying {len(args_filenames)} configs with {len(fleet_graph)} unique contracts "
+        f"instead of {len(args_filenames) * len(FULL_DEPLOY_GRAPH)}"
+    )
+
+    nonce_manager = get_nonce_manager(args.chain, args.private_key)
+
+    def run_step(step, nonce):
+        contract = step[0]
+        args_filename, *sharing_args_filenames = members[step]
+        process_deployment(
+            args.chain,
+            args.lending_protocol,
+            args.private_key,
+            args_filename,
+            contract,
+            nonce=nonce,
+        )
+        for sharing_args_filename in sharing_args_filenames:
+            record_shared_deployment(
+                args.chain, args.lending_protocol, sharing_args_filename, contract
+            )
+
+    def is_done(step):
+        for args_filename in members[step]:
+            with DEPLOY_FILE_LOCK:
+                data = read_data(args.chain, args.lending_protocol, args_filename)
+            if not get_contract_is_deployed(
+                args.chain, step[0], args.lending_protocol, args_filename, data
+            ):
+                return False
+        return True
+
+    def is_exclusive(step):
+        args_filename = members[step][0]
+        with DEPLOY_FILE_LOCK:
+            data = read_data(args.chain, args.lending_protocol, args_filename)
+        return get_contract_needs_exclusive_broadcast(
+            args.chain, step[0], args.lending_protocol, data
+        )
+
+    DeploymentScheduler(
+        fleet_graph,
+        run_step,
+        nonce_manager,
+        max_workers=args.max_workers,
+        is_done=is_done,
+        is_exclusive=is_exclusive,
+        step_name=get_fleet_step_name,
+    ).run()
+
+
 def deploy_ltv_implementation(args):
+    if args.max_workers > 1:
+        deploy_ltv_implementation_concurrently(args)
+        return
+
     deploy_erc20_module(
         args.chain, args.lending_protocol, args.private_key, args.args_filename
     )
@@ -572,15 +1212,113 @@ def read_data(chain, lending_protocol, args_filename):
     with open(get_args_file_path(chain, lending_protocol, args_filename), "r") as f:
         data.update(json.load(f))
 
-    deployed_contracts_file_path = get_deployed_contracts_file_path(
-        chain, lending_protocol, args_filename
-    )
-    if os.path.exists(deployed_contracts_file_path):
-        with open(deployed_contracts_file_path, "r") as f:
-            data.update(json.load(f))
+    data.update(get_recorded_contracts(chain, lending_protocol, args_filename))
     return data
 
 
+def get_contract_is_preset(contract, address, data):
+    """BEACON may be given in the args file instead of being deployed"""
+    return (
+        contract == CONTRACTS.BEACON
+        and address.lower() == str(data.get("BEACON", "")).lower()
+    )
+
+
+def get_deploy_plan_file_path(chain, lending_protocol, args_filename):
+    args_filename = args_filename.replace(".json", "")
+    return f"deploy_out/{chain}/{lending_protocol}/deploy_plan_{args_filename}.json"
+
+
+def plan_deployment(args, contracts, scripts=[]):
+    """Resolves the deployment of contracts without broadcasting and estimates its gas"""
+    ensure_artifacts_built()
+    data = read_data(args.chain, args.lending_protocol, args.args_filename)
+    chain_id = CHAIN_TO_CHAIN_ID[args.chain]
+
+    resolved = []
+    for contract in contracts:
+        try:
+            source_path, contract_name = get_contract_artifact(
+                args.lending_protocol, contract.value
+            )
+            libraries = ADDRESS_ENGINE.get_linked_libraries(source_path, contract_name)
+            address = ADDRESS_ENGINE.expected_address(
+                contract.value, args.lending_protocol, chain_id, data
+            )
+            init_code = None
+            if not get_contract_is_preset(contract, address, data):
+                init_code = ADDRESS_ENGINE.get_init_code(
+                    contract.value, args.lending_protocol, chain_id, data
+                )
+        except (ValueError, ArtifactNotFoundError) as e:
+            print(f"ERROR Could not plan {contract.value}: {e}")
+            sys.exit(1)
+        resolved.append((contract, address, libraries, init_code))
+        # Dependants are deployed against the address this step will record
+        data[contract.value] = address
+    ADDRESS_ENGINE.save_cache()
+
+    status = get_deployment_status(args.chain)
+    addresses = []
+    for _, address, libraries, _ in resolved:
+        addresses.append(address)
+        addresses.extend(libraries.values())
+    try:
+        status.probe(addresses)
+    except (RpcError, OSError) as e:
+        print(f"ERROR Could not probe deployment: {e}")
+        sys.exit(1)
+
+    plan = DeploymentPlan()
+    planned_libraries = set()
+    for contract, address, libraries, init_code in resolved:
+        for library, library_address in libraries.items():
+            if library in planned_libraries or status.is_deployed(library_address):
+                continue
+            planned_libraries.add(library)
+            plan.add_step(
+                PlanStep(
+                    library.split(":")[-1],
+                    "library",
+                    library_address,
+                    False,
+                    init_code=ADDRESS_ENGINE.get_linked_creation_code(
+                        *library.rsplit(":", 1)
+                    ),
+                )
+            )
+        plan.add_step(
+            PlanStep(
+                contract.value,
+                "contract" if init_code is not None else "preset",
+                address,
+                status.is_deployed(address),
+                libraries,
+                init_code,
+            )
+        )
+    for script in scripts:
+        plan.add_step(PlanStep(script.value, "script", None, False))
+
+    gas_price = None
+    if args.gas_price is not None:
+        gas_price = int(args.gas_price * 10**9)
+    sender = get_deployer_address(args.private_key) if args.private_key else None
+    try:
+        plan.estimate(get_rpc_client(args.chain), gas_price, sender)
+    except (RpcError, OSError) as e:
+        print(f"ERROR Could not estimate deployment gas: {e}")
+        sys.exit(1)
+
+    plan_file_path = get_deploy_plan_file_path(
+        args.chain, args.lending_protocol, args.args_filename
+    )
+    atomic_write(plan_file_path, json.dumps(plan.to_dict(), indent=4))
+    print(plan.format_table())
+    print(f"Plan written to {plan_file_path}")
+    return plan
+
+
 def upgrade_ltv(args):
     if args.chain.find("local") != -1:
         prepare_upgrade_ltv(args)
@@ -596,6 +1334,97 @@ def prepare_upgrade_ltv(args):
     deploy_connectors(args, CONTRACTS.NONE)
 
 
+def get_upgrade_changes(chain, lending_protocol, args_filename):
+    """
+    Returns [(contract, recorded address, new address)] of every upgrade contract
+    whose creation code hash, and so its CREATE2 address, differs from the
+    recorded deployment. New addresses are fed forward, so a changed module also
+    changes MODULES_PROVIDER and LTV.
+    """
+    ensure_artifacts_built()
+    data = read_data(chain, lending_protocol, args_filename)
+    recorded_addresses = get_recorded_contracts(chain, lending_protocol, args_filename)
+    changes = []
+    for contract in UPGRADE_LTV_CONTRACTS:
+        try:
+            expected_address = ADDRESS_ENGINE.expected_address(
+                contract.value, lending_protocol, CHAIN_TO_CHAIN_ID[chain], data
+            )
+        except (ValueError, ArtifactNotFoundError) as e:
+            print(f"ERROR Could not compute expected address of {contract.value}: {e}")
+            sys.exit(1)
+        recorded_address = recorded_addresses.get(contract.value)
+        if (
+            recorded_address is None
+            or recorded_address.lower() != expected_address.lower()
+        ):
+            changes.append((contract, recorded_address, expected_address))
+            data[contract.value] = expected_address
+    ADDRESS_ENGINE.save_cache()
+    return changes
+
+
+def check_upgrade_storage_layout(chain, lending_protocol, args_filename, contracts):
+    """Exits before any broadcast if a changed contract breaks the recorded LTVState layout"""
+    layout_file_path = get_storage_layout_file_path(
+        chain, lending_protocol, args_filename
+    )
+    if not os.path.exists(layout_file_path):
+        print(
+            f"WARNING No recorded storage layout in {layout_file_path}, skipping layout check"
+        )
+        return
+    with open(layout_file_path, "r") as f:
+        recorded_layout = json.load(f)
+
+    problems = []
+    for contract in contracts:
+        if contract not in PROXY_STORAGE_CONTRACTS:
+            continue
+        try:
+            layout = ADDRESS_ENGINE.get_storage_layout(
+                *get_contract_artifact(lending_protocol, contract.value)
+            )
+        except ArtifactNotFoundError as e:
+            print(f"ERROR {e}")
+            sys.exit(1)
+        for problem in find_layout_incompatibilities(recorded_layout, layout):
+            problems.append(f"{contract.value}: {problem}")
+    if problems:
+        for problem in problems:
+            print(f"ERROR Incompatible storage layout, {problem}")
+        sys.exit(1)
+    print("SUCCESS Storage layout is compatible with the deployed LTV")
+
+
+def incremental_upgrade_ltv(args):
+    """Redeploys only contracts whose creation code changed, then runs the upgrade script"""
+    changes = get_upgrade_changes(args.chain, args.lending_protocol, args.args_filename)
+    if not changes:
+        print("SUCCESS Deployment matches current artifacts, nothing to upgrade")
+        return
+    for contract, recorded_address, expected_address in changes:
+        print(f"{contract.value}: {recorded_address} -> {expected_address}")
+    check_upgrade_storage_layout(
+        args.chain,
+        args.lending_protocol,
+        args.args_filename,
+        [contract for contract, _, _ in changes],
+    )
+
+    for contract, _, _ in changes:
+        process_deployment(
+            args.chain,
+            args.lending_protocol,
+            args.private_key,
+            args.args_filename,
+            contract,
+        )
+    if args.chain.find("local") != -1:
+        fake_ltv_roles(args)
+    make_upgrade_ltv(args)
+
+
 def make_upgrade_ltv(args):
     data = read_data(args.chain, args.lending_protocol, args.args_filename)
     run_script(
@@ -604,20 +1433,26 @@ def make_upgrade_ltv(args):
     print(f"SUCCESS LTV upgraded successfully")
 
 
-def parse_address_from_result(output):
-    return "0x" + output.strip()[26:]
+ROLE_OWNER_KEYS = ["BEACON", "PROXY_ADMIN", "LTV_BEACON_PROXY", "WHITELIST_REGISTRY"]
+
+LTV_ROLE_CHANGES = [
+    ("updateGuardian(address)", "guardian()"),
+    ("updateEmergencyDeleverager(address)", "emergencyDeleverager()"),
+    ("updateGovernor(address)", "governor()"),
+]
 
 
-def change_role_if_needed(data, dataKey, owner, role_signature, role_getter_signature):
-    print(f"Getting {role_getter_signature} role of {dataKey} {data[dataKey]}")
-    role_getter_result = subprocess.run(
-        [f'cast call {data[dataKey]} "{role_getter_signature}"'],
-        capture_output=True,
-        shell=True,
-        text=True,
+def read_roles(client, role_reads):
+    """Reads every (address, role getter) pair with one batch of eth_call"""
+    results = client.eth_call_batch(
+        [(address, getter, (), ["address"]) for address, getter in role_reads]
     )
-    output = handle_script_result(role_getter_result)
-    role = parse_address_from_result(output)
+    return {role_read: result[0] for role_read, result in zip(role_reads, results)}
+
+
+def change_role_if_needed(
+    client, data, dataKey, owner, role_signature, role_getter_signature, role
+):
     if role.lower() == TEST_USER_ADDRESS.lower():
         print(
             f"SUCCESS {role_getter_signature} role of {dataKey} {data[dataKey]} is already owned by {TEST_USER_ADDRESS}"
@@ -626,89 +1461,301 @@ def change_role_if_needed(data, dataKey, owner, role_signature, role_getter_sign
     print(
         f"Transferring {role_getter_signature} role of {dataKey} {data[dataKey]} to new {role_getter_signature}"
     )
-    result = subprocess.run(
-        ["cast", "rpc", "anvil_setBalance", owner, "0x152d02c7e14af6800000"],
-        text=True,
-        capture_output=True,
-    )
-    handle_script_result(result)
-    result = subprocess.run(
-        [
-            "cast",
-            "send",
-            data[dataKey],
-            "--from",
-            owner,
-            role_signature,
-            TEST_USER_ADDRESS,
-            "--unlocked",
-        ],
-        text=True,
-        capture_output=True,
-    )
-    handle_script_result(result)
+    client.call("anvil_setBalance", [owner, "0x152d02c7e14af6800000"])
+    client.send_transaction(owner, data[dataKey], role_signature, [TEST_USER_ADDRESS])
     print(
         f"SUCCESS Transferring {role_getter_signature} role of {dataKey} {data[dataKey]} to new {role_getter_signature}"
     )
 
 
-def impersonate_owner_if_needed(data, dataKey):
-    if not dataKey in data.keys():
-        return
-
-    print(f"Getting owner of {dataKey} {data[dataKey]}")
-    result = subprocess.run(
-        [f'cast call {data[dataKey]} "owner()"'],
-        capture_output=True,
-        shell=True,
-        text=True,
-    )
-    output = handle_script_result(result)
-    owner = parse_address_from_result(output)
+def impersonate_owner_if_needed(client, data, dataKey, owner):
     print(f"Owner of {dataKey} {data[dataKey]} is {owner}")
 
     print(f"Impersonating owner {owner}")
-    result = subprocess.run(
-        [f"cast rpc anvil_impersonateAccount {owner}"],
-        text=True,
-        capture_output=True,
-        shell=True,
-    )
-    handle_script_result(result)
+    client.call("anvil_impersonateAccount", [owner])
     print("SUCCESS Impersonating owner")
 
-    change_role_if_needed(data, dataKey, owner, "transferOwnership(address)", "owner()")
+    change_role_if_needed(
+        client, data, dataKey, owner, "transferOwnership(address)", "owner()", owner
+    )
 
 
 def fake_ltv_roles(args):
     data = read_data(args.chain, args.lending_protocol, args.args_filename)
-    impersonate_owner_if_needed(data, "BEACON")
-    impersonate_owner_if_needed(data, "PROXY_ADMIN")
-    impersonate_owner_if_needed(data, "LTV_BEACON_PROXY")
-    impersonate_owner_if_needed(data, "WHITELIST_REGISTRY")
-    change_role_if_needed(
-        data,
-        "LTV_BEACON_PROXY",
-        TEST_USER_ADDRESS,
-        "updateGuardian(address)",
-        "guardian()",
+    client = get_rpc_client(args.chain)
+
+    owner_keys = [key for key in ROLE_OWNER_KEYS if key in data.keys()]
+    role_reads = [(data[key], "owner()") for key in owner_keys]
+    role_reads += [(data["LTV_BEACON_PROXY"], getter) for _, getter in LTV_ROLE_CHANGES]
+    print(f"Getting roles of {', '.join(owner_keys)}")
+    try:
+        roles = read_roles(client, role_reads)
+        for key in owner_keys:
+            impersonate_owner_if_needed(
+                client, data, key, roles[(data[key], "owner()")]
+            )
+        for role_signature, role_getter_signature in LTV_ROLE_CHANGES:
+            change_role_if_needed(
+                client,
+                data,
+                "LTV_BEACON_PROXY",
+                TEST_USER_ADDRESS,
+                role_signature,
+                role_getter_signature,
+                roles[(data["LTV_BEACON_PROXY"], role_getter_signature)],
+            )
+    except (RpcError, OSError) as e:
+        print(f"ERROR Could not fake LTV roles: {e}")
+        sys.exit(1)
+
+
+def start_anvil(chain):
+    """Starts anvil for a local chain, stopped when deploy.py exits"""
+    fork_url_env, fork_block_number = LOCAL_FORKS.get(chain, (None, None))
+    node = AnvilNode(
+        ANVIL_PORT,
+        fork_url=os.environ[fork_url_env] if fork_url_env else None,
+        fork_block_number=fork_block_number,
     )
-    change_role_if_needed(
-        data,
-        "LTV_BEACON_PROXY",
-        TEST_USER_ADDRESS,
-        "updateEmergencyDeleverager(address)",
-        "emergencyDeleverager()",
+    print("Starting anvil: " + " ".join(node.get_command()))
+    try:
+        node.start()
+    except AnvilError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    atexit.register(node.stop)
+    print("SUCCESS Starting anvil")
+
+
+def get_state_cache(chain):
+    return StateCache(f"deploy_out/{chain}/anvil_state")
+
+
+def get_state_cache_key(args):
+    """Key of the state after deploying and faking the roles of an args file"""
+    ensure_artifacts_built()
+    with open(
+        get_args_file_path(args.chain, args.lending_protocol, args.args_filename), "r"
+    ) as f:
+        args_file = f.read()
+    hashes = get_creation_code_hashes(
+        args.chain, args.lending_protocol, args.args_filename
+    )
+    return get_state_key(
+        {
+            "chain": args.chain,
+            "lending_protocol": args.lending_protocol,
+            "args_file": args_file,
+            "fork_block_number": LOCAL_FORKS.get(args.chain, (None, None))[1],
+            "creation_code_hashes": {
+                contract.value: code_hash for contract, code_hash in hashes.items()
+            },
+        }
+    )
+
+
+def get_state_cache_conflicts(args):
+    """
+    Requested deployment commands besides --full-deploy, whose state is not the
+    one a cache entry is saved for
+    """
+    return [
+        name
+        for name, value in vars(args).items()
+        if value and (name.startswith("deploy_") or name in ("batch_deploy", "fleet"))
+    ]
+
+
+def restore_test_state(args, key):
+    """Loads the cached state of key into anvil, returns whether it was cached"""
+    contracts = get_recorded_contracts(
+        args.chain, args.lending_protocol, args.args_filename
+    )
+    try:
+        restored = get_state_cache(args.chain).load(
+            get_rpc_client(args.chain), key, contracts
+        )
+    except (RpcError, OSError, ValueError, KeyError) as e:
+        print(f"WARNING Could not restore anvil state {key[:12]}: {e}")
+        return False
+    if restored:
+        print(f"SUCCESS Restored anvil state {key[:12]}, skipping deployment")
+    return restored
+
+
+def save_test_state(args, key):
+    contracts = get_recorded_contracts(
+        args.chain, args.lending_protocol, args.args_filename
     )
-    change_role_if_needed(
-        data,
-        "LTV_BEACON_PROXY",
-        TEST_USER_ADDRESS,
-        "updateGovernor(address)",
-        "governor()",
+    try:
+        get_state_cache(args.chain).save(get_rpc_client(args.chain), key, contracts)
+    except (RpcError, OSError) as e:
+        print(f"WARNING Could not cache anvil state {key[:12]}: {e}")
+        return
+    print(f"SUCCESS Cached anvil state {key[:12]}")
+
+
+def run_test_scripts(args, tests):
+    """Runs the test scripts, each from the same state on local chains"""
+    client = get_rpc_client(args.chain)
+    for contract, message in tests:
+        data = read_data(args.chain, args.lending_protocol, args.args_filename)
+        if args.chain.find("local") == -1:
+            run_script(
+                args.chain, contract, args.lending_protocol, args.private_key, data
+            )
+        else:
+            with evm_snapshot(client):
+                run_script(
+                    args.chain, contract, args.lending_protocol, args.private_key, data
+                )
+        print(f"SUCCESS {message}")
+
+
+def get_telemetry_report_path(chain, lending_protocol, args_filename):
+    args_filename = args_filename.replace(".json", "")
+    timestamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(TELEMETRY.started_at))
+    return (
+        f"deploy_out/{chain}/{lending_protocol}/telemetry/{args_filename}_{timestamp}"
     )
 
 
+def write_telemetry_report(args):
+    """Writes the run's JSON and CSV telemetry report and prints its summary"""
+    if not TELEMETRY.events:
+        return
+    json_path, csv_path = TELEMETRY.write_report(
+        get_telemetry_report_path(
+            args.chain, args.lending_protocol, args.args_filename
+        ),
+        {
+            "chain": args.chain,
+            "lending_protocol": args.lending_protocol,
+            "args_filename": args.args_filename,
+            "max_workers": args.max_workers,
+        },
+    )
+    print(TELEMETRY.summary_table())
+    print(f"Telemetry written to {json_path} and {csv_path}")
+
+
+def run_deploy_commands(args):
+    """Runs the deployment, upgrade and status commands of the command line"""
+    if args.deploy_erc20_module:
+        deploy_erc20_module(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_borrow_vault_module:
+        deploy_borrow_vault_module(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_collateral_vault_module:
+        deploy_collateral_vault_module(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_low_level_rebalance_module:
+        deploy_low_level_rebalance_module(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_auction_module:
+        deploy_auction_module(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_administration_module:
+        deploy_administration_module(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_initialize_module:
+        deploy_initialize_module(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_modules_provider:
+        deploy_modules_provider(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_ltv:
+        deploy_ltv(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_beacon:
+        deploy_beacon(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_whitelist_registry:
+        deploy_whitelist_registry(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_vault_balance_as_lending_connector:
+        deploy_vault_balance_as_lending_connector(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_constant_slippage_connector:
+        deploy_constant_slippage_connector(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_oracle_connector:
+        deploy_oracle_connector(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_lending_connector:
+        deploy_lending_connector(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+    if args.deploy_ltv_beacon_proxy:
+        deploy_ltv_beacon_proxy(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+    if args.deploy_ltv_implementation:
+        deploy_ltv_implementation(args)
+
+    if args.deploy_connectors:
+        deploy_connectors(args, CONTRACTS.NONE)
+
+    if args.batch_deploy:
+        batch_deploy(args)
+
+    if args.fleet:
+        deploy_fleet(args)
+
+    if args.full_deploy:
+        deploy_ltv_implementation(args)
+        deploy_beacon(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+        deploy_connectors(args, CONTRACTS.BEACON)
+        deploy_ltv_beacon_proxy(
+            args.chain, args.lending_protocol, args.private_key, args.args_filename
+        )
+
+
+def run_upgrade_commands(args):
+    """Runs the upgrade and status commands, which also run after a state restore"""
+    if args.upgrade_ltv:
+        upgrade_ltv(args)
+
+    if args.incremental_upgrade_ltv:
+        incremental_upgrade_ltv(args)
+
+    if args.deployment_status:
+        status = probe_deployment(args.chain, args.lending_protocol, args.args_filename)
+        print(json.dumps(status, indent=4))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Foundry Script")
     parser.add_argument(
@@ -813,9 +1860,63 @@ def main():
         "--deploy-connectors", help="Deploy connectors", action="store_true"
     )
 
+    parser.add_argument(
+        "--deployment-status",
+        help="Print which contracts of the deployment have code on chain",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--batch-deploy",
+        help="Deploy every missing contract of the full deployment in a single broadcast",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--max-workers",
+        help="Number of LTV implementation deployments to broadcast concurrently",
+        type=int,
+        default=1,
+    )
+
     parser.add_argument(
         "--skip-anvil",
-        help="Skip Anvil",
+        help="Use the anvil already running on port 8545 instead of starting one",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--no-state-cache",
+        help="Don't restore or cache the anvil state of the deployed LTV test flows",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--incremental-upgrade-ltv",
+        help="Upgrade LTV redeploying only contracts whose creation code changed, after a storage layout check",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--fleet",
+        help="Full deploy of every args file matching this glob (e.g. '*.json'), deploying shared contracts once",
+    )
+
+    parser.add_argument(
+        "--plan",
+        help="Show the --full-deploy (or --upgrade-ltv) steps with estimated gas without broadcasting",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--gas-price",
+        help="Gas price in gwei for the --plan cost, defaults to eth_gasPrice",
+        type=float,
+    )
+
+    parser.add_argument(
+        "--no-telemetry",
+        help="Don't write the timing and gas report to deploy_out/<chain>/<protocol>/telemetry",
         action="store_true",
     )
 
@@ -833,31 +1934,20 @@ def main():
 
     args = parser.parse_args()
 
+    if not args.no_telemetry:
+        atexit.register(write_telemetry_report, args)
+
     if args.chain.find("local") != -1:
         args.private_key = TEST_USER_PRIVATE_KEY
-        if args.chain == "local_fork_mainnet":
-            rpc_url = " --fork-url " + os.environ["RPC_MAINNET"]
-            block_number = " --fork-block-number 24461204"
-        elif args.chain == "local_fork_sepolia":
-            rpc_url = " --fork-url " + os.environ["RPC_SEPOLIA"]
-            block_number = " --fork-block-number 9532361"
-        else:
-            rpc_url = ""
-            block_number = ""
-
         if not args.skip_anvil:
-            print("Please run the following command to start anvil:")
-            print("anvil --port 8545" + rpc_url + block_number)
-            print("Press Enter to continue...")
-            input()
+            start_anvil(args.chain)
 
-        subprocess.run(
-            ["cast", "rpc", "anvil_setBlockTimestampInterval", "1"],
-            text=True,
-            capture_output=True,
-        )
+        try:
+            get_rpc_client(args.chain).call("anvil_setBlockTimestampInterval", [1])
+        except (RpcError, OSError):
+            pass
 
-    elif not args.private_key:
+    elif not args.private_key and not args.plan:
         # Check for private key from environment variable if not provided as argument
         args.private_key = os.getenv("PRIVATE_KEY")
         if not args.private_key:
@@ -866,127 +1956,63 @@ def main():
             )
             sys.exit(1)
 
-    if args.deploy_erc20_module:
-        deploy_erc20_module(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_borrow_vault_module:
-        deploy_borrow_vault_module(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_collateral_vault_module:
-        deploy_collateral_vault_module(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_low_level_rebalance_module:
-        deploy_low_level_rebalance_module(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_auction_module:
-        deploy_auction_module(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_administration_module:
-        deploy_administration_module(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_initialize_module:
-        deploy_initialize_module(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_modules_provider:
-        deploy_modules_provider(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_ltv:
-        deploy_ltv(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_beacon:
-        deploy_beacon(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_whitelist_registry:
-        deploy_whitelist_registry(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_vault_balance_as_lending_connector:
-        deploy_vault_balance_as_lending_connector(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_constant_slippage_connector:
-        deploy_constant_slippage_connector(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-
-    if args.deploy_oracle_connector:
-        deploy_oracle_connector(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
+    if args.plan:
+        if args.incremental_upgrade_ltv:
+            changes = get_upgrade_changes(
+                args.chain, args.lending_protocol, args.args_filename
+            )
+            check_upgrade_storage_layout(
+                args.chain,
+                args.lending_protocol,
+                args.args_filename,
+                [contract for contract, _, _ in changes],
+            )
+            plan_deployment(args, UPGRADE_LTV_CONTRACTS, [CONTRACTS.UPGRADE])
+        elif args.upgrade_ltv:
+            plan_deployment(args, UPGRADE_LTV_CONTRACTS, [CONTRACTS.UPGRADE])
+        else:
+            plan_deployment(args, FULL_DEPLOY_CONTRACTS)
+        return
 
-    if args.deploy_lending_connector:
-        deploy_lending_connector(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
+    tests = []
+    if args.test_deployed_ltv_beacon_proxy_general_case:
+        tests.append(
+            (CONTRACTS.GENERAL_TEST, "Test general deployed LTV beacon proxy completed")
         )
-
-    if args.deploy_ltv_beacon_proxy:
-        deploy_ltv_beacon_proxy(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
+    if args.test_deployed_ltv_beacon_proxy_lido:
+        tests.append(
+            (CONTRACTS.LIDO_TEST, "Test deployed LTV beacon proxy Lido completed")
         )
-    if args.deploy_ltv_implementation:
-        deploy_ltv_implementation(args)
 
-    if args.deploy_connectors:
-        deploy_connectors(args, CONTRACTS.NONE)
+    # the cached state is the one of a fresh anvil after the full deployment and
+    # role faking, upgrade and status commands run on top of it
+    state_cache_key = None
+    if (
+        tests
+        and args.chain.find("local") != -1
+        and not args.skip_anvil
+        and not args.no_state_cache
+    ):
+        conflicts = get_state_cache_conflicts(args)
+        if conflicts:
+            flags = ", ".join("--" + name.replace("_", "-") for name in conflicts)
+            print(f"Not using the anvil state cache with {flags}")
+        else:
+            state_cache_key = get_state_cache_key(args)
+    restored = state_cache_key is not None and restore_test_state(args, state_cache_key)
 
-    if args.full_deploy:
-        deploy_ltv_implementation(args)
-        deploy_beacon(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
-        deploy_connectors(args, CONTRACTS.BEACON)
-        deploy_ltv_beacon_proxy(
-            args.chain, args.lending_protocol, args.private_key, args.args_filename
-        )
+    if not restored:
+        run_deploy_commands(args)
+        if state_cache_key is not None:
+            fake_ltv_roles(args)
+            save_test_state(args, state_cache_key)
 
-    if args.upgrade_ltv:
-        upgrade_ltv(args)
-
-    if args.test_deployed_ltv_beacon_proxy_general_case:
-        fake_ltv_roles(args)
-        data = read_data(args.chain, args.lending_protocol, args.args_filename)
-        run_script(
-            args.chain,
-            CONTRACTS.GENERAL_TEST,
-            args.lending_protocol,
-            args.private_key,
-            data,
-        )
-        print("SUCCESS Test general deployed LTV beacon proxy completed")
+    run_upgrade_commands(args)
 
-    if args.test_deployed_ltv_beacon_proxy_lido:
-        fake_ltv_roles(args)
-        data = read_data(args.chain, args.lending_protocol, args.args_filename)
-        run_script(
-            args.chain,
-            CONTRACTS.LIDO_TEST,
-            args.lending_protocol,
-            args.private_key,
-            data,
-        )
-        print("SUCCESS Test deployed LTV beacon proxy Lido completed")
+    if tests:
+        if state_cache_key is None:
+            fake_ltv_roles(args)
+        run_test_scripts(args, tests)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,3 @@
+"""
+Helpers for the deploy.py deployment orchestrator
+"""
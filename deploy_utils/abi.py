@@ -0,0 +1,172 @@
+"""
+Minimal Solidity ABI encoder/decoder
+
+Types are passed as canonical strings, e.g. "address", "uint256", "bytes",
+"(address,uint256)[]". Tuples are Python tuples/lists, addresses are hex strings.
+"""
+
+from deploy_utils.keccak import function_selector
+
+
+def split_tuple_types(inner):
+    """Splits "address,(uint256,bool),bytes" into its top level components"""
+    types = []
+    depth = 0
+    current = ""
+    for char in inner:
+        if char == "," and depth == 0:
+            types.append(current)
+            current = ""
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        current += char
+    if current:
+        types.append(current)
+    return types
+
+
+def _parse_array(abi_type):
+    """Returns (element_type, length) for array types, length is None for T[]"""
+    if not abi_type.endswith("]"):
+        return None
+    start = abi_type.rindex("[")
+    size = abi_type[start + 1 : -1]
+    return abi_type[:start], (int(size) if size else None)
+
+
+def is_dynamic(abi_type):
+    array = _parse_array(abi_type)
+    if array is not None:
+        element_type, length = array
+        return length is None or is_dynamic(element_type)
+    if abi_type.startswith("("):
+        return any(is_dynamic(t) for t in split_tuple_types(abi_type[1:-1]))
+    return abi_type in ("bytes", "string")
+
+
+def _head_size(abi_type):
+    if is_dynamic(abi_type):
+        return 32
+    array = _parse_array(abi_type)
+    if array is not None:
+        return array[1] * _head_size(array[0])
+    if abi_type.startswith("("):
+        return sum(_head_size(t) for t in split_tuple_types(abi_type[1:-1]))
+    return 32
+
+
+def _encode_static_word(abi_type, value):
+    if abi_type == "address":
+        return bytes.fromhex(value.lower().replace("0x", "").rjust(64, "0"))
+    if abi_type == "bool":
+        return (1 if value else 0).to_bytes(32, "big")
+    if abi_type.startswith("uint"):
+        return int(value).to_bytes(32, "big")
+    if abi_type.startswith("int"):
+        return (int(value) % (1 << 256)).to_bytes(32, "big")
+    if abi_type.startswith("bytes"):
+        if isinstance(value, str):
+            value = bytes.fromhex(value.replace("0x", ""))
+        return bytes(value).ljust(32, b"\x00")
+    raise ValueError(f"Unsupported ABI type: {abi_type}")
+
+
+def _pad32(data):
+    return data + b"\x00" * (-len(data) % 32)
+
+
+def encode_single(abi_type, value):
+    array = _parse_array(abi_type)
+    if array is not None:
+        element_type, length = array
+        encoded = encode([element_type] * len(value), value)
+        if length is None:
+            return len(value).to_bytes(32, "big") + encoded
+        return encoded
+    if abi_type.startswith("("):
+        return encode(split_tuple_types(abi_type[1:-1]), value)
+    if abi_type == "string":
+        value = value.encode()
+        return len(value).to_bytes(32, "big") + _pad32(value)
+    if abi_type == "bytes":
+        if isinstance(value, str):
+            value = bytes.fromhex(value.replace("0x", ""))
+        return len(value).to_bytes(32, "big") + _pad32(bytes(value))
+    return _encode_static_word(abi_type, value)
+
+
+def encode(types, values):
+    """Equivalent of Solidity abi.encode(values...)"""
+    if len(types) != len(values):
+        raise ValueError(f"Expected {len(types)} values, got {len(values)}")
+    head_length = sum(_head_size(t) for t in types)
+    heads = []
+    tails = []
+    tail_offset = head_length
+    for abi_type, value in zip(types, values):
+        encoded = encode_single(abi_type, value)
+        if is_dynamic(abi_type):
+            heads.append(tail_offset.to_bytes(32, "big"))
+            tails.append(encoded)
+            tail_offset += len(encoded)
+        else:
+            heads.append(encoded)
+    return b"".join(heads) + b"".join(tails)
+
+
+def encode_call(signature, values=()):
+    """Equivalent of abi.encodeWithSignature(signature, values...)"""
+    inner = signature[signature.index("(") + 1 : signature.rindex(")")]
+    return function_selector(signature) + encode(split_tuple_types(inner), values)
+
+
+def _decode_word(abi_type, word):
+    if abi_type == "address":
+        return "0x" + word[12:].hex()
+    if abi_type == "bool":
+        return word[-1] != 0
+    if abi_type.startswith("uint"):
+        return int.from_bytes(word, "big")
+    if abi_type.startswith("int"):
+        bits = int(abi_type[3:] or 256)
+        value = int.from_bytes(word, "big") & ((1 << bits) - 1)
+        return value - (1 << bits) if value >> (bits - 1) else value
+    if abi_type.startswith("bytes"):
+        return word[: int(abi_type[5:])]
+    raise ValueError(f"Unsupported ABI type: {abi_type}")
+
+
+def decode_single(abi_type, data, offset=0):
+    array = _parse_array(abi_type)
+    if array is not None:
+        element_type, length = array
+        if length is None:
+            length = int.from_bytes(data[offset : offset + 32], "big")
+            offset += 32
+        return list(decode([element_type] * length, data, offset))
+    if abi_type.startswith("("):
+        return decode(split_tuple_types(abi_type[1:-1]), data, offset)
+    if abi_type in ("bytes", "string"):
+        length = int.from_bytes(data[offset : offset + 32], "big")
+        raw = bytes(data[offset + 32 : offset + 32 + length])
+        return raw.decode() if abi_type == "string" else raw
+    return _decode_word(abi_type, bytes(data[offset : offset + 32]))
+
+
+def decode(types, data, offset=0):
+    """Equivalent of Solidity abi.decode(data, (types...))"""
+    if isinstance(data, str):
+        data = bytes.fromhex(data.replace("0x", ""))
+    values = []
+    head = offset
+    for abi_type in types:
+        if is_dynamic(abi_type):
+            pointer = int.from_bytes(data[head : head + 32], "big")
+            values.append(decode_single(abi_type, data, offset + pointer))
+        else:
+            values.append(decode_single(abi_type, data, head))
+        head += _head_size(abi_type)
+    return tuple(values)
@@ -0,0 +1,133 @@
+"""
+Managed anvil node and deployment state cache
+
+deploy.py starts anvil itself for the local chains. The state reached after
+deploying and faking the LTV roles is dumped with anvil_dumpState into a
+cache entry keyed by the args file, the fork block and the creation code
+hashes of the deployment, so a later run with the same key restores it with
+anvil_loadState instead of redoing the deployment. evm_snapshot /
+evm_revert bring the node back to that state between test scripts.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+
+from deploy_utils.journal import atomic_write
+from deploy_utils.rpc import JsonRpcClient, RpcError
+
+
+class AnvilError(Exception):
+    pass
+
+
+class AnvilNode:
+    """anvil subprocess, optionally forking fork_url at fork_block_number"""
+
+    def __init__(self, port, fork_url=None, fork_block_number=None, timeout=60):
+        self.port = port
+        self.fork_url = fork_url
+        self.fork_block_number = fork_block_number
+        self.timeout = timeout
+        self.process = None
+
+    def get_command(self):
+        command = ["anvil", "--port", str(self.port)]
+        if self.fork_url:
+            command += ["--fork-url", self.fork_url]
+        if self.fork_block_number is not None:
+            command += ["--fork-block-number", str(self.fork_block_number)]
+        return command
+
+    def start(self):
+        """Starts anvil and waits until it answers"""
+        client = JsonRpcClient(f"localhost:{self.port}")
+        try:
+            client.call("eth_chainId")
+            raise AnvilError(f"A node is already running on port {self.port}")
+        except (RpcError, OSError):
+            pass
+        try:
+            self.process = subprocess.Popen(
+                self.get_command(),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            raise AnvilError(f"Could not start anvil: {e}")
+        deadline = time.monotonic() + self.timeout
+        try:
+            while True:
+                try:
+                    client.call("eth_chainId")
+                    return
+                except (RpcError, OSError):
+                    if self.process.poll() is not None:
+                        raise AnvilError(
+                            f"anvil exited with code {self.process.returncode}"
+                        )
+                    if time.monotonic() > deadline:
+                        self.stop()
+                        raise AnvilError(f"anvil did not start on port {self.port}")
+                    time.sleep(0.1)
+        finally:
+            client.close()
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def get_state_key(fields):
+    """sha256 of the JSON of fields, the values the cached state depends on"""
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+class StateCache:
+    """anvil_dumpState entries of a directory, one JSON file per key"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def get_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, client, key, contracts):
+        """
+        Loads the state of key into the node, returns False without an entry
+        or when it was dumped for other deployed contracts than contracts
+        """
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            return False
+        with open(path, "r") as f:
+            entry = json.load(f)
+        if entry["contracts"] != contracts:
+            return False
+        client.call("anvil_loadState", [entry["state"]])
+        return True
+
+    def save(self, client, key, contracts):
+        """Dumps the node state under key with the deployed contracts"""
+        state = client.call("anvil_dumpState")
+        atomic_write(
+            self.get_path(key), json.dumps({"contracts": contracts, "state": state})
+        )
+
+
+@contextmanager
+def evm_snapshot(client):
+    """Reverts the node to its state at entry when the block exits"""
+    snapshot_id = client.call("evm_snapshot")
+    try:
+        yield snapshot_id
+    finally:
+        client.call("evm_revert", [snapshot_id])
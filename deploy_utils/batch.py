@@ -0,0 +1,102 @@
+"""
+Single broadcast batch deployment
+
+Generates one forge script which runs the deploy() bodies of several existing
+BaseScript deploy scripts inside a single broadcast, and splits the resulting
+run-latest.json back into per contract transactions.
+"""
+
+import json
+import os
+import re
+
+BATCH_SCRIPT_PATH = "script/generated/BatchDeploy.s.sol"
+BATCH_SCRIPT_CONTRACT = "BatchDeploy"
+
+
+def get_script_contract_name(deploy_file):
+    """Returns the name of the BaseScript contract defined in a deploy script"""
+    deploy_file = deploy_file.split(":")[0]
+    with open(deploy_file, "r") as f:
+        source = f.read()
+    match = re.search(r"contract\s+(\w+)\s+is\s+BaseScript\b", source)
+    if not match:
+        raise ValueError(f"No BaseScript contract found in {deploy_file}")
+    return match.group(1)
+
+
+def generate_batch_script(deploy_files, output_path=BATCH_SCRIPT_PATH):
+    """
+    Writes a script running deploy() of every given deploy script, in order.
+
+    Each deploy script gets a thin wrapper contract which broadcasts its own
+    deploy() body, so vm.env* lookups and `new X{salt: bytes32(0)}` behave
+    exactly as when the deploy script is run on its own.
+    """
+    output_dir = os.path.dirname(output_path)
+    imports = []
+    wrappers = []
+    calls = []
+    for deploy_file in deploy_files:
+        deploy_file = deploy_file.split(":")[0]
+        contract_name = get_script_contract_name(deploy_file)
+        import_path = os.path.relpath(deploy_file, output_dir)
+        imports.append(f'import {{{contract_name}}} from "{import_path}";')
+        wrappers.append(
+            f"contract Batch{contract_name} is {contract_name} {{\n"
+            f"    function batchDeploy() external {{\n"
+            f"        vm.startBroadcast();\n"
+            f"        deploy();\n"
+            f"        vm.stopBroadcast();\n"
+            f"    }}\n"
+            f"}}\n"
+        )
+        calls.append(f"        new Batch{contract_name}().batchDeploy();")
+
+    source = (
+        "// SPDX-License-Identifier: BUSL-1.1\n"
+        "pragma solidity ^0.8.28;\n"
+        "\n"
+        "// Generated by deploy.py --batch-deploy, do not edit\n"
+        "\n"
+        'import {Script} from "forge-std/Script.sol";\n'
+        + "\n".join(imports)
+        + "\n\n"
+        + "\n".join(wrappers)
+        + "\n"
+        f"contract {BATCH_SCRIPT_CONTRACT} is Script {{\n"
+        "    function run() external {\n" + "\n".join(calls) + "\n"
+        "    }\n"
+        "}\n"
+    )
+    os.makedirs(output_dir, exist_ok=True)
+    with open(output_path, "w") as f:
+        f.write(source)
+    return f"{output_path}:{BATCH_SCRIPT_CONTRACT}"
+
+
+def get_receipt_transactions_by_address(receipt_file):
+    """Returns {lowercase contract address: transaction} of a run-latest.json"""
+    with open(receipt_file, "r") as f:
+        data = json.load(f)
+    transactions = {}
+    for transaction in data["transactions"]:
+        if transaction.get("contractAddress"):
+            transactions[transaction["contractAddress"].lower()] = transaction
+    return transactions
+
+
+def get_receipt_libraries(receipt_libraries, linked_addresses=None):
+    """
+    Returns {library name: address} of the "path:Name:address" libraries of a
+    run-latest.json. A batch receipt lists the libraries of every contract it
+    deployed, with linked_addresses only the libraries at these addresses are kept.
+    """
+    if linked_addresses is not None:
+        linked_addresses = {address.lower() for address in linked_addresses}
+    libraries = {}
+    for library in receipt_libraries:
+        _, library_name, library_address = library.split(":")
+        if linked_addresses is None or library_address.lower() in linked_addresses:
+            libraries[library_name] = library_address
+    return libraries
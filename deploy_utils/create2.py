@@ -0,0 +1,537 @@
+"""
+Native CREATE2 expected address engine
+
+Mirrors BaseScript.expectedAddress: every contract is deployed through the
+0x4e59... CREATE2 deployer with a zero salt, so its address only depends on the
+keccak256 of its creation code (with libraries linked and constructor arguments
+appended). Creation code and link references are read from the forge `out/`
+artifacts, results are cached on disk keyed by artifact and init code hashes.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+
+from deploy_utils import abi
+from deploy_utils.keccak import keccak256, to_checksum_address
+
+CREATE2_DEPLOYER = "0x4e59b44847b379578588920cA78FbF26c0B4956C"
+ZERO_SALT = b"\x00" * 32
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+DEFAULT_OUT_DIR = "out"
+DEFAULT_CACHE_FILE = "deploy_out/cache/create2_cache.json"
+
+AAVE_V3_POOL = {
+    1: "0x87870Bca3F3fD6335C3F4ce8392D69350B4fA4E2",
+    11155111: "0x6Ae43d3271ff6888e7Fc43Fd7321a503ff738951",
+}
+
+AAVE_V3_ORACLE = {
+    1: "0x54586bE62E3c3580375aE3723C145253060Ca0C2",
+    11155111: "0x2da88497588bf89281816106C7259e31AF45a663",
+}
+
+MORPHO_POOL = {
+    1: "0xBBBBBbbBBb9cC5e90e3b3Af64bdAF62C37EEFFCb",
+    11155111: "0xd011EE229E7459ba1ddd22631eF7bF528d424A14",
+}
+
+# (source path, contract name) of the contract created by each deploy script
+CONTRACT_ARTIFACTS = {
+    "ERC20_MODULE": ("src/elements/modules/ERC20Module.sol", "ERC20Module"),
+    "BORROW_VAULT_MODULE": (
+        "src/elements/modules/BorrowVaultModule.sol",
+        "BorrowVaultModule",
+    ),
+    "COLLATERAL_VAULT_MODULE": (
+        "src/elements/modules/CollateralVaultModule.sol",
+        "CollateralVaultModule",
+    ),
+    "LOW_LEVEL_REBALANCE_MODULE": (
+        "src/elements/modules/LowLevelRebalanceModule.sol",
+        "LowLevelRebalanceModule",
+    ),
+    "AUCTION_MODULE": ("src/elements/modules/AuctionModule.sol", "AuctionModule"),
+    "ADMINISTRATION_MODULE": (
+        "src/elements/modules/AdministrationModule.sol",
+        "AdministrationModule",
+    ),
+    "INITIALIZE_MODULE": (
+        "src/elements/modules/InitializeModule.sol",
+        "InitializeModule",
+    ),
+    "MODULES_PROVIDER": ("src/elements/ModulesProvider.sol", "ModulesProvider"),
+    "LTV": ("src/elements/LTV.sol", "LTV"),
+    "BEACON": ("contracts/proxy/beacon/UpgradeableBeacon.sol", "UpgradeableBeacon"),
+    "WHITELIST_REGISTRY": (
+        "src/elements/WhitelistRegistry.sol",
+        "WhitelistRegistry",
+    ),
+    "VAULT_BALANCE_AS_LENDING_CONNECTOR": (
+        "src/connectors/lending_connectors/VaultBalanceAsLendingConnector.sol",
+        "VaultBalanceAsLendingConnector",
+    ),
+    "SLIPPAGE_CONNECTOR": (
+        "src/connectors/slippage_connectors/ConstantSlippageConnector.sol",
+        "ConstantSlippageConnector",
+    ),
+    "LTV_BEACON_PROXY": (
+        "TransparentUpgradeableBeaconProxy.sol",
+        "TransparentUpgradeableBeaconProxy",
+    ),
+}
+
+PROTOCOL_CONTRACT_ARTIFACTS = {
+    "aave": {
+        "ORACLE_CONNECTOR": (
+            "src/connectors/oracle_connectors/AaveV3OracleConnector.sol",
+            "AaveV3OracleConnector",
+        ),
+        "LENDING_CONNECTOR": (
+            "src/connectors/lending_connectors/AaveV3Connector.sol",
+            "AaveV3Connector",
+        ),
+    },
+    "morpho": {
+        "ORACLE_CONNECTOR": (
+            "src/connectors/oracle_connectors/MorphoOracleConnector.sol",
+            "MorphoOracleConnector",
+        ),
+        "LENDING_CONNECTOR": (
+            "src/connectors/lending_connectors/MorphoConnector.sol",
+            "MorphoConnector",
+        ),
+    },
+    "ghost": {
+        "ORACLE_CONNECTOR": (
+            "src/ghost/connectors/SpookyOracleConnector.sol",
+            "SpookyOracleConnector",
+        ),
+        "LENDING_CONNECTOR": (
+            "src/ghost/connectors/HodlLendingConnector.sol",
+            "HodlLendingConnector",
+        ),
+    },
+}
+
+STATE_INIT_DATA_TYPE = (
+    "(string,string,address,address,address,uint16,uint16,uint16,uint16,uint16,"
+    "uint16,address,address,uint16,uint16,uint256,address,uint16,uint16,address,"
+    "address,address,address,address,uint24,bytes,bytes,bytes,bytes,uint16,uint16,"
+    "uint16,uint16,address,bool)"
+)
+
+
+class ArtifactNotFoundError(Exception):
+    pass
+
+
+def get_newest_mtime(path):
+    """Newest mtime_ns of a file or of the files under a directory, None without files"""
+    if os.path.isfile(path):
+        return os.stat(path).st_mtime_ns
+    newest = None
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            mtime = os.stat(os.path.join(root, file_name)).st_mtime_ns
+            if newest is None or mtime > newest:
+                newest = mtime
+    return newest
+
+
+def are_artifacts_up_to_date(out_dir, source_paths):
+    """True when out_dir was written after the last change of every source path"""
+    out_mtime = get_newest_mtime(out_dir)
+    if out_mtime is None:
+        return False
+    source_mtimes = [get_newest_mtime(path) for path in source_paths]
+    return all(mtime is None or mtime < out_mtime for mtime in source_mtimes)
+
+
+def compute_create2_address(init_code_hash, salt=ZERO_SALT, deployer=CREATE2_DEPLOYER):
+    deployer_bytes = bytes.fromhex(deployer.lower().replace("0x", ""))
+    digest = keccak256(b"\xff" + deployer_bytes + salt + init_code_hash)
+    return to_checksum_address(digest[12:].hex())
+
+
+def get_artifact_key(source_path, contract_name):
+    return f"{source_path}:{contract_name}"
+
+
+def get_contract_artifact(lending_protocol, contract_name):
+    """Returns (source path, contract name) of the artifact deployed for a CONTRACTS value"""
+    protocol_artifacts = PROTOCOL_CONTRACT_ARTIFACTS.get(lending_protocol, {})
+    if contract_name in protocol_artifacts:
+        return protocol_artifacts[contract_name]
+    if contract_name in CONTRACT_ARTIFACTS:
+        return CONTRACT_ARTIFACTS[contract_name]
+    raise ValueError(
+        f"No artifact known for {contract_name} on lending protocol {lending_protocol}"
+    )
+
+
+def _env(data, key):
+    if key not in data or data[key] is None or data[key] == "":
+        raise ValueError(f"Environment variable {key} is not set")
+    return data[key]
+
+
+def _env_address(data, key):
+    return str(_env(data, key))
+
+
+def _env_uint(data, key):
+    value = _env(data, key)
+    if isinstance(value, str):
+        return int(value, 16) if value.lower().startswith("0x") else int(value)
+    return int(value)
+
+
+def _env_bool(data, key):
+    value = _env(data, key)
+    if isinstance(value, str):
+        return value.lower() == "true"
+    return bool(value)
+
+
+def _env_or_zero_address(data, key):
+    value = data.get(key)
+    if not value:
+        return ZERO_ADDRESS
+    return str(value)
+
+
+def _chain_address(addresses, chain_id):
+    if chain_id not in addresses:
+        raise ValueError("Unsupported chain")
+    return addresses[chain_id]
+
+
+def _morpho_market_id(data):
+    return keccak256(
+        abi.encode(
+            ["address", "address", "address", "address", "uint256"],
+            [
+                _env_address(data, "BORROW_ASSET"),
+                _env_address(data, "COLLATERAL_ASSET"),
+                _env_address(data, "ORACLE"),
+                _env_address(data, "IRM"),
+                _env_uint(data, "LLTV"),
+            ],
+        )
+    )
+
+
+def get_lending_connector_init_data(data):
+    """Python version of GetConnectorData.getLendingConnectorInitData"""
+    name = _env(data, "LENDING_CONNECTOR_NAME")
+    if name == "AaveV3":
+        return abi.encode(["uint256"], [_env_uint(data, "EMODE")])
+    elif name == "Morpho":
+        return abi.encode(
+            ["address", "address", "uint256", "bytes32"],
+            [
+                _env_address(data, "ORACLE"),
+                _env_address(data, "IRM"),
+                _env_uint(data, "LLTV"),
+                _morpho_market_id(data),
+            ],
+        )
+    elif name == "Ghost":
+        return b""
+    raise ValueError("Unknown lending connector")
+
+
+def get_oracle_connector_init_data(data):
+    """Python version of GetConnectorData.getOracleConnectorInitData"""
+    name = _env(data, "LENDING_CONNECTOR_NAME")
+    if name == "AaveV3" or name == "Ghost":
+        return b""
+    elif name == "Morpho":
+        return abi.encode(
+            ["address", "bytes32"],
+            [_env_address(data, "ORACLE"), _morpho_market_id(data)],
+        )
+    raise ValueError("Unknown oracle connector")
+
+
+def get_slippage_connector_init_data(data):
+    return abi.encode(
+        ["uint256", "uint256"],
+        [_env_uint(data, "COLLATERAL_SLIPPAGE"), _env_uint(data, "BORROW_SLIPPAGE")],
+    )
+
+
+def get_initialize_function_call(data):
+    """Python version of DeployLTVBeaconProxy.getInitializeFunctionCall"""
+    is_whitelist_activated = _env_bool(data, "ACTIVATE_WHITELIST")
+    state_init_data = (
+        _env(data, "NAME"),
+        _env(data, "SYMBOL"),
+        _env_address(data, "COLLATERAL_ASSET"),
+        _env_address(data, "BORROW_ASSET"),
+        _env_address(data, "FEE_COLLECTOR"),
+        _env_uint(data, "MAX_SAFE_LTV_DIVIDEND"),
+        _env_uint(data, "MAX_SAFE_LTV_DIVIDER"),
+        _env_uint(data, "MIN_PROFIT_LTV_DIVIDEND"),
+        _env_uint(data, "MIN_PROFIT_LTV_DIVIDER"),
+        _env_uint(data, "TARGET_LTV_DIVIDEND"),
+        _env_uint(data, "TARGET_LTV_DIVIDER"),
+        _env_address(data, "LENDING_CONNECTOR"),
+        _env_address(data, "ORACLE_CONNECTOR"),
+        _env_uint(data, "MAX_GROWTH_FEE_DIVIDEND"),
+        _env_uint(data, "MAX_GROWTH_FEE_DIVIDER"),
+        _env_uint(data, "MAX_TOTAL_ASSETS_IN_UNDERLYING"),
+        _env_address(data, "SLIPPAGE_CONNECTOR"),
+        _env_uint(data, "MAX_DELEVERAGE_FEE_DIVIDEND"),
+        _env_uint(data, "MAX_DELEVERAGE_FEE_DIVIDER"),
+        _env_address(data, "VAULT_BALANCE_AS_LENDING_CONNECTOR"),
+        _env_address(data, "OWNER"),
+        _env_address(data, "GUARDIAN"),
+        _env_address(data, "GOVERNOR"),
+        _env_address(data, "EMERGENCY_DELEVERAGER"),
+        _env_uint(data, "AUCTION_DURATION"),
+        get_lending_connector_init_data(data),
+        get_oracle_connector_init_data(data),
+        get_slippage_connector_init_data(data),
+        b"",
+        _env_uint(data, "SOFT_LIQUIDATION_FEE_DIVIDEND"),
+        _env_uint(data, "SOFT_LIQUIDATION_FEE_DIVIDER"),
+        _env_uint(data, "SOFT_LIQUIDATION_LTV_DIVIDEND"),
+        _env_uint(data, "SOFT_LIQUIDATION_LTV_DIVIDER"),
+        (
+            _env_address(data, "WHITELIST_REGISTRY")
+            if is_whitelist_activated
+            else ZERO_ADDRESS
+        ),
+        is_whitelist_activated,
+    )
+    return abi.encode_call(f"initialize({STATE_INIT_DATA_TYPE})", [state_init_data])
+
+
+def get_constructor_args(contract_name, lending_protocol, chain_id, data):
+    """Returns abi encoded constructor arguments, matching each deploy script's hashedCreationCode"""
+    if contract_name == "MODULES_PROVIDER":
+        keys = [
+            "ERC20_MODULE",
+            "BORROW_VAULT_MODULE",
+            "COLLATERAL_VAULT_MODULE",
+            "LOW_LEVEL_REBALANCE_MODULE",
+            "AUCTION_MODULE",
+            "ADMINISTRATION_MODULE",
+            "INITIALIZE_MODULE",
+        ]
+        return abi.encode(["address"] * 7, [_env_address(data, k) for k in keys])
+    elif contract_name == "LTV":
+        return abi.encode(["address"], [_env_address(data, "MODULES_PROVIDER")])
+    elif contract_name == "BEACON":
+        return abi.encode(
+            ["address", "address"],
+            [_env_address(data, "LTV"), _env_address(data, "BEACON_OWNER")],
+        )
+    elif contract_name == "WHITELIST_REGISTRY":
+        return abi.encode(
+            ["address", "address"],
+            [
+                _env_address(data, "WHITELIST_OWNER"),
+                _env_address(data, "WHITELIST_SIGNER"),
+            ],
+        )
+    elif contract_name == "ORACLE_CONNECTOR":
+        if lending_protocol == "aave":
+            return abi.encode(["address"], [_chain_address(AAVE_V3_ORACLE, chain_id)])
+        elif lending_protocol == "morpho":
+            return abi.encode(["address"], [_chain_address(MORPHO_POOL, chain_id)])
+        return abi.encode(["address"], [_env_address(data, "ORACLE")])
+    elif contract_name == "LENDING_CONNECTOR":
+        if lending_protocol == "aave":
+            return abi.encode(["address"], [_chain_address(AAVE_V3_POOL, chain_id)])
+        elif lending_protocol == "morpho":
+            return abi.encode(["address"], [_chain_address(MORPHO_POOL, chain_id)])
+        return abi.encode(["address"], [_env_address(data, "LENDING")])
+    elif contract_name == "LTV_BEACON_PROXY":
+        return abi.encode(
+            ["address", "address", "bytes"],
+            [
+                _env_address(data, "BEACON"),
+                _env_address(data, "BEACON_PROXY_OWNER"),
+                get_initialize_function_call(data),
+            ],
+        )
+    return b""
+
+
+class Create2AddressEngine:
+    """Computes CREATE2 addresses from forge artifacts, caching hashes on disk"""
+
+    def __init__(self, out_dir=DEFAULT_OUT_DIR, cache_file=DEFAULT_CACHE_FILE):
+        self.out_dir = out_dir
+        self.cache_file = cache_file
+        self._cache = None
+        self._cache_dirty = False
+        self._library_addresses = {}
+        self._lock = threading.RLock()
+
+    def _load_cache(self):
+        if self._cache is not None:
+            return self._cache
+        self._cache = {"artifacts": {}, "init_code_hashes": {}}
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, "r") as f:
+                    self._cache.update(json.load(f))
+            except (ValueError, OSError):
+                pass
+        return self._cache
+
+    def save_cache(self):
+        with self._lock:
+            if not self._cache_dirty or not self.cache_file:
+                return
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(self._cache, f)
+            os.replace(tmp_file, self.cache_file)
+            self._cache_dirty = False
+
+    def _find_artifact_file(self, source_path, contract_name):
+        file_name = os.path.basename(source_path)
+        direct = os.path.join(self.out_dir, file_name, f"{contract_name}.json")
+        candidates = [direct] if os.path.exists(direct) else []
+        candidates += [
+            c
+            for c in glob.glob(
+                os.path.join(self.out_dir, "**", file_name, f"{contract_name}.json"),
+                recursive=True,
+            )
+            if c != direct
+        ]
+        if not candidates:
+            raise ArtifactNotFoundError(
+                f"Artifact for {get_artifact_key(source_path, contract_name)} not found in {self.out_dir}"
+            )
+        if len(candidates) == 1:
+            return candidates[0]
+        for candidate in candidates:
+            with open(candidate, "r") as f:
+                absolute_path = json.load(f).get("ast", {}).get("absolutePath", "")
+            if absolute_path.endswith(source_path):
+                return candidate
+        return candidates[0]
+
+    def load_artifact(self, source_path, contract_name):
+        """Returns (creation bytecode hex with placeholders, link references, artifact sha256)"""
+        cache = self._load_cache()
+        key = get_artifact_key(source_path, contract_name)
+        cached = cache["artifacts"].get(key)
+        if cached and os.path.exists(cached["path"]):
+            stat = os.stat(cached["path"])
+            if (
+                stat.st_mtime_ns == cached["mtime_ns"]
+                and stat.st_size == cached["size"]
+            ):
+                return cached["bytecode"], cached["link_references"], cached["sha256"]
+
+        path = self._find_artifact_file(source_path, contract_name)
+        with open(path, "rb") as f:
+            raw = f.read()
+        artifact = json.loads(raw)
+        bytecode = artifact["bytecode"]["object"].replace("0x", "")
+        link_references = artifact["bytecode"].get("linkReferences", {})
+        stat = os.stat(path)
+        cache["artifacts"][key] = {
+            "path": path,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "bytecode": bytecode,
+            "link_references": link_references,
+        }
+        self._cache_dirty = True
+        return bytecode, link_references, cache["artifacts"][key]["sha256"]
+
+    def get_storage_layout(self, source_path, contract_name):
+        """Returns the storageLayout output of the contract's artifact"""
+        with self._lock:
+            path = self._find_artifact_file(source_path, contract_name)
+        with open(path, "r") as f:
+            layout = json.load(f).get("storageLayout")
+        if layout is None:
+            raise ArtifactNotFoundError(
+                f'Artifact {path} has no storageLayout, build with extra_output = ["storageLayout"]'
+            )
+        return layout
+
+    def get_library_address(self, source_path, library_name):
+        """Libraries linked by forge script are themselves deployed via CREATE2 with a zero salt"""
+        key = get_artifact_key(source_path, library_name)
+        if key not in self._library_addresses:
+            creation_code = self.get_linked_creation_code(source_path, library_name)
+            self._library_addresses[key] = compute_create2_address(
+                self.hash_init_code(creation_code)
+            )
+        return self._library_addresses[key]
+
+    def get_linked_libraries(self, source_path, contract_name):
+        """Returns {"path:Name": address} of every library linked into the contract"""
+        with self._lock:
+            _, link_references, _ = self.load_artifact(source_path, contract_name)
+            libraries = {}
+            for library_source, names in link_references.items():
+                for library_name in names:
+                    libraries[get_artifact_key(library_source, library_name)] = (
+                        self.get_library_address(library_source, library_name)
+                    )
+                    libraries.update(
+                        self.get_linked_libraries(library_source, library_name)
+                    )
+            return libraries
+
+    def get_linked_creation_code(self, source_path, contract_name):
+        bytecode, link_references, _ = self.load_artifact(source_path, contract_name)
+        if link_references:
+            chars = list(bytecode)
+            for library_source, names in link_references.items():
+                for library_name, references in names.items():
+                    address = self.get_library_address(library_source, library_name)
+                    address_hex = address.lower().replace("0x", "")
+                    for reference in references:
+                        start = reference["start"] * 2
+                        chars[start : start + reference["length"] * 2] = address_hex
+            bytecode = "".join(chars)
+        return bytes.fromhex(bytecode)
+
+    def hash_init_code(self, init_code):
+        cache = self._load_cache()
+        digest = hashlib.sha256(init_code).hexdigest()
+        cached = cache["init_code_hashes"].get(digest)
+        if cached is not None:
+            return bytes.fromhex(cached)
+        hashed = keccak256(init_code)
+        cache["init_code_hashes"][digest] = hashed.hex()
+        self._cache_dirty = True
+        return hashed
+
+    def get_init_code(self, contract_name, lending_protocol, chain_id, data):
+        source_path, artifact_name = get_contract_artifact(
+            lending_protocol, contract_name
+        )
+        return self.get_linked_creation_code(
+            source_path, artifact_name
+        ) + get_constructor_args(contract_name, lending_protocol, chain_id, data)
+
+    def expected_address(self, contract_name, lending_protocol, chain_id, data):
+        """Same value as BaseScript.expectedAddress(hashedCreationCode()) for the contract's deploy script"""
+        if contract_name == "BEACON":
+            beacon = _env_or_zero_address(data, "BEACON")
+            if int(beacon, 16) != 0:
+                return beacon
+        with self._lock:
+            init_code = self.get_init_code(
+                contract_name, lending_protocol, chain_id, data
+            )
+            return compute_create2_address(self.hash_init_code(init_code))
@@ -0,0 +1,46 @@
+"""
+Fleet deployment of several args files
+
+Contracts which are CREATE2-identical across args files (same creation code
+hash, so same address) are deployed once. The per args file deployment graph
+is merged into one graph of unique steps, which DeploymentScheduler runs.
+"""
+
+
+def get_fleet_step_name(step):
+    contract, creation_code_hash = step
+    return f"{contract.value}@{creation_code_hash[:10]}"
+
+
+def build_fleet_graph(graph, hashes_by_args_file):
+    """
+    graph is the per args file deployment graph {contract: [dependencies]},
+    hashes_by_args_file is {args_filename: {contract: creation code hash}}.
+
+    Returns (fleet graph, members) where fleet steps are (contract, hash)
+    tuples and members maps every step to the args files sharing it, in the
+    order they were given. Steps of the same contract are chained so that one
+    forge script never runs twice at once and overwrites its own receipts.
+    """
+    members = {}
+    for args_filename, hashes in hashes_by_args_file.items():
+        for contract in graph:
+            members.setdefault((contract, hashes[contract]), []).append(args_filename)
+
+    fleet_graph = {step: [] for step in members}
+    for args_filename, hashes in hashes_by_args_file.items():
+        for contract, dependencies in graph.items():
+            step = (contract, hashes[contract])
+            for dependency in dependencies:
+                dependency_step = (dependency, hashes[dependency])
+                if dependency_step not in fleet_graph[step]:
+                    fleet_graph[step].append(dependency_step)
+
+    previous_by_contract = {}
+    for step in members:
+        contract = step[0]
+        if contract in previous_by_contract:
+            fleet_graph[step].append(previous_by_contract[contract])
+        previous_by_contract[contract] = step
+
+    return fleet_graph, members
@@ -0,0 +1,140 @@
+"""
+Crash-safe deployment journal
+
+Every finished deployment step is appended as one JSON line to a journal per
+chain, lending protocol and args file. Appends are fsync'd and guarded by an
+advisory file lock, so concurrent deploy.py runs never lose each other's
+entries. The deployed_contracts_*.json style views are compacted from the
+journal and replaced atomically.
+"""
+
+import fcntl
+import json
+import os
+import time
+from contextlib import contextmanager
+
+IMPORT_STEP = "IMPORT"
+
+TORN_LINE_SCAN_SIZE = 4096
+
+
+def fsync_directory(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, content):
+    """Writes content to path so readers see either the old or the new file, never a mix"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_directory(path)
+
+
+class DeploymentJournal:
+    """Append-only record of deployment steps with atomically compacted views"""
+
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self.lock_path = journal_path + ".lock"
+
+    @contextmanager
+    def lock(self):
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read_records(self):
+        if not os.path.exists(self.journal_path):
+            return []
+        records = []
+        with open(self.journal_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Torn last line of a crashed append, the step did not finish
+                    continue
+        return records
+
+    def _cut_torn_line(self):
+        """
+        Cuts the torn last line of a crashed append back to the last newline, so
+        the next record does not extend it and get dropped with it
+        """
+        with open(self.journal_path, "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(position - TORN_LINE_SCAN_SIZE, 0)
+                f.seek(start)
+                block = f.read(position - start)
+                if position == end and block.endswith(b"\n"):
+                    return
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            f.truncate(position)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append(self, record):
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        is_new = not os.path.exists(self.journal_path)
+        if not is_new:
+            self._cut_torn_line()
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if is_new:
+            fsync_directory(self.journal_path)
+
+    def append(self, record):
+        record = dict(record)
+        record.setdefault("timestamp", int(time.time()))
+        with self.lock():
+            self._append(record)
+
+    def import_existing(self, contracts):
+        """Seeds an empty journal from a deployed_contracts file written before journaling"""
+        with self.lock():
+            if self.read_records():
+                return
+            self._append(
+                {
+                    "step": IMPORT_STEP,
+                    "contracts": contracts,
+                    "timestamp": int(time.time()),
+                }
+            )
+
+    def get_contracts(self):
+        """Compacts the journal into the {name: address} deployed contracts view"""
+        contracts = {}
+        for record in self.read_records():
+            if record["step"] == IMPORT_STEP:
+                contracts.update(record["contracts"])
+                continue
+            contracts[record["step"]] = record["address"]
+            contracts.update(record.get("libraries", {}))
+            contracts.update(record.get("additional_contracts", {}))
+        return contracts
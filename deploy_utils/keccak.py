@@ -0,0 +1,127 @@
+"""
+Keccak-256 as used by the EVM (original Keccak padding, not NIST SHA3-256)
+"""
+
+try:
+    from Crypto.Hash import keccak as _pycryptodome_keccak
+except ImportError:
+    _pycryptodome_keccak = None
+
+try:
+    from eth_hash.auto import keccak as _eth_hash_keccak
+except ImportError:
+    _eth_hash_keccak = None
+
+
+_RATE = 136
+_MASK = (1 << 64) - 1
+
+_ROUND_CONSTANTS = [
+    0x0000000000000001,
+    0x0000000000008082,
+    0x800000000000808A,
+    0x8000000080008000,
+    0x000000000000808B,
+    0x0000000080000001,
+    0x8000000080008081,
+    0x8000000000008009,
+    0x000000000000008A,
+    0x0000000000000088,
+    0x0000000080008009,
+    0x000000008000000A,
+    0x000000008000808B,
+    0x800000000000008B,
+    0x8000000000008089,
+    0x8000000000008003,
+    0x8000000000008002,
+    0x8000000000000080,
+    0x000000000000800A,
+    0x800000008000000A,
+    0x8000000080008081,
+    0x8000000000008080,
+    0x0000000080000001,
+    0x8000000080008008,
+]
+
+_ROTATIONS = [
+    [0, 36, 3, 41, 18],
+    [1, 44, 10, 45, 2],
+    [62, 6, 43, 15, 61],
+    [28, 55, 25, 21, 56],
+    [27, 20, 39, 8, 14],
+]
+
+
+def _rotl(value, shift):
+    return ((value << shift) | (value >> (64 - shift))) & _MASK
+
+
+def _keccak_f(state):
+    for round_constant in _ROUND_CONSTANTS:
+        c = [
+            state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20]
+            for x in range(5)
+        ]
+        d = [c[(x - 1) % 5] ^ _rotl(c[(x + 1) % 5], 1) for x in range(5)]
+        state = [state[i] ^ d[i % 5] for i in range(25)]
+
+        b = [0] * 25
+        for x in range(5):
+            for y in range(5):
+                shift = _ROTATIONS[x][y]
+                value = state[x + 5 * y]
+                if shift:
+                    value = _rotl(value, shift)
+                b[y + 5 * ((2 * x + 3 * y) % 5)] = value
+
+        state = [
+            b[i]
+            ^ ((~b[(i % 5 + 1) % 5 + 5 * (i // 5)]) & b[(i % 5 + 2) % 5 + 5 * (i // 5)])
+            for i in range(25)
+        ]
+        state[0] ^= round_constant
+    return state
+
+
+def _keccak256_pure(data):
+    padded = bytearray(data)
+    padded.append(0x01)
+    while len(padded) % _RATE != 0:
+        padded.append(0x00)
+    padded[-1] |= 0x80
+
+    state = [0] * 25
+    for offset in range(0, len(padded), _RATE):
+        block = padded[offset : offset + _RATE]
+        for i in range(_RATE // 8):
+            state[i] ^= int.from_bytes(block[i * 8 : i * 8 + 8], "little")
+        state = _keccak_f(state)
+
+    return b"".join(state[i].to_bytes(8, "little") for i in range(4))
+
+
+def keccak256(data):
+    """Returns the 32 byte keccak256 digest of data"""
+    if isinstance(data, str):
+        data = data.encode()
+    data = bytes(data)
+    if _pycryptodome_keccak is not None:
+        return _pycryptodome_keccak.new(data=data, digest_bits=256).digest()
+    if _eth_hash_keccak is not None:
+        return _eth_hash_keccak(data)
+    return _keccak256_pure(data)
+
+
+def function_selector(signature):
+    """Returns the 4 byte selector of a function signature like "owner()" """
+    return keccak256(signature.encode())[:4]
+
+
+def to_checksum_address(address):
+    """Returns the EIP-55 checksummed form of a hex address"""
+    address = address.lower().replace("0x", "").rjust(40, "0")
+    digest = keccak256(address.encode()).hex()
+    return "0x" + "".join(
+        char.upper() if int(digest[i], 16) >= 8 else char
+        for i, char in enumerate(address)
+    )
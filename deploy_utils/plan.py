@@ -0,0 +1,138 @@
+"""
+Dry-run deployment plan
+
+Lists every step of a deployment with its expected address, whether it is
+already on chain and which libraries it links, and estimates the gas of the
+missing CREATE2 deployments with one JSON-RPC batch of eth_estimateGas.
+"""
+
+from deploy_utils.create2 import CREATE2_DEPLOYER, ZERO_SALT
+from deploy_utils.rpc import RpcError
+
+
+def get_create2_deploy_transaction(init_code, salt=ZERO_SALT):
+    """Transaction forge sends to the CREATE2 deployer for `new X{salt: salt}()`"""
+    return {"to": CREATE2_DEPLOYER, "data": "0x" + (salt + init_code).hex()}
+
+
+class PlanStep:
+    """
+    One deployment step. kind is "contract" or "library" for CREATE2
+    deployments, "preset" for an address given in the args file and "script"
+    for steps run as a forge script which are not estimated.
+    """
+
+    def __init__(self, name, kind, address, deployed, libraries={}, init_code=None):
+        self.name = name
+        self.kind = kind
+        self.address = address
+        self.deployed = deployed
+        self.libraries = dict(libraries)
+        self.init_code = init_code
+        self.gas = None
+        self.error = None
+
+    def to_dict(self, gas_price):
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "address": self.address,
+            "deployed": self.deployed,
+            "libraries": self.libraries,
+            "gas": self.gas,
+            "cost_wei": None if self.gas is None else self.gas * gas_price,
+            "error": self.error,
+        }
+
+
+class DeploymentPlan:
+    def __init__(self):
+        self.steps = []
+        self.gas_price = None
+
+    def add_step(self, step):
+        self.steps.append(step)
+        return step
+
+    def pending_steps(self):
+        return [
+            step
+            for step in self.steps
+            if not step.deployed and step.init_code is not None
+        ]
+
+    def estimate(self, client, gas_price=None, sender=None):
+        """
+        Estimates every pending step in one batch, together with eth_gasPrice
+        when no gas price is given. Steps depending on contracts which are not
+        deployed yet usually revert in estimation, their error is kept instead.
+        """
+        calls = []
+        for step in self.pending_steps():
+            transaction = get_create2_deploy_transaction(step.init_code)
+            if sender is not None:
+                transaction["from"] = sender
+            calls.append(("eth_estimateGas", [transaction]))
+        if gas_price is None:
+            calls.append(("eth_gasPrice", []))
+        results = client.batch(calls, return_errors=True)
+        if gas_price is None:
+            gas_price = results.pop()
+            if isinstance(gas_price, RpcError):
+                raise gas_price
+            gas_price = int(gas_price, 16)
+        self.gas_price = gas_price
+        for step, result in zip(self.pending_steps(), results):
+            if isinstance(result, RpcError):
+                step.error = str(result)
+            else:
+                step.gas = int(result, 16)
+
+    def total_gas(self):
+        return sum(step.gas for step in self.steps if step.gas is not None)
+
+    def to_dict(self):
+        gas_price = self.gas_price or 0
+        return {
+            "gas_price": self.gas_price,
+            "total_gas": self.total_gas(),
+            "total_cost_wei": self.total_gas() * gas_price,
+            "unestimated_steps": [
+                step.name for step in self.pending_steps() if step.gas is None
+            ],
+            "steps": [step.to_dict(gas_price) for step in self.steps],
+        }
+
+    def format_table(self):
+        gas_price = self.gas_price or 0
+        lines = [
+            f"{'STEP':<36} {'ADDRESS':<42} {'STATUS':<10} {'GAS':>10} {'COST (ETH)':>12}"
+        ]
+        for step in self.steps:
+            if step.deployed:
+                status = "deployed"
+            elif step.init_code is None:
+                status = step.kind
+            else:
+                status = "pending"
+            if step.gas is not None:
+                gas = str(step.gas)
+                cost = f"{step.gas * gas_price / 1e18:.6f}"
+            else:
+                gas = "-" if step.error is None else "reverts"
+                cost = "-"
+            lines.append(
+                f"{step.name:<36} {step.address or '-':<42} {status:<10} {gas:>10} {cost:>12}"
+            )
+            for library, address in step.libraries.items():
+                lines.append(f"    links {library.split(':')[-1]} at {address}")
+        lines.append("")
+        lines.append(
+            f"Total: {self.total_gas()} gas, {self.total_gas() * gas_price / 1e18:.6f} ETH at {gas_price / 1e9:.3f} gwei"
+        )
+        unestimated = [step for step in self.pending_steps() if step.gas is None]
+        if unestimated:
+            lines.append(
+                f"{len(unestimated)} steps could not be estimated before their dependencies are deployed"
+            )
+        return "\n".join(lines)
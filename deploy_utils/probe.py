@@ -0,0 +1,68 @@
+"""
+Batched on-chain deployment probe
+
+Checks a whole set of expected addresses with one JSON-RPC batch of
+eth_getCode calls and keeps the result as a shared deployment status map.
+Addresses without code are only trusted until the next recorded deployment.
+"""
+
+
+def has_code(code):
+    return code not in (None, "", "0x", "0x0")
+
+
+class DeploymentStatus:
+    """Which addresses have code on chain, filled by one batched probe"""
+
+    def __init__(self, client, block="latest"):
+        self.client = client
+        self.block = block
+        self._has_code = {}
+
+    def probe(self, addresses):
+        addresses = [a for a in dict.fromkeys(a.lower() for a in addresses)]
+        codes = self.client.batch(
+            [("eth_getCode", [address, self.block]) for address in addresses]
+        )
+        for address, code in zip(addresses, codes):
+            self._has_code[address] = has_code(code)
+        return {address: self._has_code[address] for address in addresses}
+
+    def is_deployed(self, address):
+        """Returns whether address has code, probing it alone if it was not in the batch"""
+        address = address.lower()
+        if address not in self._has_code:
+            self.probe([address])
+        return self._has_code[address]
+
+    def mark_deployed(self, address):
+        """
+        Records a deployment. The broadcast may have deployed libraries or other
+        contracts too, so addresses probed without code are probed again.
+        """
+        has_code = {a: True for a, deployed in self._has_code.items() if deployed}
+        has_code[address.lower()] = True
+        self._has_code = has_code
+
+
+def find_drift(expected_addresses, recorded_addresses, status):
+    """
+    Compares the recorded deployment with the chain.
+
+    expected_addresses and recorded_addresses map a contract name to an address.
+    Returns a list of (contract name, description) for every disagreement.
+    """
+    drift = []
+    for name, expected_address in expected_addresses.items():
+        recorded_address = recorded_addresses.get(name)
+        on_chain = status.is_deployed(expected_address)
+        if recorded_address is None:
+            if on_chain:
+                drift.append((name, "deployed on chain but not recorded"))
+        elif recorded_address.lower() != expected_address.lower():
+            drift.append(
+                (name, f"recorded at {recorded_address}, expected {expected_address}")
+            )
+        elif not on_chain:
+            drift.append((name, "recorded but has no code on chain"))
+    return drift
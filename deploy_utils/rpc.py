@@ -0,0 +1,186 @@
+"""
+Minimal JSON-RPC client over a keep-alive HTTP connection
+"""
+
+import http.client
+import itertools
+import json
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+from deploy_utils import abi
+
+
+class RpcError(Exception):
+    pass
+
+
+def normalize_rpc_url(rpc_url):
+    if "://" not in rpc_url:
+        return "http://" + rpc_url
+    return rpc_url
+
+
+class JsonRpcClient:
+    """JSON-RPC client supporting single and batched requests"""
+
+    def __init__(self, rpc_url, timeout=60, on_request=None):
+        self.rpc_url = normalize_rpc_url(rpc_url)
+        self.timeout = timeout
+        # Called with (method, seconds) after every request, used for telemetry
+        self.on_request = on_request
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            parsed = urlparse(self.rpc_url)
+            connection_class = (
+                http.client.HTTPSConnection
+                if parsed.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            connection = connection_class(
+                parsed.hostname, parsed.port, timeout=self.timeout
+            )
+            connection.connect()
+            # Requests are small, don't let Nagle's algorithm delay them
+            connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._local.connection = connection
+        return connection
+
+    def _path(self):
+        parsed = urlparse(self.rpc_url)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        return path
+
+    def _post(self, payload, label):
+        start = time.perf_counter()
+        try:
+            return self._send(payload)
+        finally:
+            if self.on_request is not None:
+                self.on_request(label, time.perf_counter() - start)
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request("POST", self._path(), body, headers)
+                response = connection.getresponse()
+                raw = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Keep-alive connection dropped by the server, reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt == 1:
+                    raise
+        if response.status != 200:
+            raise RpcError(f"HTTP {response.status}: {raw[:200]!r}")
+        return json.loads(raw)
+
+    def _make_request(self, method, params):
+        return {
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": method,
+            "params": list(params),
+        }
+
+    def call(self, method, params=()):
+        response = self._post(self._make_request(method, params), method)
+        if "error" in response:
+            raise RpcError(f"{method}: {response['error']}")
+        return response["result"]
+
+    def batch(self, calls, return_errors=False):
+        """
+        Sends [(method, params), ...] as one JSON-RPC batch, returns results in order.
+        With return_errors a failed call yields its RpcError instead of raising it.
+        """
+        if not calls:
+            return []
+        requests = [self._make_request(method, params) for method, params in calls]
+        responses = self._post(requests, f"batch[{calls[0][0]} x{len(calls)}]")
+        if isinstance(responses, dict):
+            raise RpcError(f"Batch request failed: {responses.get('error')}")
+        by_id = {response["id"]: response for response in responses}
+        results = []
+        for request in requests:
+            response = by_id.get(request["id"])
+            if response is None:
+                raise RpcError(f"No response for {request['method']}")
+            if "error" in response:
+                error = RpcError(f"{request['method']}: {response['error']}")
+                if not return_errors:
+                    raise error
+                results.append(error)
+                continue
+            results.append(response["result"])
+        return results
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def eth_call_batch(self, calls, block="latest"):
+        """
+        Runs [(to, signature, args, return_types), ...] as one batch of eth_call,
+        returns the decoded return values in order
+        """
+        requests = [
+            (
+                "eth_call",
+                [
+                    {"to": to, "data": "0x" + abi.encode_call(signature, args).hex()},
+                    block,
+                ],
+            )
+            for to, signature, args, _ in calls
+        ]
+        results = self.batch(requests)
+        return [
+            abi.decode(return_types, result)
+            for (_, _, _, return_types), result in zip(calls, results)
+        ]
+
+    def eth_call(self, to, signature, args=(), return_types=(), block="latest"):
+        return self.eth_call_batch([(to, signature, args, return_types)], block)[0]
+
+    def send_transaction(self, sender, to, signature, args=(), value=0):
+        """Sends a transaction from an unlocked or impersonated account and waits for it"""
+        tx_hash = self.call(
+            "eth_sendTransaction",
+            [
+                {
+                    "from": sender,
+                    "to": to,
+                    "data": "0x" + abi.encode_call(signature, args).hex(),
+                    "value": hex(value),
+                }
+            ],
+        )
+        receipt = self.wait_for_receipt(tx_hash)
+        if int(receipt["status"], 16) != 1:
+            raise RpcError(f"Transaction {tx_hash} calling {signature} reverted")
+        return receipt
+
+    def wait_for_receipt(self, tx_hash, timeout=120, poll_interval=0.05):
+        deadline = time.monotonic() + timeout
+        while True:
+            receipt = self.call("eth_getTransactionReceipt", [tx_hash])
+            if receipt is not None:
+                return receipt
+            if time.monotonic() > deadline:
+                raise RpcError(f"Timed out waiting for transaction {tx_hash}")
+            time.sleep(poll_interval)
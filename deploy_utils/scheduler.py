@@ -0,0 +1,240 @@
+"""
+Dependency graph scheduler for deployment steps
+
+Steps form a DAG (step -> list of steps it depends on). Independent steps run
+concurrently in a thread pool, each broadcasting with its own explicit nonce
+handed out by a NonceManager. Steps that cannot safely get a single explicit
+nonce (e.g. they also deploy linked libraries) run exclusively. If any step
+fails, its nonce is filled so the broadcasts reserved after it are not stuck
+behind a nonce gap, the scheduler waits for in-flight steps and for the
+deployer's pending transactions, then finishes serially.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class StepFailedError(Exception):
+    pass
+
+
+class NonceManager:
+    """Hands out consecutive nonces to concurrent broadcasts of one deployer.
+
+    get_chain_nonce returns the pending nonce of the deployer, get_mined_nonce
+    its latest mined one and cancel_nonce(nonce) sends a transaction at nonce
+    which does nothing, used to fill the nonce of a failed step.
+    """
+
+    def __init__(
+        self,
+        get_chain_nonce,
+        get_mined_nonce=None,
+        cancel_nonce=None,
+        settle_timeout=300,
+        poll_interval=0.5,
+    ):
+        self._get_chain_nonce = get_chain_nonce
+        self._get_mined_nonce = get_mined_nonce
+        self._cancel_nonce = cancel_nonce
+        self.settle_timeout = settle_timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._next_nonce = None
+
+    def reserve(self, count=1):
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = self._get_chain_nonce()
+            nonce = self._next_nonce
+            self._next_nonce += count
+            return nonce
+
+    def reset(self):
+        """Forget reserved nonces, next reservation re-reads the chain"""
+        with self._lock:
+            self._next_nonce = None
+
+    def release(self, nonce):
+        """
+        Fills the reserved nonce of a failed step unless a transaction was mined
+        with it, later nonces being mined only once it is used
+        """
+        if self._get_mined_nonce is None or self._cancel_nonce is None:
+            return
+        if self._get_mined_nonce() <= nonce:
+            self._cancel_nonce(nonce)
+
+    def settle(self):
+        """Waits until no transaction of the deployer is pending, then resets"""
+        if self._get_mined_nonce is not None:
+            deadline = time.monotonic() + self.settle_timeout
+            while self._get_mined_nonce() < self._get_chain_nonce():
+                if time.monotonic() > deadline:
+                    raise StepFailedError(
+                        "Transactions of the deployer are still pending after "
+                        f"{self.settle_timeout}s"
+                    )
+                time.sleep(self.poll_interval)
+        self.reset()
+
+
+def topological_order(graph):
+    order = []
+    visited = set()
+    visiting = set()
+
+    def visit(node):
+        if node in visited:
+            return
+        if node in visiting:
+            raise ValueError(f"Dependency cycle detected at {node}")
+        visiting.add(node)
+        for dependency in graph.get(node, []):
+            visit(dependency)
+        visiting.discard(node)
+        visited.add(node)
+        order.append(node)
+
+    for node in graph:
+        visit(node)
+    return order
+
+
+class DeploymentScheduler:
+    """Runs a DAG of deployment steps with a worker pool.
+
+    run_step(step, nonce) performs the step, nonce is None when the step is
+    executed serially and the broadcaster should pick the nonce itself.
+    is_done(step) is checked once when a step becomes ready, done steps are
+    skipped without reserving a nonce. is_exclusive(step) marks steps which
+    must run alone, e.g. because they send more than one transaction, and is
+    also checked once per step.
+    """
+
+    def __init__(
+        self,
+        graph,
+        run_step,
+        nonce_manager,
+        max_workers=4,
+        is_done=lambda step: False,
+        is_exclusive=lambda step: False,
+        step_name=str,
+    ):
+        self.graph = graph
+        self.run_step = run_step
+        self.nonce_manager = nonce_manager
+        self.max_workers = max_workers
+        self.is_done = is_done
+        self.is_exclusive = is_exclusive
+        self.step_name = step_name
+        # {step: result} of is_done and is_exclusive for ready steps
+        self._done = {}
+        self._exclusive = {}
+
+    def _is_done(self, step):
+        if step not in self._done:
+            self._done[step] = self.is_done(step)
+        return self._done[step]
+
+    def _is_exclusive(self, step):
+        if step not in self._exclusive:
+            self._exclusive[step] = self.is_exclusive(step)
+        return self._exclusive[step]
+
+    def _call_step(self, step, nonce):
+        """
+        Any failure of a concurrent step, deploy.py exiting as well as RPC,
+        OS or receipt parsing errors, must fill its nonce and fall back to
+        serial deployment, so it becomes a StepFailedError
+        """
+        try:
+            self.run_step(step, nonce)
+        except SystemExit as e:
+            raise StepFailedError(f"{self.step_name(step)} exited with {e.code}")
+        except Exception as e:
+            raise StepFailedError(f"{self.step_name(step)} failed: {e!r}") from e
+
+    def run_serial(self, steps=None):
+        completed = set()
+        for step in topological_order(self.graph):
+            if steps is not None and step not in steps:
+                continue
+            if not self.is_done(step):
+                self.run_step(step, None)
+            completed.add(step)
+        return completed
+
+    def _schedule_ready(self, executor, pending, completed, running):
+        """Starts every ready step that can start now, returns whether anything progressed"""
+        progressed = False
+        for step in list(pending):
+            if not all(dep in completed for dep in self.graph.get(step, [])):
+                continue
+            if self._is_done(step):
+                pending.remove(step)
+                completed.add(step)
+                progressed = True
+            elif self._is_exclusive(step):
+                if running:
+                    continue
+                pending.remove(step)
+                self.run_step(step, None)
+                self.nonce_manager.reset()
+                completed.add(step)
+                progressed = True
+            elif len(running) < self.max_workers:
+                pending.remove(step)
+                nonce = self.nonce_manager.reserve()
+                running[executor.submit(self._call_step, step, nonce)] = (
+                    step,
+                    nonce,
+                )
+                progressed = True
+        return progressed
+
+    def run(self):
+        if self.max_workers <= 1:
+            return self.run_serial()
+
+        pending = topological_order(self.graph)
+        completed = set()
+        running = {}
+        failed = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                progressed = False
+                if not failed:
+                    progressed = self._schedule_ready(
+                        executor, pending, completed, running
+                    )
+                if not running:
+                    if failed or not pending:
+                        break
+                    if not progressed:
+                        raise ValueError("Deployment graph cannot make progress")
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step, nonce = running.pop(future)
+                    try:
+                        future.result()
+                        completed.add(step)
+                    except StepFailedError as e:
+                        print(f"WARNING {e}, falling back to serial deployment")
+                        failed = True
+                        pending.append(step)
+                        # broadcasts in flight wait for the nonce of this step
+                        try:
+                            self.nonce_manager.release(nonce)
+                        except Exception as e:
+                            print(f"WARNING Could not fill nonce {nonce}: {e}")
+
+        if failed:
+            self.nonce_manager.settle()
+            completed |= self.run_serial(set(pending))
+        return completed
@@ -0,0 +1,97 @@
+"""
+Solidity storageLayout helpers
+
+Works on the storageLayout artifact output ({"storage": [...], "types": {...}})
+emitted because foundry.toml sets extra_output = ["storageLayout"]. Type ids
+contain AST ids which change between compilations, so types are compared by
+their canonical description instead.
+"""
+
+SLOT_SIZE = 32
+
+
+def get_type_description(types, type_id):
+    """Compilation independent description of a storage type, including struct members"""
+    type_info = types[type_id]
+    encoding = type_info.get("encoding", "inplace")
+    if encoding == "mapping":
+        key = get_type_description(types, type_info["key"])
+        value = get_type_description(types, type_info["value"])
+        return f"mapping({key} => {value})"
+    if encoding == "dynamic_array":
+        return f"{get_type_description(types, type_info['base'])}[]"
+    if "members" in type_info:
+        members = ", ".join(
+            f"{member['label']}@{member['slot']}:{member['offset']} "
+            f"{get_type_description(types, member['type'])}"
+            for member in type_info["members"]
+        )
+        return f"{type_info['label']} {{{members}}}"
+    if "base" in type_info:
+        base = get_type_description(types, type_info["base"])
+        return f"{base}[{type_info['numberOfBytes']} bytes]"
+    return f"{type_info['label']} ({type_info['numberOfBytes']} bytes)"
+
+
+def get_storage_variables(layout):
+    """Returns [(label, slot, offset, number of bytes, type description)] in slot order"""
+    types = layout.get("types") or {}
+    variables = []
+    for entry in layout.get("storage", []):
+        variables.append(
+            (
+                entry["label"],
+                int(entry["slot"]),
+                entry["offset"],
+                int(types[entry["type"]]["numberOfBytes"]),
+                get_type_description(types, entry["type"]),
+            )
+        )
+    return sorted(variables, key=lambda variable: (variable[1], variable[2]))
+
+
+def get_storage_end_slot(variables):
+    """First slot after every variable of the layout"""
+    end = 0
+    for _, slot, offset, number_of_bytes, _ in variables:
+        end = max(end, slot + (offset + number_of_bytes + SLOT_SIZE - 1) // SLOT_SIZE)
+    return end
+
+
+def find_layout_incompatibilities(old_layout, new_layout):
+    """
+    Returns a list of human readable problems making new_layout unsafe to
+    upgrade to from old_layout. Existing variables must keep their slot,
+    offset, name and type, new variables may only be appended.
+    """
+    old_variables = get_storage_variables(old_layout)
+    new_variables = get_storage_variables(new_layout)
+    new_by_position = {
+        (slot, offset): (label, type_description)
+        for label, slot, offset, _, type_description in new_variables
+    }
+
+    problems = []
+    for label, slot, offset, _, type_description in old_variables:
+        new_variable = new_by_position.get((slot, offset))
+        if new_variable is None:
+            problems.append(
+                f"{label} at slot {slot} offset {offset} was removed or moved"
+            )
+            continue
+        new_label, new_type_description = new_variable
+        if new_label != label:
+            problems.append(f"{label} at slot {slot} was renamed to {new_label}")
+        if new_type_description != type_description:
+            problems.append(
+                f"{label} at slot {slot} changed type from {type_description} to {new_type_description}"
+            )
+
+    old_positions = {(slot, offset) for _, slot, offset, _, _ in old_variables}
+    old_end_slot = get_storage_end_slot(old_variables)
+    for label, slot, offset, _, _ in new_variables:
+        if (slot, offset) not in old_positions and slot < old_end_slot:
+            problems.append(
+                f"new variable {label} at slot {slot} offset {offset} overlaps existing storage"
+            )
+    return problems
@@ -0,0 +1,185 @@
+"""
+Deployment telemetry
+
+Collects wall time of deployment steps, forge/cast subprocesses and RPC calls,
+forge compile time parsed from its output and gas used by broadcast receipts.
+Writes a JSON and a CSV report per run and renders a summary table.
+"""
+
+import csv
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+SOLC_FINISHED_REGEX = re.compile(r"Solc [\d.]+ finished in ([\d.]+)(ms|s)\b")
+
+CSV_FIELDS = [
+    "kind",
+    "name",
+    "start_s",
+    "duration_s",
+    "gas_used",
+    "effective_gas_price",
+    "tx_hash",
+    "attributes",
+]
+
+
+def parse_forge_phases(output):
+    """Returns {phase: seconds} for the phases forge reports timings for"""
+    compile_seconds = 0.0
+    for value, unit in SOLC_FINISHED_REGEX.findall(output or ""):
+        compile_seconds += float(value) / (1000 if unit == "ms" else 1)
+    if compile_seconds:
+        return {"compile": compile_seconds}
+    return {}
+
+
+def _hex_or_int(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return int(value, 16) if value.startswith("0x") else int(value)
+    return int(value)
+
+
+class Telemetry:
+    def __init__(self):
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.events = []
+
+    def _add(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def record(self, kind, name, start, duration, **attributes):
+        self._add(
+            {
+                "kind": kind,
+                "name": name,
+                "start_s": round(start - self._origin, 6),
+                "duration_s": round(duration, 6),
+                "attributes": attributes,
+            }
+        )
+
+    @contextmanager
+    def span(self, kind, name, **attributes):
+        start = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            self.record(kind, name, start, time.perf_counter() - start, **attributes)
+
+    def record_rpc(self, method, duration):
+        self.record("rpc", method, time.perf_counter() - duration, duration)
+
+    def record_forge_output(self, name, output):
+        for phase, seconds in parse_forge_phases(output).items():
+            self.record(f"forge_{phase}", name, time.perf_counter(), seconds)
+
+    def record_receipts(self, step, receipt_file, since=None):
+        """Records gas of every receipt in a run-latest.json written after `since`"""
+        if not os.path.exists(receipt_file):
+            return
+        if since is not None and os.path.getmtime(receipt_file) < since:
+            return
+        with open(receipt_file, "r") as f:
+            receipts = json.load(f).get("receipts", [])
+        for receipt in receipts:
+            self._add(
+                {
+                    "kind": "receipt",
+                    "name": step,
+                    "start_s": None,
+                    "duration_s": None,
+                    "gas_used": _hex_or_int(receipt.get("gasUsed")),
+                    "effective_gas_price": _hex_or_int(
+                        receipt.get("effectiveGasPrice")
+                    ),
+                    "tx_hash": receipt.get("transactionHash"),
+                    "attributes": {},
+                }
+            )
+
+    def summarize(self):
+        """Returns {kind: {"count", "total_s"}} and {step: {"gas_used", "cost_wei"}}"""
+        by_kind = {}
+        gas_by_step = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            if event["kind"] == "receipt":
+                step = gas_by_step.setdefault(
+                    event["name"], {"gas_used": 0, "cost_wei": 0}
+                )
+                step["gas_used"] += event["gas_used"] or 0
+                step["cost_wei"] += (event["gas_used"] or 0) * (
+                    event["effective_gas_price"] or 0
+                )
+                continue
+            kind = by_kind.setdefault(event["kind"], {"count": 0, "total_s": 0.0})
+            kind["count"] += 1
+            kind["total_s"] += event["duration_s"]
+        return by_kind, gas_by_step
+
+    def summary_table(self):
+        by_kind, gas_by_step = self.summarize()
+        lines = [f"{'KIND':<20} {'COUNT':>7} {'TOTAL (s)':>11}"]
+        for kind, values in sorted(
+            by_kind.items(), key=lambda item: -item[1]["total_s"]
+        ):
+            lines.append(f"{kind:<20} {values['count']:>7} {values['total_s']:>11.3f}")
+        step_times = {
+            event["name"]: event["duration_s"]
+            for event in self.events
+            if event["kind"] == "step"
+        }
+        if step_times or gas_by_step:
+            lines.append("")
+            lines.append(
+                f"{'STEP':<36} {'TIME (s)':>9} {'GAS USED':>12} {'COST (ETH)':>12}"
+            )
+            for step in dict.fromkeys(list(step_times) + list(gas_by_step)):
+                gas = gas_by_step.get(step, {"gas_used": 0, "cost_wei": 0})
+                lines.append(
+                    f"{step:<36} {step_times.get(step, 0.0):>9.3f} {gas['gas_used']:>12} {gas['cost_wei'] / 1e18:>12.6f}"
+                )
+        return "\n".join(lines)
+
+    def write_report(self, report_path_without_extension, metadata={}):
+        """Writes <path>.json and <path>.csv, returns both paths"""
+        os.makedirs(
+            os.path.dirname(report_path_without_extension) or ".", exist_ok=True
+        )
+        by_kind, gas_by_step = self.summarize()
+        json_path = report_path_without_extension + ".json"
+        csv_path = report_path_without_extension + ".csv"
+        with self._lock:
+            events = list(self.events)
+        with open(json_path, "w") as f:
+            json.dump(
+                {
+                    "started_at": self.started_at,
+                    "wall_time_s": round(time.perf_counter() - self._origin, 6),
+                    "metadata": metadata,
+                    "totals_by_kind": by_kind,
+                    "gas_by_step": gas_by_step,
+                    "events": events,
+                },
+                f,
+                indent=4,
+            )
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for event in events:
+                row = {field: event.get(field) for field in CSV_FIELDS}
+                row["attributes"] = json.dumps(event.get("attributes", {}))
+                writer.writerow(row)
+        return json_path, csv_path
@@ -0,0 +1,4 @@
+"""
+Off-chain tooling for LTV vaults: an exact port of the vault math and the
+keeper, analytics and testing tools built on it
+"""
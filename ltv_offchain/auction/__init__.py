@@ -0,0 +1,3 @@
+"""
+Auction execution tooling built on the ported auction math
+"""
@@ -0,0 +1,229 @@
+"""
+Auction tooling CLI
+
+    python -m ltv_offchain.auction scan --snapshots snapshots.json --gas-cost 3000000000000000
+    python -m ltv_offchain.auction keeper --rpc-url localhost:8545 --vaults 0x...,0x... --sender 0x...
+    python -m ltv_offchain.auction keeper-e2e
+
+snapshots.json is a list of objects with the AuctionSnapshot fields of
+ltv_offchain/auction/profitability.py. keeper-e2e needs anvil and forge and
+runs from the repository root.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from deploy_utils.rpc import JsonRpcClient
+
+from ltv_offchain.auction.e2e import run_keeper_e2e
+from ltv_offchain.auction.keeper import AuctionKeeper
+from ltv_offchain.auction.profitability import (
+    STRATEGIES,
+    ExecutionOption,
+    format_options_table,
+    scan_auctions,
+    snapshot_from_dict,
+)
+
+
+def scan(args):
+    with open(args.snapshots, "r") as f:
+        try:
+            snapshots = [snapshot_from_dict(values) for values in json.load(f)]
+        except ValueError as e:
+            print(f"ERROR {e}")
+            sys.exit(1)
+    results = scan_auctions(
+        snapshots,
+        workers=args.workers,
+        fills=args.fills,
+        max_blocks=args.max_blocks,
+        gas_cost=args.gas_cost,
+        min_profit=args.min_profit,
+        strategy=args.strategy,
+        with_curve=args.curve_out is not None,
+    )
+    best_options = [option for option, _ in results]
+    print(
+        format_options_table(
+            [
+                (snapshot.vault, option)
+                for snapshot, option in zip(snapshots, best_options)
+            ]
+        )
+    )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                [
+                    None if option is None else option._asdict()
+                    for option in best_options
+                ],
+                f,
+                indent=4,
+            )
+        print(f"Best executions written to {args.out}")
+    if args.curve_out:
+        with open(args.curve_out, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(ExecutionOption._fields)
+            for _, curve in results:
+                writer.writerows(curve)
+        print(f"Profit curves written to {args.curve_out}")
+
+
+def keeper(args):
+    client = JsonRpcClient(args.rpc_url)
+    auction_keeper = AuctionKeeper(
+        client,
+        [vault.strip() for vault in args.vaults.split(",") if vault.strip()],
+        args.sender,
+        lookahead=args.lookahead,
+        fills=args.fills,
+        gas_cost=args.gas_cost,
+        min_profit=args.min_profit,
+        gas_limit=args.gas_limit,
+        full_refresh_interval=args.full_refresh_interval,
+        dry_run=args.dry_run,
+    )
+    auction_keeper.load()
+    if args.approve:
+        auction_keeper.approve()
+    try:
+        auction_keeper.run(poll_interval=args.poll_interval, max_blocks=args.max_heads)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+
+def keeper_e2e(args):
+    try:
+        executions = run_keeper_e2e(
+            rpc_url=args.rpc_url, port=args.port, max_blocks=args.max_blocks
+        )
+    except RuntimeError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    print(f"Keeper end to end run passed with {len(executions)} executions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV auction tooling")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser(
+        "scan", help="Find the most profitable auction execution of many vaults"
+    )
+    scan_parser.add_argument(
+        "--snapshots", help="JSON file with the auction snapshots", required=True
+    )
+    scan_parser.add_argument(
+        "--fills", help="Partial fill sizes per block", type=int, default=10
+    )
+    scan_parser.add_argument(
+        "--max-blocks", help="Blocks evaluated per auction", type=int, default=1000
+    )
+    scan_parser.add_argument(
+        "--gas-cost",
+        help="Execution gas cost in underlying units, subtracted from the profit",
+        type=int,
+        default=0,
+    )
+    scan_parser.add_argument(
+        "--min-profit",
+        help="Profit in underlying units an execution must exceed",
+        type=int,
+        default=0,
+    )
+    scan_parser.add_argument(
+        "--strategy", help="Block choice", choices=STRATEGIES, default="earliest"
+    )
+    scan_parser.add_argument(
+        "--workers", help="Processes scanning vaults", type=int, default=1
+    )
+    scan_parser.add_argument("--out", help="JSON file for the best executions")
+    scan_parser.add_argument(
+        "--curve-out", help="CSV file for every evaluated execution"
+    )
+    scan_parser.set_defaults(handler=scan)
+
+    keeper_parser = subparsers.add_parser(
+        "keeper", help="Execute profitable auctions as new blocks arrive"
+    )
+    keeper_parser.add_argument("--rpc-url", help="JSON-RPC url", required=True)
+    keeper_parser.add_argument(
+        "--vaults", help="Comma separated vault addresses", required=True
+    )
+    keeper_parser.add_argument(
+        "--sender", help="Unlocked executor account of the node", required=True
+    )
+    keeper_parser.add_argument(
+        "--lookahead", help="Blocks of precomputed executions", type=int, default=3
+    )
+    keeper_parser.add_argument(
+        "--fills", help="Partial fill sizes per block", type=int, default=10
+    )
+    keeper_parser.add_argument(
+        "--gas-cost",
+        help="Execution gas cost in underlying units, subtracted from the profit",
+        type=int,
+        default=0,
+    )
+    keeper_parser.add_argument(
+        "--min-profit",
+        help="Profit in underlying units an execution must exceed",
+        type=int,
+        default=0,
+    )
+    keeper_parser.add_argument(
+        "--gas-limit", help="Gas limit of executions, estimated if unset", type=int
+    )
+    keeper_parser.add_argument(
+        "--full-refresh-interval",
+        help="Blocks between re-reads of every vault",
+        type=int,
+        default=100,
+    )
+    keeper_parser.add_argument(
+        "--poll-interval", help="Seconds between head polls", type=float, default=0.2
+    )
+    keeper_parser.add_argument(
+        "--max-heads", help="Stop after this many heads", type=int
+    )
+    keeper_parser.add_argument(
+        "--approve",
+        help="Approve every vault for both of its tokens first",
+        action="store_true",
+    )
+    keeper_parser.add_argument(
+        "--dry-run", help="Log executions without sending them", action="store_true"
+    )
+    keeper_parser.set_defaults(handler=keeper)
+
+    keeper_e2e_parser = subparsers.add_parser(
+        "keeper-e2e", help="Run the keeper against a dummy vault on anvil"
+    )
+    keeper_e2e_parser.add_argument(
+        "--rpc-url", help="Use a running anvil instead of starting one"
+    )
+    keeper_e2e_parser.add_argument(
+        "--port", help="Port of the started anvil", type=int, default=8546
+    )
+    keeper_e2e_parser.add_argument(
+        "--max-blocks",
+        help="Blocks mined before the run fails",
+        type=int,
+        default=200,
+    )
+    keeper_e2e_parser.set_defaults(handler=keeper_e2e)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Auction keeper end to end run against anvil
+
+Starts anvil (unless an RPC url is given), deploys the dummy vault of
+script/keeper/DeployKeeperTestVault.s.sol with an open auction from the first
+anvil account, funds the second anvil account with both vault tokens and runs
+the keeper from it while mining one block at a time, until the auction is
+executed.
+"""
+
+import json
+import os
+import subprocess
+import time
+
+from deploy_utils.rpc import JsonRpcClient, RpcError
+
+from ltv_offchain.auction.keeper import AuctionKeeper
+
+DEPLOY_SCRIPT = "script/keeper/DeployKeeperTestVault.s.sol"
+VAULT_CONTRACT_NAME = "TransparentUpgradeableBeaconProxy"
+
+# Well known anvil development accounts
+ANVIL_DEPLOYER_PRIVATE_KEY = (
+    "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+)
+ANVIL_EXECUTOR = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8"
+
+
+def start_anvil(port, timeout=30):
+    """Starts anvil and waits until it answers, returns (process, client)"""
+    process = subprocess.Popen(
+        ["anvil", "--port", str(port), "--silent"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    client = JsonRpcClient(f"http://127.0.0.1:{port}")
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client.call("eth_chainId")
+            return process, client
+        except (RpcError, OSError):
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"anvil did not start on port {port}")
+            time.sleep(0.1)
+
+
+def deploy_test_vault(rpc_url, chain_id, env={}):
+    """Runs the deploy script, returns the vault address from its receipts"""
+    result = subprocess.run(
+        [
+            "forge",
+            "script",
+            DEPLOY_SCRIPT,
+            "--rpc-url",
+            rpc_url,
+            "--private-key",
+            ANVIL_DEPLOYER_PRIVATE_KEY,
+            "--broadcast",
+        ],
+        env={**os.environ, **env},
+        text=True,
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{DEPLOY_SCRIPT} failed:\n{result.stdout}{result.stderr}")
+    receipt_file = (
+        f"broadcast/{os.path.basename(DEPLOY_SCRIPT)}/{chain_id}/run-latest.json"
+    )
+    with open(receipt_file, "r") as f:
+        transactions = json.load(f)["transactions"]
+    for transaction in transactions:
+        if (
+            transaction.get("transactionType") == "CREATE"
+            and transaction.get("contractName") == VAULT_CONTRACT_NAME
+        ):
+            return transaction["contractAddress"]
+    raise RuntimeError(f"No {VAULT_CONTRACT_NAME} deployment in {receipt_file}")
+
+
+def fund_executor(client, keeper, amount):
+    """Wraps ether of the executor into every token of the keeper vaults"""
+    for token in keeper.tokens():
+        client.send_transaction(keeper.sender, token, "deposit()", value=amount)
+
+
+def run_keeper_e2e(
+    rpc_url=None,
+    port=8546,
+    funding=100 * 10**18,
+    max_blocks=200,
+    lookahead=3,
+    fills=10,
+    deploy_env={},
+):
+    """
+    Returns the AuctionExecuted records seen by the keeper, raises
+    RuntimeError if the auction was not executed within max_blocks blocks
+    """
+    anvil = None
+    if rpc_url is None:
+        anvil, client = start_anvil(port)
+        rpc_url = client.rpc_url
+    else:
+        client = JsonRpcClient(rpc_url)
+    try:
+        chain_id = int(client.call("eth_chainId"), 16)
+        vault = deploy_test_vault(rpc_url, chain_id, deploy_env)
+        print(f"Test vault deployed at {vault}")
+
+        keeper = AuctionKeeper(
+            client, [vault], ANVIL_EXECUTOR, lookahead=lookahead, fills=fills
+        )
+        keeper.load()
+        fund_executor(client, keeper, funding)
+        keeper.approve()
+
+        for _ in range(max_blocks):
+            client.call("evm_mine")
+            keeper.on_head(int(client.call("eth_blockNumber"), 16))
+            if keeper.executions:
+                break
+        else:
+            raise RuntimeError(
+                f"Auction of {vault} not executed in {max_blocks} blocks"
+            )
+
+        # Pick up the receipt of the execution and the updated auction state
+        client.call("evm_mine")
+        keeper.on_head(int(client.call("eth_blockNumber"), 16))
+        auction_state = keeper.vaults[vault.lower()].auction_state
+        future_borrow, future_collateral = auction_state[0], auction_state[1]
+        print(
+            f"Auction executed, remaining future borrow {future_borrow}, "
+            f"future collateral {future_collateral}"
+        )
+        return keeper.executions
+    finally:
+        client.close()
+        if anvil is not None:
+            anvil.terminate()
+            anvil.wait()
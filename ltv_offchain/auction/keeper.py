@@ -0,0 +1,472 @@
+"""
+Auction keeper
+
+Follows new heads and keeps the auction state of every vault up to date
+incrementally: the vault events which change the future position
+(AuctionExecuted, deposits, withdrawals, low level rebalances, liquidations)
+mark a vault dirty and only dirty vaults re-read their auction getters. Every
+full_refresh_interval blocks all vaults are re-read, which covers changes
+without a dedicated event.
+
+For each vault an execution table holds the best affordable execution for
+each of the next lookahead blocks together with its ready to send
+transaction, so that once a head arrives the execution for the next block is
+submitted without any further computation. Tables are only rebuilt when the
+auction state, the oracle prices or the executor balances change, otherwise
+they just slide by one block.
+
+Heads are polled with eth_blockNumber over the keep-alive JSON-RPC client.
+Transactions are sent with eth_sendTransaction, so the executor has to be an
+unlocked account of the node (anvil, or a node with a local signer).
+"""
+
+import time
+
+from deploy_utils import abi
+from deploy_utils.keccak import keccak256
+from deploy_utils.rpc import RpcError
+
+from ltv_offchain.auction.profitability import AuctionSnapshot, ProfitModel
+
+MAX_UINT256 = 2**256 - 1
+
+AUCTION_EXECUTED_EVENT = "AuctionExecuted(address,int256,int256)"
+ORACLE_CONNECTOR_UPDATED_EVENT = "OracleConnectorUpdated(address,bytes,address,bytes)"
+STATE_CHANGING_EVENTS = (
+    AUCTION_EXECUTED_EVENT,
+    "Deposit(address,address,uint256,uint256)",
+    "Withdraw(address,address,address,uint256,uint256)",
+    "DepositCollateral(address,address,uint256,uint256)",
+    "WithdrawCollateral(address,address,address,uint256,uint256)",
+    "LowLevelRebalanceExecuted(address,int256,int256,int256)",
+    "LiquidationPerformed(uint256,uint16,uint16,bool)",
+    ORACLE_CONNECTOR_UPDATED_EVENT,
+)
+
+VAULT_CONFIG_GETTERS = (
+    ("collateralToken()", ["address"]),
+    ("borrowToken()", ["address"]),
+    ("collateralTokenDecimals()", ["uint8"]),
+    ("borrowTokenDecimals()", ["uint8"]),
+    ("oracleConnector()", ["address"]),
+    ("oracleConnectorGetterData()", ["bytes"]),
+)
+
+AUCTION_STATE_GETTERS = (
+    ("futureBorrowAssets()", ["int256"]),
+    ("futureCollateralAssets()", ["int256"]),
+    ("futureRewardBorrowAssets()", ["int256"]),
+    ("futureRewardCollateralAssets()", ["int256"]),
+    ("startAuction()", ["uint56"]),
+    ("auctionDuration()", ["uint24"]),
+)
+
+
+def get_event_topic(signature):
+    return "0x" + keccak256(signature).hex()
+
+
+def _eth_call(to, signature, args, block):
+    return (
+        "eth_call",
+        [{"to": to, "data": "0x" + abi.encode_call(signature, args).hex()}, block],
+    )
+
+
+def get_payments(option):
+    """(collateral, borrow) the executor pays for an ExecutionOption"""
+    return (
+        max(-option.delta_user_collateral_assets, 0),
+        max(option.delta_user_borrow_assets, 0),
+    )
+
+
+class VaultAuction:
+    """Tracked state of one vault, its execution table and pending transaction"""
+
+    def __init__(self, address):
+        self.address = address
+        self.collateral_token = None
+        self.borrow_token = None
+        self.collateral_token_decimals = None
+        self.borrow_token_decimals = None
+        self.oracle_connector = None
+        self.oracle_connector_getter_data = None
+        # (future borrow, future collateral, future reward borrow,
+        # future reward collateral, start auction, auction duration)
+        self.auction_state = None
+        self.prices = None
+        # {block number: (ExecutionOption, transaction)}
+        self.table = {}
+        self.pending = None
+
+    def has_auction(self):
+        return (
+            self.auction_state is not None
+            and self.auction_state[5] != 0
+            and (self.auction_state[0] != 0 or self.auction_state[1] != 0)
+        )
+
+    def snapshot(self, block_number):
+        return AuctionSnapshot(
+            self.address,
+            *self.auction_state,
+            block_number,
+            *self.prices,
+            self.collateral_token_decimals,
+            self.borrow_token_decimals,
+        )
+
+
+class AuctionKeeper:
+    def __init__(
+        self,
+        client,
+        vaults,
+        sender,
+        lookahead=3,
+        fills=10,
+        gas_cost=0,
+        min_profit=0,
+        gas_limit=None,
+        full_refresh_interval=100,
+        dry_run=False,
+        log=print,
+    ):
+        self.client = client
+        self.vaults = {vault.lower(): VaultAuction(vault.lower()) for vault in vaults}
+        self.sender = sender
+        self.lookahead = lookahead
+        self.fills = fills
+        self.gas_cost = gas_cost
+        self.min_profit = min_profit
+        self.gas_limit = gas_limit
+        self.full_refresh_interval = full_refresh_interval
+        self.dry_run = dry_run
+        self.log = log
+        self.topics = [get_event_topic(event) for event in STATE_CHANGING_EVENTS]
+        self.auction_executed_topic = get_event_topic(AUCTION_EXECUTED_EVENT)
+        self.oracle_connector_updated_topic = get_event_topic(
+            ORACLE_CONNECTOR_UPDATED_EVENT
+        )
+        self.balances = {}
+        self.last_block = None
+        self.last_full_refresh = None
+        # (vault, block number, executor, delta real collateral, delta real borrow)
+        self.executions = []
+
+    def tokens(self):
+        return list(
+            dict.fromkeys(
+                token
+                for vault in self.vaults.values()
+                for token in (vault.collateral_token, vault.borrow_token)
+            )
+        )
+
+    def _load_config(self, vaults, block):
+        calls = [
+            _eth_call(vault.address, signature, (), block)
+            for vault in vaults
+            for signature, _ in VAULT_CONFIG_GETTERS
+        ]
+        results = iter(self.client.batch(calls))
+        for vault in vaults:
+            (
+                vault.collateral_token,
+                vault.borrow_token,
+                vault.collateral_token_decimals,
+                vault.borrow_token_decimals,
+                vault.oracle_connector,
+                vault.oracle_connector_getter_data,
+            ) = [
+                abi.decode(return_types, next(results))[0]
+                for _, return_types in VAULT_CONFIG_GETTERS
+            ]
+
+    def _load_auction_states(self, vaults, block):
+        """Re-reads the auction getters, returns the vaults whose auction changed"""
+        calls = [
+            _eth_call(vault.address, signature, (), block)
+            for vault in vaults
+            for signature, _ in AUCTION_STATE_GETTERS
+        ]
+        results = iter(self.client.batch(calls))
+        changed = []
+        for vault in vaults:
+            auction_state = tuple(
+                abi.decode(return_types, next(results))[0]
+                for _, return_types in AUCTION_STATE_GETTERS
+            )
+            if auction_state != vault.auction_state:
+                vault.auction_state = auction_state
+                changed.append(vault)
+        return changed
+
+    def load(self, block_number=None):
+        """Reads the configuration and auction state of every vault"""
+        if block_number is None:
+            block_number = int(self.client.call("eth_blockNumber"), 16)
+        block = hex(block_number)
+        vaults = list(self.vaults.values())
+        self._load_config(vaults, block)
+        self._load_auction_states(vaults, block)
+        self.last_block = block_number
+        self.last_full_refresh = block_number
+        self.log(f"Tracking {len(vaults)} vaults from block {block_number}")
+
+    def approve(self):
+        """Approves every vault to pull both of its tokens from the executor"""
+        for vault in self.vaults.values():
+            for token in (vault.collateral_token, vault.borrow_token):
+                self.client.send_transaction(
+                    self.sender,
+                    token,
+                    "approve(address,uint256)",
+                    [vault.address, MAX_UINT256],
+                )
+        self.log(f"Approved {len(self.vaults)} vaults for {self.sender}")
+
+    def _read_head(self, block_number):
+        """
+        One batch with the vault logs since the last processed block, the
+        oracle prices, the executor balances and the pending receipts.
+        Returns (logs, vaults whose prices changed, whether balances changed,
+        receipts by vault).
+        """
+        block = hex(block_number)
+        vaults = list(self.vaults.values())
+        tokens = self.tokens()
+        pending = [vault for vault in vaults if vault.pending is not None]
+        calls = [
+            (
+                "eth_getLogs",
+                [
+                    {
+                        "fromBlock": hex(self.last_block + 1),
+                        "toBlock": block,
+                        "address": list(self.vaults),
+                        "topics": [self.topics],
+                    }
+                ],
+            )
+        ]
+        for vault in vaults:
+            calls.append(
+                _eth_call(
+                    vault.oracle_connector,
+                    "getPriceCollateralOracle(bytes)",
+                    [vault.oracle_connector_getter_data],
+                    block,
+                )
+            )
+            calls.append(
+                _eth_call(
+                    vault.oracle_connector,
+                    "getPriceBorrowOracle(bytes)",
+                    [vault.oracle_connector_getter_data],
+                    block,
+                )
+            )
+        for token in tokens:
+            calls.append(_eth_call(token, "balanceOf(address)", [self.sender], block))
+        for vault in pending:
+            calls.append(("eth_getTransactionReceipt", [vault.pending[0]]))
+
+        results = iter(self.client.batch(calls))
+        logs = next(results)
+        prices_changed = []
+        for vault in vaults:
+            prices = (
+                abi.decode(["uint256"], next(results))[0],
+                abi.decode(["uint256"], next(results))[0],
+            )
+            if prices != vault.prices:
+                vault.prices = prices
+                prices_changed.append(vault)
+        balances = {
+            token: abi.decode(["uint256"], next(results))[0] for token in tokens
+        }
+        balances_changed = balances != self.balances
+        self.balances = balances
+        receipts = {vault.address: next(results) for vault in pending}
+        return logs, prices_changed, balances_changed, receipts
+
+    def _process_logs(self, logs):
+        """Returns (dirty vaults, vaults whose oracle connector changed)"""
+        dirty = {}
+        reconfigured = {}
+        for log in logs:
+            vault = self.vaults.get(log["address"].lower())
+            if vault is None:
+                continue
+            dirty[vault.address] = vault
+            topic = log["topics"][0]
+            if topic == self.oracle_connector_updated_topic:
+                reconfigured[vault.address] = vault
+            elif topic == self.auction_executed_topic:
+                executor, delta_real_collateral, delta_real_borrow = abi.decode(
+                    ["address", "int256", "int256"], log["data"]
+                )
+                block_number = int(log["blockNumber"], 16)
+                self.executions.append(
+                    (
+                        vault.address,
+                        block_number,
+                        executor,
+                        delta_real_collateral,
+                        delta_real_borrow,
+                    )
+                )
+                self.log(
+                    f"{vault.address} auction executed at block {block_number} by {executor}: "
+                    f"delta real collateral {delta_real_collateral}, delta real borrow {delta_real_borrow}"
+                )
+        return list(dirty.values()), list(reconfigured.values())
+
+    def _process_receipts(self, receipts):
+        """Clears finished pending transactions, returns their vaults"""
+        finished = []
+        for address, receipt in receipts.items():
+            if receipt is None:
+                continue
+            vault = self.vaults[address]
+            tx_hash, block_number = vault.pending
+            status = "succeeded" if int(receipt["status"], 16) == 1 else "reverted"
+            self.log(
+                f"{vault.address} execution {tx_hash} submitted at block {block_number} {status} "
+                f"in block {int(receipt['blockNumber'], 16)}"
+            )
+            vault.pending = None
+            finished.append(vault)
+        return finished
+
+    def _is_affordable(self, vault, option, balances):
+        collateral, borrow = get_payments(option)
+        if vault.collateral_token == vault.borrow_token:
+            return collateral + borrow <= balances.get(vault.collateral_token, 0)
+        return collateral <= balances.get(
+            vault.collateral_token, 0
+        ) and borrow <= balances.get(vault.borrow_token, 0)
+
+    def _transaction(self, vault, option):
+        data = abi.encode_call(f"{option.function}(int256)", [option.delta_user_assets])
+        transaction = {
+            "from": self.sender,
+            "to": vault.address,
+            "data": "0x" + data.hex(),
+        }
+        if self.gas_limit is not None:
+            transaction["gas"] = hex(self.gas_limit)
+        return transaction
+
+    def _best_entry(self, vault, model, block_number, balances):
+        best = None
+        for option in model.options(block_number, self.fills):
+            if option[0] <= self.min_profit or (
+                best is not None and option[0] <= best[0]
+            ):
+                continue
+            execution = model.to_execution_option(block_number, option)
+            if self._is_affordable(vault, execution, balances):
+                best = (option[0], execution)
+        if best is None:
+            return None
+        return best[1], self._transaction(vault, best[1])
+
+    def _fill_table(self, vault, head, rebuild):
+        """Rebuilds the table or slides it to the blocks after head"""
+        if rebuild:
+            vault.table = {}
+        else:
+            vault.table = {
+                block_number: entry
+                for block_number, entry in vault.table.items()
+                if block_number > head
+            }
+        if not vault.has_auction() or vault.prices is None:
+            vault.table = {}
+            return
+        model = ProfitModel(vault.snapshot(head), self.gas_cost)
+        for block_number in range(head + 1, head + self.lookahead + 1):
+            if block_number not in vault.table:
+                vault.table[block_number] = self._best_entry(
+                    vault, model, block_number, self.balances
+                )
+
+    def _submit(self, vault, head, balances):
+        entry = vault.table.get(head + 1)
+        if entry is None or vault.pending is not None:
+            return
+        option, transaction = entry
+        if not self._is_affordable(vault, option, balances):
+            return
+        collateral, borrow = get_payments(option)
+        balances[vault.collateral_token] = (
+            balances.get(vault.collateral_token, 0) - collateral
+        )
+        balances[vault.borrow_token] = balances.get(vault.borrow_token, 0) - borrow
+        self.log(
+            f"{vault.address} {option.function}({option.delta_user_assets}) for block "
+            f"{option.block_number}, step {option.auction_step}, profit {option.profit}"
+        )
+        if self.dry_run:
+            return
+        try:
+            tx_hash = self.client.call("eth_sendTransaction", [transaction])
+        except RpcError as e:
+            self.log(f"{vault.address} submission failed: {e}")
+            return
+        vault.pending = (tx_hash, head)
+
+    def on_head(self, block_number):
+        """Processes a new head, submits the executions for the next block"""
+        if self.last_block is None:
+            self.load(block_number - 1)
+        if block_number <= self.last_block:
+            return
+        logs, prices_changed, balances_changed, receipts = self._read_head(block_number)
+        dirty, reconfigured = self._process_logs(logs)
+        finished = self._process_receipts(receipts)
+        if reconfigured:
+            self._load_config(reconfigured, hex(block_number))
+        if block_number - self.last_full_refresh >= self.full_refresh_interval:
+            dirty = list(self.vaults.values())
+            self.last_full_refresh = block_number
+        else:
+            dirty = list({vault.address: vault for vault in dirty + finished}.values())
+        changed = set()
+        if dirty:
+            changed.update(
+                vault.address
+                for vault in self._load_auction_states(dirty, hex(block_number))
+            )
+        changed.update(vault.address for vault in prices_changed)
+        self.last_block = block_number
+
+        balances = dict(self.balances)
+        for vault in self.vaults.values():
+            rebuild = vault.address in changed or balances_changed
+            if not rebuild and vault.table:
+                # Precomputed entry for the next block, submit before any work
+                self._submit(vault, block_number, balances)
+                self._fill_table(vault, block_number, rebuild=False)
+            else:
+                self._fill_table(vault, block_number, rebuild=True)
+                self._submit(vault, block_number, balances)
+
+    def run(self, poll_interval=0.2, max_blocks=None, stop=None):
+        """
+        Polls for new heads until max_blocks heads were processed or stop()
+        returns True
+        """
+        processed = 0
+        while max_blocks is None or processed < max_blocks:
+            if stop is not None and stop():
+                return
+            head = int(self.client.call("eth_blockNumber"), 16)
+            if self.last_block is not None and head <= self.last_block:
+                time.sleep(poll_interval)
+                continue
+            self.on_head(head)
+            processed += 1
@@ -0,0 +1,310 @@
+"""
+Auction profitability scanner
+
+For every vault snapshot the executor profit is evaluated over the remaining
+auction window (every block, or max_blocks evenly spaced ones for long
+auctions) times fills partial fill sizes through both executeAuctionBorrow
+and executeAuctionCollateral. Fill k of n is k/n of the auction size
+available at that block, so fill n closes the auction.
+
+Profit is what the executor receives minus what it pays, both valued at the
+snapshot prices in underlying units (price * amount / 10**decimals), minus
+gas_cost. The reward grows with the auction step, so a keeper competing with
+others wants the earliest block whose profit clears min_profit ("earliest"
+strategy) rather than the last one ("max_profit" strategy). Between two grid
+blocks the earliest one is refined block by block.
+
+Executions go through the unchecked fast path, falling back to the checked
+port, and vaults can be spread over a process pool.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+
+from ltv_offchain.math import auction_math, unchecked
+from ltv_offchain.math.common_math import calculate_auction_step
+from ltv_offchain.math.solidity import MathRevert
+from ltv_offchain.math.structs import AuctionData
+
+EXECUTE_AUCTION_BORROW = "executeAuctionBorrow"
+EXECUTE_AUCTION_COLLATERAL = "executeAuctionCollateral"
+
+STRATEGIES = ("earliest", "max_profit")
+
+AuctionSnapshot = namedtuple(
+    "AuctionSnapshot",
+    [
+        "vault",
+        "future_borrow_assets",
+        "future_collateral_assets",
+        "future_reward_borrow_assets",
+        "future_reward_collateral_assets",
+        "start_auction",
+        "auction_duration",
+        "block_number",
+        "collateral_price",
+        "borrow_price",
+        "collateral_token_decimals",
+        "borrow_token_decimals",
+    ],
+)
+
+ExecutionOption = namedtuple(
+    "ExecutionOption",
+    [
+        "vault",
+        "block_number",
+        "auction_step",
+        "function",
+        "delta_user_assets",
+        "delta_user_collateral_assets",
+        "delta_user_borrow_assets",
+        "profit",
+    ],
+)
+
+_FUNCTIONS = {
+    EXECUTE_AUCTION_BORROW: (
+        unchecked.calculate_execute_auction_borrow,
+        auction_math.calculate_execute_auction_borrow,
+    ),
+    EXECUTE_AUCTION_COLLATERAL: (
+        unchecked.calculate_execute_auction_collateral,
+        auction_math.calculate_execute_auction_collateral,
+    ),
+}
+
+
+def execute_auction(function, delta_user_assets, data):
+    """DeltaAuctionState fields of an auction execution, None if it reverts"""
+    calculate_unchecked, calculate = _FUNCTIONS[function]
+    try:
+        return calculate_unchecked(delta_user_assets, data)
+    except unchecked.Fallback:
+        try:
+            return tuple(calculate(delta_user_assets, AuctionData._make(data)))
+        except MathRevert:
+            return None
+
+
+def available_delta_user_assets(function, data):
+    """Largest delta user assets the auction accepts, signed like the future position"""
+    (
+        future_borrow,
+        future_collateral,
+        future_reward_borrow,
+        future_reward_collateral,
+        step,
+        duration,
+    ) = data
+    try:
+        if function == EXECUTE_AUCTION_BORROW:
+            return auction_math.available_delta_user_borrow_assets(
+                future_reward_borrow, step, duration, future_borrow
+            )
+        return auction_math.available_delta_user_collateral_assets(
+            future_reward_collateral, step, duration, future_collateral
+        )
+    except MathRevert:
+        return 0
+
+
+def get_fill_sizes(available, fills):
+    """fills delta user assets opposite to available, k/fills of it rounded towards zero"""
+    sign = 1 if available > 0 else -1
+    sizes = [-sign * (abs(available) * k // fills) for k in range(1, fills + 1)]
+    return list(dict.fromkeys(size for size in sizes if size != 0))
+
+
+def get_scan_blocks(snapshot, max_blocks):
+    """Blocks from the snapshot block to the end of the auction, at most max_blocks of them"""
+    first = max(snapshot.block_number, snapshot.start_auction)
+    last = max(first, snapshot.start_auction + snapshot.auction_duration)
+    count = last - first + 1
+    if count <= max_blocks:
+        return list(range(first, last + 1))
+    if max_blocks == 1:
+        return [first]
+    return list(
+        dict.fromkeys(
+            first + (count - 1) * i // (max_blocks - 1) for i in range(max_blocks)
+        )
+    )
+
+
+class ProfitModel:
+    """Executor profit of auction executions at the prices of one snapshot"""
+
+    def __init__(self, snapshot, gas_cost):
+        self.snapshot = snapshot
+        self.gas_cost = gas_cost
+        self.collateral_scale = snapshot.collateral_price * 10 ** (
+            snapshot.borrow_token_decimals
+        )
+        self.borrow_scale = snapshot.borrow_price * 10 ** (
+            snapshot.collateral_token_decimals
+        )
+        self.denominator = 10 ** (
+            snapshot.collateral_token_decimals + snapshot.borrow_token_decimals
+        )
+
+    def auction_data(self, block_number):
+        snapshot = self.snapshot
+        return (
+            snapshot.future_borrow_assets,
+            snapshot.future_collateral_assets,
+            snapshot.future_reward_borrow_assets,
+            snapshot.future_reward_collateral_assets,
+            calculate_auction_step(
+                snapshot.start_auction, block_number, snapshot.auction_duration
+            ),
+            snapshot.auction_duration,
+        )
+
+    def profit(self, delta_user_collateral, delta_user_borrow):
+        # positive delta user collateral is sent to the executor, positive delta
+        # user borrow is paid by the executor
+        value = (
+            delta_user_collateral * self.collateral_scale
+            - delta_user_borrow * self.borrow_scale
+        ) // self.denominator
+        return value - self.gas_cost
+
+    def options(self, block_number, fills):
+        """
+        Every executable fill of both functions at block_number as
+        (profit, function, delta user assets, DeltaAuctionState fields)
+        """
+        data = self.auction_data(block_number)
+        options = []
+        for function in _FUNCTIONS:
+            available = available_delta_user_assets(function, data)
+            for delta_user_assets in get_fill_sizes(available, fills):
+                state = execute_auction(function, delta_user_assets, data)
+                if state is not None:
+                    options.append(
+                        (
+                            self.profit(state[2], state[3]),
+                            function,
+                            delta_user_assets,
+                            state,
+                        )
+                    )
+        return options
+
+    def to_execution_option(self, block_number, option):
+        profit, function, delta_user_assets, state = option
+        return ExecutionOption(
+            vault=self.snapshot.vault,
+            block_number=block_number,
+            auction_step=calculate_auction_step(
+                self.snapshot.start_auction,
+                block_number,
+                self.snapshot.auction_duration,
+            ),
+            function=function,
+            delta_user_assets=delta_user_assets,
+            delta_user_collateral_assets=state[2],
+            delta_user_borrow_assets=state[3],
+            profit=profit,
+        )
+
+
+def _best(options):
+    return max(options, key=itemgetter(0), default=None)
+
+
+def scan_vault(
+    snapshot,
+    fills=10,
+    max_blocks=1000,
+    gas_cost=0,
+    min_profit=0,
+    strategy="earliest",
+    with_curve=False,
+):
+    """
+    Returns (best ExecutionOption or None, curve). The curve holds every
+    evaluated ExecutionOption when with_curve is set and is empty otherwise.
+    An option is only returned if its profit is above min_profit.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy}")
+    if snapshot.auction_duration == 0 or (
+        snapshot.future_borrow_assets == 0 and snapshot.future_collateral_assets == 0
+    ):
+        return None, []
+    model = ProfitModel(snapshot, gas_cost)
+
+    curve = []
+    best = None
+    previous_block = None
+    for block_number in get_scan_blocks(snapshot, max_blocks):
+        options = model.options(block_number, fills)
+        if with_curve:
+            curve.extend(
+                model.to_execution_option(block_number, option) for option in options
+            )
+        block_best = _best(options)
+        if block_best is None or block_best[0] <= min_profit:
+            previous_block = block_number
+            continue
+        if strategy == "earliest":
+            if previous_block is not None:
+                for refined_block in range(previous_block + 1, block_number):
+                    refined_best = _best(model.options(refined_block, fills))
+                    if refined_best is not None and refined_best[0] > min_profit:
+                        block_number, block_best = refined_block, refined_best
+                        break
+            return model.to_execution_option(block_number, block_best), curve
+        if best is None or block_best[0] > best[1][0]:
+            best = (block_number, block_best)
+        previous_block = block_number
+    if best is None:
+        return None, curve
+    return model.to_execution_option(*best), curve
+
+
+def scan_auctions(snapshots, workers=1, **options):
+    """scan_vault over many snapshots, returns [(best option, curve)] in order"""
+    scan = partial(scan_vault, **options)
+    workers = max(1, min(workers, len(snapshots)))
+    if workers == 1:
+        return [scan(snapshot) for snapshot in snapshots]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                scan, snapshots, chunksize=max(1, len(snapshots) // (4 * workers))
+            )
+        )
+
+
+def snapshot_from_dict(values):
+    """AuctionSnapshot from a JSON object, integers may be given as strings"""
+    missing = [field for field in AuctionSnapshot._fields if field not in values]
+    if missing:
+        raise ValueError(f"snapshot {values.get('vault')} misses {missing}")
+    return AuctionSnapshot(
+        vault=values["vault"],
+        **{
+            field: int(values[field])
+            for field in AuctionSnapshot._fields
+            if field != "vault"
+        },
+    )
+
+
+def format_options_table(results):
+    lines = [
+        f"{'VAULT':<42} {'BLOCK':>10} {'STEP':>8} {'FUNCTION':<25} {'DELTA USER ASSETS':>26} {'PROFIT':>26}"
+    ]
+    for snapshot_vault, option in results:
+        if option is None:
+            lines.append(f"{snapshot_vault:<42} {'no profitable execution':>10}")
+            continue
+        lines.append(
+            f"{option.vault:<42} {option.block_number:>10} {option.auction_step:>8} {option.function:<25} {option.delta_user_assets:>26} {option.profit:>26}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1 @@
+"""Precomputed max deposit / mint / withdraw / redeem limits of vaults"""
@@ -0,0 +1,235 @@
+"""
+Max operation limit surface CLI
+
+    python -m ltv_offchain.capacity build --state state.json --out surface.json
+    python -m ltv_offchain.capacity query --surface surface.json \
+        --function max_deposit --collateral-price 2100000000000000000000
+    python -m ltv_offchain.capacity update --surface surface.json --state new_state.json
+
+state.json is an object with the VaultState fields of
+ltv_offchain/capacity/surface.py. Price axes are spread around the state
+prices unless given explicitly.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from ltv_offchain.capacity.surface import (
+    FUNCTIONS,
+    QUERY_MODES,
+    CapacitySurface,
+    get_price_axis,
+    vault_state_from_dict,
+)
+
+
+def _parse_ints(value):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _load_state(path):
+    with open(path, "r") as f:
+        try:
+            return vault_state_from_dict(json.load(f))
+        except ValueError as e:
+            print(f"ERROR {e}")
+            sys.exit(1)
+
+
+def _load_surface(path, workers=1):
+    with open(path, "r") as f:
+        return CapacitySurface.from_dict(json.load(f), workers=workers)
+
+
+def _save_surface(surface, path):
+    with open(path, "w") as f:
+        json.dump(surface.to_dict(), f)
+
+
+def _get_axes(args, state):
+    collateral_prices = (
+        _parse_ints(args.collateral_prices)
+        if args.collateral_prices
+        else get_price_axis(state.collateral_price, args.points, args.spread)
+    )
+    borrow_prices = (
+        _parse_ints(args.borrow_prices)
+        if args.borrow_prices
+        else get_price_axis(state.borrow_price, args.borrow_points, args.spread)
+    )
+    max_total_assets = (
+        _parse_ints(args.max_total_assets) if args.max_total_assets else None
+    )
+    return collateral_prices, borrow_prices, max_total_assets
+
+
+def build(args):
+    state = _load_state(args.state)
+    collateral_prices, borrow_prices, max_total_assets = _get_axes(args, state)
+    functions = None
+    if args.functions:
+        functions = [function.strip() for function in args.functions.split(",")]
+
+    start = time.monotonic()
+    try:
+        surface = CapacitySurface(
+            state,
+            collateral_prices,
+            borrow_prices,
+            max_total_assets,
+            functions=functions,
+            workers=args.workers,
+        )
+    except ValueError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    print(
+        f"{surface.recomputed} cells of {len(surface.functions)} functions "
+        f"computed in {time.monotonic() - start:.2f}s"
+    )
+    _save_surface(surface, args.out)
+    print(f"Surface written to {args.out}")
+
+
+def update(args):
+    surface = _load_surface(args.surface, args.workers)
+    state = _load_state(args.state) if args.state else None
+    collateral_prices = (
+        _parse_ints(args.collateral_prices) if args.collateral_prices else None
+    )
+    borrow_prices = _parse_ints(args.borrow_prices) if args.borrow_prices else None
+    max_total_assets = (
+        _parse_ints(args.max_total_assets) if args.max_total_assets else None
+    )
+
+    start = time.monotonic()
+    recomputed = surface.update(
+        state, collateral_prices, borrow_prices, max_total_assets
+    )
+    print(f"{recomputed} cells recomputed in {time.monotonic() - start:.2f}s")
+    out = args.out or args.surface
+    _save_surface(surface, out)
+    print(f"Surface written to {out}")
+
+
+def query(args):
+    surface = _load_surface(args.surface)
+    state = surface.state
+    try:
+        limit = surface.get(
+            args.function,
+            (
+                args.collateral_price
+                if args.collateral_price is not None
+                else state.collateral_price
+            ),
+            args.borrow_price if args.borrow_price is not None else state.borrow_price,
+            args.max_total_assets,
+            mode=args.mode,
+        )
+    except ValueError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    if limit is None:
+        print("ERROR point outside of the surface or reverting")
+        sys.exit(1)
+    print(limit)
+
+
+def _add_axis_arguments(parser):
+    parser.add_argument(
+        "--collateral-prices", help="Comma separated collateral price axis"
+    )
+    parser.add_argument("--borrow-prices", help="Comma separated borrow price axis")
+    parser.add_argument(
+        "--max-total-assets",
+        help="Comma separated MAX_TOTAL_ASSETS_IN_UNDERLYING axis, "
+        "defaults to the state value",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV max operation limit surfaces")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="Precompute the max operation limits of a vault"
+    )
+    build_parser.add_argument("--state", help="JSON vault state", required=True)
+    _add_axis_arguments(build_parser)
+    build_parser.add_argument(
+        "--points",
+        help="Collateral prices when --collateral-prices is not given",
+        type=int,
+        default=41,
+    )
+    build_parser.add_argument(
+        "--borrow-points",
+        help="Borrow prices when --borrow-prices is not given",
+        type=int,
+        default=1,
+    )
+    build_parser.add_argument(
+        "--spread",
+        help="Relative price range around the state prices",
+        type=float,
+        default=0.2,
+    )
+    build_parser.add_argument(
+        "--functions",
+        help=f"Comma separated functions, defaults to {','.join(FUNCTIONS)}",
+    )
+    build_parser.add_argument(
+        "--workers", help="Processes computing cells", type=int, default=1
+    )
+    build_parser.add_argument("--out", help="JSON file for the surface", required=True)
+    build_parser.set_defaults(handler=build)
+
+    update_parser = subparsers.add_parser(
+        "update", help="Recompute the cells of a surface whose inputs changed"
+    )
+    update_parser.add_argument("--surface", help="JSON surface", required=True)
+    update_parser.add_argument("--state", help="New JSON vault state")
+    _add_axis_arguments(update_parser)
+    update_parser.add_argument(
+        "--workers", help="Processes computing cells", type=int, default=1
+    )
+    update_parser.add_argument(
+        "--out", help="JSON file for the surface, defaults to --surface"
+    )
+    update_parser.set_defaults(handler=update)
+
+    query_parser = subparsers.add_parser("query", help="Look up a limit")
+    query_parser.add_argument("--surface", help="JSON surface", required=True)
+    query_parser.add_argument(
+        "--function", help="Max function", choices=list(FUNCTIONS), required=True
+    )
+    query_parser.add_argument(
+        "--collateral-price",
+        help="Collateral price, defaults to the state one",
+        type=int,
+    )
+    query_parser.add_argument(
+        "--borrow-price", help="Borrow price, defaults to the state one", type=int
+    )
+    query_parser.add_argument(
+        "--max-total-assets",
+        help="MAX_TOTAL_ASSETS_IN_UNDERLYING, defaults to the state one",
+        type=int,
+    )
+    query_parser.add_argument(
+        "--mode",
+        help="Lookup between cells",
+        choices=QUERY_MODES,
+        default=QUERY_MODES[0],
+    )
+    query_parser.set_defaults(handler=query)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+"""
+Max operation limit surfaces
+
+A CapacitySurface holds maxDeposit, maxMint, maxWithdraw, maxRedeem and
+their collateral vault versions of one vault over a grid of collateral
+prices, borrow prices and, for deposit / mint, MAX_TOTAL_ASSETS_IN_UNDERLYING
+values. Cells are computed with the exact port of the vault max functions,
+so a query on a grid point is the value the vault would return, and queries
+between grid points interpolate the surrounding cells.
+
+Deposit / mint limits do not depend on the max safe LTV and the owner
+balance, withdraw / redeem limits do not depend on the min profit LTV and the
+max total assets, so both families are cached separately: update() only
+recomputes the cells whose own inputs changed, e.g. a new max total assets
+value adds one plane of deposit / mint cells and leaves withdraw / redeem
+untouched.
+
+Withdraw / redeem cells are computed for the owner_balance of the state;
+use the vault total supply there to get the vault side limit and cap redeem
+limits with the balance of the owner when querying.
+"""
+
+import bisect
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from ltv_offchain.math.max_vault import (
+    max_deposit,
+    max_deposit_collateral,
+    max_deposit_mint_collateral_state_to_data,
+    max_deposit_mint_state_to_data,
+    max_mint,
+    max_mint_collateral,
+    max_redeem,
+    max_redeem_collateral,
+    max_withdraw,
+    max_withdraw_collateral,
+    max_withdraw_redeem_collateral_state_to_data,
+    max_withdraw_redeem_state_to_data,
+)
+from ltv_offchain.math.solidity import MathRevert
+from ltv_offchain.math.structs import (
+    MaxDepositMintVaultState,
+    MaxGrowthFeeState,
+    MaxWithdrawRedeemVaultState,
+    PreviewDepositVaultState,
+    PreviewWithdrawVaultState,
+)
+
+# Everything the state readers of the max functions read, flattened
+VaultState = namedtuple(
+    "VaultState",
+    [
+        "deposit_real_collateral_assets",
+        "deposit_real_borrow_assets",
+        "withdraw_real_collateral_assets",
+        "withdraw_real_borrow_assets",
+        "future_borrow_assets",
+        "future_collateral_assets",
+        "future_reward_borrow_assets",
+        "future_reward_collateral_assets",
+        "borrow_price",
+        "collateral_price",
+        "borrow_token_decimals",
+        "collateral_token_decimals",
+        "max_growth_fee_dividend",
+        "max_growth_fee_divider",
+        "supply",
+        "last_seen_token_price",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "start_auction",
+        "auction_duration",
+        "block_number",
+        "collateral_slippage",
+        "borrow_slippage",
+        "max_total_assets_in_underlying",
+        "min_profit_ltv_dividend",
+        "min_profit_ltv_divider",
+        "max_safe_ltv_dividend",
+        "max_safe_ltv_divider",
+        "owner_balance",
+    ],
+)
+
+DEPOSIT_MINT = "deposit_mint"
+WITHDRAW_REDEEM = "withdraw_redeem"
+
+# function: (family, state to data, max function)
+FUNCTIONS = {
+    "max_deposit": (DEPOSIT_MINT, max_deposit_mint_state_to_data, max_deposit),
+    "max_mint": (DEPOSIT_MINT, max_deposit_mint_state_to_data, max_mint),
+    "max_withdraw": (WITHDRAW_REDEEM, max_withdraw_redeem_state_to_data, max_withdraw),
+    "max_redeem": (WITHDRAW_REDEEM, max_withdraw_redeem_state_to_data, max_redeem),
+    "max_deposit_collateral": (
+        DEPOSIT_MINT,
+        max_deposit_mint_collateral_state_to_data,
+        max_deposit_collateral,
+    ),
+    "max_mint_collateral": (
+        DEPOSIT_MINT,
+        max_deposit_mint_collateral_state_to_data,
+        max_mint_collateral,
+    ),
+    "max_withdraw_collateral": (
+        WITHDRAW_REDEEM,
+        max_withdraw_redeem_collateral_state_to_data,
+        max_withdraw_collateral,
+    ),
+    "max_redeem_collateral": (
+        WITHDRAW_REDEEM,
+        max_withdraw_redeem_collateral_state_to_data,
+        max_redeem_collateral,
+    ),
+}
+
+# State fields a family does not depend on, besides the grid axes
+IGNORED_FIELDS = {
+    DEPOSIT_MINT: {"max_safe_ltv_dividend", "max_safe_ltv_divider", "owner_balance"},
+    WITHDRAW_REDEEM: {
+        "max_total_assets_in_underlying",
+        "min_profit_ltv_dividend",
+        "min_profit_ltv_divider",
+    },
+}
+AXIS_FIELDS = {"collateral_price", "borrow_price", "max_total_assets_in_underlying"}
+
+INTERPOLATE = "interpolate"
+FLOOR = "floor"
+QUERY_MODES = (INTERPOLATE, FLOOR)
+
+
+def get_family_key(state, family):
+    """Values of the state fields the cells of a family depend on"""
+    ignored = IGNORED_FIELDS[family] | AXIS_FIELDS
+    return tuple(
+        value for field, value in zip(state._fields, state) if field not in ignored
+    )
+
+
+def get_max_states(state):
+    """(MaxDepositMintVaultState, MaxWithdrawRedeemVaultState) of a VaultState"""
+    fee_state = MaxGrowthFeeState(
+        **{field: getattr(state, field) for field in MaxGrowthFeeState._fields}
+    )
+    auction = {
+        "target_ltv_dividend": state.target_ltv_dividend,
+        "target_ltv_divider": state.target_ltv_divider,
+        "start_auction": state.start_auction,
+        "auction_duration": state.auction_duration,
+        "block_number": state.block_number,
+        "collateral_slippage": state.collateral_slippage,
+        "borrow_slippage": state.borrow_slippage,
+    }
+    return (
+        MaxDepositMintVaultState(
+            preview_deposit_vault_state=PreviewDepositVaultState(
+                max_growth_fee_state=fee_state,
+                deposit_real_borrow_assets=state.deposit_real_borrow_assets,
+                deposit_real_collateral_assets=state.deposit_real_collateral_assets,
+                **auction,
+            ),
+            max_total_assets_in_underlying=state.max_total_assets_in_underlying,
+            min_profit_ltv_dividend=state.min_profit_ltv_dividend,
+            min_profit_ltv_divider=state.min_profit_ltv_divider,
+        ),
+        MaxWithdrawRedeemVaultState(
+            preview_withdraw_vault_state=PreviewWithdrawVaultState(
+                max_growth_fee_state=fee_state, **auction
+            ),
+            max_safe_ltv_dividend=state.max_safe_ltv_dividend,
+            max_safe_ltv_divider=state.max_safe_ltv_divider,
+            owner_balance=state.owner_balance,
+        ),
+    )
+
+
+def compute_limits(state, functions):
+    """{function: limit, None if the vault reverts} of a VaultState"""
+    max_states = dict(zip((DEPOSIT_MINT, WITHDRAW_REDEEM), get_max_states(state)))
+    data_cache = {}
+    limits = {}
+    for function in functions:
+        family, state_to_data, calculate = FUNCTIONS[function]
+        try:
+            if state_to_data not in data_cache:
+                data_cache[state_to_data] = state_to_data(max_states[family])
+            limits[function] = calculate(data_cache[state_to_data])
+        except MathRevert:
+            limits[function] = None
+    return limits
+
+
+def _compute_cells(state, functions, cells):
+    """
+    [{function: limit}] of (collateral price, borrow price, max total assets
+    or None to keep the state one)
+    """
+    limits = []
+    for collateral_price, borrow_price, max_total_assets in cells:
+        cell_state = state._replace(
+            collateral_price=collateral_price, borrow_price=borrow_price
+        )
+        if max_total_assets is not None:
+            cell_state = cell_state._replace(
+                max_total_assets_in_underlying=max_total_assets
+            )
+        limits.append(compute_limits(cell_state, functions))
+    return limits
+
+
+def _get_bracket(axis, value):
+    """(lower index, upper index, weight of upper) of value on a sorted axis"""
+    if value < axis[0] or value > axis[-1]:
+        return None
+    upper = bisect.bisect_left(axis, value)
+    if axis[upper] == value or upper == 0:
+        return upper, upper, 0.0
+    lower = upper - 1
+    return lower, upper, (value - axis[lower]) / (axis[upper] - axis[lower])
+
+
+class CapacitySurface:
+    def __init__(
+        self,
+        state,
+        collateral_prices,
+        borrow_prices,
+        max_total_assets=None,
+        functions=None,
+        workers=1,
+    ):
+        self.functions = list(functions or FUNCTIONS)
+        unknown = [function for function in self.functions if function not in FUNCTIONS]
+        if unknown:
+            raise ValueError(f"unknown functions {unknown}")
+        self.workers = workers
+        self.state = None
+        self.collateral_prices = []
+        self.borrow_prices = []
+        self.max_total_assets = []
+        # {function: flat list of limits}
+        self.values = {}
+        # {family: (family key, {axis values: {function: limit}})}
+        self._cells = {}
+        self.recomputed = 0
+        self.update(
+            state,
+            collateral_prices,
+            borrow_prices,
+            (
+                max_total_assets
+                if max_total_assets is not None
+                else [state.max_total_assets_in_underlying]
+            ),
+        )
+
+    def _families(self):
+        families = []
+        for function in self.functions:
+            if FUNCTIONS[function][0] not in families:
+                families.append(FUNCTIONS[function][0])
+        return families
+
+    def _get_cell_keys(self, family):
+        if family == DEPOSIT_MINT:
+            return [
+                (collateral_price, borrow_price, max_total_assets)
+                for collateral_price in self.collateral_prices
+                for borrow_price in self.borrow_prices
+                for max_total_assets in self.max_total_assets
+            ]
+        # withdraw / redeem limits do not depend on the max total assets
+        return [
+            (collateral_price, borrow_price, None)
+            for collateral_price in self.collateral_prices
+            for borrow_price in self.borrow_prices
+        ]
+
+    def _compute(self, family, cells):
+        functions = [
+            function for function in self.functions if FUNCTIONS[function][0] == family
+        ]
+        compute = partial(_compute_cells, self.state, functions)
+        workers = max(1, min(self.workers, len(cells)))
+        if workers == 1:
+            return compute(cells)
+        size = max(1, len(cells) // (4 * workers))
+        chunks = [cells[i : i + size] for i in range(0, len(cells), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return [
+                limits for chunk in executor.map(compute, chunks) for limits in chunk
+            ]
+
+    def update(
+        self,
+        state=None,
+        collateral_prices=None,
+        borrow_prices=None,
+        max_total_assets=None,
+    ):
+        """
+        Replaces the state and / or axes, recomputes the cells whose inputs
+        changed and returns how many were recomputed
+        """
+        if state is not None:
+            self.state = state
+        if collateral_prices is not None:
+            self.collateral_prices = sorted(set(collateral_prices))
+        if borrow_prices is not None:
+            self.borrow_prices = sorted(set(borrow_prices))
+        if max_total_assets is not None:
+            self.max_total_assets = sorted(set(max_total_assets))
+        if not (
+            self.collateral_prices and self.borrow_prices and self.max_total_assets
+        ):
+            raise ValueError("every grid axis needs at least one value")
+
+        recomputed = 0
+        for family in self._families():
+            key = get_family_key(self.state, family)
+            previous_key, previous_cells = self._cells.get(family, (None, {}))
+            if previous_key != key:
+                previous_cells = {}
+            cell_keys = self._get_cell_keys(family)
+            missing = [cell for cell in cell_keys if cell not in previous_cells]
+            cells = {
+                cell: previous_cells[cell]
+                for cell in cell_keys
+                if cell in previous_cells
+            }
+            cells.update(zip(missing, self._compute(family, missing)))
+            self._cells[family] = (key, cells)
+            recomputed += len(missing)
+
+            for function in self.functions:
+                if FUNCTIONS[function][0] == family:
+                    self.values[function] = [
+                        cells[cell][function] for cell in cell_keys
+                    ]
+
+        self.recomputed += recomputed
+        return recomputed
+
+    def _get_value(self, function, i, j, k):
+        if FUNCTIONS[function][0] == DEPOSIT_MINT:
+            index = (i * len(self.borrow_prices) + j) * len(self.max_total_assets) + k
+        else:
+            index = i * len(self.borrow_prices) + j
+        return self.values[function][index]
+
+    def get(
+        self,
+        function,
+        collateral_price,
+        borrow_price,
+        max_total_assets=None,
+        mode=INTERPOLATE,
+    ):
+        """
+        Limit at the given point: multilinear interpolation of the
+        surrounding cells, or with mode=FLOOR their smallest value. None
+        outside of the grid or when a surrounding cell reverts
+        """
+        if function not in self.values:
+            raise ValueError(f"{function} is not part of the surface")
+        if max_total_assets is None:
+            max_total_assets = self.state.max_total_assets_in_underlying
+        brackets = [
+            _get_bracket(self.collateral_prices, collateral_price),
+            _get_bracket(self.borrow_prices, borrow_price),
+            (
+                _get_bracket(self.max_total_assets, max_total_assets)
+                if FUNCTIONS[function][0] == DEPOSIT_MINT
+                else (0, 0, 0.0)
+            ),
+        ]
+        if None in brackets:
+            return None
+
+        corners = []
+        for i, weight_i in (
+            (brackets[0][0], 1 - brackets[0][2]),
+            (brackets[0][1], brackets[0][2]),
+        ):
+            for j, weight_j in (
+                (brackets[1][0], 1 - brackets[1][2]),
+                (brackets[1][1], brackets[1][2]),
+            ):
+                for k, weight_k in (
+                    (brackets[2][0], 1 - brackets[2][2]),
+                    (brackets[2][1], brackets[2][2]),
+                ):
+                    weight = weight_i * weight_j * weight_k
+                    if weight == 0:
+                        continue
+                    value = self._get_value(function, i, j, k)
+                    if value is None:
+                        return None
+                    corners.append((value, weight))
+
+        if mode == FLOOR:
+            return min(value for value, _ in corners)
+        if len(corners) == 1:
+            return corners[0][0]
+        return int(sum(value * weight for value, weight in corners))
+
+    def to_dict(self):
+        return {
+            "state": self.state._asdict(),
+            "functions": self.functions,
+            "collateral_prices": self.collateral_prices,
+            "borrow_prices": self.borrow_prices,
+            "max_total_assets": self.max_total_assets,
+            "values": self.values,
+        }
+
+    @classmethod
+    def from_dict(cls, values, workers=1):
+        """Rebuilds a surface saved with to_dict without recomputing it"""
+        surface = cls.__new__(cls)
+        surface.functions = values["functions"]
+        surface.workers = workers
+        surface.state = VaultState(**values["state"])
+        surface.collateral_prices = values["collateral_prices"]
+        surface.borrow_prices = values["borrow_prices"]
+        surface.max_total_assets = values["max_total_assets"]
+        surface.values = values["values"]
+        surface.recomputed = 0
+        surface._cells = {}
+        for family in surface._families():
+            cell_keys = surface._get_cell_keys(family)
+            functions = [
+                function
+                for function in surface.functions
+                if FUNCTIONS[function][0] == family
+            ]
+            surface._cells[family] = (
+                get_family_key(surface.state, family),
+                {
+                    cell: {
+                        function: surface.values[function][index]
+                        for function in functions
+                    }
+                    for index, cell in enumerate(cell_keys)
+                },
+            )
+        return surface
+
+
+def vault_state_from_dict(values):
+    """VaultState of a JSON object, raises ValueError on missing fields"""
+    missing = [field for field in VaultState._fields if field not in values]
+    if missing:
+        raise ValueError(f"vault state misses {missing}")
+    return VaultState(**{field: int(values[field]) for field in VaultState._fields})
+
+
+def get_price_axis(price, count, spread):
+    """count prices spread evenly within price * (1 +- spread)"""
+    if count == 1:
+        return [price]
+    low = int(price * (1 - spread))
+    high = int(price * (1 + spread))
+    return [low + (high - low) * index // (count - 1) for index in range(count)]
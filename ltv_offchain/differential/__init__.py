@@ -0,0 +1,3 @@
+"""
+Differential fuzzing of the Python math model against the Solidity libraries
+"""
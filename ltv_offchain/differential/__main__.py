@@ -0,0 +1,155 @@
+"""
+Differential fuzzing CLI
+
+    python -m ltv_offchain.differential --count 5000000 --replay 1024 --forge
+
+Fuzzes --count rows split over the selected kinds in batches through the
+Python model, keeps a per outcome class sample, shrinks one representative of
+every class and writes --replay vectors for DifferentialMathTest, which
+replays them in one forge test run when --forge is given.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from ltv_offchain.differential.generators import InputGenerator
+from ltv_offchain.differential.models import KIND_NAMES, evaluate
+from ltv_offchain.differential.sampling import StratifiedSample, shrink
+from ltv_offchain.differential.vectors import write_vectors
+
+DEFAULT_VECTORS_PATH = "test/differential/vectors/vectors.bin"
+VECTORS_ENV = "LTV_DIFFERENTIAL_VECTORS"
+FORGE_TEST_CONTRACT = "DifferentialMathTest"
+
+
+def _parse_kinds(value):
+    by_name = {name: kind for kind, name in KIND_NAMES.items()}
+    kinds = []
+    for name in value.split(","):
+        if name not in by_name:
+            raise argparse.ArgumentTypeError(
+                f"unknown kind {name}, possible values: {', '.join(by_name)}"
+            )
+        kinds.append(by_name[name])
+    return kinds
+
+
+def fuzz(kinds, count, batch_size, sample, seed, workers=1, log=print):
+    """Runs count rows split over kinds through the Python model into sample"""
+    generator = InputGenerator(seed)
+    per_kind = -(-count // len(kinds))
+    for kind in kinds:
+        start = time.perf_counter()
+        for batch_start in range(0, per_kind, batch_size):
+            rows = generator.generate(kind, min(batch_size, per_kind - batch_start))
+            results = evaluate(kind, rows, workers)
+            for offset, (row, result) in enumerate(zip(rows, results)):
+                sample.add(kind, kind * per_kind + batch_start + offset, row, result)
+        duration = time.perf_counter() - start
+        log(
+            f"{KIND_NAMES[kind]}: {per_kind} rows in {duration:.1f}s ({per_kind / max(duration, 1e-9):.0f} rows/s)"
+        )
+
+
+def select_vectors(sample, replay, shrink_evaluations):
+    """Replay vectors with the first selected row of every class shrunk"""
+    vectors = []
+    shrunk_classes = set()
+    for outcome_class, index, row, result in sample.select(replay):
+        kind, outcome = outcome_class
+        if shrink_evaluations and outcome_class not in shrunk_classes:
+            shrunk_classes.add(outcome_class)
+            row, result = shrink(kind, row, outcome, shrink_evaluations)
+        vectors.append((kind, index, row, result))
+    return vectors
+
+
+def summary_table(sample):
+    lines = [f"{'KIND':<22} {'OUTCOME':<52} {'ROWS':>10}"]
+    for (kind, outcome), rows in sorted(sample.counts.items()):
+        lines.append(f"{KIND_NAMES[kind]:<22} {outcome:<52} {rows:>10}")
+    return "\n".join(lines)
+
+
+def run_forge(vectors_path):
+    env = dict(os.environ)
+    env[VECTORS_ENV] = os.path.abspath(vectors_path)
+    return subprocess.run(
+        ["forge", "test", "--match-contract", FORGE_TEST_CONTRACT, "-vv"], env=env
+    ).returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Differential fuzzing of the Python math model against Solidity"
+    )
+    parser.add_argument(
+        "--count", help="Rows fuzzed in total", type=int, default=1000000
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Rows generated and evaluated at once",
+        type=int,
+        default=50000,
+    )
+    parser.add_argument(
+        "--replay", help="Vectors written for the forge replay", type=int, default=512
+    )
+    parser.add_argument(
+        "--per-class", help="Rows sampled per outcome class", type=int, default=64
+    )
+    parser.add_argument(
+        "--shrink-evaluations",
+        help="Model evaluations spent shrinking each class representative, 0 disables shrinking",
+        type=int,
+        default=500,
+    )
+    parser.add_argument(
+        "--kinds",
+        help=f"Comma separated kinds to fuzz, default all of: {', '.join(KIND_NAMES.values())}",
+        type=_parse_kinds,
+        default=list(KIND_NAMES),
+    )
+    parser.add_argument("--seed", help="Random seed", type=int, default=0)
+    parser.add_argument(
+        "--workers",
+        help="Processes for deposit/withdraw and mint/redeem batches",
+        type=int,
+        default=1,
+    )
+    parser.add_argument("--out", help="Vector file", default=DEFAULT_VECTORS_PATH)
+    parser.add_argument(
+        "--forge", help="Replay the vectors with forge test", action="store_true"
+    )
+    parser.add_argument(
+        "--quiet",
+        help="Only print errors",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    if args.count <= 0 or args.batch_size <= 0 or args.replay <= 0:
+        print("ERROR --count, --batch-size and --replay must be positive")
+        sys.exit(1)
+    log = (lambda message: None) if args.quiet else print
+
+    sample = StratifiedSample(args.per_class, args.seed)
+    fuzz(args.kinds, args.count, args.batch_size, sample, args.seed, args.workers, log)
+    vectors = select_vectors(sample, args.replay, args.shrink_evaluations)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    write_vectors(args.out, vectors)
+    log(summary_table(sample))
+    log(
+        f"{len(vectors)} vectors of {len(sample.counts)} outcome classes written to {args.out}"
+    )
+
+    if args.forge:
+        sys.exit(run_forge(args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Boundary biased random inputs for every fuzzed kind
+
+Most rows are shaped like real vault states (positions of both signs in
+target ltv ratio, rewards on the side the auction accrues them, deltas within
+the auction size) so that every case of the math is reached. Each value is
+also replaced by a small, zero or int256 edge value now and then to hit the
+rounding corners and overflow reverts of the Solidity code.
+"""
+
+import random
+
+from ltv_offchain.differential.models import (
+    AUCTION_BORROW,
+    AUCTION_COLLATERAL,
+    DEPOSIT_WITHDRAW,
+    LOW_LEVEL_BORROW,
+    LOW_LEVEL_COLLATERAL,
+    LOW_LEVEL_SHARES,
+    MINT_REDEEM,
+)
+from ltv_offchain.math.solidity import INT256_MAX, INT256_MIN
+
+SMALL_VALUES = (0, 0, 1, -1, 2, -2, 3, -3)
+
+EDGE_VALUES = (
+    INT256_MIN,
+    INT256_MIN + 1,
+    INT256_MAX,
+    INT256_MAX - 1,
+    2**128,
+    -(2**128),
+    2**127 - 1,
+    -(2**127),
+)
+
+SMALL_PROBABILITY = 0.05
+EDGE_PROBABILITY = 0.003
+
+UINT24_MAX = 2**24 - 1
+
+
+class InputGenerator:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def scale(self):
+        """Number of decimal digits of the amounts of one row"""
+        return self.rng.choice((3, 6, 18, 24, 30, 38))
+
+    def amount(self, scale):
+        return self.rng.randrange(10 ** self.rng.randint(1, scale))
+
+    def perturb(self, value):
+        roll = self.rng.random()
+        if roll < EDGE_PROBABILITY:
+            return self.rng.choice(EDGE_VALUES)
+        if roll < SMALL_PROBABILITY:
+            return self.rng.choice(SMALL_VALUES)
+        return value
+
+    def perturb_uint(self, value, bits):
+        """Perturbs a uint<bits> argument, staying inside its type"""
+        roll = self.rng.random()
+        if roll < EDGE_PROBABILITY:
+            return self.rng.choice((2 ** (bits - 1), 2**bits - 1))
+        if roll < SMALL_PROBABILITY:
+            return self.rng.choice((0, 1, 2))
+        return value
+
+    def target_ltv(self):
+        divider = self.rng.choice((4, 10, 100, 10000, 65535, self.rng.randint(1, 100)))
+        roll = self.rng.random()
+        if roll < 0.1:
+            dividend = 0
+        elif roll < 0.2:
+            dividend = divider
+        elif roll < 0.6:
+            dividend = divider * 3 // 4
+        else:
+            dividend = self.rng.randint(0, divider)
+        if self.rng.random() < SMALL_PROBABILITY:
+            # dividend above divider reverts on the uint16 subtraction
+            dividend, divider = divider, dividend
+        return dividend, divider
+
+    def slippage(self):
+        return self.rng.choice((0, 10**16, self.rng.randrange(10**18)))
+
+    def positions(self, scale, dividend, divider):
+        """(collateral, borrow, future borrow, future collateral) in ltv ratio"""
+        collateral = self.amount(scale)
+        borrow = collateral * dividend // max(divider, 1)
+        if self.rng.random() < 0.5:
+            borrow = self.amount(scale)
+        future_collateral = self.rng.choice((1, -1)) * self.amount(scale - 1)
+        if self.rng.random() < 0.7:
+            future_borrow = future_collateral * dividend // max(divider, 1)
+        else:
+            future_borrow = self.rng.choice((1, -1)) * self.amount(scale - 1)
+        return collateral, borrow, future_borrow, future_collateral
+
+    def rewards(self, scale, future_collateral):
+        """(user borrow, user collateral, protocol borrow, protocol collateral) future rewards"""
+        reward_scale = max(scale - 3, 1)
+        if future_collateral > 0:
+            user_collateral = -self.amount(reward_scale)
+            protocol_collateral = -self.amount(reward_scale)
+            return 0, user_collateral, 0, protocol_collateral
+        if future_collateral < 0:
+            return self.amount(reward_scale), 0, self.amount(reward_scale), 0
+        return 0, 0, 0, 0
+
+    def common_vault_fields(self):
+        scale = self.scale()
+        dividend, divider = self.target_ltv()
+        collateral, borrow, future_borrow, future_collateral = self.positions(
+            scale, dividend, divider
+        )
+        rewards = self.rewards(scale, future_collateral)
+        values = [
+            self.perturb(value)
+            for value in (collateral, borrow, future_borrow, future_collateral)
+            + rewards
+        ]
+        # real collateral and borrow are uint256 converted to int256 in the vault
+        values[0] = min(abs(values[0]), INT256_MAX)
+        values[1] = min(abs(values[1]), INT256_MAX)
+        return scale, values + [
+            self.perturb_uint(self.slippage(), 256),
+            self.perturb_uint(self.slippage(), 256),
+            dividend,
+            divider,
+        ]
+
+    def delta(self, scale):
+        return self.perturb(self.rng.choice((1, -1)) * self.amount(scale))
+
+    def deposit_withdraw(self):
+        scale, fields = self.common_vault_fields()
+        delta_real_collateral = self.delta(scale)
+        delta_real_borrow = self.delta(scale) if self.rng.random() < 0.3 else 0
+        return tuple(fields + [delta_real_collateral, delta_real_borrow])
+
+    def mint_redeem(self):
+        scale, fields = self.common_vault_fields()
+        return tuple(fields + [self.delta(scale), self.rng.randint(0, 1)])
+
+    def auction_data(self):
+        scale = self.scale()
+        future_collateral = self.rng.choice((1, -1)) * self.amount(scale)
+        future_borrow = future_collateral * self.rng.randint(50, 95) // 100
+        if self.rng.random() < 0.1:
+            future_borrow = self.rng.choice((1, -1)) * self.amount(scale)
+        _, reward_collateral, _, _ = self.rewards(scale, future_collateral)
+        reward_borrow = 0
+        if future_collateral < 0:
+            reward_borrow = self.amount(max(scale - 3, 1))
+        duration = self.rng.choice((1000, 1, self.rng.randint(1, UINT24_MAX)))
+        step = self.rng.choice((0, duration, self.rng.randint(0, duration)))
+        return scale, [
+            self.perturb(future_borrow),
+            self.perturb(future_collateral),
+            self.perturb(reward_borrow),
+            self.perturb(reward_collateral),
+            self.perturb_uint(step, 24),
+            self.perturb_uint(duration, 24),
+        ]
+
+    def auction_delta(self, future):
+        """Delta of the opposite sign of future, mostly within the auction size"""
+        roll = self.rng.random()
+        if roll < 0.1:
+            delta = -future
+        elif roll < 0.2:
+            delta = -future * self.rng.randint(101, 200) // 100
+        else:
+            delta = -future * self.rng.randint(1, 10**6) // 10**6
+        return self.perturb(delta)
+
+    def auction_collateral(self):
+        _, data = self.auction_data()
+        return tuple([self.auction_delta(data[1])] + data)
+
+    def auction_borrow(self):
+        _, data = self.auction_data()
+        return tuple([self.auction_delta(data[0])] + data)
+
+    def low_level_data(self):
+        scale = self.scale()
+        dividend, divider = self.target_ltv()
+        collateral, borrow, future_borrow, future_collateral = self.positions(
+            scale, dividend, divider
+        )
+        (
+            user_reward_borrow,
+            user_reward_collateral,
+            protocol_reward_borrow,
+            protocol_reward_collateral,
+        ) = self.rewards(scale, future_collateral)
+        collateral_decimals = self.rng.choice((6, 8, 18, self.rng.randint(0, 36)))
+        borrow_decimals = self.rng.choice((6, 8, 18, self.rng.randint(0, 36)))
+        total_assets = self.amount(scale) + 1
+        supply = total_assets * self.rng.randint(1, 10**6) // 10**3 + 1
+        return scale, [
+            self.perturb(future_collateral),
+            self.perturb(future_borrow),
+            self.perturb(collateral),
+            self.perturb(borrow),
+            self.perturb(user_reward_collateral),
+            self.perturb(user_reward_borrow),
+            self.perturb(protocol_reward_collateral),
+            self.perturb(protocol_reward_borrow),
+            self.perturb_uint(self.rng.randint(1, 10**22), 256),
+            collateral_decimals,
+            self.perturb_uint(self.rng.randint(1, 10**22), 256),
+            borrow_decimals,
+            self.perturb_uint(supply, 256),
+            self.perturb_uint(total_assets, 256),
+            dividend,
+            divider,
+            self.perturb_uint(total_assets, 256),
+        ]
+
+    def low_level(self):
+        scale, data = self.low_level_data()
+        return tuple([self.delta(scale)] + data)
+
+    def generate(self, kind, count):
+        generate_row = {
+            DEPOSIT_WITHDRAW: self.deposit_withdraw,
+            MINT_REDEEM: self.mint_redeem,
+            AUCTION_COLLATERAL: self.auction_collateral,
+            AUCTION_BORROW: self.auction_borrow,
+            LOW_LEVEL_SHARES: self.low_level,
+            LOW_LEVEL_BORROW: self.low_level,
+            LOW_LEVEL_COLLATERAL: self.low_level,
+        }[kind]
+        return [generate_row() for _ in range(count)]
@@ -0,0 +1,171 @@
+"""
+Evaluation of every fuzzed kind through the Python math model
+
+Rows are tuples of int256 words in Solidity argument order: the struct fields
+of DepositWithdrawData and MintRedeemData, or the delta followed by the
+AuctionData/LowLevelRebalanceData fields. Results are the output tuple in
+return order, or a revert label when the Solidity counterpart reverts.
+"""
+
+from ltv_offchain.math import auction_math, low_level_rebalance_math
+from ltv_offchain.math.batch import (
+    DELTA_FUTURE_FIELDS,
+    calculate_deposit_withdraw_batch,
+    calculate_mint_redeem_batch,
+)
+from ltv_offchain.math.solidity import MathRevert
+from ltv_offchain.math.structs import (
+    AuctionData,
+    DeltaAuctionState,
+    DepositWithdrawData,
+    LowLevelRebalanceData,
+    MintRedeemData,
+)
+
+DEPOSIT_WITHDRAW = 0
+MINT_REDEEM = 1
+AUCTION_COLLATERAL = 2
+AUCTION_BORROW = 3
+LOW_LEVEL_SHARES = 4
+LOW_LEVEL_BORROW = 5
+LOW_LEVEL_COLLATERAL = 6
+
+KIND_NAMES = {
+    DEPOSIT_WITHDRAW: "deposit_withdraw",
+    MINT_REDEEM: "mint_redeem",
+    AUCTION_COLLATERAL: "auction_collateral",
+    AUCTION_BORROW: "auction_borrow",
+    LOW_LEVEL_SHARES: "low_level_shares",
+    LOW_LEVEL_BORROW: "low_level_borrow",
+    LOW_LEVEL_COLLATERAL: "low_level_collateral",
+}
+
+_VAULT_OUTPUT_FIELDS = ["value"] + DELTA_FUTURE_FIELDS + ["ncase"]
+
+INPUT_FIELDS = {
+    DEPOSIT_WITHDRAW: list(DepositWithdrawData._fields),
+    MINT_REDEEM: list(MintRedeemData._fields),
+    AUCTION_COLLATERAL: ["delta_user_collateral_assets"] + list(AuctionData._fields),
+    AUCTION_BORROW: ["delta_user_borrow_assets"] + list(AuctionData._fields),
+    LOW_LEVEL_SHARES: ["delta_shares"] + list(LowLevelRebalanceData._fields),
+    LOW_LEVEL_BORROW: ["delta_borrow_assets"] + list(LowLevelRebalanceData._fields),
+    LOW_LEVEL_COLLATERAL: ["delta_collateral_assets"]
+    + list(LowLevelRebalanceData._fields),
+}
+
+OUTPUT_FIELDS = {
+    DEPOSIT_WITHDRAW: _VAULT_OUTPUT_FIELDS,
+    MINT_REDEEM: _VAULT_OUTPUT_FIELDS,
+    AUCTION_COLLATERAL: list(DeltaAuctionState._fields),
+    AUCTION_BORROW: list(DeltaAuctionState._fields),
+    LOW_LEVEL_SHARES: [
+        "delta_real_collateral_assets",
+        "delta_real_borrow_assets",
+        "delta_protocol_future_reward_shares",
+    ],
+    LOW_LEVEL_BORROW: [
+        "delta_real_collateral_assets",
+        "delta_shares",
+        "delta_protocol_future_reward_shares",
+    ],
+    LOW_LEVEL_COLLATERAL: [
+        "delta_real_borrow_assets",
+        "delta_shares",
+        "delta_protocol_future_reward_shares",
+    ],
+}
+
+REVERT = "revert"
+
+_SINGLE_CALCULATIONS = {
+    AUCTION_COLLATERAL: (
+        AuctionData,
+        auction_math.calculate_execute_auction_collateral,
+    ),
+    AUCTION_BORROW: (AuctionData, auction_math.calculate_execute_auction_borrow),
+    LOW_LEVEL_SHARES: (
+        LowLevelRebalanceData,
+        low_level_rebalance_math.calculate_low_level_rebalance_shares,
+    ),
+    LOW_LEVEL_BORROW: (
+        LowLevelRebalanceData,
+        low_level_rebalance_math.calculate_low_level_rebalance_borrow,
+    ),
+    LOW_LEVEL_COLLATERAL: (
+        LowLevelRebalanceData,
+        low_level_rebalance_math.calculate_low_level_rebalance_collateral,
+    ),
+}
+
+
+def is_revert(result):
+    return isinstance(result, str)
+
+
+def _evaluate_vault_rows(calculate_batch, struct, rows, workers):
+    columns = dict(zip(struct._fields, zip(*rows)))
+    outputs = calculate_batch(columns, workers=workers)
+    results = []
+    for values in zip(
+        *(outputs[field] for field in ["shares_as_assets"] + _VAULT_OUTPUT_FIELDS[1:]),
+        outputs["reverted"],
+    ):
+        results.append(REVERT if values[-1] else values[:-1])
+    return results
+
+
+def _evaluate_single_rows(struct, calculate, rows):
+    results = []
+    for row in rows:
+        try:
+            results.append(tuple(calculate(row[0], struct._make(row[1:]))))
+        except MathRevert as e:
+            results.append(f"{REVERT} {type(e).__name__}")
+    return results
+
+
+def evaluate(kind, rows, workers=1):
+    """Python model results of rows, in order"""
+    if not rows:
+        return []
+    if kind == DEPOSIT_WITHDRAW:
+        return _evaluate_vault_rows(
+            calculate_deposit_withdraw_batch, DepositWithdrawData, rows, workers
+        )
+    if kind == MINT_REDEEM:
+        return _evaluate_vault_rows(
+            calculate_mint_redeem_batch, MintRedeemData, rows, workers
+        )
+    struct, calculate = _SINGLE_CALCULATIONS[kind]
+    return _evaluate_single_rows(struct, calculate, rows)
+
+
+def _sign(value):
+    return "+" if value > 0 else "-" if value < 0 else "0"
+
+
+def get_outcome(kind, row, result):
+    """
+    Coarse behaviour class of a result, rows are sampled and shrunk per class
+    so that every code path found by the fuzzer gets replayed
+    """
+    if is_revert(result):
+        return result
+    if kind in (DEPOSIT_WITHDRAW, MINT_REDEEM):
+        outcome = f"case {result[-1]} value {_sign(result[0])}"
+        if kind == MINT_REDEEM:
+            outcome += " borrow" if row[-1] else " collateral"
+        return outcome
+    if kind in (AUCTION_COLLATERAL, AUCTION_BORROW):
+        state = DeltaAuctionState._make(result)
+        future = row[2] if kind == AUCTION_COLLATERAL else row[1]
+        delta_future = (
+            state.delta_future_collateral_assets
+            if kind == AUCTION_COLLATERAL
+            else state.delta_future_borrow_assets
+        )
+        outcome = f"delta {_sign(row[0])}"
+        if delta_future == -future:
+            outcome += " closes auction"
+        return outcome
+    return "outputs " + "".join(map(_sign, result))
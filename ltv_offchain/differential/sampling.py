@@ -0,0 +1,93 @@
+"""
+Selection of the rows replayed through Solidity
+
+Only a small subset of the fuzzed rows is worth an EVM execution: rows are
+grouped by outcome class, a bounded reservoir is kept per class, and the
+replay set takes rows round robin over classes with the rarest first. The
+representative of each class is shrunk to the simplest row with the same
+outcome before replay, which keeps mismatches readable.
+"""
+
+import random
+
+from ltv_offchain.differential.models import evaluate, get_outcome
+
+
+class StratifiedSample:
+    def __init__(self, capacity_per_class, seed=None):
+        self.capacity_per_class = capacity_per_class
+        self.rng = random.Random(seed)
+        self.reservoirs = {}
+        self.counts = {}
+
+    def add(self, kind, index, row, result):
+        """Reservoir sampling of (index, row, result) per (kind, outcome) class"""
+        outcome_class = (kind, get_outcome(kind, row, result))
+        seen = self.counts.get(outcome_class, 0)
+        self.counts[outcome_class] = seen + 1
+        reservoir = self.reservoirs.setdefault(outcome_class, [])
+        if seen < self.capacity_per_class:
+            reservoir.append((index, row, result))
+            return
+        slot = self.rng.randrange(seen + 1)
+        if slot < self.capacity_per_class:
+            reservoir[slot] = (index, row, result)
+
+    def select(self, total):
+        """Up to total [(outcome class, index, row, result)], every class first"""
+        classes = sorted(
+            self.reservoirs, key=lambda outcome_class: self.counts[outcome_class]
+        )
+        selected = []
+        depth = 0
+        while len(selected) < total:
+            added = False
+            for outcome_class in classes:
+                reservoir = self.reservoirs[outcome_class]
+                if depth < len(reservoir) and len(selected) < total:
+                    selected.append((outcome_class,) + reservoir[depth])
+                    added = True
+            if not added:
+                break
+            depth += 1
+        return selected
+
+
+def _shrink_candidates(value):
+    """Simpler values of the same sign, most aggressive first"""
+    sign = -1 if value < 0 else 1
+    magnitude = abs(value)
+    if magnitude == 0:
+        return []
+    candidates = [0, sign]
+    digits = len(str(magnitude))
+    if digits > 1:
+        leading = magnitude // 10 ** (digits - 1) * 10 ** (digits - 1)
+        candidates += [sign * 10 ** (digits - 1), sign * leading]
+    candidates += [sign * (magnitude // 10), sign * (magnitude // 2), value - sign]
+    return list(dict.fromkeys(c for c in candidates if abs(c) < magnitude))
+
+
+def shrink(kind, row, outcome, max_evaluations=500):
+    """
+    Greedy shrinking of every field towards zero while the outcome class of
+    the row stays the same. Returns the shrunk row and its result.
+    """
+    best = list(row)
+    best_result = evaluate(kind, [row])[0]
+    evaluations = 0
+    improved = True
+    while improved and evaluations < max_evaluations:
+        improved = False
+        for i, value in enumerate(best):
+            for candidate in _shrink_candidates(value):
+                if evaluations >= max_evaluations:
+                    break
+                trial = best[:i] + [candidate] + best[i + 1 :]
+                result = evaluate(kind, [tuple(trial)])[0]
+                evaluations += 1
+                if get_outcome(kind, trial, result) == outcome:
+                    best, best_result = trial, result
+                    improved = True
+                    break
+    return tuple(best), best_result
@@ -0,0 +1,42 @@
+"""
+Binary vector file replayed by test/differential/DifferentialMathTest.t.sol
+
+Everything is 32-byte big-endian words so that Solidity can mload them:
+
+    file header:   bytes8 "LTVDIFF1" | 16 zero bytes | uint64 vector count
+    vector header: uint8 kind | uint8 expect revert | uint8 input count |
+                   uint8 output count | 20 zero bytes | uint64 vector id
+    inputs:        input count int256 words in Solidity argument order
+    outputs:       output count int256 words in return order, none on revert
+
+uint arguments are stored as their uint256 word. The vector id is the index
+of the row in the fuzzed stream, which together with the seed reproduces it.
+"""
+
+from ltv_offchain.differential.models import is_revert
+from ltv_offchain.math.solidity import UINT256_MAX
+
+MAGIC = b"LTVDIFF1"
+WORD_SIZE = 32
+
+
+def _word(value):
+    return (value & UINT256_MAX).to_bytes(WORD_SIZE, "big")
+
+
+def encode_vector(kind, vector_id, row, result):
+    outputs = () if is_revert(result) else result
+    header = (
+        bytes([kind, int(is_revert(result)), len(row), len(outputs)])
+        + bytes(20)
+        + vector_id.to_bytes(8, "big")
+    )
+    return header + b"".join(map(_word, row)) + b"".join(map(_word, outputs))
+
+
+def write_vectors(path, vectors):
+    """vectors is [(kind, vector id, row, result)]"""
+    with open(path, "wb") as f:
+        f.write(MAGIC + bytes(16) + len(vectors).to_bytes(8, "big"))
+        for kind, vector_id, row, result in vectors:
+            f.write(encode_vector(kind, vector_id, row, result))
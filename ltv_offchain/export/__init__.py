@@ -0,0 +1 @@
+"""Streaming per block share price, TVL and LTV series of vaults"""
@@ -0,0 +1,96 @@
+"""
+Vault series export CLI
+
+    python -m ltv_offchain.export export --rpc-url localhost:8545 --vaults 0x...,0x... \
+        --from-block 19000000 --to-block 19100000 --out-dir series
+
+export writes the share price, TVL and LTV of the vaults at every --step-th
+block of the range to part files of --out-dir, resuming after the last
+written part when run again.
+"""
+
+import argparse
+import sys
+
+from deploy_utils.rpc import JsonRpcClient, RpcError
+
+from ltv_offchain.export.exporter import FORMATS, export_series
+from ltv_offchain.snapshot.multicall import DEFAULT_BATCH_SIZE, MULTICALL3_ADDRESS
+
+
+def export(args):
+    client = JsonRpcClient(args.rpc_url)
+    try:
+        to_block = args.to_block
+        if to_block is None:
+            to_block = int(client.call("eth_blockNumber"), 16)
+        rows = export_series(
+            client,
+            [vault.strip() for vault in args.vaults.split(",") if vault.strip()],
+            args.from_block,
+            to_block,
+            args.out_dir,
+            file_format=args.format,
+            step=args.step,
+            chunk_blocks=args.chunk_blocks,
+            workers=args.workers,
+            multicall=args.multicall,
+            batch_size=args.batch_size,
+        )
+    except (RpcError, ValueError, RuntimeError) as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    finally:
+        client.close()
+    print(f"Exported {rows} rows to {args.out_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV vault series export")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export share price, TVL and LTV per block"
+    )
+    export_parser.add_argument("--rpc-url", help="JSON-RPC url", required=True)
+    export_parser.add_argument(
+        "--vaults", help="Comma separated vault addresses", required=True
+    )
+    export_parser.add_argument(
+        "--from-block", help="First block", type=int, required=True
+    )
+    export_parser.add_argument(
+        "--to-block", help="Last block, latest by default", type=int
+    )
+    export_parser.add_argument("--out-dir", help="Part files directory", required=True)
+    export_parser.add_argument(
+        "--format",
+        help="Part file format, parquet when pyarrow is installed, csv otherwise",
+        choices=FORMATS,
+    )
+    export_parser.add_argument(
+        "--step", help="Export every step-th block", type=int, default=1
+    )
+    export_parser.add_argument(
+        "--chunk-blocks", help="Blocks per part file", type=int, default=1000
+    )
+    export_parser.add_argument(
+        "--workers", help="Blocks read concurrently", type=int, default=4
+    )
+    export_parser.add_argument(
+        "--multicall", help="Multicall3 address", default=MULTICALL3_ADDRESS
+    )
+    export_parser.add_argument(
+        "--batch-size",
+        help="Reads per aggregate3 call",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+    )
+    export_parser.set_defaults(handler=export)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Per block vault series export
+
+The export is a generator pipeline: block numbers are mapped to
+VaultSnapshotter snapshots, one JSON-RPC batch per block, on at most workers
+blocks in flight and kept in block order; snapshots become rows, rows of
+chunk_blocks blocks become one part file of out_dir. Memory is bounded by one
+chunk whatever the block range.
+
+Part files are named part-<first block>-<last block>.<format> and are
+renamed into place once complete, so a resumed export starts after the last
+block of the last part. A resumed export has to use the same vaults.
+
+share_price is convertToAssets(1e18), ltv the LTV of the lending position,
+real borrow value over real collateral value at the oracle prices.
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ltv_offchain.fees.series import SeriesWriter
+from ltv_offchain.snapshot.multicall import MULTICALL3_ADDRESS
+from ltv_offchain.snapshot.snapshotter import VaultSnapshotter
+
+COLUMNS = [
+    "block_number",
+    "timestamp",
+    "vault",
+    "share_price",
+    "total_assets",
+    "total_supply",
+    "ltv",
+]
+
+SHARE_PRICE_SHARES = 10**18
+
+EXTRA_READS = [
+    ("share_price", "convertToAssets(uint256)", [SHARE_PRICE_SHARES], ["uint256"]),
+]
+
+FORMATS = ("parquet", "arrow", "csv")
+
+PART_PATTERN = re.compile(r"^part-(\d+)-(\d+)\.(parquet|arrow|csv)$")
+
+
+def get_default_format():
+    """parquet when pyarrow is installed, csv otherwise"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "csv"
+    return "parquet"
+
+
+def get_part_path(out_dir, first_block, last_block, file_format):
+    return os.path.join(
+        out_dir, f"part-{first_block:012d}-{last_block:012d}.{file_format}"
+    )
+
+
+def get_last_block(out_dir):
+    """Last block of the parts of out_dir, None without parts"""
+    if not os.path.isdir(out_dir):
+        return None
+    last_blocks = [
+        int(match.group(2))
+        for match in map(PART_PATTERN.match, os.listdir(out_dir))
+        if match
+    ]
+    return max(last_blocks, default=None)
+
+
+def get_resume_block(out_dir, from_block, step=1):
+    """First block of from_block + k * step after the parts of out_dir"""
+    last_block = get_last_block(out_dir)
+    if last_block is None or last_block < from_block:
+        return from_block
+    return from_block + ((last_block - from_block) // step + 1) * step
+
+
+def get_ltv(snapshot):
+    if None in (
+        snapshot.withdraw_real_borrow_assets,
+        snapshot.withdraw_real_collateral_assets,
+        snapshot.borrow_price,
+        snapshot.collateral_price,
+    ):
+        return None
+    collateral = (
+        snapshot.withdraw_real_collateral_assets
+        * snapshot.collateral_price
+        / 10**snapshot.collateral_token_decimals
+    )
+    borrow = (
+        snapshot.withdraw_real_borrow_assets
+        * snapshot.borrow_price
+        / 10**snapshot.borrow_token_decimals
+    )
+    return borrow / collateral if collateral > 0 else None
+
+
+def iter_ordered(function, items, workers):
+    """function of every item on workers threads, in item order"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class BlockReader:
+    """Snapshots of the vaults per block, one VaultSnapshotter per thread"""
+
+    def __init__(self, client, vaults, multicall=MULTICALL3_ADDRESS, batch_size=None):
+        self.client = client
+        self.vaults = vaults
+        self.multicall = multicall
+        self.batch_size = batch_size
+        self._local = threading.local()
+
+    def __call__(self, block_number):
+        snapshotter = getattr(self._local, "snapshotter", None)
+        if snapshotter is None:
+            snapshotter = VaultSnapshotter(
+                self.client,
+                self.vaults,
+                multicall=self.multicall,
+                batch_size=self.batch_size,
+                extra_reads=EXTRA_READS,
+            )
+            self._local.snapshotter = snapshotter
+        return block_number, snapshotter.snapshot(block_number)
+
+
+def iter_rows(block_snapshots):
+    """Rows without timestamp, which is filled per chunk"""
+    for block_number, snapshots in block_snapshots:
+        for snapshot in snapshots:
+            yield [
+                block_number,
+                None,
+                snapshot.vault,
+                snapshot.extra.get("share_price"),
+                snapshot.total_assets,
+                snapshot.total_supply,
+                get_ltv(snapshot),
+            ]
+
+
+def iter_chunks(rows, chunk_blocks):
+    """Lists of the rows of at most chunk_blocks consecutive exported blocks"""
+    chunk = []
+    blocks = 0
+    for row in rows:
+        if not chunk or row[0] != chunk[-1][0]:
+            if blocks == chunk_blocks:
+                yield chunk
+                chunk = []
+                blocks = 0
+            blocks += 1
+        chunk.append(row)
+    if chunk:
+        yield chunk
+
+
+def fill_timestamps(client, chunk):
+    """Sets the timestamp of the rows of a chunk with one JSON-RPC batch"""
+    block_numbers = list(dict.fromkeys(row[0] for row in chunk))
+    blocks = client.batch(
+        [("eth_getBlockByNumber", [hex(number), False]) for number in block_numbers]
+    )
+    timestamps = {
+        number: int(block["timestamp"], 16)
+        for number, block in zip(block_numbers, blocks)
+    }
+    for row in chunk:
+        row[1] = timestamps[row[0]]
+
+
+def write_part(out_dir, chunk, file_format):
+    """Writes the part of a chunk atomically, returns its path"""
+    path = get_part_path(out_dir, chunk[0][0], chunk[-1][0], file_format)
+    temporary_path = os.path.join(out_dir, f"_writing.{file_format}")
+    with SeriesWriter(temporary_path, COLUMNS) as writer:
+        writer.write(chunk)
+    os.replace(temporary_path, path)
+    return path
+
+
+def export_series(
+    client,
+    vaults,
+    from_block,
+    to_block,
+    out_dir,
+    file_format=None,
+    step=1,
+    chunk_blocks=1000,
+    workers=4,
+    multicall=MULTICALL3_ADDRESS,
+    batch_size=None,
+    log=print,
+):
+    """
+    Exports every step-th block of [from_block, to_block] after the parts
+    already in out_dir, returns the number of written rows
+    """
+    file_format = file_format or get_default_format()
+    os.makedirs(out_dir, exist_ok=True)
+    start = get_resume_block(out_dir, from_block, step)
+    if start > to_block:
+        log(f"Nothing to export, {out_dir} is complete up to block {to_block}")
+        return 0
+    if start != from_block:
+        log(f"Resuming at block {start}")
+
+    reader = BlockReader(client, vaults, multicall, batch_size)
+    block_snapshots = iter_ordered(reader, range(start, to_block + 1, step), workers)
+    rows = 0
+    for chunk in iter_chunks(iter_rows(block_snapshots), chunk_blocks):
+        fill_timestamps(client, chunk)
+        path = write_part(out_dir, chunk, file_format)
+        rows += len(chunk)
+        log(f"Blocks {chunk[0][0]}-{chunk[-1][0]} written to {path}")
+    return rows
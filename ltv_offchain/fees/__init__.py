@@ -0,0 +1 @@
+"""Max growth fee and protocol rewards projections over price history"""
@@ -0,0 +1,167 @@
+"""
+Fee projection CLI
+
+    python -m ltv_offchain.fees project --series prices.csv \
+        --args-file deploy/sepolia/aave/permissionless.json \
+        --supply 1000000000000000000000 --real-collateral 4000000000000000000 \
+        --real-borrow 3000000000000000000 --out fees.csv
+
+The series is a CSV or Parquet file with the row columns described in
+ltv_offchain/fees/projector.py, the output gets the --key-columns of the
+series followed by the projected fee state.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from ltv_offchain.fees.projector import (
+    OUTPUT_COLUMNS,
+    FeeProjector,
+    ProjectionError,
+    project,
+)
+from ltv_offchain.fees.series import SeriesWriter, read_chunks
+
+
+def _parse_max_growth_fee(args):
+    if args.max_growth_fee:
+        try:
+            dividend, divider = (int(x) for x in args.max_growth_fee.split("/"))
+        except ValueError:
+            print("ERROR expected --max-growth-fee as dividend/divider")
+            sys.exit(1)
+        return dividend, divider
+    if args.args_file:
+        with open(args.args_file, "r") as f:
+            vault_args = json.load(f)
+        if "MAX_GROWTH_FEE_DIVIDEND" not in vault_args:
+            print(f"ERROR {args.args_file} has no MAX_GROWTH_FEE_DIVIDEND")
+            sys.exit(1)
+        return (
+            vault_args["MAX_GROWTH_FEE_DIVIDEND"],
+            vault_args["MAX_GROWTH_FEE_DIVIDER"],
+        )
+    print("ERROR either --max-growth-fee or --args-file is required")
+    sys.exit(1)
+
+
+def project_fees(args):
+    dividend, divider = _parse_max_growth_fee(args)
+    projector = FeeProjector(
+        dividend,
+        divider,
+        base_supply=args.supply,
+        last_seen_token_price=args.last_seen_price,
+        fee_collector_shares=args.fee_collector_shares,
+        real_collateral_assets=args.real_collateral,
+        real_borrow_assets=args.real_borrow,
+        collateral_token_decimals=args.collateral_decimals,
+        borrow_token_decimals=args.borrow_decimals,
+    )
+    key_columns = [column for column in args.key_columns.split(",") if column]
+
+    start = time.monotonic()
+    writer = None
+    if args.out:
+        writer = SeriesWriter(args.out, key_columns + OUTPUT_COLUMNS)
+    try:
+        summary = project(
+            projector,
+            read_chunks(args.series, args.chunk_rows),
+            writer,
+            key_columns,
+            args.every,
+        )
+    except (ProjectionError, RuntimeError, KeyError) as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    print(f"Rows                    {summary.rows}")
+    print(f"Growth fee shares       {summary.growth_fee_shares}")
+    print(f"Protocol reward shares  {summary.protocol_reward_shares}")
+    print(f"Fee collector shares    {summary.fee_collector_shares}")
+    print(f"Total supply            {summary.total_supply}")
+    print(f"Last seen token price   {summary.last_seen_token_price}")
+    print(
+        f"Share price first/last  {summary.first_share_price} / {summary.last_share_price}"
+    )
+    print(f"Max share price         {summary.max_share_price}")
+    print(f"Projected in {time.monotonic() - start:.2f}s")
+    if args.out:
+        print(f"Fee projection written to {args.out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV fee projections")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    project_parser = subparsers.add_parser(
+        "project", help="Project max growth fee and protocol rewards over a series"
+    )
+    project_parser.add_argument(
+        "--series", help="CSV or Parquet price time series", required=True
+    )
+    project_parser.add_argument(
+        "--args-file", help="Deploy args file to take MAX_GROWTH_FEE from"
+    )
+    project_parser.add_argument(
+        "--max-growth-fee", help="Max growth fee as dividend/divider, e.g. 1/5"
+    )
+    project_parser.add_argument(
+        "--supply", help="Initial total supply", type=int, required=True
+    )
+    project_parser.add_argument(
+        "--last-seen-price",
+        help="Initial last seen token price",
+        type=int,
+        default=10**18,
+    )
+    project_parser.add_argument(
+        "--fee-collector-shares",
+        help="Initial fee collector balance",
+        type=int,
+        default=0,
+    )
+    project_parser.add_argument(
+        "--real-collateral",
+        help="Real collateral assets of rows without real_collateral_assets",
+        type=int,
+        default=0,
+    )
+    project_parser.add_argument(
+        "--real-borrow",
+        help="Real borrow assets of rows without real_borrow_assets",
+        type=int,
+        default=0,
+    )
+    project_parser.add_argument(
+        "--collateral-decimals", help="Collateral token decimals", type=int, default=18
+    )
+    project_parser.add_argument(
+        "--borrow-decimals", help="Borrow token decimals", type=int, default=18
+    )
+    project_parser.add_argument(
+        "--key-columns",
+        help="Comma separated series columns copied to the output",
+        default="timestamp",
+    )
+    project_parser.add_argument(
+        "--every", help="Write every n-th row and the last one", type=int, default=1
+    )
+    project_parser.add_argument(
+        "--chunk-rows", help="Rows read per chunk", type=int, default=65536
+    )
+    project_parser.add_argument("--out", help="CSV or Parquet output file")
+    project_parser.set_defaults(handler=project_fees)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
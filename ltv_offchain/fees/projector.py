@@ -0,0 +1,277 @@
+"""
+Max growth fee and protocol rewards projector
+
+Replays the fee minting of a vault over a price time series, one row being
+one vault interaction: applyMaxGrowthFee runs with the withdraw total assets
+of the row, then _mintProtocolRewards with the row protocol rewards, then
+the user shares of the row are minted or burned. Rows are processed chunk by
+chunk: total assets of a chunk are computed in one pass since they do not
+depend on the supply, then the fee state is folded over the chunk, so memory
+stays constant whatever the series length.
+
+Row columns, all integers as the vault sees them:
+
+    collateral_price, borrow_price               required, oracle units
+    real_collateral_assets, real_borrow_assets   default to the projector ones
+    future_borrow_assets, future_collateral_assets,
+    future_reward_borrow_assets, future_reward_collateral_assets
+                                                 default to 0
+    delta_protocol_future_reward_borrow,
+    delta_protocol_future_reward_collateral      default to 0
+    is_deposit                                   1 when protocol rewards come
+                                                 from a deposit, default 0
+    delta_user_shares                            default to 0
+"""
+
+from collections import namedtuple
+
+from ltv_offchain.math.constants import LAST_SEEN_PRICE_PRECISION
+from ltv_offchain.math.max_growth_fee import (
+    apply_max_growth_fee,
+    calculate_protocol_reward_shares,
+    calculate_total_assets,
+    calculate_total_supply,
+    preview_supply_after_fee,
+)
+from ltv_offchain.math.solidity import MathRevert, checked_uint
+from ltv_offchain.math.structs import (
+    MaxGrowthFeeData,
+    MintProtocolRewardsData,
+    TotalAssetsState,
+)
+
+ASSET_COLUMNS = [
+    "real_collateral_assets",
+    "real_borrow_assets",
+    "future_borrow_assets",
+    "future_collateral_assets",
+    "future_reward_borrow_assets",
+    "future_reward_collateral_assets",
+]
+
+REWARD_COLUMNS = [
+    "delta_protocol_future_reward_borrow",
+    "delta_protocol_future_reward_collateral",
+]
+
+OUTPUT_COLUMNS = [
+    "withdraw_total_assets",
+    "total_supply",
+    "growth_fee_shares",
+    "protocol_reward_shares",
+    "fee_collector_shares",
+    "last_seen_token_price",
+    # withdraw total assets per share after the row, LAST_SEEN_PRICE_PRECISION
+    "share_price",
+]
+
+ProjectionSummary = namedtuple(
+    "ProjectionSummary",
+    [
+        "rows",
+        "growth_fee_shares",
+        "protocol_reward_shares",
+        "fee_collector_shares",
+        "total_supply",
+        "last_seen_token_price",
+        "first_share_price",
+        "last_share_price",
+        "max_share_price",
+    ],
+)
+
+
+class ProjectionError(Exception):
+    """Raised when the vault math reverts on a row"""
+
+
+def _get_int(row, column, default):
+    value = row.get(column)
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+class FeeProjector:
+    """
+    Fee state of one vault: base_supply is the stored total supply without
+    virtual assets, fee_collector_shares the fee collector balance
+    """
+
+    def __init__(
+        self,
+        max_growth_fee_dividend,
+        max_growth_fee_divider,
+        base_supply,
+        last_seen_token_price=LAST_SEEN_PRICE_PRECISION,
+        fee_collector_shares=0,
+        real_collateral_assets=0,
+        real_borrow_assets=0,
+        collateral_token_decimals=18,
+        borrow_token_decimals=18,
+    ):
+        self.max_growth_fee_dividend = max_growth_fee_dividend
+        self.max_growth_fee_divider = max_growth_fee_divider
+        self.base_supply = base_supply
+        self.last_seen_token_price = last_seen_token_price
+        self.fee_collector_shares = fee_collector_shares
+        self.defaults = {
+            "real_collateral_assets": real_collateral_assets,
+            "real_borrow_assets": real_borrow_assets,
+        }
+        self.collateral_token_decimals = collateral_token_decimals
+        self.borrow_token_decimals = borrow_token_decimals
+        self.rows = 0
+        self.growth_fee_shares = 0
+        self.protocol_reward_shares = 0
+        self.first_share_price = None
+        self.last_share_price = None
+        self.max_share_price = None
+
+    def _get_total_assets_state(self, row):
+        return TotalAssetsState(
+            borrow_price=int(row["borrow_price"]),
+            collateral_price=int(row["collateral_price"]),
+            borrow_token_decimals=self.borrow_token_decimals,
+            collateral_token_decimals=self.collateral_token_decimals,
+            **{
+                column: _get_int(row, column, self.defaults.get(column, 0))
+                for column in ASSET_COLUMNS
+            },
+        )
+
+    def _get_total_assets(self, rows):
+        """[(withdraw total assets, deposit total assets or None)] of a chunk"""
+        total_assets = []
+        for row in rows:
+            state = self._get_total_assets_state(row)
+            deposit_total_assets = None
+            if _get_int(row, "is_deposit", 0) and any(
+                _get_int(row, column, 0) for column in REWARD_COLUMNS
+            ):
+                deposit_total_assets = calculate_total_assets(True, state)
+            total_assets.append(
+                (calculate_total_assets(False, state), deposit_total_assets, state)
+            )
+        return total_assets
+
+    def _process_row(self, row, withdraw_total_assets, deposit_total_assets, state):
+        supply = calculate_total_supply(self.base_supply)
+        supply_after_fee = preview_supply_after_fee(
+            MaxGrowthFeeData(
+                withdraw_total_assets=withdraw_total_assets,
+                max_growth_fee_dividend=self.max_growth_fee_dividend,
+                max_growth_fee_divider=self.max_growth_fee_divider,
+                supply=supply,
+                last_seen_token_price=self.last_seen_token_price,
+            )
+        )
+        growth_fee_shares, last_seen_token_price = apply_max_growth_fee(
+            supply_after_fee, withdraw_total_assets, supply
+        )
+        if last_seen_token_price is not None:
+            self.last_seen_token_price = last_seen_token_price
+
+        protocol_reward_shares = calculate_protocol_reward_shares(
+            MintProtocolRewardsData(
+                delta_protocol_future_reward_borrow=_get_int(
+                    row, "delta_protocol_future_reward_borrow", 0
+                ),
+                delta_protocol_future_reward_collateral=_get_int(
+                    row, "delta_protocol_future_reward_collateral", 0
+                ),
+                supply=supply_after_fee,
+                total_appropriate_assets=(
+                    withdraw_total_assets
+                    if deposit_total_assets is None
+                    else deposit_total_assets
+                ),
+                asset_price=state.borrow_price,
+                asset_token_decimals=state.borrow_token_decimals,
+            )
+        )
+
+        minted = growth_fee_shares + protocol_reward_shares
+        self.fee_collector_shares += minted
+        self.base_supply = checked_uint(
+            self.base_supply + minted + _get_int(row, "delta_user_shares", 0)
+        )
+        self.growth_fee_shares += growth_fee_shares
+        self.protocol_reward_shares += protocol_reward_shares
+
+        total_supply = calculate_total_supply(self.base_supply)
+        share_price = withdraw_total_assets * LAST_SEEN_PRICE_PRECISION // total_supply
+        if self.first_share_price is None:
+            self.first_share_price = share_price
+        self.last_share_price = share_price
+        if self.max_share_price is None or share_price > self.max_share_price:
+            self.max_share_price = share_price
+        self.rows += 1
+
+        return (
+            withdraw_total_assets,
+            total_supply,
+            growth_fee_shares,
+            protocol_reward_shares,
+            self.fee_collector_shares,
+            self.last_seen_token_price,
+            share_price,
+        )
+
+    def process_chunk(self, rows):
+        """Returns the OUTPUT_COLUMNS values of every row of the chunk"""
+        try:
+            total_assets = self._get_total_assets(rows)
+        except MathRevert as e:
+            raise ProjectionError(f"total assets revert in rows after {self.rows}: {e}")
+        outputs = []
+        for row, (withdraw_total_assets, deposit_total_assets, state) in zip(
+            rows, total_assets
+        ):
+            try:
+                outputs.append(
+                    self._process_row(
+                        row, withdraw_total_assets, deposit_total_assets, state
+                    )
+                )
+            except MathRevert as e:
+                raise ProjectionError(f"row {self.rows} reverts: {e}")
+        return outputs
+
+    def summary(self):
+        return ProjectionSummary(
+            rows=self.rows,
+            growth_fee_shares=self.growth_fee_shares,
+            protocol_reward_shares=self.protocol_reward_shares,
+            fee_collector_shares=self.fee_collector_shares,
+            total_supply=calculate_total_supply(self.base_supply),
+            last_seen_token_price=self.last_seen_token_price,
+            first_share_price=self.first_share_price,
+            last_share_price=self.last_share_price,
+            max_share_price=self.max_share_price,
+        )
+
+
+def project(projector, chunks, writer=None, key_columns=(), every=1):
+    """
+    Runs the projector over an iterable of row chunks, writing key_columns
+    followed by OUTPUT_COLUMNS of every every-th row and of the last row
+    """
+    pending_last = None
+    for chunk in chunks:
+        outputs = projector.process_chunk(chunk)
+        if writer is None:
+            continue
+        first_index = projector.rows - len(outputs)
+        selected = []
+        for offset, (row, output) in enumerate(zip(chunk, outputs)):
+            line = [row.get(column) for column in key_columns] + list(output)
+            if (first_index + offset) % every == 0:
+                selected.append(line)
+                pending_last = None
+            else:
+                pending_last = line
+        writer.write(selected)
+    if writer is not None and pending_last is not None:
+        writer.write([pending_last])
+    return projector.summary()
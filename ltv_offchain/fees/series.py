@@ -0,0 +1,122 @@
+"""
+Chunked readers and writers of time series files
+
+CSV is read with the standard library, Parquet and Arrow IPC (.arrow) need
+pyarrow. Values are kept as read, uint256 columns are written as decimal
+strings since they do not fit Parquet integer types.
+"""
+
+import csv
+import itertools
+
+CHUNK_ROWS = 65536
+
+
+def is_parquet(path):
+    return path.endswith(".parquet")
+
+
+def is_arrow(path):
+    return path.endswith(".arrow")
+
+
+def _import_parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("pyarrow is required for Parquet files")
+    return pyarrow, pyarrow.parquet
+
+
+def _import_arrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        raise RuntimeError("pyarrow is required for Arrow files")
+    return pyarrow, pyarrow.ipc
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yields lists of at most chunk_rows {column: value} rows"""
+    if is_parquet(path):
+        _, parquet = _import_parquet()
+        for batch in parquet.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pylist()
+        return
+    if is_arrow(path):
+        _, ipc = _import_arrow()
+        with ipc.open_file(path) as reader:
+            for i in range(reader.num_record_batches):
+                rows = reader.get_batch(i).to_pylist()
+                for start in range(0, len(rows), chunk_rows):
+                    yield rows[start : start + chunk_rows]
+        return
+    with open(path, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        while True:
+            chunk = list(itertools.islice(reader, chunk_rows))
+            if not chunk:
+                return
+            yield chunk
+
+
+class SeriesWriter:
+    """Appends chunks of rows to a CSV, Parquet or Arrow file"""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self._file = None
+        self._writer = None
+        if is_parquet(path):
+            pyarrow, parquet = _import_parquet()
+            self._table = pyarrow.Table
+            self._schema = pyarrow.schema(
+                [(column, pyarrow.string()) for column in columns]
+            )
+            self._writer = parquet.ParquetWriter(path, self._schema)
+        elif is_arrow(path):
+            pyarrow, ipc = _import_arrow()
+            self._table = pyarrow.Table
+            self._schema = pyarrow.schema(
+                [(column, pyarrow.string()) for column in columns]
+            )
+            self._writer = ipc.new_file(path, self._schema)
+        else:
+            self._file = open(path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(columns)
+
+    def write(self, rows):
+        """rows are sequences of values in column order"""
+        if not rows:
+            return
+        if self._file is None:
+            self._writer.write_table(
+                self._table.from_pylist(
+                    [
+                        {
+                            column: None if value is None else str(value)
+                            for column, value in zip(self.columns, row)
+                        }
+                        for row in rows
+                    ],
+                    schema=self._schema,
+                )
+            )
+        else:
+            self._writer.writerows(rows)
+
+    def close(self):
+        if self._file is None:
+            self._writer.close()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
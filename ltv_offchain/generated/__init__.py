@@ -0,0 +1,3 @@
+"""
+Table driven generation of the initializeGeneratedTest vault tests
+"""
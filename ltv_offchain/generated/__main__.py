@@ -0,0 +1,119 @@
+"""
+Generated vault tests CLI
+
+    python -m ltv_offchain.generated generate
+    python -m ltv_offchain.generated generate --check
+    python -m ltv_offchain.generated extract --source test/Generated.t.sol --out table.csv
+
+generate computes the expected post-state of every row of the scenario table
+and writes the tests as GeneratedBaseTest shards; with --check it only
+reports whether the shards on disk are up to date. extract turns hand written
+initializeGeneratedTest tests into table rows.
+"""
+
+import argparse
+import sys
+import time
+
+from ltv_offchain.generated.shards import GenerationError, generate_shards
+from ltv_offchain.generated.table import (
+    extract_scenarios,
+    read_scenarios,
+    write_scenarios,
+)
+
+DEFAULT_TABLE_PATH = "test/generated/scenarios.csv"
+DEFAULT_OUT_DIR = "test/generated"
+
+
+def generate(args):
+    start = time.monotonic()
+    try:
+        result, skipped = generate_shards(
+            read_scenarios(args.table),
+            args.out_dir,
+            args.shard_size,
+            skip_invalid=args.skip_invalid,
+            workers=args.workers,
+            check=args.check,
+        )
+    except (GenerationError, ValueError) as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+
+    for name, error in skipped:
+        print(f"Skipped test_{name}: {error}")
+    print(
+        f"{result.tests} tests in {result.shards} shards, {len(skipped)} skipped, "
+        f"in {time.monotonic() - start:.2f}s"
+    )
+    if args.check:
+        if result.written or result.removed:
+            print(
+                f"ERROR {result.written} shards out of date and {result.removed} "
+                f"stale in {args.out_dir}"
+            )
+            sys.exit(1)
+        print("Shards up to date")
+        return
+    print(
+        f"{result.written} shards written, {result.unchanged} unchanged, "
+        f"{result.removed} removed in {args.out_dir}"
+    )
+
+
+def extract(args):
+    with open(args.source, "r") as f:
+        source = f.read()
+    try:
+        count = write_scenarios(extract_scenarios(source), args.out)
+    except ValueError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    print(f"{count} scenarios written to {args.out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV generated vault tests")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser(
+        "generate", help="Write the test shards of a scenario table"
+    )
+    generate_parser.add_argument(
+        "--table", help="CSV scenario table", default=DEFAULT_TABLE_PATH
+    )
+    generate_parser.add_argument(
+        "--out-dir", help="Directory of the shards", default=DEFAULT_OUT_DIR
+    )
+    generate_parser.add_argument(
+        "--shard-size", help="Tests per shard contract", type=int, default=16
+    )
+    generate_parser.add_argument(
+        "--skip-invalid",
+        help="Skip scenarios the vault can not pass instead of failing",
+        action="store_true",
+    )
+    generate_parser.add_argument(
+        "--check",
+        help="Only check the shards on disk are up to date",
+        action="store_true",
+    )
+    generate_parser.add_argument(
+        "--workers", help="Processes computing shards", type=int, default=1
+    )
+    generate_parser.set_defaults(handler=generate)
+
+    extract_parser = subparsers.add_parser(
+        "extract", help="Turn initializeGeneratedTest tests into table rows"
+    )
+    extract_parser.add_argument("--source", help="Solidity test file", required=True)
+    extract_parser.add_argument("--out", help="CSV scenario table", required=True)
+    extract_parser.set_defaults(handler=extract)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
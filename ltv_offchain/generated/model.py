@@ -0,0 +1,383 @@
+"""
+Expected post-state of a generated test scenario
+
+Replays one vault operation on the vault initializeGeneratedTest sets up,
+with the exact ports of ltv_offchain/math: the max limit check, the preview
+the operation executes, applyMaxGrowthFee, _mintProtocolRewards, the lending
+balance change, NextStep and the state transition. The vault constants are
+the GeneratedBaseTest ones, and like the Dummy*Module modules of
+DummyModulesBaseTest total assets and total supply have no virtual assets.
+"""
+
+from collections import namedtuple
+
+from ltv_offchain.capacity.surface import (
+    DEPOSIT_MINT,
+    FUNCTIONS,
+    WITHDRAW_REDEEM,
+    VaultState,
+    get_max_states,
+)
+from ltv_offchain.math import preview
+from ltv_offchain.math.common_math import calculate_auction_step
+from ltv_offchain.math.constants import (
+    LAST_SEEN_PRICE_PRECISION,
+    VIRTUAL_ASSETS_AMOUNT,
+)
+from ltv_offchain.math.max_growth_fee import (
+    apply_max_growth_fee,
+    calculate_protocol_reward_shares,
+    calculate_total_assets,
+    calculate_total_assets_collateral,
+    calculate_total_assets_from_data,
+    calculate_total_supply,
+    preview_supply_after_fee,
+)
+from ltv_offchain.math.mul_div import u_mul_div_down
+from ltv_offchain.math.next_step import calculate_next_step
+from ltv_offchain.math.solidity import MathRevert, checked_uint
+from ltv_offchain.math.structs import (
+    MaxGrowthFeeData,
+    MintProtocolRewardsData,
+    NextStepData,
+    TotalAssetsState,
+)
+from ltv_offchain.math.vault_state_transition import apply_state_transition
+
+# initializeGeneratedTest and initializeDummyTest constants
+BLOCK_NUMBER = 1000
+AUCTION_DURATION = 1000
+PRICE = 10**20
+TOKEN_DECIMALS = 18
+SLIPPAGE = 10**16
+TARGET_LTV = (75, 100)
+MAX_SAFE_LTV = (9, 10)
+MIN_PROFIT_LTV = (5, 10)
+MAX_GROWTH_FEE = (1, 5)
+MAX_TOTAL_ASSETS_IN_UNDERLYING = 2**128 - 1
+# assertApproxEqAbs tolerance of the target LTV check
+LTV_TOLERANCE = 3
+
+# (vault, operation): (max function, preview function, amount is assets)
+OPERATIONS = {
+    ("borrow", "deposit"): ("max_deposit", preview.preview_deposit, True),
+    ("borrow", "mint"): ("max_mint", preview.preview_mint, False),
+    ("borrow", "withdraw"): ("max_withdraw", preview.preview_withdraw, True),
+    ("borrow", "redeem"): ("max_redeem", preview.preview_redeem, False),
+    ("collateral", "deposit"): (
+        "max_deposit_collateral",
+        preview.preview_deposit_collateral,
+        True,
+    ),
+    ("collateral", "mint"): (
+        "max_mint_collateral",
+        preview.preview_mint_collateral,
+        False,
+    ),
+    ("collateral", "withdraw"): (
+        "max_withdraw_collateral",
+        preview.preview_withdraw_collateral,
+        True,
+    ),
+    ("collateral", "redeem"): (
+        "max_redeem_collateral",
+        preview.preview_redeem_collateral,
+        False,
+    ),
+}
+
+ExpectedState = namedtuple(
+    "ExpectedState",
+    [
+        # value returned by the operation and by its preview
+        "delta",
+        "supply_balance",
+        "borrow_balance",
+        "future_borrow_assets",
+        "future_collateral_assets",
+        "future_reward_borrow_assets",
+        "future_reward_collateral_assets",
+        "convert_to_shares",
+    ],
+)
+
+
+class ScenarioError(Exception):
+    """Raised when a scenario reverts or does not keep the vault at target LTV"""
+
+
+def get_initial_state(scenario):
+    """VaultState of the vault right after initializeGeneratedTest"""
+    future_reward_borrow_assets = 0
+    future_reward_collateral_assets = 0
+    if scenario.future_borrow < 0:
+        future_reward_borrow_assets = scenario.auction_reward
+    else:
+        future_reward_collateral_assets = scenario.auction_reward
+
+    state = VaultState(
+        deposit_real_collateral_assets=scenario.real_collateral,
+        deposit_real_borrow_assets=scenario.real_borrow,
+        withdraw_real_collateral_assets=scenario.real_collateral,
+        withdraw_real_borrow_assets=scenario.real_borrow,
+        future_borrow_assets=scenario.future_borrow,
+        future_collateral_assets=scenario.future_collateral,
+        future_reward_borrow_assets=future_reward_borrow_assets,
+        future_reward_collateral_assets=future_reward_collateral_assets,
+        borrow_price=PRICE,
+        collateral_price=PRICE,
+        borrow_token_decimals=TOKEN_DECIMALS,
+        collateral_token_decimals=TOKEN_DECIMALS,
+        max_growth_fee_dividend=MAX_GROWTH_FEE[0],
+        max_growth_fee_divider=MAX_GROWTH_FEE[1],
+        supply=0,
+        last_seen_token_price=LAST_SEEN_PRICE_PRECISION,
+        target_ltv_dividend=TARGET_LTV[0],
+        target_ltv_divider=TARGET_LTV[1],
+        start_auction=scenario.start_auction,
+        auction_duration=AUCTION_DURATION,
+        block_number=BLOCK_NUMBER,
+        collateral_slippage=SLIPPAGE,
+        borrow_slippage=SLIPPAGE,
+        max_total_assets_in_underlying=MAX_TOTAL_ASSETS_IN_UNDERLYING,
+        min_profit_ltv_dividend=MIN_PROFIT_LTV[0],
+        min_profit_ltv_divider=MIN_PROFIT_LTV[1],
+        max_safe_ltv_dividend=MAX_SAFE_LTV[0],
+        max_safe_ltv_divider=MAX_SAFE_LTV[1],
+        owner_balance=0,
+    )
+    # ltv.mintFreeTokens(ltv.totalAssets(), address(this))
+    total_assets = _get_withdraw_total_assets(state)
+    return state._replace(supply=total_assets, owner_balance=total_assets)
+
+
+def _get_withdraw_total_assets(state):
+    return (
+        calculate_total_assets(
+            False,
+            TotalAssetsState(
+                real_collateral_assets=state.withdraw_real_collateral_assets,
+                real_borrow_assets=state.withdraw_real_borrow_assets,
+                **{
+                    field: getattr(state, field)
+                    for field in TotalAssetsState._fields
+                    if not field.startswith("real_")
+                },
+            ),
+        )
+        - VIRTUAL_ASSETS_AMOUNT
+    )
+
+
+def _get_supply_after_fee(state, withdraw_total_assets):
+    return preview_supply_after_fee(
+        MaxGrowthFeeData(
+            withdraw_total_assets=withdraw_total_assets,
+            max_growth_fee_dividend=state.max_growth_fee_dividend,
+            max_growth_fee_divider=state.max_growth_fee_divider,
+            supply=state.supply,
+            last_seen_token_price=state.last_seen_token_price,
+        )
+    )
+
+
+def _drop_virtual_assets(preview_data, is_deposit, state):
+    """Preview data of the dummy modules for preview data of the vault ones"""
+    withdraw_total_assets = preview_data.withdraw_total_assets - VIRTUAL_ASSETS_AMOUNT
+    fields = {
+        "withdraw_total_assets": withdraw_total_assets,
+        "supply_after_fee": _get_supply_after_fee(state, withdraw_total_assets),
+    }
+    if "deposit_total_assets" in preview_data._fields:
+        fields["deposit_total_assets"] = (
+            preview_data.deposit_total_assets - VIRTUAL_ASSETS_AMOUNT
+        )
+    if "total_assets_collateral" in preview_data._fields:
+        total_assets = calculate_total_assets_from_data(
+            is_deposit,
+            preview_data.collateral,
+            preview_data.borrow,
+            state.borrow_price,
+            state.borrow_token_decimals,
+        )
+        fields["total_assets_collateral"] = calculate_total_assets_collateral(
+            is_deposit,
+            total_assets - VIRTUAL_ASSETS_AMOUNT,
+            state.collateral_price,
+            state.borrow_price,
+            state.borrow_token_decimals,
+            state.collateral_token_decimals,
+        )
+    return preview_data._replace(**fields)
+
+
+def _convert_to_shares(assets, state):
+    withdraw_total_assets = _get_withdraw_total_assets(state)
+    return u_mul_div_down(
+        assets,
+        _get_supply_after_fee(state, withdraw_total_assets),
+        withdraw_total_assets,
+    )
+
+
+def _get_target_ltv_error(state):
+    """
+    Value the assertApproxEqAbs of the generated tests checks, 4 * borrow -
+    3 * collateral for the 3/4 target LTV
+    """
+    borrow = (
+        state.future_borrow_assets
+        + state.future_reward_borrow_assets
+        + state.withdraw_real_borrow_assets
+    )
+    collateral = (
+        state.future_collateral_assets
+        + state.future_reward_collateral_assets
+        + state.withdraw_real_collateral_assets
+    )
+    return borrow * 4 - 3 * collateral
+
+
+def execute_operation(state, vault, operation, amount, virtual_assets=True):
+    """
+    (operation result, VaultState after the operation) of one operation of the
+    borrow or collateral vault, virtual_assets False for the Dummy*Module
+    modules, whose total assets and total supply have no virtual assets
+    """
+    max_function, preview_function, amount_is_assets = OPERATIONS[(vault, operation)]
+    family, state_to_data, calculate_max = FUNCTIONS[max_function]
+    max_states = dict(zip((DEPOSIT_MINT, WITHDRAW_REDEEM), get_max_states(state)))
+    is_deposit = operation in ("deposit", "mint")
+    data = state_to_data(max_states[family])
+    total_supply = calculate_total_supply(state.supply)
+    if not virtual_assets:
+        data = data._replace(
+            preview_data=_drop_virtual_assets(data.preview_data, is_deposit, state)
+        )
+        total_supply = state.supply
+    limit = calculate_max(data)
+    if amount > limit:
+        raise ScenarioError(f"amount {amount} exceeds {max_function} {limit}")
+
+    preview_data = data.preview_data
+    result, delta_future = preview_function(amount, preview_data)
+    if result == 0:
+        return result, state
+
+    growth_fee_shares, last_seen_token_price = apply_max_growth_fee(
+        preview_data.supply_after_fee, preview_data.withdraw_total_assets, total_supply
+    )
+    if vault == "borrow":
+        total_appropriate_assets = (
+            preview_data.deposit_total_assets
+            if is_deposit
+            else preview_data.withdraw_total_assets
+        )
+        asset_price = preview_data.borrow_price
+        asset_token_decimals = preview_data.borrow_token_decimals
+    else:
+        total_appropriate_assets = preview_data.total_assets_collateral
+        asset_price = preview_data.collateral_price
+        asset_token_decimals = preview_data.collateral_token_decimals
+    protocol_reward_shares = calculate_protocol_reward_shares(
+        MintProtocolRewardsData(
+            delta_protocol_future_reward_borrow=delta_future.delta_protocol_future_reward_borrow,
+            delta_protocol_future_reward_collateral=delta_future.delta_protocol_future_reward_collateral,
+            supply=preview_data.supply_after_fee,
+            total_appropriate_assets=total_appropriate_assets,
+            asset_price=asset_price,
+            asset_token_decimals=asset_token_decimals,
+        )
+    )
+
+    assets, shares = (amount, result) if amount_is_assets else (result, amount)
+    real_borrow_assets = state.withdraw_real_borrow_assets
+    real_collateral_assets = state.withdraw_real_collateral_assets
+    if vault == "borrow":
+        # repay on deposit / mint, borrow on withdraw / redeem
+        real_borrow_assets += -assets if is_deposit else assets
+    else:
+        # supply on deposit / mint, withdraw on withdraw / redeem
+        real_collateral_assets += assets if is_deposit else -assets
+    if real_borrow_assets < 0 or real_collateral_assets < 0:
+        raise ScenarioError("lending balance underflow")
+    if not is_deposit and shares > state.owner_balance:
+        raise ScenarioError(f"burns {shares} shares of {state.owner_balance}")
+
+    next_state = calculate_next_step(
+        NextStepData(
+            future_borrow=preview_data.future_borrow,
+            future_collateral=preview_data.future_collateral,
+            future_reward_borrow=preview_data.user_future_reward_borrow
+            + preview_data.protocol_future_reward_borrow,
+            future_reward_collateral=preview_data.user_future_reward_collateral
+            + preview_data.protocol_future_reward_collateral,
+            delta_future_borrow=delta_future.delta_future_borrow,
+            delta_future_collateral=delta_future.delta_future_collateral,
+            delta_future_payment_borrow=delta_future.delta_future_payment_borrow,
+            delta_user_future_reward_borrow=delta_future.delta_user_future_reward_borrow,
+            delta_protocol_future_reward_borrow=delta_future.delta_protocol_future_reward_borrow,
+            delta_future_payment_collateral=delta_future.delta_future_payment_collateral,
+            delta_user_future_reward_collateral=delta_future.delta_user_future_reward_collateral,
+            delta_protocol_future_reward_collateral=delta_future.delta_protocol_future_reward_collateral,
+            block_number=state.block_number,
+            auction_step=calculate_auction_step(
+                state.start_auction, state.block_number, state.auction_duration
+            ),
+            cases=delta_future.cases,
+        )
+    )
+    future_state = apply_state_transition(
+        next_state,
+        state.start_auction,
+        state.borrow_price,
+        state.collateral_price,
+        state.borrow_token_decimals,
+        state.collateral_token_decimals,
+    )
+
+    delta_shares = shares if is_deposit else -shares
+    return result, state._replace(
+        deposit_real_collateral_assets=real_collateral_assets,
+        deposit_real_borrow_assets=real_borrow_assets,
+        withdraw_real_collateral_assets=real_collateral_assets,
+        withdraw_real_borrow_assets=real_borrow_assets,
+        supply=checked_uint(
+            state.supply + growth_fee_shares + protocol_reward_shares + delta_shares
+        ),
+        last_seen_token_price=(
+            last_seen_token_price
+            if last_seen_token_price is not None
+            else state.last_seen_token_price
+        ),
+        owner_balance=state.owner_balance + delta_shares,
+        **future_state._asdict(),
+    )
+
+
+def compute_expected_state(scenario):
+    """ExpectedState of a Scenario, raises ScenarioError when it can not pass"""
+    try:
+        result, state = execute_operation(
+            get_initial_state(scenario),
+            scenario.vault,
+            scenario.operation,
+            scenario.amount,
+            virtual_assets=False,
+        )
+        convert_to_shares = _convert_to_shares(10**18, state)
+    except MathRevert as e:
+        raise ScenarioError(f"vault reverts: {e}")
+    ltv_error = _get_target_ltv_error(state)
+    if abs(ltv_error) > LTV_TOLERANCE:
+        raise ScenarioError(f"target LTV missed by {ltv_error}")
+    return ExpectedState(
+        delta=result,
+        supply_balance=state.withdraw_real_collateral_assets,
+        borrow_balance=state.withdraw_real_borrow_assets,
+        future_borrow_assets=state.future_borrow_assets,
+        future_collateral_assets=state.future_collateral_assets,
+        future_reward_borrow_assets=state.future_reward_borrow_assets,
+        future_reward_collateral_assets=state.future_reward_collateral_assets,
+        convert_to_shares=convert_to_shares,
+    )
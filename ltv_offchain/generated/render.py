@@ -0,0 +1,159 @@
+"""
+Solidity rendering of the generated vault tests, in the forge fmt layout of
+test/Generated.t.sol
+"""
+
+LINE_LENGTH = 120
+
+HEADER = """// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {GeneratedBaseTest} from "test/utils/GeneratedBaseTest.t.sol";
+"""
+
+TARGET_LTV_CHECK = """        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+"""
+
+ONE = 10**18
+
+
+def _get_result_name(scenario):
+    if scenario.operation in ("deposit", "withdraw"):
+        return "deltaShares"
+    return "deltaBorrow" if scenario.vault == "borrow" else "deltaCollateral"
+
+
+def _get_function_name(scenario):
+    if scenario.vault == "borrow":
+        return scenario.operation
+    return f"{scenario.operation}Collateral"
+
+
+def _format_one(value):
+    return "10 ** 18" if value == ONE else str(value)
+
+
+def render_call(indent, call, arguments, suffix=";"):
+    """Call statement, wrapped the way forge fmt wraps lines over LINE_LENGTH"""
+    prefix = " " * indent
+    line = f"{prefix}{call}({', '.join(arguments)}){suffix}"
+    if len(line) <= LINE_LENGTH:
+        return line + "\n"
+    inner = " " * (indent + 4)
+    joined = f"{inner}{', '.join(arguments)}"
+    if len(joined) <= LINE_LENGTH:
+        return f"{prefix}{call}(\n{joined}\n{prefix}){suffix}\n"
+    lines = ",\n".join(f"{inner}{argument}" for argument in arguments)
+    return f"{prefix}{call}(\n{lines}\n{prefix}){suffix}\n"
+
+
+def _render_signature(scenario):
+    arguments = [
+        str(value)
+        for value in (
+            scenario.real_borrow,
+            scenario.real_collateral,
+            scenario.future_borrow,
+            scenario.future_collateral,
+            scenario.auction_reward,
+            scenario.start_auction,
+        )
+    ]
+    line = render_call(
+        4,
+        f"function test_{scenario.name}() public initializeGeneratedTest",
+        arguments,
+        " {",
+    )
+    if "\n" not in line[:-1]:
+        return line
+    return (
+        f"    function test_{scenario.name}()\n"
+        "        public\n"
+        + render_call(8, "initializeGeneratedTest", arguments, "")
+        + "    {\n"
+    )
+
+
+def render_test(scenario, expected):
+    """Test function of a Scenario and its ExpectedState"""
+    function = _get_function_name(scenario)
+    preview = "preview" + function[0].upper() + function[1:]
+    result = _get_result_name(scenario)
+    arguments = [str(scenario.amount), "address(this)"]
+    if scenario.operation in ("withdraw", "redeem"):
+        arguments.append("address(this)")
+    return "".join(
+        [
+            _render_signature(scenario),
+            render_call(
+                8, f"uint256 preview = dummyLtv.{preview}", [str(scenario.amount)]
+            ),
+            render_call(8, f"uint256 {result} = dummyLtv.{function}", arguments),
+            "\n",
+            render_call(8, "assertEq", [result, "preview"]),
+            render_call(8, "assertEq", [result, str(expected.delta)]),
+            render_call(
+                8,
+                "assertEq",
+                [
+                    "lendingProtocol.supplyBalance(address(collateralToken))",
+                    str(expected.supply_balance),
+                ],
+            ),
+            render_call(
+                8,
+                "assertEq",
+                [
+                    "lendingProtocol.borrowBalance(address(borrowToken))",
+                    str(expected.borrow_balance),
+                ],
+            ),
+            render_call(
+                8,
+                "assertEq",
+                ["dummyLtv.futureBorrowAssets()", str(expected.future_borrow_assets)],
+            ),
+            render_call(
+                8,
+                "assertEq",
+                [
+                    "dummyLtv.futureCollateralAssets()",
+                    str(expected.future_collateral_assets),
+                ],
+            ),
+            render_call(
+                8,
+                "assertEq",
+                [
+                    "dummyLtv.convertToShares(10 ** 18)",
+                    _format_one(expected.convert_to_shares),
+                ],
+            ),
+            TARGET_LTV_CHECK,
+            "    }\n",
+        ]
+    )
+
+
+def render_contract(contract_name, tests):
+    """Solidity source of a GeneratedBaseTest contract made of rendered tests"""
+    return (
+        HEADER
+        + "\n"
+        + f"contract {contract_name} is GeneratedBaseTest {{\n"
+        + "\n".join(tests)
+        + "}\n"
+    )
@@ -0,0 +1,139 @@
+"""
+Sharded output of the generated vault tests
+
+Scenarios are cut into shards of shard_size tests in table order, every
+shard being one GeneratedBaseTest contract in its own file so forge compiles
+and runs shards in parallel. Shards are computed by worker processes with a
+bounded number in flight, so memory does not grow with the table size.
+"""
+
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from ltv_offchain.generated.model import ScenarioError, compute_expected_state
+from ltv_offchain.generated.render import render_contract, render_test
+
+SHARD_FILE_PATTERN = re.compile(r"^GeneratedShard(\d+)\.t\.sol$")
+
+GenerationResult = namedtuple(
+    "GenerationResult", ["shards", "tests", "written", "unchanged", "removed"]
+)
+
+
+class GenerationError(Exception):
+    """Raised on scenarios the vault can not pass when they are not skipped"""
+
+
+def get_shard_file_name(index):
+    return f"GeneratedShard{index}.t.sol"
+
+
+def get_shard_contract_name(index):
+    return f"GeneratedTestsShard{index}"
+
+
+def get_batches(scenarios, shard_size):
+    iterator = iter(scenarios)
+    while True:
+        batch = list(islice(iterator, shard_size))
+        if not batch:
+            return
+        yield batch
+
+
+def render_tests(scenarios, skip_invalid=False):
+    """([rendered test], [(name, error)] of skipped scenarios) of scenarios"""
+    tests = []
+    skipped = []
+    for scenario in scenarios:
+        try:
+            expected = compute_expected_state(scenario)
+        except ScenarioError as e:
+            if not skip_invalid:
+                raise GenerationError(f"test_{scenario.name}: {e}")
+            skipped.append((scenario.name, str(e)))
+            continue
+        tests.append(render_test(scenario, expected))
+    return tests, skipped
+
+
+def _render_tests_task(task):
+    scenarios, skip_invalid = task
+    return render_tests(scenarios, skip_invalid)
+
+
+def _render_batches(scenarios, shard_size, skip_invalid, workers):
+    """Yields the render_tests result of every batch in order"""
+    tasks = ((batch, skip_invalid) for batch in get_batches(scenarios, shard_size))
+    if workers <= 1:
+        yield from map(_render_tests_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for task in tasks:
+            pending.append(executor.submit(_render_tests_task, task))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def _read(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return f.read()
+
+
+def generate_shards(
+    scenarios, out_dir, shard_size, skip_invalid=False, workers=1, check=False
+):
+    """
+    Writes the shards of scenarios to out_dir and removes the shard files of
+    a previous larger generation. With check nothing is written and written /
+    removed count the files that would change.
+
+    Returns (GenerationResult, [(name, error)] of skipped scenarios)
+    """
+    if shard_size < 1:
+        raise ValueError("shard size must be positive")
+    if not check:
+        os.makedirs(out_dir, exist_ok=True)
+
+    shards = 0
+    tests = 0
+    written = 0
+    unchanged = 0
+    skipped = []
+    for shard_tests, shard_skipped in _render_batches(
+        scenarios, shard_size, skip_invalid, workers
+    ):
+        skipped.extend(shard_skipped)
+        if not shard_tests:
+            continue
+        # shards are numbered after skipping so file names stay contiguous
+        source = render_contract(get_shard_contract_name(shards), shard_tests)
+        path = os.path.join(out_dir, get_shard_file_name(shards))
+        shards += 1
+        tests += len(shard_tests)
+        if _read(path) == source:
+            unchanged += 1
+            continue
+        written += 1
+        if not check:
+            with open(path, "w") as f:
+                f.write(source)
+
+    removed = 0
+    if os.path.isdir(out_dir):
+        for file_name in sorted(os.listdir(out_dir)):
+            match = SHARD_FILE_PATTERN.match(file_name)
+            if match and int(match.group(1)) >= shards:
+                removed += 1
+                if not check:
+                    os.remove(os.path.join(out_dir, file_name))
+
+    return GenerationResult(shards, tests, written, unchanged, removed), skipped
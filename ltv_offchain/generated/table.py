@@ -0,0 +1,129 @@
+"""
+Scenario table of the generated vault tests
+
+One CSV row per test, with the header
+
+    name,vault,operation,amount,real_borrow,real_collateral,future_borrow,
+    future_collateral,auction_reward,start_auction
+
+vault is borrow or collateral, operation one of deposit, mint, withdraw,
+redeem, and the integer columns are the initializeGeneratedTest arguments
+(start_auction being its auctionStep argument) followed by the operation
+amount. Rows are read lazily so tables of any size stream through the
+generator.
+"""
+
+import csv
+import re
+from collections import namedtuple
+
+Scenario = namedtuple(
+    "Scenario",
+    [
+        "name",
+        "vault",
+        "operation",
+        "amount",
+        "real_borrow",
+        "real_collateral",
+        "future_borrow",
+        "future_collateral",
+        "auction_reward",
+        "start_auction",
+    ],
+)
+
+VAULTS = ("borrow", "collateral")
+OPERATIONS = ("deposit", "mint", "withdraw", "redeem")
+INT_COLUMNS = Scenario._fields[3:]
+
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+def parse_scenario(row):
+    """Scenario of a CSV row dict, raises ValueError on invalid rows"""
+    missing = [column for column in Scenario._fields if not row.get(column)]
+    if missing:
+        raise ValueError(f"missing columns {missing}")
+    if not NAME_PATTERN.match(row["name"]):
+        raise ValueError(f"invalid test name {row['name']}")
+    if row["vault"] not in VAULTS:
+        raise ValueError(f"unknown vault {row['vault']}")
+    if row["operation"] not in OPERATIONS:
+        raise ValueError(f"unknown operation {row['operation']}")
+    scenario = Scenario(
+        name=row["name"],
+        vault=row["vault"],
+        operation=row["operation"],
+        **{column: int(row[column]) for column in INT_COLUMNS},
+    )
+    if scenario.future_borrow < 0 and scenario.auction_reward < 0:
+        raise ValueError("auction reward must be positive when future borrow is")
+    if scenario.future_borrow >= 0 and scenario.auction_reward > 0:
+        raise ValueError("auction reward must be negative when future borrow is not")
+    return scenario
+
+
+def read_scenarios(path):
+    """Yields the Scenario of every row of a CSV table"""
+    names = set()
+    with open(path, "r", newline="") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                scenario = parse_scenario(row)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line}: {e}")
+            if scenario.name in names:
+                raise ValueError(f"{path}:{line}: duplicated name {scenario.name}")
+            names.add(scenario.name)
+            yield scenario
+
+
+def write_scenarios(scenarios, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(Scenario._fields)
+        count = 0
+        for scenario in scenarios:
+            writer.writerow(scenario)
+            count += 1
+    return count
+
+
+TEST_PATTERN = re.compile(
+    r"function test_(?P<name>\w+)\(\)\s*public\s*initializeGeneratedTest\("
+    r"(?P<arguments>[^)]*)\)"
+    r".*?dummyLtv\.(?P<operation>deposit|mint|withdraw|redeem)"
+    r"(?P<collateral>Collateral)?\((?P<amount>\d+),",
+    re.S,
+)
+
+
+def _parse_argument(value):
+    # auctionStep is written as 600.0 in hand written tests
+    value = value.strip()
+    if value.endswith(".0"):
+        value = value[:-2]
+    return int(value)
+
+
+def extract_scenarios(source):
+    """Yields the Scenario of every initializeGeneratedTest test of a Solidity source"""
+    for match in TEST_PATTERN.finditer(source):
+        arguments = [
+            _parse_argument(value) for value in match.group("arguments").split(",")
+        ]
+        if len(arguments) != 6:
+            raise ValueError(f"unexpected arguments of test_{match.group('name')}")
+        yield Scenario(
+            name=match.group("name"),
+            vault="collateral" if match.group("collateral") else "borrow",
+            operation=match.group("operation"),
+            amount=int(match.group("amount")),
+            real_borrow=arguments[0],
+            real_collateral=arguments[1],
+            future_borrow=arguments[2],
+            future_collateral=arguments[3],
+            auction_reward=arguments[4],
+            start_auction=arguments[5],
+        )
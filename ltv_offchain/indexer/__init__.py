@@ -0,0 +1 @@
+"""Incremental SQLite indexer of the vault events"""
@@ -0,0 +1,170 @@
+"""
+Vault event indexer CLI
+
+    python -m ltv_offchain.indexer sync --rpc-url localhost:8545 --vaults 0x...,0x... --db events.db
+    python -m ltv_offchain.indexer flows --db events.db --user 0x...
+    python -m ltv_offchain.indexer auctions --db events.db --vault 0x...
+    python -m ltv_offchain.indexer e2e
+
+sync indexes the events of src/events emitted by the vaults since their
+cursor, with --follow it keeps indexing new heads. e2e needs anvil and forge
+and runs from the repository root.
+"""
+
+import argparse
+import sys
+import time
+
+from deploy_utils.rpc import JsonRpcClient, RpcError
+
+from ltv_offchain.indexer.e2e import run_indexer_e2e
+from ltv_offchain.indexer.events import EVENTS_DIR, get_events, get_topic_table
+from ltv_offchain.indexer.indexer import EventIndexer
+from ltv_offchain.indexer.store import (
+    connect,
+    get_auction_history,
+    get_user_flows,
+    summarize_flows,
+)
+
+
+def sync(args):
+    client = JsonRpcClient(args.rpc_url)
+    connection = connect(args.db)
+    indexer = EventIndexer(
+        client,
+        connection,
+        [vault.strip() for vault in args.vaults.split(",") if vault.strip()],
+        get_topic_table(get_events(args.events_dir)),
+        start_block=args.start_block,
+        initial_range=args.initial_range,
+        max_range=args.max_range,
+        target_logs=args.target_logs,
+        confirmations=args.confirmations,
+    )
+    try:
+        start = time.monotonic()
+        count = indexer.sync()
+        print(f"{count} logs indexed in {time.monotonic() - start:.2f}s")
+        while args.follow:
+            time.sleep(args.poll_interval)
+            indexer.sync()
+    except RpcError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        connection.close()
+        client.close()
+
+
+def flows(args):
+    connection = connect(args.db)
+    user_flows = get_user_flows(
+        connection, args.user, args.vault, args.from_block, args.to_block
+    )
+    connection.close()
+    for flow in user_flows:
+        print(
+            f"{flow.block_number} {flow.vault} {flow.event}: "
+            f"assets {flow.assets}, shares {flow.shares}"
+        )
+    for vault, totals in summarize_flows(user_flows).items():
+        print(f"{vault}: " + ", ".join(f"{k} {v}" for k, v in totals.items()))
+
+
+def auctions(args):
+    connection = connect(args.db)
+    records = get_auction_history(
+        connection, args.vault, args.from_block, args.to_block
+    )
+    connection.close()
+    for record in records:
+        print(
+            f"{record.block_number} {record.vault} executor {record.executor}: "
+            f"collateral {record.delta_real_collateral_assets}, "
+            f"borrow {record.delta_real_borrow_assets}"
+        )
+    print(f"{len(records)} auction executions")
+
+
+def e2e(args):
+    try:
+        run_indexer_e2e(port=args.port)
+    except RuntimeError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV event indexer")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Index new vault events")
+    sync_parser.add_argument("--rpc-url", help="JSON-RPC url", required=True)
+    sync_parser.add_argument(
+        "--vaults", help="Comma separated vault addresses", required=True
+    )
+    sync_parser.add_argument("--db", help="SQLite database file", required=True)
+    sync_parser.add_argument(
+        "--events-dir", help="Solidity event interfaces", default=EVENTS_DIR
+    )
+    sync_parser.add_argument(
+        "--start-block", help="First block of new vaults", type=int, default=0
+    )
+    sync_parser.add_argument(
+        "--initial-range", help="Blocks of the first request", type=int, default=2000
+    )
+    sync_parser.add_argument(
+        "--max-range", help="Largest block range", type=int, default=100000
+    )
+    sync_parser.add_argument(
+        "--target-logs",
+        help="Logs per request the range adapts to",
+        type=int,
+        default=5000,
+    )
+    sync_parser.add_argument(
+        "--confirmations", help="Blocks behind the head", type=int, default=0
+    )
+    sync_parser.add_argument(
+        "--follow", help="Keep indexing new heads", action="store_true"
+    )
+    sync_parser.add_argument(
+        "--poll-interval", help="Seconds between syncs", type=float, default=2
+    )
+    sync_parser.set_defaults(handler=sync)
+
+    def add_query_arguments(subparser):
+        subparser.add_argument("--db", help="SQLite database file", required=True)
+        subparser.add_argument("--from-block", help="First block", type=int)
+        subparser.add_argument("--to-block", help="Last block", type=int)
+
+    flows_parser = subparsers.add_parser(
+        "flows", help="Deposits and withdrawals of a share owner"
+    )
+    add_query_arguments(flows_parser)
+    flows_parser.add_argument("--user", help="Share owner address", required=True)
+    flows_parser.add_argument("--vault", help="Vault address, all by default")
+    flows_parser.set_defaults(handler=flows)
+
+    auctions_parser = subparsers.add_parser(
+        "auctions", help="Auction executions of the indexed vaults"
+    )
+    add_query_arguments(auctions_parser)
+    auctions_parser.add_argument("--vault", help="Vault address, all by default")
+    auctions_parser.set_defaults(handler=auctions)
+
+    e2e_parser = subparsers.add_parser(
+        "e2e", help="Index the keeper end to end scenario on anvil"
+    )
+    e2e_parser.add_argument("--port", help="anvil port", type=int, default=8547)
+    e2e_parser.set_defaults(handler=e2e)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
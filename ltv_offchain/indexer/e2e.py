@@ -0,0 +1,62 @@
+"""
+Indexer end to end run against anvil
+
+Starts anvil, runs the auction keeper end to end scenario on it, which
+deploys the dummy vault of script/keeper/DeployKeeperTestVault.s.sol and
+executes its auction, then indexes the chain with a small initial range and
+checks the indexed auction history against the executions the keeper saw.
+"""
+
+import os
+import tempfile
+
+from ltv_offchain.auction.e2e import run_keeper_e2e, start_anvil
+from ltv_offchain.indexer.events import get_events, get_topic_table
+from ltv_offchain.indexer.indexer import EventIndexer
+from ltv_offchain.indexer.store import connect, get_auction_history
+
+
+def run_indexer_e2e(port=8547, initial_range=4):
+    """Returns the indexed AuctionRecord list, raises RuntimeError on mismatch"""
+    anvil, client = start_anvil(port)
+    try:
+        executions = run_keeper_e2e(rpc_url=client.rpc_url)
+        vaults = list(dict.fromkeys(execution[0] for execution in executions))
+        with tempfile.TemporaryDirectory() as directory:
+            connection = connect(os.path.join(directory, "events.db"))
+            indexer = EventIndexer(
+                client,
+                connection,
+                vaults,
+                get_topic_table(get_events()),
+                initial_range=initial_range,
+            )
+            count = indexer.sync()
+            # a second sync has nothing left to index
+            count += indexer.sync()
+            auctions = get_auction_history(connection)
+            connection.close()
+        indexed = [
+            (
+                auction.vault,
+                auction.block_number,
+                auction.executor,
+                auction.delta_real_collateral_assets,
+                auction.delta_real_borrow_assets,
+            )
+            for auction in auctions
+        ]
+        expected = [
+            (vault.lower(), block_number, executor.lower(), collateral, borrow)
+            for vault, block_number, executor, collateral, borrow in executions
+        ]
+        if indexed != expected:
+            raise RuntimeError(
+                f"Indexed auctions {indexed} differ from keeper executions {expected}"
+            )
+        print(f"{count} logs indexed, {len(auctions)} auction executions match")
+        return auctions
+    finally:
+        client.close()
+        anvil.terminate()
+        anvil.wait()
@@ -0,0 +1,85 @@
+"""
+Topic table of the vault events
+
+Event declarations are parsed from the interfaces of src/events, so the table
+follows the contracts without a copied ABI. Every EventSpec keeps the
+topic0, the indexed and data types and the parameter names, so decoding a
+log is one dictionary lookup and one abi.decode of its data.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+from deploy_utils import abi
+from deploy_utils.keccak import keccak256
+
+EVENTS_DIR = "src/events"
+
+EventSpec = namedtuple(
+    "EventSpec",
+    ["name", "signature", "topic", "names", "types", "indexed", "data_types"],
+)
+
+EVENT_PATTERN = re.compile(r"\bevent\s+(\w+)\s*\(([^)]*)\)\s*;", re.S)
+COMMENT_PATTERN = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+
+# Indexed dynamic values are stored as their keccak256 hash
+DYNAMIC_INDEXED_TYPES = ("bytes", "string")
+
+
+def parse_event(name, parameters):
+    names = []
+    types = []
+    indexed = []
+    for parameter in filter(None, (p.strip() for p in parameters.split(","))):
+        words = parameter.split()
+        types.append(words[0])
+        indexed.append("indexed" in words[1:])
+        names.append(words[-1] if len(words) > 1 and words[-1] != "indexed" else "")
+    signature = f"{name}({','.join(types)})"
+    return EventSpec(
+        name=name,
+        signature=signature,
+        topic="0x" + keccak256(signature).hex(),
+        names=names,
+        types=types,
+        indexed=indexed,
+        data_types=[t for t, i in zip(types, indexed) if not i],
+    )
+
+
+def get_events(events_dir=EVENTS_DIR):
+    """EventSpec of every event declared in the .sol files of events_dir"""
+    events = []
+    for file_name in sorted(os.listdir(events_dir)):
+        if not file_name.endswith(".sol"):
+            continue
+        with open(os.path.join(events_dir, file_name), "r") as f:
+            source = COMMENT_PATTERN.sub("", f.read())
+        events += [parse_event(*match) for match in EVENT_PATTERN.findall(source)]
+    return events
+
+
+def get_topic_table(events):
+    """{topic0: EventSpec}"""
+    return {event.topic: event for event in events}
+
+
+def _decode_topic(abi_type, topic):
+    if abi_type in DYNAMIC_INDEXED_TYPES:
+        return topic
+    return abi.decode([abi_type], topic)[0]
+
+
+def decode_log(event, log):
+    """{parameter name: value} of a log of event, bytes as 0x strings"""
+    topics = iter(log["topics"][1:])
+    data = iter(abi.decode(event.data_types, log["data"]))
+    values = {}
+    for name, abi_type, indexed in zip(event.names, event.types, event.indexed):
+        value = _decode_topic(abi_type, next(topics)) if indexed else next(data)
+        if isinstance(value, bytes):
+            value = "0x" + value.hex()
+        values[name] = value
+    return values
@@ -0,0 +1,156 @@
+"""
+Incremental eth_getLogs indexing
+
+Vaults sharing the same cursor are fetched together with one eth_getLogs
+filtering every known topic0. The block range adapts to the log density:
+it is halved when the node rejects a range for returning too many logs and
+when a range returns more than target_logs logs, and doubled, up to
+max_range, when a range returns less than a quarter of target_logs. The
+range of a lagging vault group stops at the next cursor, so groups catch up
+and merge instead of refetching blocks.
+
+Only blocks confirmations blocks behind the head are indexed; the indexer
+does not follow reorgs deeper than that.
+"""
+
+import re
+
+from deploy_utils.rpc import RpcError
+
+from ltv_offchain.indexer.events import decode_log
+from ltv_offchain.indexer.store import IndexedLog, get_cursors, insert_logs
+
+# Errors of nodes and providers refusing a range for its size
+TOO_MANY_RESULTS_PATTERN = re.compile(
+    r"more than \d+ results|too many|limit exceeded|response size|"
+    r"block range|range is too large|query timeout",
+    re.I,
+)
+
+
+class RangeTooLarge(Exception):
+    pass
+
+
+class EventIndexer:
+    def __init__(
+        self,
+        client,
+        connection,
+        vaults,
+        topic_table,
+        start_block=0,
+        initial_range=2000,
+        max_range=100000,
+        target_logs=5000,
+        confirmations=0,
+        log=print,
+    ):
+        self.client = client
+        self.connection = connection
+        self.vaults = [vault.lower() for vault in vaults]
+        self.topic_table = topic_table
+        self.start_block = start_block
+        self.range = initial_range
+        self.max_range = max_range
+        self.target_logs = target_logs
+        self.confirmations = confirmations
+        self.log = log
+
+    def get_cursors(self):
+        """{vault: last indexed block}, start_block - 1 for new vaults"""
+        cursors = get_cursors(self.connection)
+        return {
+            vault: cursors.get(vault, self.start_block - 1) for vault in self.vaults
+        }
+
+    def _get_logs(self, vaults, from_block, to_block):
+        try:
+            return self.client.call(
+                "eth_getLogs",
+                [
+                    {
+                        "fromBlock": hex(from_block),
+                        "toBlock": hex(to_block),
+                        "address": vaults,
+                        "topics": [list(self.topic_table)],
+                    }
+                ],
+            )
+        except RpcError as e:
+            if TOO_MANY_RESULTS_PATTERN.search(str(e)):
+                raise RangeTooLarge(str(e))
+            raise
+
+    def _decode(self, logs):
+        indexed = []
+        for log in logs:
+            if log.get("removed"):
+                continue
+            event = self.topic_table.get(log["topics"][0] if log["topics"] else None)
+            if event is None:
+                continue
+            indexed.append(
+                IndexedLog(
+                    block_number=int(log["blockNumber"], 16),
+                    log_index=int(log["logIndex"], 16),
+                    vault=log["address"].lower(),
+                    transaction_hash=log["transactionHash"],
+                    event=event.name,
+                    args=decode_log(event, log),
+                )
+            )
+        return indexed
+
+    def _adapt_range(self, log_count):
+        if log_count > self.target_logs:
+            self.range = max(self.range // 2, 1)
+        elif log_count < self.target_logs // 4:
+            self.range = min(self.range * 2, self.max_range)
+
+    def _index_range(self, vaults, from_block, to_block):
+        """Indexes vaults up to at most to_block, returns (last block, log count)"""
+        while True:
+            end = min(from_block + self.range - 1, to_block)
+            try:
+                logs = self._get_logs(vaults, from_block, end)
+                break
+            except RangeTooLarge as e:
+                if end == from_block:
+                    raise RpcError(
+                        f"Too many logs in block {from_block} for one request: {e}"
+                    )
+                self.range = max((end - from_block + 1) // 2, 1)
+        insert_logs(
+            self.connection, self._decode(logs), {vault: end for vault in vaults}
+        )
+        self._adapt_range(len(logs))
+        return end, len(logs)
+
+    def sync(self, to_block=None):
+        """
+        Indexes every vault up to to_block, latest confirmed block by default,
+        returns the number of indexed logs
+        """
+        if not self.vaults:
+            return 0
+        if to_block is None:
+            head = int(self.client.call("eth_blockNumber"), 16)
+            to_block = head - self.confirmations
+        cursors = self.get_cursors()
+        total = 0
+        while True:
+            lowest = min(cursors.values())
+            if lowest >= to_block:
+                return total
+            group = [vault for vault, cursor in cursors.items() if cursor == lowest]
+            # stop at the next cursor so the group merges with the vaults there
+            above = [cursor for cursor in cursors.values() if cursor > lowest]
+            end, count = self._index_range(group, lowest + 1, min(above + [to_block]))
+            for vault in group:
+                cursors[vault] = end
+            total += count
+            self.log(
+                f"Indexed blocks {lowest + 1}-{end} of {len(group)} vaults: "
+                f"{count} logs, next range {self.range}"
+            )
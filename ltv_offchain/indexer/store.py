@@ -0,0 +1,226 @@
+"""
+SQLite store of indexed vault logs
+
+Every decoded log goes to the logs table with its arguments as JSON; deposit
+/ withdraw events are also written to flows keyed by share owner and auction
+executions to auctions, which back the query helpers. uint256 / int256
+values are stored as decimal strings since SQLite integers are 64 bit.
+
+The database runs in WAL mode so queries can read while the indexer writes,
+and the logs of a block range are inserted in the same transaction as the
+cursors of their vaults, so an interrupted run resumes from the last
+committed range.
+"""
+
+import json
+import sqlite3
+from collections import namedtuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors (
+    vault TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS logs (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    vault TEXT NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS logs_vault_event ON logs (vault, event, block_number);
+CREATE TABLE IF NOT EXISTS flows (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    vault TEXT NOT NULL,
+    user TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    event TEXT NOT NULL,
+    assets TEXT NOT NULL,
+    shares TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS flows_user ON flows (user, vault, block_number);
+CREATE TABLE IF NOT EXISTS auctions (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    vault TEXT NOT NULL,
+    executor TEXT NOT NULL,
+    delta_real_collateral_assets TEXT NOT NULL,
+    delta_real_borrow_assets TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS auctions_vault ON auctions (vault, block_number);
+"""
+
+# event: (assets argument, whether shares are minted)
+FLOW_EVENTS = {
+    "Deposit": ("assets", True),
+    "Withdraw": ("assets", False),
+    "DepositCollateral": ("collateralAssets", True),
+    "WithdrawCollateral": ("collateralAssets", False),
+}
+
+AUCTION_EVENT = "AuctionExecuted"
+
+# log of a decoded event, args being {parameter name: value}
+IndexedLog = namedtuple(
+    "IndexedLog",
+    ["block_number", "log_index", "vault", "transaction_hash", "event", "args"],
+)
+
+Flow = namedtuple(
+    "Flow",
+    [
+        "block_number",
+        "log_index",
+        "vault",
+        "user",
+        "sender",
+        "event",
+        "assets",
+        "shares",
+    ],
+)
+
+AuctionRecord = namedtuple(
+    "AuctionRecord",
+    [
+        "block_number",
+        "log_index",
+        "vault",
+        "executor",
+        "delta_real_collateral_assets",
+        "delta_real_borrow_assets",
+    ],
+)
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps committed transactions durable against crashes with NORMAL
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _to_json_value(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        return value
+    return str(value)
+
+
+def get_cursors(connection):
+    """{vault: last indexed block number}"""
+    return dict(connection.execute("SELECT vault, block_number FROM cursors"))
+
+
+def insert_logs(connection, logs, cursors):
+    """Inserts IndexedLog records and moves the cursors, in one transaction"""
+    log_rows = []
+    flow_rows = []
+    auction_rows = []
+    for log in logs:
+        position = (log.block_number, log.log_index, log.vault)
+        log_rows.append(
+            position
+            + (
+                log.transaction_hash,
+                log.event,
+                json.dumps({k: _to_json_value(v) for k, v in log.args.items()}),
+            )
+        )
+        if log.event in FLOW_EVENTS:
+            assets_argument, _ = FLOW_EVENTS[log.event]
+            flow_rows.append(
+                position
+                + (
+                    log.args["owner"],
+                    log.args["sender"],
+                    log.event,
+                    str(log.args[assets_argument]),
+                    str(log.args["shares"]),
+                )
+            )
+        elif log.event == AUCTION_EVENT:
+            auction_rows.append(
+                position
+                + (
+                    log.args["executor"],
+                    str(log.args["deltaRealCollateralAssets"]),
+                    str(log.args["deltaRealBorrowAssets"]),
+                )
+            )
+    with connection:
+        connection.executemany(
+            "INSERT OR IGNORE INTO logs VALUES (?, ?, ?, ?, ?, ?)", log_rows
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO flows VALUES (?, ?, ?, ?, ?, ?, ?, ?)", flow_rows
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO auctions VALUES (?, ?, ?, ?, ?, ?)", auction_rows
+        )
+        connection.executemany(
+            "INSERT INTO cursors VALUES (?, ?) ON CONFLICT (vault) "
+            "DO UPDATE SET block_number = excluded.block_number",
+            cursors.items(),
+        )
+
+
+def _get_range_filter(from_block, to_block):
+    conditions = []
+    params = []
+    if from_block is not None:
+        conditions.append("block_number >= ?")
+        params.append(from_block)
+    if to_block is not None:
+        conditions.append("block_number <= ?")
+        params.append(to_block)
+    return conditions, params
+
+
+def get_user_flows(connection, user, vault=None, from_block=None, to_block=None):
+    """Flow records of the shares of user, in chain order"""
+    conditions, params = _get_range_filter(from_block, to_block)
+    conditions.append("user = ?")
+    params.append(user.lower())
+    if vault is not None:
+        conditions.append("vault = ?")
+        params.append(vault.lower())
+    rows = connection.execute(
+        f"SELECT * FROM flows WHERE {' AND '.join(conditions)} "
+        "ORDER BY block_number, log_index",
+        params,
+    )
+    return [Flow(*row[:6], int(row[6]), int(row[7])) for row in rows]
+
+
+def summarize_flows(flows):
+    """
+    {vault: {event: total assets, "shares": net minted shares}} of Flow
+    records; share transfers are not flows and are not counted
+    """
+    summary = {}
+    for flow in flows:
+        vault = summary.setdefault(flow.vault, {"shares": 0})
+        vault[flow.event] = vault.get(flow.event, 0) + flow.assets
+        minted = FLOW_EVENTS[flow.event][1]
+        vault["shares"] += flow.shares if minted else -flow.shares
+    return summary
+
+
+def get_auction_history(connection, vault=None, from_block=None, to_block=None):
+    """AuctionRecord of the auction executions, in chain order"""
+    conditions, params = _get_range_filter(from_block, to_block)
+    if vault is not None:
+        conditions.append("vault = ?")
+        params.append(vault.lower())
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    rows = connection.execute(
+        f"SELECT * FROM auctions {where}ORDER BY block_number, log_index", params
+    )
+    return [AuctionRecord(*row[:4], int(row[4]), int(row[5])) for row in rows]
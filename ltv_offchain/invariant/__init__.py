@@ -0,0 +1,3 @@
+"""
+Parallel invariant runs with regression capture of their failures
+"""
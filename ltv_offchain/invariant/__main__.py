@@ -0,0 +1,186 @@
+"""
+Sharded invariant runner CLI
+
+    python -m ltv_offchain.invariant run --budget 600
+    python -m ltv_offchain.invariant run --suites BasicInvariantTest --jobs 16 --seed 42
+
+run spreads invariant suites and fuzz seeds over forge processes, merges their
+results and writes every new failure, shrunk by replaying it with fewer calls,
+as a regression test of test/invariant/findings.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from ltv_offchain.invariant.findings import (
+    FINDINGS_DIR,
+    deduplicate,
+    get_finding_path,
+    write_regression,
+)
+from ltv_offchain.invariant.runner import run_shards, shrink
+from ltv_offchain.invariant.suites import (
+    INVARIANT_TEST_DIR,
+    discover_suites,
+    get_suite_source,
+)
+
+
+def _select_suites(test_dir, names):
+    suites = discover_suites(test_dir)
+    if not names:
+        return suites
+    by_contract = {suite.contract: suite for suite in suites}
+    unknown = [name for name in names if name not in by_contract]
+    if unknown:
+        print(f"ERROR unknown suites {', '.join(unknown)}")
+        sys.exit(1)
+    return [by_contract[name] for name in names]
+
+
+def _summarize(job_results):
+    """{suite contract: {jobs, runs, calls, failures, errors}}"""
+    summary = {}
+    for result in job_results:
+        suite = summary.setdefault(
+            result.job.suite.contract,
+            {"jobs": 0, "runs": 0, "calls": 0, "failures": 0, "errors": 0},
+        )
+        suite["jobs"] += 1
+        suite["errors"] += result.error is not None
+        for status, runs, calls in result.results.values():
+            suite["runs"] += runs
+            suite["calls"] += calls
+            suite["failures"] += status == "Failure"
+    return summary
+
+
+def run(args):
+    suites = _select_suites(
+        args.test_dir, args.suites.split(",") if args.suites else []
+    )
+    if not suites:
+        print(f"ERROR no invariant suite found in {args.test_dir}")
+        sys.exit(1)
+    if args.jobs is None and args.budget is None:
+        args.jobs = len(suites)
+
+    if not args.no_build:
+        process = subprocess.run(["forge", "build"], text=True, capture_output=True)
+        if process.returncode != 0:
+            print(process.stderr)
+            print("ERROR forge build failed")
+            sys.exit(1)
+
+    start = time.monotonic()
+    job_results = run_shards(
+        suites,
+        args.seed,
+        args.workers,
+        jobs=args.jobs,
+        budget=args.budget,
+        runs=args.runs,
+        depth=args.depth,
+    )
+    summary = _summarize(job_results)
+    for contract, suite in summary.items():
+        print(
+            f"{contract}: {suite['jobs']} jobs, {suite['runs']} runs, "
+            f"{suite['calls']} calls, {suite['failures']} failures, "
+            f"{suite['errors']} errors"
+        )
+    print(f"{len(job_results)} jobs in {time.monotonic() - start:.0f}s")
+
+    findings = deduplicate(
+        finding for result in job_results for finding in result.findings
+    )
+    written = []
+    for finding in findings:
+        path = get_finding_path(finding, args.findings_dir)
+        if os.path.exists(path):
+            print(f"Known finding {path}")
+            continue
+        source = get_suite_source(finding.suite)
+        os.makedirs(args.findings_dir, exist_ok=True)
+        calls = shrink(finding, source, args.findings_dir, args.shrink_attempts)
+        written.append(write_regression(finding, source, args.findings_dir, calls))
+        print(
+            f"New finding {path}: {finding.invariant}, "
+            f"{len(finding.calls)} calls shrunk to {len(calls)}"
+        )
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(
+                {
+                    "seed": args.seed,
+                    "suites": summary,
+                    "findings": [
+                        get_finding_path(finding, args.findings_dir)
+                        for finding in findings
+                    ],
+                    "written": written,
+                },
+                f,
+                indent=2,
+            )
+
+    if findings or any(suite["errors"] for suite in summary.values()):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV invariant runner")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run invariant suites on parallel forge processes"
+    )
+    run_parser.add_argument(
+        "--test-dir", help="Directory of the suites", default=INVARIANT_TEST_DIR
+    )
+    run_parser.add_argument(
+        "--suites", help="Comma separated suite contracts, all by default"
+    )
+    run_parser.add_argument(
+        "--seed", help="Fuzz seed of the first job", type=int, default=0
+    )
+    run_parser.add_argument(
+        "--jobs", help="Jobs to run, one per suite by default", type=int
+    )
+    run_parser.add_argument(
+        "--budget", help="Wall clock seconds to keep starting jobs", type=float
+    )
+    run_parser.add_argument(
+        "--workers",
+        help="Parallel forge processes",
+        type=int,
+        default=os.cpu_count() or 1,
+    )
+    run_parser.add_argument("--runs", help="Invariant runs per job", type=int)
+    run_parser.add_argument("--depth", help="Calls per invariant run", type=int)
+    run_parser.add_argument(
+        "--shrink-attempts",
+        help="Replays tried to shrink each new finding, 0 to disable",
+        type=int,
+        default=32,
+    )
+    run_parser.add_argument(
+        "--findings-dir", help="Directory of regression tests", default=FINDINGS_DIR
+    )
+    run_parser.add_argument(
+        "--no-build", help="Skip the initial forge build", action="store_true"
+    )
+    run_parser.add_argument("--report", help="JSON summary output file")
+    run_parser.set_defaults(handler=run)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Invariant failures and their regression tests
+
+Failures are read from the forge test --json output of a shard, keyed by
+suite, invariant and normalized failure reason so the same bug found by many
+seeds gives one finding, the shortest call sequence being kept. A finding is
+written to test/invariant/findings as a contract made of the suite source
+without its invariant functions and one test replaying the call sequence
+through BaseInvariantTest.replay.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+FINDINGS_DIR = "test/invariant/findings"
+
+Call = namedtuple(
+    "Call", ["sender", "target", "calldata", "function", "args", "warp", "roll"]
+)
+
+Finding = namedtuple(
+    "Finding", ["suite", "invariant", "reason", "seed", "calls", "original_length"]
+)
+
+# Numbers and addresses of failure reasons differ from one seed to another
+REASON_NUMBER_PATTERN = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+def normalize_reason(reason):
+    return REASON_NUMBER_PATTERN.sub("N", " ".join((reason or "").split()))
+
+
+def get_finding_key(finding):
+    return (
+        finding.suite.contract,
+        finding.invariant,
+        normalize_reason(finding.reason),
+    )
+
+
+def get_finding_id(finding):
+    return hashlib.sha256("\0".join(get_finding_key(finding)).encode()).hexdigest()[:8]
+
+
+def get_finding_contract_name(finding):
+    return f"{finding.suite.contract}Finding{get_finding_id(finding)}"
+
+
+def _parse_int(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return int(value, 16) if value.startswith("0x") else int(value)
+    return int(value)
+
+
+def _parse_call(item):
+    return Call(
+        sender=item.get("sender"),
+        target=item.get("addr"),
+        calldata=item["calldata"],
+        function=item.get("func_name") or item.get("signature"),
+        args=item.get("args"),
+        warp=_parse_int(item.get("warp")),
+        roll=_parse_int(item.get("roll")),
+    )
+
+
+def _parse_sequence(counterexample):
+    """(calls, length before forge shrinking) of a counterexample"""
+    sequence = counterexample
+    if isinstance(counterexample, dict):
+        sequence = counterexample.get("Sequence")
+        if sequence is None:
+            return None, None
+    # serialized as [original length, calls] by recent forge versions
+    if (
+        isinstance(sequence, list)
+        and len(sequence) == 2
+        and isinstance(sequence[0], int)
+        and isinstance(sequence[1], list)
+    ):
+        original_length, sequence = sequence
+    else:
+        original_length = len(sequence)
+    return [_parse_call(item) for item in sequence], original_length
+
+
+def parse_results(output, suite, seed):
+    """
+    (test results, [Finding]) of the forge test --json output of one suite,
+    test results being {test name: (status, runs, calls)}
+    """
+    results = {}
+    findings = []
+    for contract_id, contract_results in json.loads(output).items():
+        if contract_id.split(":")[-1] != suite.contract:
+            continue
+        for test_name, result in contract_results.get("test_results", {}).items():
+            invariant = (result.get("kind") or {}).get("Invariant") or {}
+            status = result.get("status")
+            results[test_name] = (
+                status,
+                invariant.get("runs", 0),
+                invariant.get("calls", 0),
+            )
+            if status != "Failure" or not result.get("counterexample"):
+                continue
+            calls, original_length = _parse_sequence(result["counterexample"])
+            if not calls:
+                continue
+            findings.append(
+                Finding(
+                    suite=suite,
+                    invariant=test_name.split("(")[0],
+                    reason=result.get("reason") or "",
+                    seed=seed,
+                    calls=calls,
+                    original_length=original_length,
+                )
+            )
+    return results, findings
+
+
+def deduplicate(findings):
+    """Shortest finding of every finding key, in first seen order"""
+    unique = {}
+    for finding in findings:
+        key = get_finding_key(finding)
+        if key not in unique or len(finding.calls) < len(unique[key].calls):
+            unique[key] = finding
+    return list(unique.values())
+
+
+def _render_address(address):
+    # uint160 literals need no EIP-55 checksum
+    return f"address(uint160({address}))"
+
+
+def _render_call(call):
+    lines = []
+    if call.function:
+        lines.append(f"        // {call.function}({call.args or ''})")
+    if call.warp:
+        lines.append(f"        vm.warp(block.timestamp + {call.warp});")
+    if call.roll:
+        lines.append(f"        vm.roll(block.number + {call.roll});")
+    sender = _render_address(call.sender) if call.sender else "address(this)"
+    calldata = call.calldata[2:] if call.calldata.startswith("0x") else call.calldata
+    lines.append(f'        replay({sender}, hex"{calldata}");')
+    return "\n".join(lines)
+
+
+def render_regression(finding, source, calls=None, contract=None):
+    """Solidity regression test of a finding, source being its SuiteSource"""
+    calls = finding.calls if calls is None else calls
+    contract = contract or get_finding_contract_name(finding)
+    reason = " ".join(finding.reason.split()).replace("*/", "* /")
+    test_name = f"test_{finding.invariant[len('invariant_'):]}Regression"
+    lines = [
+        "// SPDX-License-Identifier: BUSL-1.1",
+        "pragma solidity ^0.8.28;",
+        "",
+        *source.imports,
+        "",
+        "/**",
+        f" * @title {contract}",
+        f" * @dev {finding.invariant} failure of {finding.suite.contract} found with fuzz",
+        f" * seed {finding.seed}, shrunk from {finding.original_length} to {len(calls)} calls.",
+        f" * Reason: {reason}",
+        " */",
+        f"contract {contract} is {source.parents} {{",
+    ]
+    if source.body.strip():
+        lines += [source.body, ""]
+    lines.append(f"    function {test_name}() public {{")
+    lines += [_render_call(call) for call in calls]
+    lines += ["    }", "}", ""]
+    return "\n".join(lines)
+
+
+def get_finding_path(finding, findings_dir=FINDINGS_DIR):
+    return os.path.join(findings_dir, f"{get_finding_contract_name(finding)}.t.sol")
+
+
+def write_regression(finding, source, findings_dir=FINDINGS_DIR, calls=None):
+    """Writes the regression of a finding, returns its path or None if known"""
+    path = get_finding_path(finding, findings_dir)
+    if os.path.exists(path):
+        return None
+    os.makedirs(findings_dir, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(render_regression(finding, source, calls))
+    return path
@@ -0,0 +1,191 @@
+"""
+Sharded invariant runs
+
+A job is one suite run with one fuzz seed in its own forge process, so suites
+and seed ranges spread over all cores instead of sharing one forge invocation
+and one seed space. Jobs are scheduled round robin over the suites until the
+job count or the wall clock budget is spent. Every job gets its own failure
+persist directory so forge does not replay the failures of another shard.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ltv_offchain.invariant.findings import (
+    get_finding_contract_name,
+    normalize_reason,
+    parse_results,
+    render_regression,
+)
+
+Job = namedtuple("Job", ["suite", "seed"])
+
+JobResult = namedtuple("JobResult", ["job", "results", "findings", "duration", "error"])
+
+
+def get_forge_test_command(path, contract, seed=None):
+    command = [
+        "forge",
+        "test",
+        "--match-path",
+        path,
+        "--match-contract",
+        f"^{contract}$",
+        "--json",
+    ]
+    if seed is not None:
+        command += ["--fuzz-seed", str(seed)]
+    return command
+
+
+def _get_env(persist_dir, runs=None, depth=None):
+    env = dict(os.environ)
+    env["FOUNDRY_INVARIANT_FAILURE_PERSIST_DIR"] = persist_dir
+    if runs is not None:
+        env["FOUNDRY_INVARIANT_RUNS"] = str(runs)
+    if depth is not None:
+        env["FOUNDRY_INVARIANT_DEPTH"] = str(depth)
+    return env
+
+
+def _get_json_output(stdout):
+    # forge may print compilation lines before the JSON document
+    start = stdout.find("{")
+    return stdout[start:] if start != -1 else ""
+
+
+def run_job(job, runs=None, depth=None, timeout=None):
+    """JobResult of one forge process"""
+    start = time.monotonic()
+    with tempfile.TemporaryDirectory(prefix="invariant-failures-") as persist_dir:
+        try:
+            process = subprocess.run(
+                get_forge_test_command(job.suite.path, job.suite.contract, job.seed),
+                env=_get_env(persist_dir, runs, depth),
+                text=True,
+                capture_output=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return JobResult(job, {}, [], time.monotonic() - start, "timeout")
+    duration = time.monotonic() - start
+
+    output = _get_json_output(process.stdout)
+    if not output:
+        error = process.stderr.strip().splitlines()
+        return JobResult(
+            job, {}, [], duration, error[-1] if error else "no forge output"
+        )
+    try:
+        results, findings = parse_results(output, job.suite, job.seed)
+    except ValueError as e:
+        return JobResult(job, {}, [], duration, f"invalid forge output: {e}")
+    return JobResult(job, results, findings, duration, None)
+
+
+def iter_jobs(suites, seed, jobs=None):
+    """Jobs cycling over suites with consecutive seeds, endless without jobs"""
+    index = 0
+    while jobs is None or index < jobs:
+        yield Job(suites[index % len(suites)], seed + index)
+        index += 1
+
+
+def run_shards(
+    suites,
+    seed,
+    workers,
+    jobs=None,
+    budget=None,
+    runs=None,
+    depth=None,
+    log=print,
+):
+    """
+    Runs jobs on workers forge processes until jobs are done or budget
+    seconds are spent, returns the JobResult of every finished job
+    """
+    if jobs is None and budget is None:
+        raise ValueError("jobs or budget is required")
+    deadline = None if budget is None else time.monotonic() + budget
+    pending_jobs = iter_jobs(suites, seed, jobs)
+    job_results = []
+
+    def remaining():
+        return None if deadline is None else deadline - time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = set()
+        while True:
+            while len(running) < workers and (remaining() is None or remaining() > 0):
+                job = next(pending_jobs, None)
+                if job is None:
+                    break
+                running.add(executor.submit(run_job, job, runs, depth, remaining()))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                job_results.append(result)
+                status = result.error or (
+                    f"{len(result.findings)} failures" if result.findings else "ok"
+                )
+                log(
+                    f"{result.job.suite.contract} seed {result.job.seed}: "
+                    f"{status} in {result.duration:.0f}s"
+                )
+    return job_results
+
+
+def _replays_failure(finding, source, calls, findings_dir, timeout):
+    """True when the regression of calls fails like the finding"""
+    contract = f"{get_finding_contract_name(finding)}Shrink"
+    path = os.path.join(findings_dir, f"{contract}.t.sol")
+    with open(path, "w") as f:
+        f.write(render_regression(finding, source, calls, contract))
+    try:
+        process = subprocess.run(
+            get_forge_test_command(path, contract),
+            text=True,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    finally:
+        os.remove(path)
+
+    output = _get_json_output(process.stdout)
+    if not output:
+        return False
+    for contract_results in json.loads(output).values():
+        for result in contract_results.get("test_results", {}).values():
+            if result.get("status") != "Failure":
+                continue
+            return not finding.reason or normalize_reason(
+                result.get("reason")
+            ) == normalize_reason(finding.reason)
+    return False
+
+
+def shrink(finding, source, findings_dir, attempts, timeout=None):
+    """
+    Calls of a finding after greedily dropping the calls its regression test
+    still fails without, replaying at most attempts candidates with forge
+    """
+    calls = list(finding.calls)
+    index = 0
+    while index < len(calls) and attempts > 0 and len(calls) > 1:
+        candidate = calls[:index] + calls[index + 1 :]
+        attempts -= 1
+        if _replays_failure(finding, source, candidate, findings_dir, timeout):
+            calls = candidate
+        else:
+            index += 1
+    return calls
@@ -0,0 +1,102 @@
+"""
+Invariant suites of test/invariant
+
+A suite is a contract of a test/invariant/*.t.sol file declaring invariant_
+functions. Regression tests of a suite are made of its source without the
+invariant functions, so forge runs them as plain tests instead of starting a
+new invariant campaign.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+INVARIANT_TEST_DIR = "test/invariant"
+
+Suite = namedtuple("Suite", ["path", "contract", "invariants"])
+
+# Source of a suite: import lines, inheritance list and contract body
+SuiteSource = namedtuple("SuiteSource", ["imports", "parents", "body"])
+
+CONTRACT_PATTERN = re.compile(r"^contract\s+(\w+)\s+is\s+([^{]+?)\s*\{", re.M)
+INVARIANT_PATTERN = re.compile(r"function\s+(invariant_\w+)\s*\(")
+IMPORT_PATTERN = re.compile(r"^import\s.*?;", re.M | re.S)
+
+
+def _get_contract_body(source, match):
+    """(start, end) of the body of a CONTRACT_PATTERN match, braces excluded"""
+    depth = 1
+    index = match.end()
+    while depth:
+        if index >= len(source):
+            raise ValueError(f"unbalanced braces in contract {match.group(1)}")
+        if source[index] == "{":
+            depth += 1
+        elif source[index] == "}":
+            depth -= 1
+        index += 1
+    return match.end(), index - 1
+
+
+def discover_suites(test_dir=INVARIANT_TEST_DIR):
+    """Suites of the .t.sol files directly in test_dir, sorted by path"""
+    suites = []
+    for file_name in sorted(os.listdir(test_dir)):
+        if not file_name.endswith(".t.sol"):
+            continue
+        path = os.path.join(test_dir, file_name)
+        with open(path, "r") as f:
+            source = f.read()
+        for match in CONTRACT_PATTERN.finditer(source):
+            start, end = _get_contract_body(source, match)
+            invariants = INVARIANT_PATTERN.findall(source[start:end])
+            if invariants:
+                suites.append(Suite(path, match.group(1), invariants))
+    return suites
+
+
+def _strip_function(body, start):
+    """body without the function starting at start and its leading comments"""
+    brace = body.index("{", start)
+    depth = 1
+    end = brace + 1
+    while depth:
+        if body[end] == "{":
+            depth += 1
+        elif body[end] == "}":
+            depth -= 1
+        end += 1
+
+    lines = body[:start].split("\n")
+    # the function line itself starts after the last newline
+    head = lines.pop()
+    while lines and (
+        not lines[-1].strip() or lines[-1].strip().startswith(("//", "/*", "*"))
+    ):
+        lines.pop()
+    prefix = "\n".join(lines)
+    if head.strip():
+        prefix += "\n" + head
+    return prefix + "\n" + body[end:].lstrip("\n")
+
+
+def get_suite_source(suite):
+    """SuiteSource of a suite, its body having no invariant function"""
+    with open(suite.path, "r") as f:
+        source = f.read()
+    for match in CONTRACT_PATTERN.finditer(source):
+        if match.group(1) != suite.contract:
+            continue
+        start, end = _get_contract_body(source, match)
+        body = source[start:end]
+        while True:
+            invariant = re.search(r"^[ \t]*function\s+invariant_\w+\s*\(", body, re.M)
+            if invariant is None:
+                break
+            body = _strip_function(body, invariant.start())
+        return SuiteSource(
+            imports=IMPORT_PATTERN.findall(source),
+            parents=" ".join(match.group(2).split()),
+            body=body.strip("\n"),
+        )
+    raise ValueError(f"contract {suite.contract} not found in {suite.path}")
@@ -0,0 +1,6 @@
+"""
+Exact integer port of src/math/libraries
+
+Every function mirrors its Solidity counterpart, including checked int256
+arithmetic and mulDiv rounding, so results and reverts are bit-identical.
+"""
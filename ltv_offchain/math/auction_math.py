@@ -0,0 +1,314 @@
+"""
+Port of AuctionMath.sol
+"""
+
+from ltv_offchain.math.errors import (
+    NoAuctionForProvidedDeltaFutureBorrow,
+    NoAuctionForProvidedDeltaFutureCollateral,
+    UnexpectedDeltaUserBorrowAssets,
+    UnexpectedDeltaUserCollateralAssets,
+)
+from ltv_offchain.math.mul_div import s_mul_div_down, s_mul_div_up
+from ltv_offchain.math.solidity import checked
+from ltv_offchain.math.structs import DeltaAuctionState
+
+
+def _calculate_delta_future_borrow_assets_from_delta_user_borrow_assets(
+    delta_user_borrow_assets,
+    future_borrow_assets,
+    future_reward_borrow_assets,
+    auction_step,
+    auction_duration,
+):
+    divider = checked(
+        future_borrow_assets
+        + s_mul_div_up(future_reward_borrow_assets, auction_step, auction_duration)
+    )
+    if divider == 0:
+        return checked(-future_borrow_assets)
+    return s_mul_div_down(delta_user_borrow_assets, future_borrow_assets, divider)
+
+
+def _calculate_delta_future_collateral_assets_from_delta_user_collateral_assets(
+    delta_user_collateral_assets,
+    future_collateral_assets,
+    future_reward_collateral_assets,
+    auction_step,
+    auction_duration,
+):
+    divider = checked(
+        future_collateral_assets
+        + s_mul_div_down(
+            future_reward_collateral_assets, auction_step, auction_duration
+        )
+    )
+    if divider == 0:
+        return checked(-future_collateral_assets)
+    return s_mul_div_up(delta_user_collateral_assets, future_collateral_assets, divider)
+
+
+def available_delta_user_borrow_assets(
+    future_reward_borrow_assets, auction_step, auction_duration, future_borrow_assets
+):
+    delta_user_reward_borrow_assets = s_mul_div_down(
+        checked(-future_reward_borrow_assets), auction_step, auction_duration
+    )
+    return checked(future_borrow_assets - delta_user_reward_borrow_assets)
+
+
+def available_delta_user_collateral_assets(
+    future_reward_collateral_assets,
+    auction_step,
+    auction_duration,
+    future_collateral_assets,
+):
+    user_reward_collateral_assets = s_mul_div_up(
+        checked(-future_reward_collateral_assets), auction_step, auction_duration
+    )
+    return checked(future_collateral_assets - user_reward_collateral_assets)
+
+
+def _is_within_auction_size(available_assets, delta_user_assets):
+    # -delta is only evaluated where Solidity's short-circuit evaluates it
+    return (
+        available_assets > 0 and available_assets >= checked(-delta_user_assets)
+    ) or (available_assets < 0 and available_assets <= checked(-delta_user_assets))
+
+
+def calculate_execute_auction_collateral(delta_user_collateral_assets, data):
+    """Returns the DeltaAuctionState of executeAuctionCollateral for an AuctionData"""
+    has_opposite_sign = (
+        checked(data.future_collateral_assets * delta_user_collateral_assets) < 0
+    )
+    available_collateral_assets = available_delta_user_collateral_assets(
+        data.future_reward_collateral_assets,
+        data.auction_step,
+        data.auction_duration,
+        data.future_collateral_assets,
+    )
+    if not (
+        has_opposite_sign
+        and _is_within_auction_size(
+            available_collateral_assets, delta_user_collateral_assets
+        )
+    ):
+        raise NoAuctionForProvidedDeltaFutureCollateral(
+            data.future_collateral_assets,
+            data.future_reward_collateral_assets,
+            delta_user_collateral_assets,
+        )
+
+    delta_future_borrow_assets = 0
+    delta_user_borrow_assets = 0
+    delta_user_future_reward_collateral_assets = 0
+    delta_user_future_reward_borrow_assets = 0
+    delta_protocol_future_reward_collateral_assets = 0
+    delta_protocol_future_reward_borrow_assets = 0
+
+    if delta_user_collateral_assets > 0:
+        delta_future_collateral_assets = delta_user_collateral_assets
+        delta_future_borrow_assets = s_mul_div_up(
+            delta_future_collateral_assets,
+            data.future_borrow_assets,
+            data.future_collateral_assets,
+        )
+        if delta_future_borrow_assets == checked(-data.future_borrow_assets):
+            delta_future_collateral_assets = checked(-data.future_collateral_assets)
+
+        delta_future_reward_borrow_assets = s_mul_div_up(
+            data.future_reward_borrow_assets,
+            delta_future_borrow_assets,
+            data.future_borrow_assets,
+        )
+        delta_user_future_reward_borrow_assets = s_mul_div_down(
+            delta_future_reward_borrow_assets,
+            data.auction_step,
+            data.auction_duration,
+        )
+        delta_protocol_future_reward_borrow_assets = checked(
+            delta_future_reward_borrow_assets - delta_user_future_reward_borrow_assets
+        )
+        delta_user_borrow_assets = checked(
+            delta_future_borrow_assets + delta_user_future_reward_borrow_assets
+        )
+    else:
+        delta_future_collateral_assets = (
+            _calculate_delta_future_collateral_assets_from_delta_user_collateral_assets(
+                delta_user_collateral_assets,
+                data.future_collateral_assets,
+                data.future_reward_collateral_assets,
+                data.auction_step,
+                data.auction_duration,
+            )
+        )
+        delta_future_borrow_assets = s_mul_div_up(
+            delta_future_collateral_assets,
+            data.future_borrow_assets,
+            data.future_collateral_assets,
+        )
+        delta_user_borrow_assets = delta_future_borrow_assets
+
+        if delta_future_borrow_assets == checked(
+            -data.future_borrow_assets
+        ) and delta_future_collateral_assets != checked(-data.future_collateral_assets):
+            delta_future_collateral_assets = checked(-data.future_collateral_assets)
+            delta_future_reward_collateral_assets = s_mul_div_down(
+                data.future_reward_collateral_assets,
+                delta_future_collateral_assets,
+                data.future_collateral_assets,
+            )
+            delta_user_future_reward_collateral_assets = s_mul_div_up(
+                delta_future_reward_collateral_assets,
+                data.auction_step,
+                data.auction_duration,
+            )
+        else:
+            delta_future_reward_collateral_assets = s_mul_div_down(
+                data.future_reward_collateral_assets,
+                delta_future_collateral_assets,
+                data.future_collateral_assets,
+            )
+            delta_user_future_reward_collateral_assets = checked(
+                delta_user_collateral_assets - delta_future_collateral_assets
+            )
+        delta_protocol_future_reward_collateral_assets = checked(
+            delta_future_reward_collateral_assets
+            - delta_user_future_reward_collateral_assets
+        )
+
+    user_collateral_assets = checked(
+        delta_future_collateral_assets + delta_user_future_reward_collateral_assets
+    )
+    if not delta_user_collateral_assets <= user_collateral_assets:
+        raise UnexpectedDeltaUserCollateralAssets(
+            delta_user_collateral_assets, user_collateral_assets
+        )
+
+    return DeltaAuctionState(
+        delta_future_borrow_assets=delta_future_borrow_assets,
+        delta_future_collateral_assets=delta_future_collateral_assets,
+        delta_user_collateral_assets=delta_user_collateral_assets,
+        delta_user_borrow_assets=delta_user_borrow_assets,
+        delta_user_future_reward_collateral_assets=delta_user_future_reward_collateral_assets,
+        delta_user_future_reward_borrow_assets=delta_user_future_reward_borrow_assets,
+        delta_protocol_future_reward_collateral_assets=delta_protocol_future_reward_collateral_assets,
+        delta_protocol_future_reward_borrow_assets=delta_protocol_future_reward_borrow_assets,
+    )
+
+
+def calculate_execute_auction_borrow(delta_user_borrow_assets, data):
+    """Returns the DeltaAuctionState of executeAuctionBorrow for an AuctionData"""
+    has_opposite_sign = (
+        checked(data.future_borrow_assets * delta_user_borrow_assets) < 0
+    )
+    available_borrow_assets = available_delta_user_borrow_assets(
+        data.future_reward_borrow_assets,
+        data.auction_step,
+        data.auction_duration,
+        data.future_borrow_assets,
+    )
+    if not (
+        has_opposite_sign
+        and _is_within_auction_size(available_borrow_assets, delta_user_borrow_assets)
+    ):
+        raise NoAuctionForProvidedDeltaFutureBorrow(
+            data.future_borrow_assets,
+            data.future_reward_borrow_assets,
+            delta_user_borrow_assets,
+        )
+
+    delta_user_collateral_assets = 0
+    delta_user_future_reward_collateral_assets = 0
+    delta_user_future_reward_borrow_assets = 0
+    delta_protocol_future_reward_collateral_assets = 0
+    delta_protocol_future_reward_borrow_assets = 0
+
+    if delta_user_borrow_assets > 0:
+        delta_future_borrow_assets = (
+            _calculate_delta_future_borrow_assets_from_delta_user_borrow_assets(
+                delta_user_borrow_assets,
+                data.future_borrow_assets,
+                data.future_reward_borrow_assets,
+                data.auction_step,
+                data.auction_duration,
+            )
+        )
+        delta_future_collateral_assets = s_mul_div_down(
+            delta_future_borrow_assets,
+            data.future_collateral_assets,
+            data.future_borrow_assets,
+        )
+        delta_user_collateral_assets = delta_future_collateral_assets
+
+        if delta_future_collateral_assets == checked(
+            -data.future_collateral_assets
+        ) and delta_future_borrow_assets != checked(-data.future_borrow_assets):
+            delta_future_borrow_assets = checked(-data.future_borrow_assets)
+            delta_future_reward_borrow_assets = s_mul_div_up(
+                data.future_reward_borrow_assets,
+                delta_future_borrow_assets,
+                data.future_borrow_assets,
+            )
+            delta_user_future_reward_borrow_assets = s_mul_div_down(
+                delta_future_reward_borrow_assets,
+                data.auction_step,
+                data.auction_duration,
+            )
+        else:
+            delta_future_reward_borrow_assets = s_mul_div_up(
+                data.future_reward_borrow_assets,
+                delta_future_borrow_assets,
+                data.future_borrow_assets,
+            )
+            delta_user_future_reward_borrow_assets = checked(
+                delta_user_borrow_assets - delta_future_borrow_assets
+            )
+        delta_protocol_future_reward_borrow_assets = checked(
+            delta_future_reward_borrow_assets - delta_user_future_reward_borrow_assets
+        )
+    else:
+        delta_future_borrow_assets = delta_user_borrow_assets
+        delta_future_collateral_assets = s_mul_div_down(
+            delta_future_borrow_assets,
+            data.future_collateral_assets,
+            data.future_borrow_assets,
+        )
+        if delta_future_collateral_assets == checked(-data.future_collateral_assets):
+            delta_future_borrow_assets = checked(-data.future_borrow_assets)
+
+        delta_future_reward_collateral_assets = s_mul_div_down(
+            data.future_reward_collateral_assets,
+            delta_future_collateral_assets,
+            data.future_collateral_assets,
+        )
+        delta_user_future_reward_collateral_assets = s_mul_div_up(
+            delta_future_reward_collateral_assets,
+            data.auction_step,
+            data.auction_duration,
+        )
+        delta_protocol_future_reward_collateral_assets = checked(
+            delta_future_reward_collateral_assets
+            - delta_user_future_reward_collateral_assets
+        )
+        delta_user_collateral_assets = checked(
+            delta_future_collateral_assets + delta_user_future_reward_collateral_assets
+        )
+
+    user_borrow_assets = checked(
+        delta_future_borrow_assets + delta_user_future_reward_borrow_assets
+    )
+    if not delta_user_borrow_assets >= user_borrow_assets:
+        raise UnexpectedDeltaUserBorrowAssets(
+            delta_user_borrow_assets, user_borrow_assets
+        )
+
+    return DeltaAuctionState(
+        delta_future_borrow_assets=delta_future_borrow_assets,
+        delta_future_collateral_assets=delta_future_collateral_assets,
+        delta_user_collateral_assets=delta_user_collateral_assets,
+        delta_user_borrow_assets=delta_user_borrow_assets,
+        delta_user_future_reward_collateral_assets=delta_user_future_reward_collateral_assets,
+        delta_user_future_reward_borrow_assets=delta_user_future_reward_borrow_assets,
+        delta_protocol_future_reward_collateral_assets=delta_protocol_future_reward_collateral_assets,
+        delta_protocol_future_reward_borrow_assets=delta_protocol_future_reward_borrow_assets,
+    )
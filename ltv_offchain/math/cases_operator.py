@@ -0,0 +1,23 @@
+"""
+Port of CasesOperator.sol
+"""
+
+from ltv_offchain.math.structs import Cases
+
+_CASES = tuple(
+    Cases(
+        cna=int(ncase == 6),
+        cmcb=int(ncase == 0),
+        cmbc=int(ncase == 1),
+        cecb=int(ncase == 2),
+        cebc=int(ncase == 3),
+        ceccb=int(ncase == 4),
+        cecbc=int(ncase == 5),
+        ncase=ncase,
+    )
+    for ncase in range(256)
+)
+
+
+def generate_case(ncase):
+    return _CASES[ncase]
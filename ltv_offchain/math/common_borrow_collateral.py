@@ -0,0 +1,186 @@
+"""
+Port of CommonBorrowCollateral.sol
+"""
+
+from ltv_offchain.math.constants import SLIPPAGE_PRECISION
+from ltv_offchain.math.mul_div import s_mul_div_down, s_mul_div_up
+from ltv_offchain.math.solidity import checked, to_int256
+
+
+def calculate_delta_future_borrow_from_delta_future_collateral(
+    ncase, future_collateral, future_borrow, delta_future_collateral
+):
+    delta_future_borrow = checked(
+        (ncase.cna + ncase.cmcb + ncase.cmbc + ncase.ceccb + ncase.cecbc)
+        * delta_future_collateral
+    )
+    delta_future_borrow = checked(
+        delta_future_borrow
+        + checked(
+            (ncase.ceccb + ncase.cecbc) * checked(future_collateral - future_borrow)
+        )
+    )
+
+    if future_collateral == 0:
+        return delta_future_borrow
+
+    return checked(
+        delta_future_borrow
+        + checked(
+            (ncase.cecb + ncase.cebc)
+            * s_mul_div_up(delta_future_collateral, future_borrow, future_collateral)
+        )
+    )
+
+
+def calculate_delta_future_collateral_from_delta_future_borrow(
+    ncase, future_collateral, future_borrow, delta_future_borrow
+):
+    delta_future_collateral = checked(
+        (ncase.cna + ncase.cmcb + ncase.cmbc + ncase.ceccb + ncase.cecbc)
+        * delta_future_borrow
+    )
+    delta_future_collateral = checked(
+        delta_future_collateral
+        + checked(
+            (ncase.ceccb + ncase.cecbc) * checked(future_borrow - future_collateral)
+        )
+    )
+
+    if future_borrow == 0:
+        return delta_future_collateral
+
+    return checked(
+        delta_future_collateral
+        + checked(
+            (ncase.cecb + ncase.cebc)
+            * s_mul_div_down(delta_future_borrow, future_collateral, future_borrow)
+        )
+    )
+
+
+def calculate_delta_user_future_reward_collateral(
+    ncase, future_collateral, user_future_reward_collateral, delta_future_collateral
+):
+    delta_user_future_reward_collateral = checked(
+        -ncase.ceccb * user_future_reward_collateral
+    )
+    if future_collateral == 0:
+        return delta_user_future_reward_collateral
+
+    return checked(
+        delta_user_future_reward_collateral
+        + checked(
+            ncase.cecb
+            * s_mul_div_down(
+                user_future_reward_collateral,
+                delta_future_collateral,
+                future_collateral,
+            )
+        )
+    )
+
+
+def calculate_delta_protocol_future_reward_collateral(
+    ncase,
+    future_collateral,
+    protocol_future_reward_collateral,
+    delta_future_collateral,
+):
+    delta_protocol_future_reward_collateral = checked(
+        -ncase.ceccb * protocol_future_reward_collateral
+    )
+    if future_collateral == 0:
+        return delta_protocol_future_reward_collateral
+
+    return checked(
+        delta_protocol_future_reward_collateral
+        + checked(
+            ncase.cecb
+            * s_mul_div_down(
+                protocol_future_reward_collateral,
+                delta_future_collateral,
+                future_collateral,
+            )
+        )
+    )
+
+
+def calculate_delta_future_payment_collateral(
+    ncase, future_collateral, delta_future_collateral, collateral_slippage
+):
+    collateral_slippage = to_int256(collateral_slippage)
+    delta_future_payment_collateral = checked(
+        -ncase.cmbc
+        * s_mul_div_up(delta_future_collateral, collateral_slippage, SLIPPAGE_PRECISION)
+    )
+    return checked(
+        delta_future_payment_collateral
+        - checked(
+            ncase.cecbc
+            * s_mul_div_up(
+                checked(delta_future_collateral + future_collateral),
+                collateral_slippage,
+                SLIPPAGE_PRECISION,
+            )
+        )
+    )
+
+
+def calculate_delta_user_future_reward_borrow(
+    ncase, future_borrow, user_future_reward_borrow, delta_future_borrow
+):
+    delta_user_future_reward_borrow = checked(-ncase.cecbc * user_future_reward_borrow)
+    if future_borrow == 0:
+        return delta_user_future_reward_borrow
+
+    return checked(
+        delta_user_future_reward_borrow
+        + checked(
+            ncase.cebc
+            * s_mul_div_up(
+                user_future_reward_borrow, delta_future_borrow, future_borrow
+            )
+        )
+    )
+
+
+def calculate_delta_protocol_future_reward_borrow(
+    ncase, future_borrow, protocol_future_reward_borrow, delta_future_borrow
+):
+    delta_protocol_future_reward_borrow = checked(
+        -ncase.cecbc * protocol_future_reward_borrow
+    )
+    if future_borrow == 0:
+        return delta_protocol_future_reward_borrow
+
+    return checked(
+        delta_protocol_future_reward_borrow
+        + checked(
+            ncase.cebc
+            * s_mul_div_up(
+                protocol_future_reward_borrow, delta_future_borrow, future_borrow
+            )
+        )
+    )
+
+
+def calculate_delta_future_payment_borrow(
+    ncase, future_borrow, delta_future_borrow, borrow_slippage
+):
+    borrow_slippage = to_int256(borrow_slippage)
+    delta_future_payment_borrow = checked(
+        -ncase.cmcb
+        * s_mul_div_down(delta_future_borrow, borrow_slippage, SLIPPAGE_PRECISION)
+    )
+    return checked(
+        delta_future_payment_borrow
+        - checked(
+            ncase.ceccb
+            * s_mul_div_down(
+                checked(delta_future_borrow + future_borrow),
+                borrow_slippage,
+                SLIPPAGE_PRECISION,
+            )
+        )
+    )
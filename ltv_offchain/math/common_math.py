@@ -0,0 +1,98 @@
+"""
+Port of CommonMath.sol
+"""
+
+from ltv_offchain.math.mul_div import s_mul_div, s_mul_div_down, s_mul_div_up
+from ltv_offchain.math.mul_div import u_mul_div
+from ltv_offchain.math.solidity import MathRevert, to_int256
+
+
+def convert_real_collateral(
+    real_collateral_assets, collateral_price, collateral_token_decimals, is_deposit
+):
+    return u_mul_div(
+        real_collateral_assets,
+        collateral_price,
+        10**collateral_token_decimals,
+        is_deposit,
+    )
+
+
+def convert_real_borrow(
+    real_borrow_assets, borrow_price, borrow_token_decimals, is_deposit
+):
+    return u_mul_div(
+        real_borrow_assets, borrow_price, 10**borrow_token_decimals, not is_deposit
+    )
+
+
+def convert_future_collateral(
+    future_collateral_assets, collateral_price, collateral_token_decimals, is_deposit
+):
+    return s_mul_div(
+        future_collateral_assets,
+        to_int256(collateral_price),
+        to_int256(10**collateral_token_decimals),
+        is_deposit,
+    )
+
+
+def convert_future_borrow(
+    future_borrow_assets, borrow_price, borrow_token_decimals, is_deposit
+):
+    return s_mul_div(
+        future_borrow_assets,
+        to_int256(borrow_price),
+        to_int256(10**borrow_token_decimals),
+        not is_deposit,
+    )
+
+
+def convert_future_reward_collateral(
+    future_reward_collateral_assets,
+    collateral_price,
+    collateral_token_decimals,
+    is_deposit,
+):
+    return s_mul_div(
+        future_reward_collateral_assets,
+        to_int256(collateral_price),
+        to_int256(10**collateral_token_decimals),
+        is_deposit,
+    )
+
+
+def convert_future_reward_borrow(
+    future_reward_borrow_assets, borrow_price, borrow_token_decimals, is_deposit
+):
+    return s_mul_div(
+        future_reward_borrow_assets,
+        to_int256(borrow_price),
+        to_int256(10**borrow_token_decimals),
+        not is_deposit,
+    )
+
+
+def calculate_auction_step(start_auction, block_number, auction_duration):
+    auction_step = block_number - start_auction
+    if auction_step < 0:
+        raise MathRevert("uint56 underflow")
+    if auction_step > auction_duration:
+        return auction_duration
+    return auction_step
+
+
+def calculate_user_future_reward_borrow(
+    future_reward_borrow_assets, auction_step, auction_duration
+):
+    return s_mul_div_up(
+        future_reward_borrow_assets, to_int256(auction_step), auction_duration
+    )
+
+
+def calculate_user_future_reward_collateral(
+    future_reward_collateral_assets, auction_step, auction_duration
+):
+    return s_mul_div_down(
+        future_reward_collateral_assets, to_int256(auction_step), auction_duration
+    )
@@ -0,0 +1,12 @@
+"""
+Port of src/constants/Constants.sol, math related constants only
+"""
+
+ORACLE_DIVIDER = 10**18
+SLIPPAGE_PRECISION = 10**18
+VIRTUAL_ASSETS_AMOUNT = 10**4
+DIVIDER_PRECISION = 10**18
+FUTURE_ADJUSTMENT_NUMERATOR = 10**5 + 1
+FUTURE_ADJUSTMENT_DENOMINATOR = 10**5
+UINT56_MAX = 2**56 - 1
+LAST_SEEN_PRICE_PRECISION = 10**18
@@ -0,0 +1,3 @@
+"""
+Port of src/math/libraries/delta_future_borrow
+"""
@@ -0,0 +1,268 @@
+"""
+Port of DeltaRealBorrowAndDeltaRealCollateral.sol
+"""
+
+from ltv_offchain.math.cases_operator import generate_case
+from ltv_offchain.math.constants import (
+    DIVIDER_PRECISION,
+    FUTURE_ADJUSTMENT_DENOMINATOR,
+    FUTURE_ADJUSTMENT_NUMERATOR,
+    SLIPPAGE_PRECISION,
+)
+from ltv_offchain.math.errors import (
+    DeltaRealBorrowAndDeltaRealCollateralUnexpectedError,
+)
+from ltv_offchain.math.mul_div import s_mul_div, s_mul_div_down, s_mul_div_up
+from ltv_offchain.math.solidity import checked, to_int256
+
+
+def _calculate_dividend(data, cases, need_to_round_up):
+    dividend = checked(-data.borrow)
+    dividend = checked(dividend - data.delta_real_borrow)
+    dividend = checked(
+        dividend
+        - checked(
+            (cases.ceccb + cases.cecbc)
+            * checked(data.future_collateral - data.future_borrow)
+        )
+    )
+    dividend = checked(dividend + checked(cases.cecbc * data.user_future_reward_borrow))
+    dividend = checked(
+        dividend
+        + checked(
+            cases.ceccb
+            * s_mul_div(
+                data.future_collateral,
+                to_int256(data.borrow_slippage),
+                SLIPPAGE_PRECISION,
+                need_to_round_up,
+            )
+        )
+    )
+    dividend = checked(
+        dividend + checked(cases.cecbc * data.protocol_future_reward_borrow)
+    )
+
+    dividend_with_target_ltv = checked(data.collateral + data.delta_real_collateral)
+    dividend_with_target_ltv = checked(
+        dividend_with_target_ltv
+        - checked(cases.ceccb * data.user_future_reward_collateral)
+    )
+    dividend_with_target_ltv = checked(
+        dividend_with_target_ltv
+        + checked(
+            cases.cecbc
+            * s_mul_div(
+                checked(-data.future_collateral),
+                to_int256(data.collateral_slippage),
+                SLIPPAGE_PRECISION,
+                need_to_round_up,
+            )
+        )
+    )
+    dividend_with_target_ltv = checked(
+        dividend_with_target_ltv
+        - checked(cases.ceccb * data.protocol_future_reward_collateral)
+    )
+
+    return checked(
+        dividend
+        + s_mul_div(
+            dividend_with_target_ltv,
+            data.target_ltv_dividend,
+            data.target_ltv_divider,
+            need_to_round_up,
+        )
+    )
+
+
+def _calculate_divider(data, cases, need_to_round_up):
+    divider = checked(
+        DIVIDER_PRECISION
+        * (cases.cna + cases.cmcb + cases.cmbc + cases.ceccb + cases.cecbc)
+    )
+
+    if data.future_collateral != 0:
+        divider_div_future_collateral = checked(
+            (cases.cecb + cases.cebc) * data.future_borrow
+        )
+        divider_div_future_collateral = checked(
+            divider_div_future_collateral
+            + checked(cases.cebc * data.user_future_reward_borrow)
+        )
+        divider_div_future_collateral = checked(
+            divider_div_future_collateral
+            + checked(cases.cebc * data.protocol_future_reward_borrow)
+        )
+        divider = checked(
+            divider
+            + s_mul_div(
+                divider_div_future_collateral,
+                DIVIDER_PRECISION,
+                data.future_collateral,
+                need_to_round_up,
+            )
+        )
+
+    divider_borrow_slippage = -cases.cmcb - cases.ceccb
+    divider = checked(
+        divider + checked(divider_borrow_slippage * to_int256(data.borrow_slippage))
+    )
+
+    divider_target_ltv = -DIVIDER_PRECISION
+
+    if data.future_collateral != 0:
+        divider_target_ltv_div_future_collateral = checked(
+            -cases.cecb * data.user_future_reward_collateral
+        )
+        divider_target_ltv_div_future_collateral = checked(
+            divider_target_ltv_div_future_collateral
+            - checked(cases.cecb * data.protocol_future_reward_collateral)
+        )
+        divider_target_ltv = checked(
+            divider_target_ltv
+            + s_mul_div(
+                divider_target_ltv_div_future_collateral,
+                DIVIDER_PRECISION,
+                data.future_collateral,
+                need_to_round_up,
+            )
+        )
+
+    divider_target_ltv_collateral_slippage = cases.cmbc + cases.cecbc
+    divider_target_ltv = checked(
+        divider_target_ltv
+        + checked(
+            divider_target_ltv_collateral_slippage * to_int256(data.collateral_slippage)
+        )
+    )
+
+    return checked(
+        divider
+        + s_mul_div(
+            divider_target_ltv,
+            data.target_ltv_dividend,
+            data.target_ltv_divider,
+            need_to_round_up,
+        )
+    )
+
+
+def _calculate_single_case(
+    data, cases, need_to_round_up_dividend, need_to_round_up_divider, dividend=None
+):
+    """Returns (delta future collateral, success), dividend is given when cached"""
+    if dividend is None:
+        dividend = _calculate_dividend(data, cases, need_to_round_up_dividend)
+    divider = _calculate_divider(data, cases, need_to_round_up_divider)
+    if divider == 0:
+        return 0, False
+    return (
+        s_mul_div(dividend, DIVIDER_PRECISION, divider, need_to_round_up_dividend),
+        True,
+    )
+
+
+# (round dividend up, round divider up) for cmcb, cmbc, cecb, cebc, ceccb, cecbc
+CASE_ROUNDING = (
+    (False, False),
+    (True, False),
+    (True, True),
+    (False, True),
+    (False, False),
+    (True, False),
+)
+
+
+def _calculate_case(data, ncase, cache_dividend=None):
+    cases = generate_case(ncase)
+    need_to_round_up_dividend, need_to_round_up_divider = CASE_ROUNDING[ncase]
+    delta, success = _calculate_single_case(
+        data, cases, need_to_round_up_dividend, need_to_round_up_divider, cache_dividend
+    )
+    return delta, cases, success
+
+
+def _positive_branch(data):
+    cache_dividend = _calculate_dividend(data, generate_case(6), True)
+
+    delta, cases, success = _calculate_case(data, 1, cache_dividend)
+    if delta > 0 and success:
+        return delta, cases
+    if delta == 0 and success:
+        return 0, generate_case(6)
+
+    delta, cases, success = _calculate_case(data, 4)
+    if checked(delta + data.future_collateral) < 0 and success:
+        return delta, cases
+
+    delta, cases, success = _calculate_case(data, 2, cache_dividend)
+    if not success:
+        raise DeltaRealBorrowAndDeltaRealCollateralUnexpectedError(data)
+
+    if checked(delta + data.future_collateral) < 0:
+        adjusted_future_collateral = s_mul_div_up(
+            data.future_collateral,
+            FUTURE_ADJUSTMENT_NUMERATOR,
+            FUTURE_ADJUSTMENT_DENOMINATOR,
+        )
+        if checked(delta + adjusted_future_collateral) > 0 and delta < 0:
+            delta = checked(-data.future_collateral)
+        else:
+            raise DeltaRealBorrowAndDeltaRealCollateralUnexpectedError(data)
+
+    return delta, cases
+
+
+def _negative_branch(data):
+    cache_dividend = _calculate_dividend(data, generate_case(6), False)
+
+    delta, cases, success = _calculate_case(data, 0, cache_dividend)
+    if delta < 0 and success:
+        return delta, cases
+    if delta == 0 and success:
+        return 0, generate_case(6)
+
+    delta, cases, success = _calculate_case(data, 5)
+    if checked(delta + data.future_collateral) > 0 and success:
+        return delta, cases
+
+    delta, cases, success = _calculate_case(data, 3, cache_dividend)
+    if not success:
+        raise DeltaRealBorrowAndDeltaRealCollateralUnexpectedError(data)
+
+    if checked(delta + data.future_collateral) > 0:
+        adjusted_future_collateral = s_mul_div_down(
+            data.future_collateral,
+            FUTURE_ADJUSTMENT_NUMERATOR,
+            FUTURE_ADJUSTMENT_DENOMINATOR,
+        )
+        if checked(delta + adjusted_future_collateral) < 0 and delta > 0:
+            delta = checked(-data.future_collateral)
+        else:
+            raise DeltaRealBorrowAndDeltaRealCollateralUnexpectedError(data)
+
+    return delta, cases
+
+
+def _zero_branch(data):
+    delta, cases, success = _calculate_case(data, 1)
+    if delta > 0 and success:
+        return delta, cases
+
+    delta, cases, success = _calculate_case(data, 0)
+    if delta < 0 and success:
+        return delta, cases
+
+    return 0, generate_case(6)
+
+
+def calculate_delta_future_collateral_by_delta_real_borrow_and_delta_real_collateral(
+    data,
+):
+    """Returns (delta future collateral, cases) for a DeltaRealBorrowAndDeltaRealCollateralData"""
+    if data.future_collateral > 0 or data.future_borrow > 0:
+        return _positive_branch(data)
+    if data.future_collateral < 0 or data.future_borrow < 0:
+        return _negative_branch(data)
+    return _zero_branch(data)
@@ -0,0 +1,101 @@
+"""
+Port of DepositWithdraw.sol
+"""
+
+from ltv_offchain.math import common_borrow_collateral
+from ltv_offchain.math.delta_future_collateral.delta_real_borrow_and_delta_real_collateral import (
+    calculate_delta_future_collateral_by_delta_real_borrow_and_delta_real_collateral,
+)
+from ltv_offchain.math.solidity import checked
+from ltv_offchain.math.structs import (
+    DeltaFuture,
+    DeltaRealBorrowAndDeltaRealCollateralData,
+)
+
+
+def calculate_delta_future(data, cases, delta_future_collateral, delta_future_borrow):
+    """DeltaFuture of both libraries once the future collateral and borrow deltas are known"""
+    return DeltaFuture(
+        delta_future_collateral=delta_future_collateral,
+        delta_future_borrow=delta_future_borrow,
+        delta_protocol_future_reward_collateral=common_borrow_collateral.calculate_delta_protocol_future_reward_collateral(
+            cases,
+            data.future_collateral,
+            data.protocol_future_reward_collateral,
+            delta_future_collateral,
+        ),
+        delta_user_future_reward_collateral=common_borrow_collateral.calculate_delta_user_future_reward_collateral(
+            cases,
+            data.future_collateral,
+            data.user_future_reward_collateral,
+            delta_future_collateral,
+        ),
+        delta_future_payment_collateral=common_borrow_collateral.calculate_delta_future_payment_collateral(
+            cases,
+            data.future_collateral,
+            delta_future_collateral,
+            data.collateral_slippage,
+        ),
+        delta_protocol_future_reward_borrow=common_borrow_collateral.calculate_delta_protocol_future_reward_borrow(
+            cases,
+            data.future_borrow,
+            data.protocol_future_reward_borrow,
+            delta_future_borrow,
+        ),
+        delta_user_future_reward_borrow=common_borrow_collateral.calculate_delta_user_future_reward_borrow(
+            cases,
+            data.future_borrow,
+            data.user_future_reward_borrow,
+            delta_future_borrow,
+        ),
+        delta_future_payment_borrow=common_borrow_collateral.calculate_delta_future_payment_borrow(
+            cases, data.future_borrow, delta_future_borrow, data.borrow_slippage
+        ),
+        cases=cases,
+    )
+
+
+def calculate_deposit_withdraw(data):
+    """Returns (shares as assets, DeltaFuture) for a DepositWithdrawData"""
+    delta_future_collateral, cases = (
+        calculate_delta_future_collateral_by_delta_real_borrow_and_delta_real_collateral(
+            DeltaRealBorrowAndDeltaRealCollateralData(
+                delta_real_collateral=data.delta_real_collateral,
+                delta_real_borrow=data.delta_real_borrow,
+                target_ltv_dividend=data.target_ltv_dividend,
+                target_ltv_divider=data.target_ltv_divider,
+                collateral_slippage=data.collateral_slippage,
+                borrow_slippage=data.borrow_slippage,
+                collateral=data.collateral,
+                borrow=data.borrow,
+                future_borrow=data.future_borrow,
+                future_collateral=data.future_collateral,
+                user_future_reward_borrow=data.user_future_reward_borrow,
+                user_future_reward_collateral=data.user_future_reward_collateral,
+                protocol_future_reward_borrow=data.protocol_future_reward_borrow,
+                protocol_future_reward_collateral=data.protocol_future_reward_collateral,
+            )
+        )
+    )
+    delta_future_borrow = common_borrow_collateral.calculate_delta_future_borrow_from_delta_future_collateral(
+        cases, data.future_collateral, data.future_borrow, delta_future_collateral
+    )
+    delta_future = calculate_delta_future(
+        data, cases, delta_future_collateral, delta_future_borrow
+    )
+
+    shares_as_assets = data.delta_real_collateral
+    for term in (
+        delta_future.delta_future_collateral,
+        delta_future.delta_user_future_reward_collateral,
+        delta_future.delta_future_payment_collateral,
+    ):
+        shares_as_assets = checked(shares_as_assets + term)
+    for term in (
+        data.delta_real_borrow,
+        delta_future.delta_future_borrow,
+        delta_future.delta_user_future_reward_borrow,
+        delta_future.delta_future_payment_borrow,
+    ):
+        shares_as_assets = checked(shares_as_assets - term)
+    return shares_as_assets, delta_future
@@ -0,0 +1,45 @@
+"""
+Custom errors of src/errors raised by the ported math
+"""
+
+from ltv_offchain.math.solidity import MathRevert
+
+
+class CustomError(MathRevert):
+    """Solidity custom error, params are the error arguments"""
+
+    def __init__(self, *params):
+        super().__init__(f"{type(self).__name__}({', '.join(map(str, params))})")
+        self.params = params
+
+
+class DeltaRealBorrowAndDeltaRealCollateralUnexpectedError(CustomError):
+    pass
+
+
+class DeltaSharesAndDeltaRealCollateralUnexpectedError(CustomError):
+    pass
+
+
+class DeltaSharesAndDeltaRealBorrowUnexpectedError(CustomError):
+    pass
+
+
+class NoAuctionForProvidedDeltaFutureCollateral(CustomError):
+    pass
+
+
+class NoAuctionForProvidedDeltaFutureBorrow(CustomError):
+    pass
+
+
+class UnexpectedDeltaUserCollateralAssets(CustomError):
+    pass
+
+
+class UnexpectedDeltaUserBorrowAssets(CustomError):
+    pass
+
+
+class ZeroTargetLtvDisablesBorrow(CustomError):
+    pass
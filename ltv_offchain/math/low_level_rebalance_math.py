@@ -0,0 +1,263 @@
+"""
+Port of LowLevelRebalanceMath.sol
+"""
+
+from ltv_offchain.math.errors import ZeroTargetLtvDisablesBorrow
+from ltv_offchain.math.mul_div import s_mul_div_down, s_mul_div_up, u_mul_div_up
+from ltv_offchain.math.solidity import UINT256_MAX, checked, checked_uint, to_int256
+
+
+def _checked_sum(*terms):
+    """
+    Left to right sum reverting on any intermediate overflow like Solidity,
+    subtracted terms are passed negated (exact on Python ints)
+    """
+    total = terms[0]
+    for term in terms[1:]:
+        total = checked(total + term)
+    return total
+
+
+def _calculate_delta_real_collateral_from_delta_shares(
+    delta_shares,
+    future_collateral,
+    user_future_reward_collateral,
+    real_collateral,
+    real_borrow,
+    future_borrow,
+    user_future_reward_borrow,
+    target_ltv_dividend,
+    target_ltv_divider,
+):
+    # round up to leave more collateral in protocol
+    return s_mul_div_up(
+        _checked_sum(
+            delta_shares,
+            future_collateral,
+            user_future_reward_collateral,
+            s_mul_div_up(real_collateral, target_ltv_dividend, target_ltv_divider),
+            -real_borrow,
+            -future_borrow,
+            -user_future_reward_borrow,
+        ),
+        target_ltv_divider,
+        checked_uint(target_ltv_divider - target_ltv_dividend, 16),
+    )
+
+
+def _calculate_delta_real_borrow_from_delta_real_collateral(
+    delta_collateral,
+    real_collateral,
+    real_borrow,
+    target_ltv_dividend,
+    target_ltv_divider,
+):
+    return _checked_sum(
+        s_mul_div_down(real_collateral, target_ltv_dividend, target_ltv_divider),
+        s_mul_div_down(delta_collateral, target_ltv_dividend, target_ltv_divider),
+        -real_borrow,
+    )
+
+
+def _calculate_delta_real_collateral_from_delta_real_borrow(
+    delta_borrow, real_borrow, real_collateral, target_ltv_dividend, target_ltv_divider
+):
+    if checked(real_borrow + delta_borrow) == 0:
+        return checked(-real_collateral)
+
+    if target_ltv_dividend == 0:
+        raise ZeroTargetLtvDisablesBorrow()
+    next_real_borrow = checked(real_borrow + delta_borrow) & UINT256_MAX
+    return checked(
+        to_int256(
+            u_mul_div_up(next_real_borrow, target_ltv_divider, target_ltv_dividend)
+        )
+        - real_collateral
+    )
+
+
+def _calculate_delta_shares_from_delta_real_collateral_and_delta_real_borrow(
+    delta_collateral,
+    delta_borrow,
+    future_collateral,
+    user_future_reward_collateral,
+    future_borrow,
+    user_future_reward_borrow,
+):
+    return _checked_sum(
+        delta_collateral,
+        -delta_borrow,
+        -future_collateral,
+        -user_future_reward_collateral,
+        future_borrow,
+        user_future_reward_borrow,
+    )
+
+
+def _calculate_delta_protocol_future_reward_shares(data):
+    # HODLer <=> Fee collector conflict, round down to give less rewards
+    return s_mul_div_down(
+        s_mul_div_down(
+            _checked_sum(
+                checked(-data.protocol_future_reward_collateral),
+                data.protocol_future_reward_borrow,
+            ),
+            to_int256(10**data.borrow_token_decimals),
+            to_int256(data.borrow_price),
+        ),
+        to_int256(data.supply_after_fee),
+        to_int256(data.total_assets),
+    )
+
+
+def _convert_underlying_to_shares(delta_underlying, data):
+    return s_mul_div_down(
+        s_mul_div_down(
+            delta_underlying,
+            to_int256(10**data.borrow_token_decimals),
+            to_int256(data.borrow_price),
+        ),
+        to_int256(data.supply_after_fee),
+        to_int256(data.total_assets),
+    )
+
+
+def calculate_low_level_rebalance_shares(delta_shares, data):
+    """Returns (deltaRealCollateralAssets, deltaRealBorrowAssets, deltaProtocolFutureRewardShares)"""
+    delta_protocol_future_reward_shares = (
+        _calculate_delta_protocol_future_reward_shares(data)
+    )
+
+    delta_shares_in_assets = s_mul_div_up(
+        delta_shares, to_int256(data.total_assets), to_int256(data.supply_after_fee)
+    )
+    delta_shares_in_underlying = s_mul_div_up(
+        delta_shares_in_assets,
+        to_int256(data.borrow_price),
+        to_int256(10**data.borrow_token_decimals),
+    )
+
+    delta_real_collateral = _calculate_delta_real_collateral_from_delta_shares(
+        delta_shares_in_underlying,
+        data.future_collateral,
+        data.user_future_reward_collateral,
+        data.real_collateral,
+        data.real_borrow,
+        data.future_borrow,
+        data.user_future_reward_borrow,
+        data.target_ltv_dividend,
+        data.target_ltv_divider,
+    )
+    delta_real_borrow = _calculate_delta_real_borrow_from_delta_real_collateral(
+        delta_real_collateral,
+        data.real_collateral,
+        data.real_borrow,
+        data.target_ltv_dividend,
+        data.target_ltv_divider,
+    )
+
+    # round up to leave more collateral in protocol
+    delta_real_collateral_assets = s_mul_div_up(
+        delta_real_collateral,
+        to_int256(10**data.collateral_token_decimals),
+        to_int256(data.collateral_price),
+    )
+    # round down to leave less borrow in protocol
+    delta_real_borrow_assets = s_mul_div_down(
+        delta_real_borrow,
+        to_int256(10**data.borrow_token_decimals),
+        to_int256(data.borrow_price),
+    )
+    return (
+        delta_real_collateral_assets,
+        delta_real_borrow_assets,
+        delta_protocol_future_reward_shares,
+    )
+
+
+def calculate_low_level_rebalance_borrow(delta_borrow_assets, data):
+    """Returns (deltaRealCollateralAssets, deltaShares, deltaProtocolFutureRewardShares)"""
+    delta_protocol_future_reward_shares = (
+        _calculate_delta_protocol_future_reward_shares(data)
+    )
+
+    delta_real_borrow = s_mul_div_up(
+        delta_borrow_assets,
+        to_int256(data.borrow_price),
+        to_int256(10**data.borrow_token_decimals),
+    )
+    delta_real_collateral = _calculate_delta_real_collateral_from_delta_real_borrow(
+        delta_real_borrow,
+        data.real_borrow,
+        data.real_collateral,
+        data.target_ltv_dividend,
+        data.target_ltv_divider,
+    )
+    delta_shares_in_underlying = (
+        _calculate_delta_shares_from_delta_real_collateral_and_delta_real_borrow(
+            delta_real_collateral,
+            delta_real_borrow,
+            data.future_collateral,
+            data.user_future_reward_collateral,
+            data.future_borrow,
+            data.user_future_reward_borrow,
+        )
+    )
+
+    # round down to give less shares
+    delta_shares = _convert_underlying_to_shares(delta_shares_in_underlying, data)
+    # round up to keep more collateral in the protocol
+    delta_real_collateral_assets = s_mul_div_up(
+        delta_real_collateral,
+        to_int256(10**data.collateral_token_decimals),
+        to_int256(data.collateral_price),
+    )
+    return (
+        delta_real_collateral_assets,
+        delta_shares,
+        delta_protocol_future_reward_shares,
+    )
+
+
+def calculate_low_level_rebalance_collateral(delta_collateral_assets, data):
+    """Returns (deltaRealBorrowAssets, deltaShares, deltaProtocolFutureRewardShares)"""
+    delta_protocol_future_reward_shares = (
+        _calculate_delta_protocol_future_reward_shares(data)
+    )
+
+    delta_real_collateral = s_mul_div_down(
+        delta_collateral_assets,
+        to_int256(data.collateral_price),
+        to_int256(10**data.collateral_token_decimals),
+    )
+    delta_real_borrow = _calculate_delta_real_borrow_from_delta_real_collateral(
+        delta_real_collateral,
+        data.real_collateral,
+        data.real_borrow,
+        data.target_ltv_dividend,
+        data.target_ltv_divider,
+    )
+    delta_shares_in_underlying = (
+        _calculate_delta_shares_from_delta_real_collateral_and_delta_real_borrow(
+            delta_real_collateral,
+            delta_real_borrow,
+            data.future_collateral,
+            data.user_future_reward_collateral,
+            data.future_borrow,
+            data.user_future_reward_borrow,
+        )
+    )
+
+    # round down, less shares minted - bigger token price
+    delta_shares = _convert_underlying_to_shares(delta_shares_in_underlying, data)
+    # round down to keep less borrow in the protocol
+    delta_real_borrow_assets = s_mul_div_down(
+        delta_real_borrow,
+        to_int256(10**data.borrow_token_decimals),
+        to_int256(data.borrow_price),
+    )
+    return (
+        delta_real_borrow_assets,
+        delta_shares,
+        delta_protocol_future_reward_shares,
+    )
@@ -0,0 +1,177 @@
+"""
+Port of the total assets, max growth fee and protocol rewards math:
+TotalAssets._totalAssets, TotalAssetsCollateral._totalAssetsCollateral,
+TotalSupply._totalSupply, MaxGrowthFee._previewSupplyAfterFee,
+ApplyMaxGrowthFee.applyMaxGrowthFee and MintProtocolRewards._mintProtocolRewards
+"""
+
+from ltv_offchain.math.common_math import (
+    convert_future_borrow,
+    convert_future_collateral,
+    convert_future_reward_borrow,
+    convert_future_reward_collateral,
+    convert_real_borrow,
+    convert_real_collateral,
+)
+from ltv_offchain.math.constants import (
+    LAST_SEEN_PRICE_PRECISION,
+    VIRTUAL_ASSETS_AMOUNT,
+)
+from ltv_offchain.math.mul_div import u_mul_div, u_mul_div_down, u_mul_div_up
+from ltv_offchain.math.solidity import checked, checked_uint, to_int256
+
+
+def calculate_total_assets(is_deposit, state):
+    """_totalAssets(isDeposit, TotalAssetsState)"""
+    collateral = checked(
+        checked(
+            to_int256(
+                convert_real_collateral(
+                    state.real_collateral_assets,
+                    state.collateral_price,
+                    state.collateral_token_decimals,
+                    is_deposit,
+                )
+            )
+            + convert_future_collateral(
+                state.future_collateral_assets,
+                state.collateral_price,
+                state.collateral_token_decimals,
+                is_deposit,
+            )
+        )
+        + convert_future_reward_collateral(
+            state.future_reward_collateral_assets,
+            state.collateral_price,
+            state.collateral_token_decimals,
+            is_deposit,
+        )
+    )
+    borrow = checked(
+        checked(
+            to_int256(
+                convert_real_borrow(
+                    state.real_borrow_assets,
+                    state.borrow_price,
+                    state.borrow_token_decimals,
+                    is_deposit,
+                )
+            )
+            + convert_future_borrow(
+                state.future_borrow_assets,
+                state.borrow_price,
+                state.borrow_token_decimals,
+                is_deposit,
+            )
+        )
+        + convert_future_reward_borrow(
+            state.future_reward_borrow_assets,
+            state.borrow_price,
+            state.borrow_token_decimals,
+            is_deposit,
+        )
+    )
+    return calculate_total_assets_from_data(
+        is_deposit,
+        collateral,
+        borrow,
+        state.borrow_price,
+        state.borrow_token_decimals,
+    )
+
+
+def calculate_total_assets_from_data(
+    is_deposit, collateral, borrow, borrow_price, borrow_token_decimals
+):
+    """_totalAssets(isDeposit, TotalAssetsData)"""
+    # uint256(collateral - borrow) wraps on negative values
+    return checked_uint(
+        u_mul_div(
+            checked(collateral - borrow) % 2**256,
+            10**borrow_token_decimals,
+            borrow_price,
+            is_deposit,
+        )
+        + VIRTUAL_ASSETS_AMOUNT
+    )
+
+
+def calculate_total_assets_collateral(
+    is_deposit,
+    total_assets,
+    collateral_price,
+    borrow_price,
+    borrow_token_decimals,
+    collateral_token_decimals,
+):
+    """_totalAssetsCollateral(isDeposit, TotalAssetsCollateralData)"""
+    return u_mul_div(
+        u_mul_div(total_assets, borrow_price, collateral_price, is_deposit),
+        10**collateral_token_decimals,
+        10**borrow_token_decimals,
+        is_deposit,
+    )
+
+
+def calculate_total_supply(supply):
+    return checked_uint(supply + VIRTUAL_ASSETS_AMOUNT)
+
+
+def preview_supply_after_fee(data):
+    if (
+        u_mul_div_down(
+            data.withdraw_total_assets, LAST_SEEN_PRICE_PRECISION, data.supply
+        )
+        <= data.last_seen_token_price
+    ):
+        return data.supply
+
+    return u_mul_div_down(
+        data.withdraw_total_assets,
+        data.supply,
+        checked_uint(
+            u_mul_div_up(
+                data.supply,
+                checked_uint(data.max_growth_fee_dividend * data.last_seen_token_price),
+                checked_uint(LAST_SEEN_PRICE_PRECISION * data.max_growth_fee_divider),
+            )
+            + u_mul_div_up(
+                data.withdraw_total_assets,
+                # uint16 subtraction
+                checked_uint(
+                    data.max_growth_fee_divider - data.max_growth_fee_dividend, 16
+                ),
+                data.max_growth_fee_divider,
+            )
+        ),
+    )
+
+
+def apply_max_growth_fee(supply_after_fee, withdraw_total_assets, supply):
+    """
+    Returns (shares minted to the fee collector, new last seen token price or
+    None if unchanged), supply being the virtual total supply
+    """
+    if supply_after_fee > supply:
+        return supply_after_fee - supply, u_mul_div_up(
+            withdraw_total_assets, LAST_SEEN_PRICE_PRECISION, supply_after_fee
+        )
+    return 0, None
+
+
+def calculate_protocol_reward_shares(data):
+    """Shares _mintProtocolRewards mints to the fee collector"""
+    # uint256 casts of int256 values wrap on negative values
+    rewards_in_underlying = checked_uint(
+        checked(-data.delta_protocol_future_reward_borrow) % 2**256
+        + data.delta_protocol_future_reward_collateral % 2**256
+    )
+    if rewards_in_underlying == 0:
+        return 0
+    return u_mul_div_down(
+        u_mul_div_down(
+            rewards_in_underlying, 10**data.asset_token_decimals, data.asset_price
+        ),
+        data.supply,
+        data.total_appropriate_assets,
+    )
@@ -0,0 +1,387 @@
+"""
+Port of the max deposit / mint / withdraw / redeem functions of
+src/public/vault/read/borrow/max and src/public/vault/read/collateral/max,
+with their state to data conversions and getAvailableSpaceInShares of
+Vault.sol and VaultCollateral.sol
+"""
+
+from ltv_offchain.math.mul_div import u_mul_div_down, u_mul_div_up
+from ltv_offchain.math.preview import (
+    convert_real_assets,
+    preview_deposit,
+    preview_deposit_collateral,
+    preview_deposit_state_to_preview_deposit_data,
+    preview_deposit_vault_state_to_preview_collateral_vault_data,
+    preview_mint,
+    preview_mint_collateral,
+    preview_redeem_collateral_in_underlying,
+    preview_redeem_in_underlying,
+    preview_withdraw_collateral_in_underlying,
+    preview_withdraw_in_underlying,
+    preview_withdraw_state_to_preview_withdraw_data,
+    preview_withdraw_vault_state_to_preview_collateral_vault_data,
+)
+from ltv_offchain.math.solidity import MathRevert
+from ltv_offchain.math.structs import (
+    MaxDepositMintVaultData,
+    MaxWithdrawRedeemVaultData,
+)
+
+UINT128_MAX = 2**128 - 1
+
+
+def _max_deposit_mint_state_to_data(state, preview_state_to_data):
+    preview_state = state.preview_deposit_vault_state
+    real_collateral, real_borrow = convert_real_assets(preview_state, True)
+    return MaxDepositMintVaultData(
+        preview_data=preview_state_to_data(real_collateral, real_borrow, preview_state),
+        real_collateral=real_collateral,
+        real_borrow=real_borrow,
+        max_total_assets_in_underlying=state.max_total_assets_in_underlying,
+        min_profit_ltv_dividend=state.min_profit_ltv_dividend,
+        min_profit_ltv_divider=state.min_profit_ltv_divider,
+    )
+
+
+def _max_withdraw_redeem_state_to_data(state, preview_state_to_data):
+    preview_state = state.preview_withdraw_vault_state
+    real_collateral, real_borrow = convert_real_assets(preview_state, False)
+    return MaxWithdrawRedeemVaultData(
+        preview_data=preview_state_to_data(real_collateral, real_borrow, preview_state),
+        real_collateral=real_collateral,
+        real_borrow=real_borrow,
+        max_safe_ltv_dividend=state.max_safe_ltv_dividend,
+        max_safe_ltv_divider=state.max_safe_ltv_divider,
+        owner_balance=state.owner_balance,
+    )
+
+
+def max_deposit_mint_state_to_data(state):
+    """maxDepositMintStateToData"""
+    return _max_deposit_mint_state_to_data(
+        state, preview_deposit_state_to_preview_deposit_data
+    )
+
+
+def max_withdraw_redeem_state_to_data(state):
+    """maxWithdrawRedeemStateToData"""
+    return _max_withdraw_redeem_state_to_data(
+        state, preview_withdraw_state_to_preview_withdraw_data
+    )
+
+
+def max_deposit_mint_collateral_state_to_data(state):
+    """maxDepositMintCollateralVaultStateToMaxDepositMintCollateralVaultData"""
+    return _max_deposit_mint_state_to_data(
+        state, preview_deposit_vault_state_to_preview_collateral_vault_data
+    )
+
+
+def max_withdraw_redeem_collateral_state_to_data(state):
+    """maxWithdrawRedeemCollateralVaultStateToMaxWithdrawRedeemCollateralVaultData"""
+    return _max_withdraw_redeem_state_to_data(
+        state, preview_withdraw_vault_state_to_preview_collateral_vault_data
+    )
+
+
+def get_available_space_in_shares(
+    collateral,
+    borrow,
+    max_total_assets_in_underlying,
+    supply_after_fee,
+    total_assets,
+    price,
+    token_decimals,
+):
+    """
+    getAvailableSpaceInShares of Vault.sol (borrow price and total assets) and
+    VaultCollateral.sol (collateral price and total assets collateral)
+    """
+    # uint256 casts of int256 values wrap on negative values
+    collateral %= 2**256
+    borrow %= 2**256
+    if collateral < borrow:
+        raise MathRevert("uint256 underflow")
+    total_assets_in_underlying = collateral - borrow
+    if total_assets_in_underlying >= max_total_assets_in_underlying:
+        return 0
+    return u_mul_div_down(
+        u_mul_div_down(
+            max_total_assets_in_underlying - total_assets_in_underlying,
+            10**token_decimals,
+            price,
+        ),
+        supply_after_fee,
+        total_assets,
+    )
+
+
+def _get_available_space_in_shares(data):
+    preview_data = data.preview_data
+    if hasattr(preview_data, "deposit_total_assets"):
+        total_assets = preview_data.deposit_total_assets
+        price = preview_data.borrow_price
+        token_decimals = preview_data.borrow_token_decimals
+    else:
+        total_assets = preview_data.total_assets_collateral
+        price = preview_data.collateral_price
+        token_decimals = preview_data.collateral_token_decimals
+    return get_available_space_in_shares(
+        preview_data.collateral,
+        preview_data.borrow,
+        data.max_total_assets_in_underlying,
+        preview_data.supply_after_fee,
+        total_assets,
+        price,
+        token_decimals,
+    )
+
+
+def _get_max_deposit_in_underlying(data):
+    """None when the vault is at or below min profit LTV"""
+    min_profit_real_borrow = u_mul_div_up(
+        data.real_collateral, data.min_profit_ltv_dividend, data.min_profit_ltv_divider
+    )
+    if data.real_borrow <= min_profit_real_borrow:
+        return None
+    return data.real_borrow - min_profit_real_borrow
+
+
+def max_deposit(data):
+    available_space_in_shares = _get_available_space_in_shares(data)
+    available_space_in_assets, _ = preview_mint(
+        available_space_in_shares, data.preview_data
+    )
+    max_deposit_in_underlying = _get_max_deposit_in_underlying(data)
+    if max_deposit_in_underlying is None:
+        return 0
+    max_deposit_in_assets = u_mul_div_down(
+        max_deposit_in_underlying,
+        10**data.preview_data.borrow_token_decimals,
+        data.preview_data.borrow_price,
+    )
+    return min(max_deposit_in_assets, available_space_in_assets)
+
+
+def max_mint(data):
+    available_space_in_shares = _get_available_space_in_shares(data)
+    max_deposit_in_underlying = _get_max_deposit_in_underlying(data)
+    if max_deposit_in_underlying is None:
+        return 0
+    max_deposit_in_assets = u_mul_div_down(
+        max_deposit_in_underlying,
+        10**data.preview_data.borrow_token_decimals,
+        data.preview_data.borrow_price,
+    )
+    max_mint_shares, _ = preview_deposit(max_deposit_in_assets, data.preview_data)
+    return min(max_mint_shares, available_space_in_shares)
+
+
+def _get_safe_shares_in_underlying(
+    max_in_underlying, withdraw_in_underlying, redeem_in_underlying, data
+):
+    """
+    Shares in underlying of withdrawing max_in_underlying - 3, reduced until
+    redeeming them gives at most max_in_underlying, see MaxRedeem.sol.
+    None when nothing can be redeemed
+    """
+    if max_in_underlying <= 3:
+        return None
+    shares_in_underlying, _ = withdraw_in_underlying(max_in_underlying - 3, data)
+    assets_with_delta, _ = redeem_in_underlying(shares_in_underlying, data)
+    if assets_with_delta > max_in_underlying:
+        delta = assets_with_delta + 3 - max_in_underlying
+        if shares_in_underlying < 2 * delta:
+            return None
+        shares_in_underlying -= 2 * delta
+    return shares_in_underlying
+
+
+def _get_safe_assets_in_underlying(
+    balance_in_underlying,
+    redeem_in_underlying,
+    withdraw_in_underlying,
+    data,
+):
+    """
+    Assets in underlying of redeeming balance_in_underlying - 3, reduced
+    until withdrawing them burns at most the balance, see MaxWithdraw.sol.
+    None when nothing can be withdrawn
+    """
+    if balance_in_underlying <= 3:
+        return None
+    assets_in_underlying, _ = redeem_in_underlying(balance_in_underlying - 3, data)
+    balance_with_delta, _ = withdraw_in_underlying(assets_in_underlying, data)
+    if balance_with_delta > balance_in_underlying:
+        delta = balance_with_delta + 3 - balance_in_underlying
+        if assets_in_underlying < 2 * delta:
+            return None
+        assets_in_underlying -= 2 * delta
+    return assets_in_underlying
+
+
+def max_withdraw(data):
+    preview_data = data.preview_data
+    max_safe_real_borrow = u_mul_div_down(
+        data.real_collateral, data.max_safe_ltv_dividend, data.max_safe_ltv_divider
+    )
+    if max_safe_real_borrow <= data.real_borrow:
+        return 0
+    max_vault_withdraw_in_underlying = max_safe_real_borrow - data.real_borrow
+    user_balance_in_underlying = u_mul_div_down(
+        u_mul_div_down(
+            data.owner_balance,
+            preview_data.withdraw_total_assets,
+            preview_data.supply_after_fee,
+        ),
+        preview_data.borrow_price,
+        10**preview_data.borrow_token_decimals,
+    )
+    user_assets_in_underlying = _get_safe_assets_in_underlying(
+        user_balance_in_underlying,
+        preview_redeem_in_underlying,
+        preview_withdraw_in_underlying,
+        preview_data,
+    )
+    if user_assets_in_underlying is None:
+        return 0
+    return u_mul_div_down(
+        min(user_assets_in_underlying, max_vault_withdraw_in_underlying),
+        10**preview_data.borrow_token_decimals,
+        preview_data.borrow_price,
+    )
+
+
+def max_redeem(data):
+    preview_data = data.preview_data
+    max_safe_real_borrow = u_mul_div_down(
+        data.real_collateral, data.max_safe_ltv_dividend, data.max_safe_ltv_divider
+    )
+    if max_safe_real_borrow <= data.real_borrow:
+        return 0
+    shares_in_underlying = _get_safe_shares_in_underlying(
+        max_safe_real_borrow - data.real_borrow,
+        preview_withdraw_in_underlying,
+        preview_redeem_in_underlying,
+        preview_data,
+    )
+    if shares_in_underlying is None:
+        return 0
+    max_vault_withdraw_in_shares = u_mul_div_down(
+        u_mul_div_down(
+            shares_in_underlying,
+            10**preview_data.borrow_token_decimals,
+            preview_data.borrow_price,
+        ),
+        preview_data.supply_after_fee,
+        preview_data.withdraw_total_assets,
+    )
+    return min(data.owner_balance, max_vault_withdraw_in_shares)
+
+
+def _get_max_deposit_collateral_in_underlying(data):
+    """None when the vault is at or below min profit LTV"""
+    if data.min_profit_ltv_dividend == 0:
+        min_profit_real_collateral = UINT128_MAX
+    else:
+        min_profit_real_collateral = u_mul_div_down(
+            data.real_borrow, data.min_profit_ltv_divider, data.min_profit_ltv_dividend
+        )
+    if data.real_collateral >= min_profit_real_collateral:
+        return None
+    return min_profit_real_collateral - data.real_collateral
+
+
+def max_deposit_collateral(data):
+    preview_data = data.preview_data
+    available_space_in_shares = _get_available_space_in_shares(data)
+    available_space_in_collateral, _ = preview_mint_collateral(
+        available_space_in_shares, preview_data
+    )
+    max_deposit_in_underlying = _get_max_deposit_collateral_in_underlying(data)
+    if max_deposit_in_underlying is None:
+        return 0
+    max_deposit_in_collateral = u_mul_div_down(
+        max_deposit_in_underlying,
+        10**preview_data.collateral_token_decimals,
+        preview_data.collateral_price,
+    )
+    return min(max_deposit_in_collateral, available_space_in_collateral)
+
+
+def max_mint_collateral(data):
+    preview_data = data.preview_data
+    available_space_in_shares = _get_available_space_in_shares(data)
+    max_deposit_in_underlying = _get_max_deposit_collateral_in_underlying(data)
+    if max_deposit_in_underlying is None:
+        return 0
+    max_deposit_in_collateral = u_mul_div_down(
+        max_deposit_in_underlying,
+        10**preview_data.collateral_token_decimals,
+        preview_data.collateral_price,
+    )
+    max_mint_shares, _ = preview_deposit_collateral(
+        max_deposit_in_collateral, preview_data
+    )
+    return min(max_mint_shares, available_space_in_shares)
+
+
+def _get_max_safe_real_collateral(data):
+    return u_mul_div_up(
+        data.real_borrow, data.max_safe_ltv_divider, data.max_safe_ltv_dividend
+    )
+
+
+def max_withdraw_collateral(data):
+    preview_data = data.preview_data
+    max_safe_real_collateral = _get_max_safe_real_collateral(data)
+    if max_safe_real_collateral >= data.real_collateral:
+        return 0
+    vault_withdraw_in_underlying = data.real_collateral - max_safe_real_collateral
+    owner_balance_in_underlying = u_mul_div_down(
+        u_mul_div_down(
+            data.owner_balance,
+            preview_data.total_assets_collateral,
+            preview_data.supply_after_fee,
+        ),
+        preview_data.collateral_price,
+        10**preview_data.collateral_token_decimals,
+    )
+    owner_assets_in_underlying = _get_safe_assets_in_underlying(
+        owner_balance_in_underlying,
+        preview_redeem_collateral_in_underlying,
+        preview_withdraw_collateral_in_underlying,
+        preview_data,
+    )
+    if owner_assets_in_underlying is None:
+        return 0
+    return u_mul_div_down(
+        min(owner_assets_in_underlying, vault_withdraw_in_underlying),
+        10**preview_data.collateral_token_decimals,
+        preview_data.collateral_price,
+    )
+
+
+def max_redeem_collateral(data):
+    preview_data = data.preview_data
+    max_safe_real_collateral = _get_max_safe_real_collateral(data)
+    if max_safe_real_collateral >= data.real_collateral:
+        return 0
+    shares_in_underlying = _get_safe_shares_in_underlying(
+        data.real_collateral - max_safe_real_collateral,
+        preview_withdraw_collateral_in_underlying,
+        preview_redeem_collateral_in_underlying,
+        preview_data,
+    )
+    if shares_in_underlying is None:
+        return 0
+    max_withdraw_shares = u_mul_div_down(
+        u_mul_div_down(
+            shares_in_underlying,
+            10**preview_data.collateral_token_decimals,
+            preview_data.collateral_price,
+        ),
+        preview_data.supply_after_fee,
+        preview_data.total_assets_collateral,
+    )
+    return min(max_withdraw_shares, data.owner_balance)
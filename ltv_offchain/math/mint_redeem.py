@@ -0,0 +1,84 @@
+"""
+Port of MintRedeem.sol
+"""
+
+from ltv_offchain.math import common_borrow_collateral
+from ltv_offchain.math.delta_future_borrow.delta_shares_and_delta_real_borrow import (
+    calculate_delta_future_borrow_by_delta_shares_and_delta_real_borrow,
+)
+from ltv_offchain.math.delta_future_collateral.delta_shares_and_delta_real_collateral import (
+    calculate_delta_future_collateral_by_delta_shares_and_delta_real_collateral,
+)
+from ltv_offchain.math.deposit_withdraw import calculate_delta_future
+from ltv_offchain.math.solidity import checked
+from ltv_offchain.math.structs import (
+    DeltaSharesAndDeltaRealBorrowData,
+    DeltaSharesAndDeltaRealCollateralData,
+)
+
+
+def calculate_mint_redeem(data):
+    """Returns (assets, DeltaFuture) for a MintRedeemData"""
+    if data.is_borrow:
+        delta_future_collateral, cases = (
+            calculate_delta_future_collateral_by_delta_shares_and_delta_real_collateral(
+                DeltaSharesAndDeltaRealCollateralData(
+                    target_ltv_dividend=data.target_ltv_dividend,
+                    target_ltv_divider=data.target_ltv_divider,
+                    borrow=data.borrow,
+                    collateral=data.collateral,
+                    protocol_future_reward_borrow=data.protocol_future_reward_borrow,
+                    protocol_future_reward_collateral=data.protocol_future_reward_collateral,
+                    delta_shares=data.delta_shares,
+                    delta_real_collateral=0,
+                    user_future_reward_collateral=data.user_future_reward_collateral,
+                    future_collateral=data.future_collateral,
+                    future_borrow=data.future_borrow,
+                    collateral_slippage=data.collateral_slippage,
+                )
+            )
+        )
+        delta_future_borrow = common_borrow_collateral.calculate_delta_future_borrow_from_delta_future_collateral(
+            cases, data.future_collateral, data.future_borrow, delta_future_collateral
+        )
+    else:
+        delta_future_borrow, cases = (
+            calculate_delta_future_borrow_by_delta_shares_and_delta_real_borrow(
+                DeltaSharesAndDeltaRealBorrowData(
+                    target_ltv_dividend=data.target_ltv_dividend,
+                    target_ltv_divider=data.target_ltv_divider,
+                    borrow=data.borrow,
+                    collateral=data.collateral,
+                    protocol_future_reward_borrow=data.protocol_future_reward_borrow,
+                    protocol_future_reward_collateral=data.protocol_future_reward_collateral,
+                    delta_shares=data.delta_shares,
+                    delta_real_borrow=0,
+                    user_future_reward_borrow=data.user_future_reward_borrow,
+                    future_borrow=data.future_borrow,
+                    future_collateral=data.future_collateral,
+                    borrow_slippage=data.borrow_slippage,
+                )
+            )
+        )
+        delta_future_collateral = common_borrow_collateral.calculate_delta_future_collateral_from_delta_future_borrow(
+            cases, data.future_collateral, data.future_borrow, delta_future_borrow
+        )
+
+    delta_future = calculate_delta_future(
+        data, cases, delta_future_collateral, delta_future_borrow
+    )
+
+    assets = delta_future.delta_future_collateral
+    for term in (
+        delta_future.delta_user_future_reward_collateral,
+        delta_future.delta_future_payment_collateral,
+    ):
+        assets = checked(assets + term)
+    for term in (
+        data.delta_shares,
+        delta_future.delta_future_borrow,
+        delta_future.delta_user_future_reward_borrow,
+        delta_future.delta_future_payment_borrow,
+    ):
+        assets = checked(assets - term)
+    return (assets if data.is_borrow else checked(-assets)), delta_future
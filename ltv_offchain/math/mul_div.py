@@ -0,0 +1,63 @@
+"""
+Port of MulDiv.sol (UMulDiv and SMulDiv)
+"""
+
+from ltv_offchain.math.solidity import (
+    INT256_MAX,
+    INT256_MIN,
+    UINT256_MAX,
+    MathRevert,
+)
+
+
+def u_mul_div_down(factor_a, factor_b, denominator):
+    product = factor_a * factor_b
+    if denominator == 0 or product > UINT256_MAX:
+        raise MathRevert("UMulDiv")
+    return product // denominator
+
+
+def u_mul_div_up(x, y, denominator):
+    product = x * y
+    if denominator == 0 or product > UINT256_MAX:
+        raise MathRevert("UMulDiv")
+    return -(-product // denominator)
+
+
+def u_mul_div(x, y, denominator, is_up):
+    if is_up:
+        return u_mul_div_up(x, y, denominator)
+    return u_mul_div_down(x, y, denominator)
+
+
+def _s_product(x, y, denominator):
+    """
+    The assembly reverts on a zero denominator, on a product outside int256
+    and on type(int256).min divided by -1. Any other product is exact.
+    """
+    if denominator == 0:
+        raise MathRevert("SMulDiv")
+    product = x * y
+    if product > INT256_MAX or product < INT256_MIN:
+        raise MathRevert("SMulDiv")
+    if product == INT256_MIN and denominator == -1:
+        raise MathRevert("SMulDiv")
+    return product
+
+
+def s_mul_div_down(x, y, denominator):
+    """Rounds towards negative infinity"""
+    product = _s_product(x, y, denominator)
+    return product // denominator
+
+
+def s_mul_div_up(x, y, denominator):
+    """Rounds towards positive infinity"""
+    product = _s_product(x, y, denominator)
+    return -(-product // denominator)
+
+
+def s_mul_div(x, y, denominator, is_up):
+    if is_up:
+        return s_mul_div_up(x, y, denominator)
+    return s_mul_div_down(x, y, denominator)
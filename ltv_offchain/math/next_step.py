@@ -0,0 +1,69 @@
+"""
+Port of NextStep.sol
+"""
+
+from ltv_offchain.math.constants import UINT56_MAX
+from ltv_offchain.math.mul_div import s_mul_div_down
+from ltv_offchain.math.solidity import checked, checked_uint
+from ltv_offchain.math.structs import NextState
+
+
+def _merging_auction(data):
+    auction_weight = 0
+    if data.future_reward_borrow != 0:
+        auction_weight = data.future_reward_borrow
+    if data.future_reward_collateral != 0:
+        auction_weight = data.future_reward_collateral
+
+    delta_auction_weight = 0
+    if data.delta_future_payment_borrow != 0:
+        delta_auction_weight = data.delta_future_payment_borrow
+    if data.delta_future_payment_collateral != 0:
+        delta_auction_weight = data.delta_future_payment_collateral
+
+    total_weight = checked(auction_weight + delta_auction_weight)
+    if total_weight == 0:
+        next_auction_step = data.auction_step
+    else:
+        # uint24(uint256(int256)) truncates instead of reverting
+        next_auction_step = s_mul_div_down(
+            data.auction_step, auction_weight, total_weight
+        ) & (2**24 - 1)
+    return checked_uint(data.block_number - next_auction_step, 56)
+
+
+def calculate_next_step(data):
+    """Returns the NextState after applying the DeltaFuture of a NextStepData"""
+    future_reward_borrow = checked(
+        checked(
+            checked(data.future_reward_borrow + data.delta_future_payment_borrow)
+            + data.delta_user_future_reward_borrow
+        )
+        + data.delta_protocol_future_reward_borrow
+    )
+    future_reward_collateral = checked(
+        checked(
+            checked(
+                data.future_reward_collateral + data.delta_future_payment_collateral
+            )
+            + data.delta_user_future_reward_collateral
+        )
+        + data.delta_protocol_future_reward_collateral
+    )
+
+    if data.cases.cmcb + data.cases.cmbc == 1:
+        start_auction = _merging_auction(data)
+    elif data.cases.ceccb + data.cases.cecbc == 1:
+        start_auction = data.block_number
+    else:
+        start_auction = UINT56_MAX
+
+    return NextState(
+        future_borrow=checked(data.future_borrow + data.delta_future_borrow),
+        future_collateral=checked(
+            data.future_collateral + data.delta_future_collateral
+        ),
+        future_reward_borrow=future_reward_borrow,
+        future_reward_collateral=future_reward_collateral,
+        start_auction=start_auction,
+    )
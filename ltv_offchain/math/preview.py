@@ -0,0 +1,530 @@
+"""
+Port of the preview state to data conversions of
+src/math/abstracts/state_to_data/preview and of the _preview* functions of
+src/public/vault/read/borrow/preview and src/public/vault/read/collateral/preview
+
+Every _preview* function returns (amount, DeltaFuture) like its Solidity
+counterpart.
+"""
+
+from ltv_offchain.math.common_math import (
+    calculate_auction_step,
+    calculate_user_future_reward_borrow,
+    calculate_user_future_reward_collateral,
+    convert_future_borrow,
+    convert_future_collateral,
+    convert_future_reward_borrow,
+    convert_future_reward_collateral,
+    convert_real_borrow,
+    convert_real_collateral,
+)
+from ltv_offchain.math.deposit_withdraw import calculate_deposit_withdraw
+from ltv_offchain.math.max_growth_fee import (
+    calculate_total_assets,
+    calculate_total_assets_collateral,
+    calculate_total_assets_from_data,
+    calculate_total_supply,
+    preview_supply_after_fee,
+)
+from ltv_offchain.math.mint_redeem import calculate_mint_redeem
+from ltv_offchain.math.mul_div import u_mul_div_down, u_mul_div_up
+from ltv_offchain.math.solidity import checked, to_int256
+from ltv_offchain.math.structs import (
+    DepositWithdrawData,
+    MaxGrowthFeeData,
+    MintRedeemData,
+    PreviewCollateralVaultData,
+    PreviewDepositBorrowVaultData,
+    PreviewWithdrawBorrowVaultData,
+    TotalAssetsState,
+)
+
+
+def convert_real_assets(state, is_deposit):
+    """
+    (realCollateral, realBorrow) of a PreviewDepositVaultState when
+    is_deposit, of a PreviewWithdrawVaultState otherwise
+    """
+    fee_state = state.max_growth_fee_state
+    if is_deposit:
+        real_collateral_assets = state.deposit_real_collateral_assets
+        real_borrow_assets = state.deposit_real_borrow_assets
+    else:
+        real_collateral_assets = fee_state.withdraw_real_collateral_assets
+        real_borrow_assets = fee_state.withdraw_real_borrow_assets
+    return (
+        convert_real_collateral(
+            real_collateral_assets,
+            fee_state.collateral_price,
+            fee_state.collateral_token_decimals,
+            is_deposit,
+        ),
+        convert_real_borrow(
+            real_borrow_assets,
+            fee_state.borrow_price,
+            fee_state.borrow_token_decimals,
+            is_deposit,
+        ),
+    )
+
+
+def _get_common_data(real_collateral, real_borrow, state, is_deposit):
+    """Fields every preview data conversion computes the same way"""
+    fee_state = state.max_growth_fee_state
+    future_collateral = convert_future_collateral(
+        fee_state.future_collateral_assets,
+        fee_state.collateral_price,
+        fee_state.collateral_token_decimals,
+        is_deposit,
+    )
+    future_borrow = convert_future_borrow(
+        fee_state.future_borrow_assets,
+        fee_state.borrow_price,
+        fee_state.borrow_token_decimals,
+        is_deposit,
+    )
+    future_reward_collateral = convert_future_reward_collateral(
+        fee_state.future_reward_collateral_assets,
+        fee_state.collateral_price,
+        fee_state.collateral_token_decimals,
+        is_deposit,
+    )
+    future_reward_borrow = convert_future_reward_borrow(
+        fee_state.future_reward_borrow_assets,
+        fee_state.borrow_price,
+        fee_state.borrow_token_decimals,
+        is_deposit,
+    )
+    auction_step = calculate_auction_step(
+        state.start_auction, state.block_number, state.auction_duration
+    )
+    user_future_reward_borrow = calculate_user_future_reward_borrow(
+        future_reward_borrow, auction_step, state.auction_duration
+    )
+    user_future_reward_collateral = calculate_user_future_reward_collateral(
+        future_reward_collateral, auction_step, state.auction_duration
+    )
+    return {
+        "collateral": checked(
+            checked(to_int256(real_collateral) + future_collateral)
+            + future_reward_collateral
+        ),
+        "borrow": checked(
+            checked(to_int256(real_borrow) + future_borrow) + future_reward_borrow
+        ),
+        "future_borrow": future_borrow,
+        "future_collateral": future_collateral,
+        "user_future_reward_borrow": user_future_reward_borrow,
+        "user_future_reward_collateral": user_future_reward_collateral,
+        "protocol_future_reward_borrow": checked(
+            future_reward_borrow - user_future_reward_borrow
+        ),
+        "protocol_future_reward_collateral": checked(
+            future_reward_collateral - user_future_reward_collateral
+        ),
+        "collateral_slippage": state.collateral_slippage,
+        "borrow_slippage": state.borrow_slippage,
+        "target_ltv_dividend": state.target_ltv_dividend,
+        "target_ltv_divider": state.target_ltv_divider,
+    }
+
+
+def _preview_supply_after_fee(fee_state, withdraw_total_assets):
+    return preview_supply_after_fee(
+        MaxGrowthFeeData(
+            withdraw_total_assets=withdraw_total_assets,
+            max_growth_fee_dividend=fee_state.max_growth_fee_dividend,
+            max_growth_fee_divider=fee_state.max_growth_fee_divider,
+            supply=calculate_total_supply(fee_state.supply),
+            last_seen_token_price=fee_state.last_seen_token_price,
+        )
+    )
+
+
+def _get_withdraw_total_assets_of_state(fee_state):
+    return calculate_total_assets(
+        False,
+        TotalAssetsState(
+            real_collateral_assets=fee_state.withdraw_real_collateral_assets,
+            real_borrow_assets=fee_state.withdraw_real_borrow_assets,
+            future_borrow_assets=fee_state.future_borrow_assets,
+            future_collateral_assets=fee_state.future_collateral_assets,
+            future_reward_borrow_assets=fee_state.future_reward_borrow_assets,
+            future_reward_collateral_assets=fee_state.future_reward_collateral_assets,
+            borrow_price=fee_state.borrow_price,
+            collateral_price=fee_state.collateral_price,
+            borrow_token_decimals=fee_state.borrow_token_decimals,
+            collateral_token_decimals=fee_state.collateral_token_decimals,
+        ),
+    )
+
+
+def preview_deposit_state_to_preview_deposit_data(real_collateral, real_borrow, state):
+    """_previewDepositStateToPreviewDepositData"""
+    fee_state = state.max_growth_fee_state
+    common = _get_common_data(real_collateral, real_borrow, state, True)
+    withdraw_total_assets = _get_withdraw_total_assets_of_state(fee_state)
+    return PreviewDepositBorrowVaultData(
+        borrow_price=fee_state.borrow_price,
+        borrow_token_decimals=fee_state.borrow_token_decimals,
+        deposit_total_assets=calculate_total_assets_from_data(
+            True,
+            common["collateral"],
+            common["borrow"],
+            fee_state.borrow_price,
+            fee_state.borrow_token_decimals,
+        ),
+        withdraw_total_assets=withdraw_total_assets,
+        supply_after_fee=_preview_supply_after_fee(fee_state, withdraw_total_assets),
+        **common,
+    )
+
+
+def preview_withdraw_state_to_preview_withdraw_data(
+    real_collateral, real_borrow, state
+):
+    """_previewWithdrawStateToPreviewWithdrawData"""
+    fee_state = state.max_growth_fee_state
+    common = _get_common_data(real_collateral, real_borrow, state, False)
+    withdraw_total_assets = calculate_total_assets_from_data(
+        False,
+        common["collateral"],
+        common["borrow"],
+        fee_state.borrow_price,
+        fee_state.borrow_token_decimals,
+    )
+    return PreviewWithdrawBorrowVaultData(
+        borrow_price=fee_state.borrow_price,
+        borrow_token_decimals=fee_state.borrow_token_decimals,
+        withdraw_total_assets=withdraw_total_assets,
+        supply_after_fee=_preview_supply_after_fee(fee_state, withdraw_total_assets),
+        **common,
+    )
+
+
+def _get_total_assets_collateral(is_deposit, total_assets, fee_state):
+    return calculate_total_assets_collateral(
+        is_deposit,
+        total_assets,
+        fee_state.collateral_price,
+        fee_state.borrow_price,
+        fee_state.borrow_token_decimals,
+        fee_state.collateral_token_decimals,
+    )
+
+
+def preview_deposit_vault_state_to_preview_collateral_vault_data(
+    real_collateral, real_borrow, state
+):
+    """_previewDepositVaultStateToPreviewCollateralVaultData"""
+    fee_state = state.max_growth_fee_state
+    common = _get_common_data(real_collateral, real_borrow, state, True)
+    total_assets = calculate_total_assets_from_data(
+        True,
+        common["collateral"],
+        common["borrow"],
+        fee_state.borrow_price,
+        fee_state.borrow_token_decimals,
+    )
+    withdraw_total_assets = _get_withdraw_total_assets_of_state(fee_state)
+    return PreviewCollateralVaultData(
+        collateral_price=fee_state.collateral_price,
+        collateral_token_decimals=fee_state.collateral_token_decimals,
+        total_assets_collateral=_get_total_assets_collateral(
+            True, total_assets, fee_state
+        ),
+        withdraw_total_assets=withdraw_total_assets,
+        supply_after_fee=_preview_supply_after_fee(fee_state, withdraw_total_assets),
+        **common,
+    )
+
+
+def preview_withdraw_vault_state_to_preview_collateral_vault_data(
+    real_collateral, real_borrow, state
+):
+    """_previewWithdrawVaultStateToPreviewCollateralVaultData"""
+    fee_state = state.max_growth_fee_state
+    common = _get_common_data(real_collateral, real_borrow, state, False)
+    withdraw_total_assets = calculate_total_assets_from_data(
+        False,
+        common["collateral"],
+        common["borrow"],
+        fee_state.borrow_price,
+        fee_state.borrow_token_decimals,
+    )
+    return PreviewCollateralVaultData(
+        collateral_price=fee_state.collateral_price,
+        collateral_token_decimals=fee_state.collateral_token_decimals,
+        total_assets_collateral=_get_total_assets_collateral(
+            False, withdraw_total_assets, fee_state
+        ),
+        withdraw_total_assets=withdraw_total_assets,
+        supply_after_fee=_preview_supply_after_fee(fee_state, withdraw_total_assets),
+        **common,
+    )
+
+
+def _calculate_deposit_withdraw(data, delta_real_collateral, delta_real_borrow):
+    return calculate_deposit_withdraw(
+        DepositWithdrawData(
+            collateral=data.collateral,
+            borrow=data.borrow,
+            future_borrow=data.future_borrow,
+            future_collateral=data.future_collateral,
+            user_future_reward_borrow=data.user_future_reward_borrow,
+            user_future_reward_collateral=data.user_future_reward_collateral,
+            protocol_future_reward_borrow=data.protocol_future_reward_borrow,
+            protocol_future_reward_collateral=data.protocol_future_reward_collateral,
+            collateral_slippage=data.collateral_slippage,
+            borrow_slippage=data.borrow_slippage,
+            target_ltv_dividend=data.target_ltv_dividend,
+            target_ltv_divider=data.target_ltv_divider,
+            delta_real_collateral=delta_real_collateral,
+            delta_real_borrow=delta_real_borrow,
+        )
+    )
+
+
+def _calculate_mint_redeem(data, delta_shares, is_borrow):
+    return calculate_mint_redeem(
+        MintRedeemData(
+            collateral=data.collateral,
+            borrow=data.borrow,
+            future_borrow=data.future_borrow,
+            future_collateral=data.future_collateral,
+            user_future_reward_borrow=data.user_future_reward_borrow,
+            user_future_reward_collateral=data.user_future_reward_collateral,
+            protocol_future_reward_borrow=data.protocol_future_reward_borrow,
+            protocol_future_reward_collateral=data.protocol_future_reward_collateral,
+            collateral_slippage=data.collateral_slippage,
+            borrow_slippage=data.borrow_slippage,
+            target_ltv_dividend=data.target_ltv_dividend,
+            target_ltv_divider=data.target_ltv_divider,
+            delta_shares=delta_shares,
+            is_borrow=is_borrow,
+        )
+    )
+
+
+def preview_deposit_in_underlying(assets_in_underlying, data):
+    shares_in_underlying, delta_future = _calculate_deposit_withdraw(
+        data, 0, checked(-to_int256(assets_in_underlying))
+    )
+    if shares_in_underlying < 0:
+        return 0, delta_future
+    return shares_in_underlying, delta_future
+
+
+def preview_deposit(assets, data):
+    assets_in_underlying = u_mul_div_down(
+        assets, data.borrow_price, 10**data.borrow_token_decimals
+    )
+    shares_in_underlying, delta_future = preview_deposit_in_underlying(
+        assets_in_underlying, data
+    )
+    return (
+        u_mul_div_down(
+            u_mul_div_down(
+                shares_in_underlying, 10**data.borrow_token_decimals, data.borrow_price
+            ),
+            data.supply_after_fee,
+            data.deposit_total_assets,
+        ),
+        delta_future,
+    )
+
+
+def preview_mint_in_underlying(shares_in_underlying, data):
+    assets_in_underlying, delta_future = _calculate_mint_redeem(
+        data, to_int256(shares_in_underlying), True
+    )
+    if assets_in_underlying > 0:
+        return 0, delta_future
+    return -assets_in_underlying, delta_future
+
+
+def preview_mint(shares, data):
+    shares_in_underlying = u_mul_div_up(
+        u_mul_div_up(shares, data.deposit_total_assets, data.supply_after_fee),
+        data.borrow_price,
+        10**data.borrow_token_decimals,
+    )
+    assets_in_underlying, delta_future = preview_mint_in_underlying(
+        shares_in_underlying, data
+    )
+    return (
+        u_mul_div_up(
+            assets_in_underlying, 10**data.borrow_token_decimals, data.borrow_price
+        ),
+        delta_future,
+    )
+
+
+def preview_withdraw_in_underlying(assets_in_underlying, data):
+    shares_in_underlying, delta_future = _calculate_deposit_withdraw(
+        data, 0, to_int256(assets_in_underlying)
+    )
+    if shares_in_underlying > 0:
+        return 0, delta_future
+    return -shares_in_underlying, delta_future
+
+
+def preview_withdraw(assets, data):
+    assets_in_underlying = u_mul_div_up(
+        assets, data.borrow_price, 10**data.borrow_token_decimals
+    )
+    shares_in_underlying, delta_future = preview_withdraw_in_underlying(
+        assets_in_underlying, data
+    )
+    return (
+        u_mul_div_up(
+            u_mul_div_up(
+                shares_in_underlying, 10**data.borrow_token_decimals, data.borrow_price
+            ),
+            data.supply_after_fee,
+            data.withdraw_total_assets,
+        ),
+        delta_future,
+    )
+
+
+def preview_redeem_in_underlying(shares_in_underlying, data):
+    assets_in_underlying, delta_future = _calculate_mint_redeem(
+        data, checked(-to_int256(shares_in_underlying)), True
+    )
+    if assets_in_underlying < 0:
+        return 0, delta_future
+    return assets_in_underlying, delta_future
+
+
+def preview_redeem(shares, data):
+    shares_in_underlying = u_mul_div_down(
+        u_mul_div_down(shares, data.withdraw_total_assets, data.supply_after_fee),
+        data.borrow_price,
+        10**data.borrow_token_decimals,
+    )
+    assets_in_underlying, delta_future = preview_redeem_in_underlying(
+        shares_in_underlying, data
+    )
+    return (
+        u_mul_div_down(
+            assets_in_underlying, 10**data.borrow_token_decimals, data.borrow_price
+        ),
+        delta_future,
+    )
+
+
+def preview_deposit_collateral_in_underlying(assets_in_underlying, data):
+    shares_in_underlying, delta_future = _calculate_deposit_withdraw(
+        data, to_int256(assets_in_underlying), 0
+    )
+    if shares_in_underlying < 0:
+        return 0, delta_future
+    return shares_in_underlying, delta_future
+
+
+def preview_deposit_collateral(assets, data):
+    assets_in_underlying = u_mul_div_down(
+        assets, data.collateral_price, 10**data.collateral_token_decimals
+    )
+    shares_in_underlying, delta_future = preview_deposit_collateral_in_underlying(
+        assets_in_underlying, data
+    )
+    return (
+        u_mul_div_down(
+            u_mul_div_down(
+                shares_in_underlying,
+                10**data.collateral_token_decimals,
+                data.collateral_price,
+            ),
+            data.supply_after_fee,
+            data.total_assets_collateral,
+        ),
+        delta_future,
+    )
+
+
+def preview_mint_collateral_in_underlying(shares_in_underlying, data):
+    assets_in_underlying, delta_future = _calculate_mint_redeem(
+        data, to_int256(shares_in_underlying), False
+    )
+    if assets_in_underlying < 0:
+        return 0, delta_future
+    return assets_in_underlying, delta_future
+
+
+def preview_mint_collateral(shares, data):
+    shares_in_underlying = u_mul_div_up(
+        u_mul_div_up(shares, data.total_assets_collateral, data.supply_after_fee),
+        data.collateral_price,
+        10**data.collateral_token_decimals,
+    )
+    assets_in_underlying, delta_future = preview_mint_collateral_in_underlying(
+        shares_in_underlying, data
+    )
+    return (
+        u_mul_div_up(
+            assets_in_underlying,
+            10**data.collateral_token_decimals,
+            data.collateral_price,
+        ),
+        delta_future,
+    )
+
+
+def preview_withdraw_collateral_in_underlying(assets_in_underlying, data):
+    shares_in_underlying, delta_future = _calculate_deposit_withdraw(
+        data, checked(-to_int256(assets_in_underlying)), 0
+    )
+    if shares_in_underlying > 0:
+        return 0, delta_future
+    return -shares_in_underlying, delta_future
+
+
+def preview_withdraw_collateral(assets, data):
+    assets_in_underlying = u_mul_div_up(
+        assets, data.collateral_price, 10**data.collateral_token_decimals
+    )
+    shares_in_underlying, delta_future = preview_withdraw_collateral_in_underlying(
+        assets_in_underlying, data
+    )
+    return (
+        u_mul_div_up(
+            u_mul_div_up(
+                shares_in_underlying,
+                10**data.collateral_token_decimals,
+                data.collateral_price,
+            ),
+            data.supply_after_fee,
+            data.total_assets_collateral,
+        ),
+        delta_future,
+    )
+
+
+def preview_redeem_collateral_in_underlying(shares_in_underlying, data):
+    assets_in_underlying, delta_future = _calculate_mint_redeem(
+        data, checked(-to_int256(shares_in_underlying)), False
+    )
+    if assets_in_underlying >= 0:
+        return 0, delta_future
+    return -assets_in_underlying, delta_future
+
+
+def preview_redeem_collateral(shares, data):
+    shares_in_underlying = u_mul_div_down(
+        u_mul_div_down(shares, data.total_assets_collateral, data.supply_after_fee),
+        data.collateral_price,
+        10**data.collateral_token_decimals,
+    )
+    assets_in_underlying, delta_future = preview_redeem_collateral_in_underlying(
+        shares_in_underlying, data
+    )
+    return (
+        u_mul_div_down(
+            assets_in_underlying,
+            10**data.collateral_token_decimals,
+            data.collateral_price,
+        ),
+        delta_future,
+    )
@@ -0,0 +1,30 @@
+"""
+Solidity integer semantics on Python ints
+"""
+
+INT256_MIN = -(2**255)
+INT256_MAX = 2**255 - 1
+UINT256_MAX = 2**256 - 1
+
+
+class MathRevert(Exception):
+    """Raised wherever the Solidity code reverts"""
+
+
+def checked(value):
+    """Checked int256 arithmetic: reverts instead of overflowing like Solidity >= 0.8"""
+    if value > INT256_MAX or value < INT256_MIN:
+        raise MathRevert("int256 overflow")
+    return value
+
+
+def checked_uint(value, bits=256):
+    if value < 0 or value >> bits:
+        raise MathRevert(f"uint{bits} overflow")
+    return value
+
+
+def to_int256(value):
+    """Explicit int256(uint256) conversion, which wraps instead of reverting"""
+    value &= UINT256_MAX
+    return value - 2**256 if value > INT256_MAX else value
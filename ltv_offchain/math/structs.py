@@ -0,0 +1,423 @@
+"""
+Python counterparts of the structs in src/structs used by the vault math
+
+Field names are the snake_case versions of the Solidity ones.
+"""
+
+from collections import namedtuple
+
+Cases = namedtuple(
+    "Cases", ["cna", "cmcb", "cmbc", "cecb", "cebc", "ceccb", "cecbc", "ncase"]
+)
+
+DepositWithdrawData = namedtuple(
+    "DepositWithdrawData",
+    [
+        "collateral",
+        "borrow",
+        "future_borrow",
+        "future_collateral",
+        "user_future_reward_borrow",
+        "user_future_reward_collateral",
+        "protocol_future_reward_borrow",
+        "protocol_future_reward_collateral",
+        "collateral_slippage",
+        "borrow_slippage",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "delta_real_collateral",
+        "delta_real_borrow",
+    ],
+)
+
+MintRedeemData = namedtuple(
+    "MintRedeemData",
+    [
+        "collateral",
+        "borrow",
+        "future_borrow",
+        "future_collateral",
+        "user_future_reward_borrow",
+        "user_future_reward_collateral",
+        "protocol_future_reward_borrow",
+        "protocol_future_reward_collateral",
+        "collateral_slippage",
+        "borrow_slippage",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "delta_shares",
+        "is_borrow",
+    ],
+)
+
+DeltaRealBorrowAndDeltaRealCollateralData = namedtuple(
+    "DeltaRealBorrowAndDeltaRealCollateralData",
+    [
+        "delta_real_collateral",
+        "delta_real_borrow",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "collateral_slippage",
+        "borrow_slippage",
+        "collateral",
+        "borrow",
+        "future_borrow",
+        "future_collateral",
+        "user_future_reward_borrow",
+        "user_future_reward_collateral",
+        "protocol_future_reward_borrow",
+        "protocol_future_reward_collateral",
+    ],
+)
+
+DeltaSharesAndDeltaRealCollateralData = namedtuple(
+    "DeltaSharesAndDeltaRealCollateralData",
+    [
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "borrow",
+        "collateral",
+        "protocol_future_reward_borrow",
+        "protocol_future_reward_collateral",
+        "delta_shares",
+        "delta_real_collateral",
+        "user_future_reward_collateral",
+        "future_collateral",
+        "future_borrow",
+        "collateral_slippage",
+    ],
+)
+
+DeltaSharesAndDeltaRealBorrowData = namedtuple(
+    "DeltaSharesAndDeltaRealBorrowData",
+    [
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "borrow",
+        "collateral",
+        "protocol_future_reward_borrow",
+        "protocol_future_reward_collateral",
+        "delta_shares",
+        "delta_real_borrow",
+        "user_future_reward_borrow",
+        "future_borrow",
+        "future_collateral",
+        "borrow_slippage",
+    ],
+)
+
+DeltaFuture = namedtuple(
+    "DeltaFuture",
+    [
+        "delta_future_collateral",
+        "delta_future_borrow",
+        "delta_protocol_future_reward_collateral",
+        "delta_user_future_reward_collateral",
+        "delta_future_payment_collateral",
+        "delta_protocol_future_reward_borrow",
+        "delta_user_future_reward_borrow",
+        "delta_future_payment_borrow",
+        "cases",
+    ],
+)
+
+NextStepData = namedtuple(
+    "NextStepData",
+    [
+        "future_borrow",
+        "future_collateral",
+        "future_reward_borrow",
+        "future_reward_collateral",
+        "delta_future_borrow",
+        "delta_future_collateral",
+        "delta_future_payment_borrow",
+        "delta_user_future_reward_borrow",
+        "delta_protocol_future_reward_borrow",
+        "delta_future_payment_collateral",
+        "delta_user_future_reward_collateral",
+        "delta_protocol_future_reward_collateral",
+        "block_number",
+        "auction_step",
+        "cases",
+    ],
+)
+
+NextState = namedtuple(
+    "NextState",
+    [
+        "future_borrow",
+        "future_collateral",
+        "future_reward_borrow",
+        "future_reward_collateral",
+        "start_auction",
+    ],
+)
+
+AuctionData = namedtuple(
+    "AuctionData",
+    [
+        "future_borrow_assets",
+        "future_collateral_assets",
+        "future_reward_borrow_assets",
+        "future_reward_collateral_assets",
+        "auction_step",
+        "auction_duration",
+    ],
+)
+
+DeltaAuctionState = namedtuple(
+    "DeltaAuctionState",
+    [
+        "delta_future_borrow_assets",
+        "delta_future_collateral_assets",
+        "delta_user_collateral_assets",
+        "delta_user_borrow_assets",
+        "delta_user_future_reward_collateral_assets",
+        "delta_user_future_reward_borrow_assets",
+        "delta_protocol_future_reward_collateral_assets",
+        "delta_protocol_future_reward_borrow_assets",
+    ],
+)
+
+LowLevelRebalanceData = namedtuple(
+    "LowLevelRebalanceData",
+    [
+        "future_collateral",
+        "future_borrow",
+        "real_collateral",
+        "real_borrow",
+        "user_future_reward_collateral",
+        "user_future_reward_borrow",
+        "protocol_future_reward_collateral",
+        "protocol_future_reward_borrow",
+        "collateral_price",
+        "collateral_token_decimals",
+        "borrow_price",
+        "borrow_token_decimals",
+        "supply_after_fee",
+        "total_assets",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "withdraw_total_assets",
+    ],
+)
+
+# TotalAssetsState with its CommonTotalAssetsState fields inlined
+TotalAssetsState = namedtuple(
+    "TotalAssetsState",
+    [
+        "real_collateral_assets",
+        "real_borrow_assets",
+        "future_borrow_assets",
+        "future_collateral_assets",
+        "future_reward_borrow_assets",
+        "future_reward_collateral_assets",
+        "borrow_price",
+        "collateral_price",
+        "borrow_token_decimals",
+        "collateral_token_decimals",
+    ],
+)
+
+MaxGrowthFeeData = namedtuple(
+    "MaxGrowthFeeData",
+    [
+        "withdraw_total_assets",
+        "max_growth_fee_dividend",
+        "max_growth_fee_divider",
+        "supply",
+        "last_seen_token_price",
+    ],
+)
+
+MintProtocolRewardsData = namedtuple(
+    "MintProtocolRewardsData",
+    [
+        "delta_protocol_future_reward_borrow",
+        "delta_protocol_future_reward_collateral",
+        "supply",
+        "total_appropriate_assets",
+        "asset_price",
+        "asset_token_decimals",
+    ],
+)
+
+# MaxGrowthFeeState with its CommonTotalAssetsState fields inlined
+MaxGrowthFeeState = namedtuple(
+    "MaxGrowthFeeState",
+    [
+        "future_borrow_assets",
+        "future_collateral_assets",
+        "future_reward_borrow_assets",
+        "future_reward_collateral_assets",
+        "borrow_price",
+        "collateral_price",
+        "borrow_token_decimals",
+        "collateral_token_decimals",
+        "withdraw_real_collateral_assets",
+        "withdraw_real_borrow_assets",
+        "max_growth_fee_dividend",
+        "max_growth_fee_divider",
+        "supply",
+        "last_seen_token_price",
+    ],
+)
+
+PreviewDepositVaultState = namedtuple(
+    "PreviewDepositVaultState",
+    [
+        "max_growth_fee_state",
+        "deposit_real_borrow_assets",
+        "deposit_real_collateral_assets",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "start_auction",
+        "auction_duration",
+        "block_number",
+        "collateral_slippage",
+        "borrow_slippage",
+    ],
+)
+
+PreviewWithdrawVaultState = namedtuple(
+    "PreviewWithdrawVaultState",
+    [
+        "max_growth_fee_state",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "start_auction",
+        "auction_duration",
+        "block_number",
+        "collateral_slippage",
+        "borrow_slippage",
+    ],
+)
+
+PreviewDepositBorrowVaultData = namedtuple(
+    "PreviewDepositBorrowVaultData",
+    [
+        "collateral",
+        "borrow",
+        "future_borrow",
+        "future_collateral",
+        "user_future_reward_borrow",
+        "user_future_reward_collateral",
+        "protocol_future_reward_borrow",
+        "protocol_future_reward_collateral",
+        "collateral_slippage",
+        "borrow_slippage",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "borrow_price",
+        "borrow_token_decimals",
+        "supply_after_fee",
+        "withdraw_total_assets",
+        "deposit_total_assets",
+    ],
+)
+
+PreviewWithdrawBorrowVaultData = namedtuple(
+    "PreviewWithdrawBorrowVaultData",
+    [
+        "collateral",
+        "borrow",
+        "future_borrow",
+        "future_collateral",
+        "user_future_reward_borrow",
+        "user_future_reward_collateral",
+        "protocol_future_reward_borrow",
+        "protocol_future_reward_collateral",
+        "collateral_slippage",
+        "borrow_slippage",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "borrow_price",
+        "borrow_token_decimals",
+        "supply_after_fee",
+        "withdraw_total_assets",
+    ],
+)
+
+PreviewCollateralVaultData = namedtuple(
+    "PreviewCollateralVaultData",
+    [
+        "collateral",
+        "borrow",
+        "future_borrow",
+        "future_collateral",
+        "user_future_reward_borrow",
+        "user_future_reward_collateral",
+        "protocol_future_reward_borrow",
+        "protocol_future_reward_collateral",
+        "collateral_slippage",
+        "borrow_slippage",
+        "target_ltv_dividend",
+        "target_ltv_divider",
+        "collateral_price",
+        "collateral_token_decimals",
+        "supply_after_fee",
+        "total_assets_collateral",
+        "withdraw_total_assets",
+    ],
+)
+
+# MaxDepositMintBorrowVaultState and MaxDepositMintCollateralVaultState
+MaxDepositMintVaultState = namedtuple(
+    "MaxDepositMintVaultState",
+    [
+        "preview_deposit_vault_state",
+        "max_total_assets_in_underlying",
+        "min_profit_ltv_dividend",
+        "min_profit_ltv_divider",
+    ],
+)
+
+# MaxWithdrawRedeemBorrowVaultState and MaxWithdrawRedeemCollateralVaultState
+MaxWithdrawRedeemVaultState = namedtuple(
+    "MaxWithdrawRedeemVaultState",
+    [
+        "preview_withdraw_vault_state",
+        "max_safe_ltv_dividend",
+        "max_safe_ltv_divider",
+        "owner_balance",
+    ],
+)
+
+# MaxDepositMintBorrowVaultData and MaxDepositMintCollateralVaultData,
+# preview_data being the borrow or collateral preview data
+MaxDepositMintVaultData = namedtuple(
+    "MaxDepositMintVaultData",
+    [
+        "preview_data",
+        "real_collateral",
+        "real_borrow",
+        "max_total_assets_in_underlying",
+        "min_profit_ltv_dividend",
+        "min_profit_ltv_divider",
+    ],
+)
+
+# MaxWithdrawRedeemBorrowVaultData and MaxWithdrawRedeemCollateralVaultData
+MaxWithdrawRedeemVaultData = namedtuple(
+    "MaxWithdrawRedeemVaultData",
+    [
+        "preview_data",
+        "real_collateral",
+        "real_borrow",
+        "max_safe_ltv_dividend",
+        "max_safe_ltv_divider",
+        "owner_balance",
+    ],
+)
+
+# Future assets and start auction stored by VaultStateTransition
+FutureAssetsState = namedtuple(
+    "FutureAssetsState",
+    [
+        "future_borrow_assets",
+        "future_collateral_assets",
+        "future_reward_borrow_assets",
+        "future_reward_collateral_assets",
+        "start_auction",
+    ],
+)
@@ -0,0 +1,813 @@
+"""
+Unchecked fast path of calculate_deposit_withdraw, calculate_mint_redeem and
+the execute auction calculations
+
+Python ints never overflow, so the checked int256 arithmetic of the reference
+port can only differ from plain arithmetic once a value leaves the int256
+range. With every input below INPUT_BOUND and slippages below SLIPPAGE_BOUND no
+intermediate value gets close to 2**255, except for deltas divided by a tiny
+future position, which are guarded by DELTA_BOUND. Rows outside these bounds
+and rows reaching any revert of the Solidity code raise Fallback, the caller
+then runs the checked reference implementation for them.
+
+Case flags are 0 or 1, so the formulas below are the reference ones with
+every zero term dropped.
+"""
+
+from ltv_offchain.math.constants import (
+    DIVIDER_PRECISION as P,
+    FUTURE_ADJUSTMENT_DENOMINATOR,
+    FUTURE_ADJUSTMENT_NUMERATOR,
+    SLIPPAGE_PRECISION,
+)
+from ltv_offchain.math.delta_future_borrow import delta_shares_and_delta_real_borrow
+from ltv_offchain.math.delta_future_collateral import (
+    delta_real_borrow_and_delta_real_collateral,
+    delta_shares_and_delta_real_collateral,
+)
+
+INPUT_BOUND = 2**100
+SLIPPAGE_BOUND = 2**64
+DELTA_BOUND = 2**120
+
+NEUTRAL_CASE = 6
+
+
+class Fallback(Exception):
+    """The row must be computed by the checked reference implementation"""
+
+
+def _md(x, y, denominator, is_up):
+    if is_up:
+        return -(-x * y // denominator)
+    return x * y // denominator
+
+
+def _check_bounds(values, collateral_slippage, borrow_slippage, dividend, divider):
+    if max(map(abs, values)) >= INPUT_BOUND:
+        raise Fallback()
+    if not (
+        0 <= collateral_slippage < SLIPPAGE_BOUND
+        and 0 <= borrow_slippage < SLIPPAGE_BOUND
+        and 0 <= dividend <= divider < 2**16
+        and divider > 0
+    ):
+        raise Fallback()
+
+
+def _check_delta(delta):
+    if not -DELTA_BOUND < delta < DELTA_BOUND:
+        raise Fallback()
+    return delta
+
+
+def _search_cases(
+    future,
+    future_other,
+    dividend,
+    divider,
+    case_rounding,
+    invert_final_rounding,
+    positive_cache_round_up,
+    negative_cache_round_up,
+):
+    """
+    Case search shared by the three delta_future libraries, future is the
+    position the library solves for. dividend(ncase, round up) and
+    divider(ncase, round up) are the library formulas. Returns (delta, ncase).
+    """
+
+    def single_case(ncase, cache_dividend=None):
+        round_up_dividend, round_up_divider = case_rounding[ncase]
+        if cache_dividend is None:
+            cache_dividend = dividend(ncase, round_up_dividend)
+        case_divider = divider(ncase, round_up_divider)
+        if case_divider == 0:
+            return 0, False
+        round_up = round_up_dividend != invert_final_rounding
+        return _md(cache_dividend, P, case_divider, round_up), True
+
+    if future > 0 or future_other > 0:
+        first, exceeding, last, sign = 1, 4, 2, 1
+        cache_dividend = dividend(NEUTRAL_CASE, positive_cache_round_up)
+    elif future < 0 or future_other < 0:
+        first, exceeding, last, sign = 0, 5, 3, -1
+        cache_dividend = dividend(NEUTRAL_CASE, negative_cache_round_up)
+    else:
+        delta, success = single_case(1)
+        if delta > 0 and success:
+            return delta, 1
+        delta, success = single_case(0)
+        if delta < 0 and success:
+            return delta, 0
+        return 0, NEUTRAL_CASE
+
+    delta, success = single_case(first, cache_dividend)
+    if success and delta * sign > 0:
+        return delta, first
+    if success and delta == 0:
+        return 0, NEUTRAL_CASE
+
+    delta, success = single_case(exceeding)
+    if success and (delta + future) * sign < 0:
+        return delta, exceeding
+
+    delta, success = single_case(last, cache_dividend)
+    if not success:
+        raise Fallback()
+    if (delta + future) * sign < 0:
+        adjusted_future = _md(
+            future,
+            FUTURE_ADJUSTMENT_NUMERATOR,
+            FUTURE_ADJUSTMENT_DENOMINATOR,
+            sign > 0,
+        )
+        if (delta + adjusted_future) * sign > 0 and delta * sign < 0:
+            delta = -future
+        else:
+            raise Fallback()
+    return delta, last
+
+
+def _delta_future_borrow_from_delta_future_collateral(
+    ncase, future_collateral, future_borrow, delta_future_collateral
+):
+    if ncase == 4 or ncase == 5:
+        return delta_future_collateral + future_collateral - future_borrow
+    if ncase == 2 or ncase == 3:
+        if future_collateral == 0:
+            return 0
+        return _md(delta_future_collateral, future_borrow, future_collateral, True)
+    return delta_future_collateral
+
+
+def _delta_future_collateral_from_delta_future_borrow(
+    ncase, future_collateral, future_borrow, delta_future_borrow
+):
+    if ncase == 4 or ncase == 5:
+        return delta_future_borrow + future_borrow - future_collateral
+    if ncase == 2 or ncase == 3:
+        if future_borrow == 0:
+            return 0
+        return _md(delta_future_borrow, future_collateral, future_borrow, False)
+    return delta_future_borrow
+
+
+def _delta_future(
+    ncase,
+    future_collateral,
+    future_borrow,
+    user_future_reward_collateral,
+    protocol_future_reward_collateral,
+    user_future_reward_borrow,
+    protocol_future_reward_borrow,
+    collateral_slippage,
+    borrow_slippage,
+    delta_future_collateral,
+    delta_future_borrow,
+):
+    """DeltaFuture fields in struct order, without cases"""
+    delta_protocol_future_reward_collateral = 0
+    delta_user_future_reward_collateral = 0
+    delta_future_payment_collateral = 0
+    delta_protocol_future_reward_borrow = 0
+    delta_user_future_reward_borrow = 0
+    delta_future_payment_borrow = 0
+    if ncase == 0:
+        delta_future_payment_borrow = -_md(
+            delta_future_borrow, borrow_slippage, SLIPPAGE_PRECISION, False
+        )
+    elif ncase == 1:
+        delta_future_payment_collateral = -_md(
+            delta_future_collateral, collateral_slippage, SLIPPAGE_PRECISION, True
+        )
+    elif ncase == 2:
+        if future_collateral != 0:
+            delta_protocol_future_reward_collateral = _md(
+                protocol_future_reward_collateral,
+                delta_future_collateral,
+                future_collateral,
+                False,
+            )
+            delta_user_future_reward_collateral = _md(
+                user_future_reward_collateral,
+                delta_future_collateral,
+                future_collateral,
+                False,
+            )
+    elif ncase == 3:
+        if future_borrow != 0:
+            delta_protocol_future_reward_borrow = _md(
+                protocol_future_reward_borrow, delta_future_borrow, future_borrow, True
+            )
+            delta_user_future_reward_borrow = _md(
+                user_future_reward_borrow, delta_future_borrow, future_borrow, True
+            )
+    elif ncase == 4:
+        delta_protocol_future_reward_collateral = -protocol_future_reward_collateral
+        delta_user_future_reward_collateral = -user_future_reward_collateral
+        delta_future_payment_borrow = -_md(
+            delta_future_borrow + future_borrow,
+            borrow_slippage,
+            SLIPPAGE_PRECISION,
+            False,
+        )
+    elif ncase == 5:
+        delta_future_payment_collateral = -_md(
+            delta_future_collateral + future_collateral,
+            collateral_slippage,
+            SLIPPAGE_PRECISION,
+            True,
+        )
+        delta_protocol_future_reward_borrow = -protocol_future_reward_borrow
+        delta_user_future_reward_borrow = -user_future_reward_borrow
+    return (
+        delta_future_collateral,
+        delta_future_borrow,
+        delta_protocol_future_reward_collateral,
+        delta_user_future_reward_collateral,
+        delta_future_payment_collateral,
+        delta_protocol_future_reward_borrow,
+        delta_user_future_reward_borrow,
+        delta_future_payment_borrow,
+    )
+
+
+def calculate_deposit_withdraw(data):
+    """
+    Same as deposit_withdraw.calculate_deposit_withdraw for a DepositWithdrawData
+    (or a tuple in its field order) but returns (shares as assets, DeltaFuture
+    fields without cases, ncase)
+    """
+    (
+        collateral,
+        borrow,
+        future_borrow,
+        future_collateral,
+        user_future_reward_borrow,
+        user_future_reward_collateral,
+        protocol_future_reward_borrow,
+        protocol_future_reward_collateral,
+        collateral_slippage,
+        borrow_slippage,
+        target_ltv_dividend,
+        target_ltv_divider,
+        delta_real_collateral,
+        delta_real_borrow,
+    ) = data
+    _check_bounds(
+        (
+            collateral,
+            borrow,
+            future_borrow,
+            future_collateral,
+            user_future_reward_borrow,
+            user_future_reward_collateral,
+            protocol_future_reward_borrow,
+            protocol_future_reward_collateral,
+            delta_real_collateral,
+            delta_real_borrow,
+        ),
+        collateral_slippage,
+        borrow_slippage,
+        target_ltv_dividend,
+        target_ltv_divider,
+    )
+
+    def dividend(ncase, round_up):
+        result = -borrow - delta_real_borrow
+        with_target_ltv = collateral + delta_real_collateral
+        if ncase == 4:
+            result += (
+                future_borrow
+                - future_collateral
+                + _md(future_collateral, borrow_slippage, SLIPPAGE_PRECISION, round_up)
+            )
+            with_target_ltv -= (
+                user_future_reward_collateral + protocol_future_reward_collateral
+            )
+        elif ncase == 5:
+            result += (
+                future_borrow
+                - future_collateral
+                + user_future_reward_borrow
+                + protocol_future_reward_borrow
+            )
+            with_target_ltv += _md(
+                -future_collateral, collateral_slippage, SLIPPAGE_PRECISION, round_up
+            )
+        return result + _md(
+            with_target_ltv, target_ltv_dividend, target_ltv_divider, round_up
+        )
+
+    def divider(ncase, round_up):
+        if ncase == 0 or ncase == 4:
+            return (
+                P
+                - borrow_slippage
+                + _md(-P, target_ltv_dividend, target_ltv_divider, round_up)
+            )
+        if ncase == 1 or ncase == 5:
+            return P + _md(
+                collateral_slippage - P,
+                target_ltv_dividend,
+                target_ltv_divider,
+                round_up,
+            )
+        result = 0
+        with_target_ltv = -P
+        if future_collateral != 0:
+            if ncase == 2:
+                result = _md(future_borrow, P, future_collateral, round_up)
+                with_target_ltv += _md(
+                    -(
+                        user_future_reward_collateral
+                        + protocol_future_reward_collateral
+                    ),
+                    P,
+                    future_collateral,
+                    round_up,
+                )
+            else:
+                result = _md(
+                    future_borrow
+                    + user_future_reward_borrow
+                    + protocol_future_reward_borrow,
+                    P,
+                    future_collateral,
+                    round_up,
+                )
+        return result + _md(
+            with_target_ltv, target_ltv_dividend, target_ltv_divider, round_up
+        )
+
+    delta_future_collateral, ncase = _search_cases(
+        future_collateral,
+        future_borrow,
+        dividend,
+        divider,
+        delta_real_borrow_and_delta_real_collateral.CASE_ROUNDING,
+        False,
+        True,
+        False,
+    )
+    delta_future_collateral = _check_delta(delta_future_collateral)
+    delta_future_borrow = _check_delta(
+        _delta_future_borrow_from_delta_future_collateral(
+            ncase, future_collateral, future_borrow, delta_future_collateral
+        )
+    )
+    delta_future = _delta_future(
+        ncase,
+        future_collateral,
+        future_borrow,
+        user_future_reward_collateral,
+        protocol_future_reward_collateral,
+        user_future_reward_borrow,
+        protocol_future_reward_borrow,
+        collateral_slippage,
+        borrow_slippage,
+        delta_future_collateral,
+        delta_future_borrow,
+    )
+    shares_as_assets = (
+        delta_real_collateral
+        + delta_future_collateral
+        + delta_future[3]
+        + delta_future[4]
+        - delta_real_borrow
+        - delta_future_borrow
+        - delta_future[6]
+        - delta_future[7]
+    )
+    return shares_as_assets, delta_future, ncase
+
+
+def calculate_mint_redeem(data):
+    """
+    Same as mint_redeem.calculate_mint_redeem for a MintRedeemData (or a tuple
+    in its field order) but returns (assets, DeltaFuture fields without
+    cases, ncase)
+    """
+    (
+        collateral,
+        borrow,
+        future_borrow,
+        future_collateral,
+        user_future_reward_borrow,
+        user_future_reward_collateral,
+        protocol_future_reward_borrow,
+        protocol_future_reward_collateral,
+        collateral_slippage,
+        borrow_slippage,
+        target_ltv_dividend,
+        target_ltv_divider,
+        delta_shares,
+        is_borrow,
+    ) = data
+    _check_bounds(
+        (
+            collateral,
+            borrow,
+            future_borrow,
+            future_collateral,
+            user_future_reward_borrow,
+            user_future_reward_collateral,
+            protocol_future_reward_borrow,
+            protocol_future_reward_collateral,
+            delta_shares,
+        ),
+        collateral_slippage,
+        borrow_slippage,
+        target_ltv_dividend,
+        target_ltv_divider,
+    )
+    one_minus_target_ltv_dividend = target_ltv_divider - target_ltv_dividend
+
+    if is_borrow:
+
+        def dividend(ncase, round_up):
+            result = borrow - delta_shares
+            with_target_ltv = -collateral
+            with_one_minus_target_ltv = 0
+            if ncase == 5:
+                result -= protocol_future_reward_borrow
+                with_one_minus_target_ltv = _md(
+                    -future_collateral,
+                    collateral_slippage,
+                    SLIPPAGE_PRECISION,
+                    round_up,
+                )
+            elif ncase == 4:
+                with_target_ltv += protocol_future_reward_collateral
+                with_one_minus_target_ltv = -user_future_reward_collateral
+            return (
+                result
+                + _md(
+                    with_one_minus_target_ltv,
+                    one_minus_target_ltv_dividend,
+                    target_ltv_divider,
+                    round_up,
+                )
+                + _md(
+                    with_target_ltv, target_ltv_dividend, target_ltv_divider, round_up
+                )
+            )
+
+        def divider(ncase, round_up):
+            result = 0
+            with_one_minus_target_ltv = -P
+            if ncase == 2 and future_collateral != 0:
+                with_one_minus_target_ltv += _md(
+                    -user_future_reward_collateral, P, future_collateral, round_up
+                )
+                result = _md(
+                    protocol_future_reward_collateral,
+                    P * target_ltv_dividend,
+                    future_collateral * target_ltv_divider,
+                    round_up,
+                )
+            elif ncase == 3 and future_collateral != 0:
+                result = _md(
+                    -protocol_future_reward_borrow, P, future_collateral, round_up
+                )
+            elif ncase == 1 or ncase == 5:
+                with_one_minus_target_ltv += collateral_slippage
+            return result + _md(
+                with_one_minus_target_ltv,
+                one_minus_target_ltv_dividend,
+                target_ltv_divider,
+                round_up,
+            )
+
+        delta_future_collateral, ncase = _search_cases(
+            future_collateral,
+            future_borrow,
+            dividend,
+            divider,
+            delta_shares_and_delta_real_collateral.CASE_ROUNDING,
+            True,
+            False,
+            False,
+        )
+        delta_future_collateral = _check_delta(delta_future_collateral)
+        delta_future_borrow = _check_delta(
+            _delta_future_borrow_from_delta_future_collateral(
+                ncase, future_collateral, future_borrow, delta_future_collateral
+            )
+        )
+    else:
+
+        def dividend(ncase, round_up):
+            result = borrow
+            with_target_ltv = -collateral - delta_shares
+            with_one_minus_target_ltv = 0
+            if ncase == 5:
+                result -= protocol_future_reward_borrow
+                with_one_minus_target_ltv = -user_future_reward_borrow
+            elif ncase == 4:
+                with_one_minus_target_ltv = _md(
+                    -future_borrow, borrow_slippage, SLIPPAGE_PRECISION, round_up
+                )
+                with_target_ltv += protocol_future_reward_collateral
+            return (
+                result
+                + _md(
+                    with_one_minus_target_ltv,
+                    one_minus_target_ltv_dividend,
+                    target_ltv_divider,
+                    round_up,
+                )
+                + _md(
+                    with_target_ltv, target_ltv_dividend, target_ltv_divider, round_up
+                )
+            )
+
+        def divider(ncase, round_up):
+            result = 0
+            with_one_minus_target_ltv = -P
+            if ncase == 3 and future_borrow != 0:
+                with_one_minus_target_ltv += _md(
+                    -user_future_reward_borrow, P, future_borrow, round_up
+                )
+                result = _md(-protocol_future_reward_borrow, P, future_borrow, round_up)
+            elif ncase == 2 and future_borrow != 0:
+                result = _md(
+                    protocol_future_reward_collateral,
+                    P * target_ltv_dividend,
+                    future_borrow * target_ltv_divider,
+                    round_up,
+                )
+            elif ncase == 0 or ncase == 4:
+                with_one_minus_target_ltv += borrow_slippage
+            return result + _md(
+                with_one_minus_target_ltv,
+                one_minus_target_ltv_dividend,
+                target_ltv_divider,
+                round_up,
+            )
+
+        delta_future_borrow, ncase = _search_cases(
+            future_borrow,
+            future_collateral,
+            dividend,
+            divider,
+            delta_shares_and_delta_real_borrow.CASE_ROUNDING,
+            True,
+            False,
+            True,
+        )
+        delta_future_borrow = _check_delta(delta_future_borrow)
+        delta_future_collateral = _check_delta(
+            _delta_future_collateral_from_delta_future_borrow(
+                ncase, future_collateral, future_borrow, delta_future_borrow
+            )
+        )
+
+    delta_future = _delta_future(
+        ncase,
+        future_collateral,
+        future_borrow,
+        user_future_reward_collateral,
+        protocol_future_reward_collateral,
+        user_future_reward_borrow,
+        protocol_future_reward_borrow,
+        collateral_slippage,
+        borrow_slippage,
+        delta_future_collateral,
+        delta_future_borrow,
+    )
+    assets = (
+        delta_future_collateral
+        + delta_future[3]
+        + delta_future[4]
+        - delta_shares
+        - delta_future_borrow
+        - delta_future[6]
+        - delta_future[7]
+    )
+    return (assets if is_borrow else -assets), delta_future, ncase
+
+
+def _check_auction_bounds(delta_user_assets, data):
+    (
+        future_borrow_assets,
+        future_collateral_assets,
+        future_reward_borrow_assets,
+        future_reward_collateral_assets,
+        auction_step,
+        auction_duration,
+    ) = data
+    if not (
+        -INPUT_BOUND < delta_user_assets < INPUT_BOUND
+        and -INPUT_BOUND < future_borrow_assets < INPUT_BOUND
+        and -INPUT_BOUND < future_collateral_assets < INPUT_BOUND
+        and -INPUT_BOUND < future_reward_borrow_assets < INPUT_BOUND
+        and -INPUT_BOUND < future_reward_collateral_assets < INPUT_BOUND
+        and future_borrow_assets != 0
+        and future_collateral_assets != 0
+        and 0 <= auction_step < 2**24
+        and 0 < auction_duration < 2**24
+    ):
+        raise Fallback()
+    return data
+
+
+def _is_within_auction_size(available_assets, delta_user_assets):
+    return (available_assets > 0 and available_assets >= -delta_user_assets) or (
+        available_assets < 0 and available_assets <= -delta_user_assets
+    )
+
+
+def calculate_execute_auction_collateral(delta_user_collateral_assets, data):
+    """
+    Same as auction_math.calculate_execute_auction_collateral for an
+    AuctionData (or a tuple in its field order) but returns a plain tuple of
+    the DeltaAuctionState fields
+    """
+    (
+        future_borrow,
+        future_collateral,
+        future_reward_borrow,
+        future_reward_collateral,
+        step,
+        duration,
+    ) = _check_auction_bounds(delta_user_collateral_assets, data)
+    delta_user = delta_user_collateral_assets
+    if not (
+        future_collateral * delta_user < 0
+        and _is_within_auction_size(
+            future_collateral - _md(-future_reward_collateral, step, duration, True),
+            delta_user,
+        )
+    ):
+        raise Fallback()
+
+    delta_user_borrow = 0
+    delta_user_future_reward_collateral = 0
+    delta_user_future_reward_borrow = 0
+    delta_protocol_future_reward_collateral = 0
+    delta_protocol_future_reward_borrow = 0
+    if delta_user > 0:
+        delta_future_collateral = delta_user
+        delta_future_borrow = _md(
+            delta_future_collateral, future_borrow, future_collateral, True
+        )
+        if delta_future_borrow == -future_borrow:
+            delta_future_collateral = -future_collateral
+        delta_future_reward_borrow = _md(
+            future_reward_borrow, delta_future_borrow, future_borrow, True
+        )
+        delta_user_future_reward_borrow = _md(
+            delta_future_reward_borrow, step, duration, False
+        )
+        delta_protocol_future_reward_borrow = (
+            delta_future_reward_borrow - delta_user_future_reward_borrow
+        )
+        delta_user_borrow = delta_future_borrow + delta_user_future_reward_borrow
+    else:
+        divider = future_collateral + _md(
+            future_reward_collateral, step, duration, False
+        )
+        if divider == 0:
+            delta_future_collateral = -future_collateral
+        else:
+            delta_future_collateral = _check_delta(
+                _md(delta_user, future_collateral, divider, True)
+            )
+        delta_future_borrow = _md(
+            delta_future_collateral, future_borrow, future_collateral, True
+        )
+        delta_user_borrow = delta_future_borrow
+        if (
+            delta_future_borrow == -future_borrow
+            and delta_future_collateral != -future_collateral
+        ):
+            delta_future_collateral = -future_collateral
+            delta_future_reward_collateral = _md(
+                future_reward_collateral,
+                delta_future_collateral,
+                future_collateral,
+                False,
+            )
+            delta_user_future_reward_collateral = _md(
+                delta_future_reward_collateral, step, duration, True
+            )
+        else:
+            delta_future_reward_collateral = _md(
+                future_reward_collateral,
+                delta_future_collateral,
+                future_collateral,
+                False,
+            )
+            delta_user_future_reward_collateral = delta_user - delta_future_collateral
+        delta_protocol_future_reward_collateral = (
+            delta_future_reward_collateral - delta_user_future_reward_collateral
+        )
+
+    if not delta_user <= delta_future_collateral + delta_user_future_reward_collateral:
+        raise Fallback()
+    return (
+        delta_future_borrow,
+        delta_future_collateral,
+        delta_user,
+        delta_user_borrow,
+        delta_user_future_reward_collateral,
+        delta_user_future_reward_borrow,
+        delta_protocol_future_reward_collateral,
+        delta_protocol_future_reward_borrow,
+    )
+
+
+def calculate_execute_auction_borrow(delta_user_borrow_assets, data):
+    """
+    Same as auction_math.calculate_execute_auction_borrow for an AuctionData
+    (or a tuple in its field order) but returns a plain tuple of the
+    DeltaAuctionState fields
+    """
+    (
+        future_borrow,
+        future_collateral,
+        future_reward_borrow,
+        future_reward_collateral,
+        step,
+        duration,
+    ) = _check_auction_bounds(delta_user_borrow_assets, data)
+    delta_user = delta_user_borrow_assets
+    if not (
+        future_borrow * delta_user < 0
+        and _is_within_auction_size(
+            future_borrow - _md(-future_reward_borrow, step, duration, False),
+            delta_user,
+        )
+    ):
+        raise Fallback()
+
+    delta_user_collateral = 0
+    delta_user_future_reward_collateral = 0
+    delta_user_future_reward_borrow = 0
+    delta_protocol_future_reward_collateral = 0
+    delta_protocol_future_reward_borrow = 0
+    if delta_user > 0:
+        divider = future_borrow + _md(future_reward_borrow, step, duration, True)
+        if divider == 0:
+            delta_future_borrow = -future_borrow
+        else:
+            delta_future_borrow = _check_delta(
+                _md(delta_user, future_borrow, divider, False)
+            )
+        delta_future_collateral = _md(
+            delta_future_borrow, future_collateral, future_borrow, False
+        )
+        delta_user_collateral = delta_future_collateral
+        if (
+            delta_future_collateral == -future_collateral
+            and delta_future_borrow != -future_borrow
+        ):
+            delta_future_borrow = -future_borrow
+            delta_future_reward_borrow = _md(
+                future_reward_borrow, delta_future_borrow, future_borrow, True
+            )
+            delta_user_future_reward_borrow = _md(
+                delta_future_reward_borrow, step, duration, False
+            )
+        else:
+            delta_future_reward_borrow = _md(
+                future_reward_borrow, delta_future_borrow, future_borrow, True
+            )
+            delta_user_future_reward_borrow = delta_user - delta_future_borrow
+        delta_protocol_future_reward_borrow = (
+            delta_future_reward_borrow - delta_user_future_reward_borrow
+        )
+    else:
+        delta_future_borrow = delta_user
+        delta_future_collateral = _md(
+            delta_future_borrow, future_collateral, future_borrow, False
+        )
+        if delta_future_collateral == -future_collateral:
+            delta_future_borrow = -future_borrow
+        delta_future_reward_collateral = _md(
+            future_reward_collateral, delta_future_collateral, future_collateral, False
+        )
+        delta_user_future_reward_collateral = _md(
+            delta_future_reward_collateral, step, duration, True
+        )
+        delta_protocol_future_reward_collateral = (
+            delta_future_reward_collateral - delta_user_future_reward_collateral
+        )
+        delta_user_collateral = (
+            delta_future_collateral + delta_user_future_reward_collateral
+        )
+
+    if not delta_user >= delta_future_borrow + delta_user_future_reward_borrow:
+        raise Fallback()
+    return (
+        delta_future_borrow,
+        delta_future_collateral,
+        delta_user_collateral,
+        delta_user,
+        delta_user_future_reward_collateral,
+        delta_user_future_reward_borrow,
+        delta_protocol_future_reward_collateral,
+        delta_protocol_future_reward_borrow,
+    )
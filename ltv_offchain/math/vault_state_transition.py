@@ -0,0 +1,59 @@
+"""
+Port of VaultStateTransition.applyStateTransition
+"""
+
+from ltv_offchain.math.constants import UINT56_MAX
+from ltv_offchain.math.mul_div import s_mul_div_down, s_mul_div_up
+from ltv_offchain.math.solidity import to_int256
+from ltv_offchain.math.structs import FutureAssetsState
+
+
+def apply_state_transition(
+    next_state,
+    start_auction,
+    borrow_price,
+    collateral_price,
+    borrow_token_decimals,
+    collateral_token_decimals,
+):
+    """
+    Returns the FutureAssetsState stored for a NextState, start_auction
+    being the stored one before the transition
+    """
+    borrow_price = to_int256(borrow_price)
+    collateral_price = to_int256(collateral_price)
+    future_borrow_assets = s_mul_div_down(
+        next_state.future_borrow, 10**borrow_token_decimals, borrow_price
+    )
+    future_collateral_assets = s_mul_div_up(
+        next_state.future_collateral, 10**collateral_token_decimals, collateral_price
+    )
+    future_reward_borrow_assets = s_mul_div_down(
+        next_state.future_reward_borrow, 10**borrow_token_decimals, borrow_price
+    )
+    future_reward_collateral_assets = s_mul_div_up(
+        next_state.future_reward_collateral,
+        10**collateral_token_decimals,
+        collateral_price,
+    )
+
+    if next_state.start_auction != UINT56_MAX:
+        start_auction = next_state.start_auction
+
+    # auction considered fully executed when one side rounds to zero
+    if (future_borrow_assets == 0) != (future_collateral_assets == 0):
+        return FutureAssetsState(0, 0, 0, 0, 0)
+
+    if future_borrow_assets > 0:
+        future_reward_borrow_assets = 0
+
+    if future_collateral_assets < 0:
+        future_reward_collateral_assets = 0
+
+    return FutureAssetsState(
+        future_borrow_assets=future_borrow_assets,
+        future_collateral_assets=future_collateral_assets,
+        future_reward_borrow_assets=future_reward_borrow_assets,
+        future_reward_collateral_assets=future_reward_collateral_assets,
+        start_auction=start_auction,
+    )
@@ -0,0 +1,3 @@
+"""
+Low level rebalance tooling built on the ported low level rebalance math
+"""
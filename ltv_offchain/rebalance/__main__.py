@@ -0,0 +1,120 @@
+"""
+Low level rebalance tooling CLI
+
+    python -m ltv_offchain.rebalance optimize --snapshots snapshots.json --out rebalances.json
+
+snapshots.json is a list of objects with the LowLevelRebalanceSnapshot fields
+of ltv_offchain/rebalance/optimizer.py, deposit_data and withdraw_data being
+objects with the LowLevelRebalanceData fields.
+"""
+
+import argparse
+import json
+import sys
+
+from ltv_offchain.rebalance.optimizer import (
+    MODES,
+    OBJECTIVES,
+    format_options_table,
+    optimize_vaults,
+    snapshot_from_dict,
+)
+
+
+def optimize(args):
+    with open(args.snapshots, "r") as f:
+        try:
+            snapshots = [snapshot_from_dict(values) for values in json.load(f)]
+        except ValueError as e:
+            print(f"ERROR {e}")
+            sys.exit(1)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        print(f"ERROR unknown modes {unknown}, expected some of {list(MODES)}")
+        sys.exit(1)
+    options = optimize_vaults(
+        snapshots,
+        workers=args.workers,
+        modes=modes,
+        objective=args.objective,
+        samples=args.samples,
+        gas_cost=args.gas_cost,
+        min_value=args.min_value,
+    )
+    print(
+        format_options_table(
+            [(snapshot.vault, option) for snapshot, option in zip(snapshots, options)]
+        )
+    )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                [
+                    (
+                        None
+                        if option is None
+                        else {"to": option.vault, "data": option.calldata}
+                        | option._asdict()
+                    )
+                    for option in options
+                ],
+                f,
+                indent=4,
+            )
+        print(f"Rebalance transactions written to {args.out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV low level rebalance tooling")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    optimize_parser = subparsers.add_parser(
+        "optimize", help="Find the best low level rebalance of many vaults"
+    )
+    optimize_parser.add_argument(
+        "--snapshots", help="JSON file with the vault snapshots", required=True
+    )
+    optimize_parser.add_argument(
+        "--modes",
+        help="Comma separated low level rebalance functions to consider",
+        default=",".join(MODES),
+    )
+    optimize_parser.add_argument(
+        "--objective",
+        help="What to optimize",
+        choices=OBJECTIVES,
+        default=OBJECTIVES[0],
+    )
+    optimize_parser.add_argument(
+        "--samples",
+        help="Deltas evaluated inside the executable interval besides its ends",
+        type=int,
+        default=16,
+    )
+    optimize_parser.add_argument(
+        "--gas-cost",
+        help="Execution gas cost in underlying units, subtracted from the keeper value",
+        type=int,
+        default=0,
+    )
+    optimize_parser.add_argument(
+        "--min-value",
+        help="Keeper value in underlying units a rebalance must exceed",
+        type=int,
+    )
+    optimize_parser.add_argument(
+        "--workers", help="Processes optimizing vaults", type=int, default=1
+    )
+    optimize_parser.add_argument(
+        "--out", help="JSON file for the rebalance transactions"
+    )
+    optimize_parser.set_defaults(handler=optimize)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+"""
+Low level rebalance optimizer
+
+Finds, for every vault snapshot, the low level rebalance a keeper should
+send: which of executeLowLevelRebalanceShares, executeLowLevelRebalanceBorrow
+and executeLowLevelRebalanceCollateral to call and with which delta, without
+probing previewLowLevelRebalance* over RPC.
+
+Every output of the three low level rebalance calculations (delta real
+collateral assets, delta real borrow assets, delta shares) is non decreasing
+in the input delta: the vault always ends at target LTV, so more of one side
+means more of the others. Constraints on the outputs are therefore half
+lines of the input delta, and the executable interval is found by bisection
+on the exact port, starting from the closed form bounds (the
+maxLowLevelRebalance* value, existing real assets, keeper balances). The
+keeper value is linear in the delta up to rounding, so the interval ends, a
+grid of samples inside it and zero are evaluated exactly and the best one is
+kept.
+
+Objectives:
+    keeper_value: maximize what the keeper receives minus what it pays, in
+        underlying units at the snapshot prices, with shares valued at the
+        snapshot share price, minus gas_cost. Ties are broken by the smallest
+        absolute delta
+    target_ltv: minimize the distance of the resulting LTV to the target LTV,
+        ties broken by the smallest absolute delta
+
+Borrow and collateral executions use the Hint variants with the correct
+shares sign hint, which skips the recalculation the vault does on a wrong
+hint.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import partial
+
+from deploy_utils import abi
+
+from ltv_offchain.math.low_level_rebalance_math import (
+    calculate_low_level_rebalance_borrow,
+    calculate_low_level_rebalance_collateral,
+    calculate_low_level_rebalance_shares,
+)
+from ltv_offchain.math.solidity import INT256_MAX, INT256_MIN, MathRevert
+from ltv_offchain.math.structs import LowLevelRebalanceData
+
+SHARES = "shares"
+BORROW = "borrow"
+COLLATERAL = "collateral"
+MODES = (SHARES, BORROW, COLLATERAL)
+
+KEEPER_VALUE = "keeper_value"
+TARGET_LTV = "target_ltv"
+OBJECTIVES = (KEEPER_VALUE, TARGET_LTV)
+
+EXECUTE_SIGNATURES = {
+    SHARES: "executeLowLevelRebalanceShares(int256)",
+    BORROW: "executeLowLevelRebalanceBorrowHint(int256,bool)",
+    COLLATERAL: "executeLowLevelRebalanceCollateralHint(int256,bool)",
+}
+
+LowLevelRebalanceSnapshot = namedtuple(
+    "LowLevelRebalanceSnapshot",
+    [
+        "vault",
+        # previewLowLevelRebalanceStateToData with isDeposit true and false
+        "deposit_data",
+        "withdraw_data",
+        "max_low_level_rebalance_shares",
+        "max_low_level_rebalance_borrow",
+        "max_low_level_rebalance_collateral",
+        "real_collateral_assets",
+        "real_borrow_assets",
+        # keeper balances, None for unlimited
+        "keeper_shares",
+        "keeper_collateral_assets",
+        "keeper_borrow_assets",
+    ],
+)
+
+RebalanceResult = namedtuple(
+    "RebalanceResult",
+    [
+        "mode",
+        "delta",
+        "delta_real_collateral_assets",
+        "delta_real_borrow_assets",
+        "delta_shares",
+        "delta_protocol_future_reward_shares",
+    ],
+)
+
+RebalanceOption = namedtuple(
+    "RebalanceOption",
+    [
+        "vault",
+        "function",
+        "delta",
+        "is_shares_positive_hint",
+        "delta_real_collateral_assets",
+        "delta_real_borrow_assets",
+        "delta_shares",
+        "keeper_value",
+        "ltv_distance",
+        "calldata",
+    ],
+)
+
+
+def preview(mode, delta, snapshot):
+    """
+    RebalanceResult of an execution the way the vault computes it, including
+    the rounding direction chosen from the shares sign. Raises MathRevert if
+    the vault reverts.
+    """
+    if mode == SHARES:
+        if delta > snapshot.max_low_level_rebalance_shares:
+            raise MathRevert("ExceedsLowLevelRebalanceMaxDeltaShares")
+        data = snapshot.deposit_data if delta >= 0 else snapshot.withdraw_data
+        collateral, borrow, protocol_reward = calculate_low_level_rebalance_shares(
+            delta, data
+        )
+        return RebalanceResult(mode, delta, collateral, borrow, delta, protocol_reward)
+
+    if mode == BORROW:
+        if delta > snapshot.max_low_level_rebalance_borrow:
+            raise MathRevert("ExceedsLowLevelRebalanceMaxDeltaBorrow")
+        calculate = calculate_low_level_rebalance_borrow
+    else:
+        if delta > snapshot.max_low_level_rebalance_collateral:
+            raise MathRevert("ExceedsLowLevelRebalanceMaxDeltaCollateral")
+        calculate = calculate_low_level_rebalance_collateral
+    other, shares, protocol_reward = calculate(delta, snapshot.deposit_data)
+    if shares < 0:
+        other, shares, protocol_reward = calculate(delta, snapshot.withdraw_data)
+    if mode == BORROW:
+        return RebalanceResult(mode, delta, other, delta, shares, protocol_reward)
+    return RebalanceResult(mode, delta, delta, other, shares, protocol_reward)
+
+
+def _get_lower_limits(snapshot):
+    """
+    [(output index, lowest allowed value)] of RebalanceResult, every output
+    being non decreasing in the delta
+    """
+    limits = [
+        # the vault can not withdraw or repay more than it has
+        (2, -snapshot.real_collateral_assets),
+        (3, -snapshot.real_borrow_assets),
+    ]
+    if snapshot.keeper_shares is not None:
+        limits.append((4, -snapshot.keeper_shares))
+    if snapshot.keeper_borrow_assets is not None:
+        limits.append((3, -snapshot.keeper_borrow_assets))
+    return limits
+
+
+def _get_upper_limits(snapshot):
+    if snapshot.keeper_collateral_assets is None:
+        return []
+    return [(2, snapshot.keeper_collateral_assets)]
+
+
+def _get_initial_bounds(mode, snapshot):
+    """Closed form bounds of the delta itself"""
+    if mode == SHARES:
+        high = snapshot.max_low_level_rebalance_shares
+        low = -snapshot.withdraw_data.supply_after_fee
+        if snapshot.keeper_shares is not None:
+            low = max(low, -snapshot.keeper_shares)
+    elif mode == BORROW:
+        high = snapshot.max_low_level_rebalance_borrow
+        low = -snapshot.real_borrow_assets
+        if snapshot.keeper_borrow_assets is not None:
+            low = max(low, -snapshot.keeper_borrow_assets)
+    else:
+        high = snapshot.max_low_level_rebalance_collateral
+        low = -snapshot.real_collateral_assets
+        if snapshot.keeper_collateral_assets is not None:
+            high = min(high, snapshot.keeper_collateral_assets)
+    return max(low, INT256_MIN), min(high, INT256_MAX)
+
+
+def _satisfies(result, lower_limits, upper_limits):
+    return all(result[index] >= limit for index, limit in lower_limits) and all(
+        result[index] <= limit for index, limit in upper_limits
+    )
+
+
+def _try_preview(mode, delta, snapshot):
+    try:
+        return preview(mode, delta, snapshot)
+    except MathRevert:
+        return None
+
+
+def _first_at_least(mode, snapshot, low, high, index, limit):
+    """Smallest delta in [low, high] whose output index reaches limit, None if none does"""
+    result = _try_preview(mode, high, snapshot)
+    if result is None or result[index] < limit:
+        return None
+    while low < high:
+        middle = (low + high) // 2
+        result = _try_preview(mode, middle, snapshot)
+        if result is not None and result[index] >= limit:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _last_at_most(mode, snapshot, low, high, index, limit):
+    """Largest delta in [low, high] whose output index stays within limit, None if none does"""
+    result = _try_preview(mode, low, snapshot)
+    if result is None or result[index] > limit:
+        return None
+    while low < high:
+        middle = (low + high + 1) // 2
+        result = _try_preview(mode, middle, snapshot)
+        if result is not None and result[index] <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _clamp_to_non_reverting(mode, snapshot, low, high):
+    """
+    Narrows [low, high] to the deltas around the one closest to zero which do
+    not revert, reverts only coming from overflows at large magnitudes
+    """
+    anchor = min(max(0, low), high)
+    if _try_preview(mode, anchor, snapshot) is None:
+        return None
+    while anchor < high:
+        middle = (anchor + high + 1) // 2
+        if _try_preview(mode, middle, snapshot) is None:
+            high = middle - 1
+        else:
+            anchor = middle
+    anchor = min(max(0, low), high)
+    while low < anchor:
+        middle = (low + anchor) // 2
+        if _try_preview(mode, middle, snapshot) is None:
+            low = middle + 1
+        else:
+            anchor = middle
+    return low, high
+
+
+def get_feasible_interval(mode, snapshot):
+    """[low, high] of executable deltas of a mode, None if there are none"""
+    low, high = _get_initial_bounds(mode, snapshot)
+    if low > high:
+        return None
+    interval = _clamp_to_non_reverting(mode, snapshot, low, high)
+    if interval is None:
+        return None
+    low, high = interval
+    for index, limit in _get_lower_limits(snapshot):
+        low = _first_at_least(mode, snapshot, low, high, index, limit)
+        if low is None:
+            return None
+    for index, limit in _get_upper_limits(snapshot):
+        high = _last_at_most(mode, snapshot, low, high, index, limit)
+        if high is None:
+            return None
+    return low, high
+
+
+def get_keeper_value(result, data, gas_cost=0):
+    """
+    Underlying value the keeper receives minus what it pays: minted shares
+    and borrowed assets are received, burned shares and supplied collateral
+    are paid
+    """
+    collateral_value = Fraction(
+        result.delta_real_collateral_assets * data.collateral_price,
+        10**data.collateral_token_decimals,
+    )
+    borrow_value = Fraction(
+        result.delta_real_borrow_assets * data.borrow_price,
+        10**data.borrow_token_decimals,
+    )
+    shares_value = Fraction(
+        result.delta_shares * data.total_assets * data.borrow_price,
+        data.supply_after_fee * 10**data.borrow_token_decimals,
+    )
+    value = shares_value + borrow_value - collateral_value
+    return value.numerator // value.denominator - gas_cost
+
+
+def get_ltv_distance(result, data):
+    """Distance of the LTV after the rebalance to the target LTV, futures being cleared"""
+    collateral = data.real_collateral + Fraction(
+        result.delta_real_collateral_assets * data.collateral_price,
+        10**data.collateral_token_decimals,
+    )
+    borrow = data.real_borrow + Fraction(
+        result.delta_real_borrow_assets * data.borrow_price,
+        10**data.borrow_token_decimals,
+    )
+    if collateral <= 0:
+        return Fraction(0) if borrow == 0 else None
+    return abs(
+        borrow / collateral
+        - Fraction(data.target_ltv_dividend, data.target_ltv_divider)
+    )
+
+
+def get_candidates(low, high, samples):
+    """Interval ends, zero and samples evenly spaced deltas in between"""
+    candidates = [low, high]
+    if low <= 0 <= high:
+        candidates.append(0)
+    if samples > 0 and high > low:
+        candidates.extend(
+            low + (high - low) * i // (samples + 1) for i in range(1, samples + 1)
+        )
+    return list(dict.fromkeys(candidates))
+
+
+def _score(result, snapshot, objective, gas_cost):
+    data = snapshot.deposit_data if result.delta_shares >= 0 else snapshot.withdraw_data
+    keeper_value = get_keeper_value(result, data, gas_cost)
+    ltv_distance = get_ltv_distance(result, data)
+    if objective == KEEPER_VALUE:
+        key = (keeper_value, -abs(result.delta))
+    elif ltv_distance is None:
+        key = None
+    else:
+        key = (-ltv_distance, -abs(result.delta))
+    return key, keeper_value, ltv_distance
+
+
+def get_calldata(result):
+    if result.mode == SHARES:
+        return abi.encode_call(EXECUTE_SIGNATURES[SHARES], [result.delta])
+    return abi.encode_call(
+        EXECUTE_SIGNATURES[result.mode], [result.delta, result.delta_shares >= 0]
+    )
+
+
+def optimize_vault(
+    snapshot,
+    modes=MODES,
+    objective=KEEPER_VALUE,
+    samples=16,
+    gas_cost=0,
+    min_value=None,
+):
+    """
+    Returns the best RebalanceOption of a snapshot over the given modes, None
+    if nothing is executable. With min_value, keeper_value options must
+    exceed it.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unknown objective {objective}")
+    best = None
+    for mode in modes:
+        interval = get_feasible_interval(mode, snapshot)
+        if interval is None:
+            continue
+        lower_limits = _get_lower_limits(snapshot)
+        upper_limits = _get_upper_limits(snapshot)
+        for delta in get_candidates(*interval, samples):
+            result = _try_preview(mode, delta, snapshot)
+            if result is None or not _satisfies(result, lower_limits, upper_limits):
+                continue
+            key, keeper_value, ltv_distance = _score(
+                result, snapshot, objective, gas_cost
+            )
+            if key is None:
+                continue
+            if min_value is not None and keeper_value <= min_value:
+                continue
+            if best is None or key > best[0]:
+                best = (key, result, keeper_value, ltv_distance)
+    if best is None:
+        return None
+    _, result, keeper_value, ltv_distance = best
+    return RebalanceOption(
+        vault=snapshot.vault,
+        function=EXECUTE_SIGNATURES[result.mode].split("(")[0],
+        delta=result.delta,
+        is_shares_positive_hint=result.delta_shares >= 0,
+        delta_real_collateral_assets=result.delta_real_collateral_assets,
+        delta_real_borrow_assets=result.delta_real_borrow_assets,
+        delta_shares=result.delta_shares,
+        keeper_value=keeper_value,
+        ltv_distance=float(ltv_distance),
+        calldata="0x" + get_calldata(result).hex(),
+    )
+
+
+def optimize_vaults(snapshots, workers=1, **options):
+    """optimize_vault over many snapshots, returns the best options in order"""
+    optimize = partial(optimize_vault, **options)
+    workers = max(1, min(workers, len(snapshots)))
+    if workers == 1:
+        return [optimize(snapshot) for snapshot in snapshots]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                optimize,
+                snapshots,
+                chunksize=max(1, len(snapshots) // (4 * workers)),
+            )
+        )
+
+
+def _data_from_dict(values, vault):
+    missing = [field for field in LowLevelRebalanceData._fields if field not in values]
+    if missing:
+        raise ValueError(f"snapshot {vault} data misses {missing}")
+    return LowLevelRebalanceData(
+        **{field: int(values[field]) for field in LowLevelRebalanceData._fields}
+    )
+
+
+def snapshot_from_dict(values):
+    """
+    LowLevelRebalanceSnapshot from a JSON object, integers may be given as
+    strings. withdraw_data defaults to deposit_data and keeper balances to
+    unlimited.
+    """
+    vault = values.get("vault")
+    required = [
+        "vault",
+        "deposit_data",
+        "max_low_level_rebalance_shares",
+        "max_low_level_rebalance_borrow",
+        "max_low_level_rebalance_collateral",
+        "real_collateral_assets",
+        "real_borrow_assets",
+    ]
+    missing = [field for field in required if field not in values]
+    if missing:
+        raise ValueError(f"snapshot {vault} misses {missing}")
+    deposit_data = _data_from_dict(values["deposit_data"], vault)
+    withdraw_data = (
+        _data_from_dict(values["withdraw_data"], vault)
+        if "withdraw_data" in values
+        else deposit_data
+    )
+    optional = {
+        field: None if values.get(field) is None else int(values[field])
+        for field in (
+            "keeper_shares",
+            "keeper_collateral_assets",
+            "keeper_borrow_assets",
+        )
+    }
+    return LowLevelRebalanceSnapshot(
+        vault=vault,
+        deposit_data=deposit_data,
+        withdraw_data=withdraw_data,
+        **{field: int(values[field]) for field in required[2:]},
+        **optional,
+    )
+
+
+def format_options_table(results):
+    lines = [
+        f"{'VAULT':<42} {'FUNCTION':<38} {'DELTA':>26} {'SHARES':>26} {'KEEPER VALUE':>26}"
+    ]
+    for vault, option in results:
+        if option is None:
+            lines.append(f"{vault:<42} no executable rebalance")
+            continue
+        lines.append(
+            f"{option.vault:<42} {option.function:<38} {option.delta:>26} {option.delta_shares:>26} {option.keeper_value:>26}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1 @@
+"""Multicall snapshots of the state of a fleet of vaults"""
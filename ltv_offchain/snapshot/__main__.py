@@ -0,0 +1,110 @@
+"""
+Vault snapshot CLI
+
+    python -m ltv_offchain.snapshot read --rpc-url localhost:8545 --vaults 0x...,0x...
+    python -m ltv_offchain.snapshot read --rpc-url localhost:8545 --vaults 0x... --follow
+
+read prints one JSON line per vault with its snapshot at --block, latest by
+default; with --follow it keeps printing the snapshots of every new head.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from deploy_utils.rpc import JsonRpcClient, RpcError
+
+from ltv_offchain.snapshot.multicall import DEFAULT_BATCH_SIZE, MULTICALL3_ADDRESS
+from ltv_offchain.snapshot.snapshotter import VaultSnapshotter
+
+
+def _write_snapshots(snapshots, out):
+    for snapshot in snapshots:
+        out.write(json.dumps(snapshot.to_dict()) + "\n")
+    out.flush()
+
+
+def _follow(client, snapshotter, out, poll_interval):
+    last_block = None
+    while True:
+        block_number = int(client.call("eth_blockNumber"), 16)
+        if block_number == last_block:
+            time.sleep(poll_interval)
+            continue
+        start = time.perf_counter()
+        _write_snapshots(snapshotter.snapshot(block_number), out)
+        print(
+            f"Block {block_number}: {len(snapshotter.vaults)} vaults in "
+            f"{time.perf_counter() - start:.3f}s",
+            file=sys.stderr,
+        )
+        last_block = block_number
+
+
+def read(args):
+    client = JsonRpcClient(args.rpc_url)
+    snapshotter = VaultSnapshotter(
+        client,
+        [vault.strip() for vault in args.vaults.split(",") if vault.strip()],
+        multicall=args.multicall,
+        batch_size=args.batch_size,
+    )
+    out = open(args.out, "a") if args.out else sys.stdout
+    try:
+        if args.follow:
+            _follow(client, snapshotter, out, args.poll_interval)
+        else:
+            _write_snapshots(snapshotter.snapshot(args.block), out)
+    except (RpcError, ValueError) as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV vault snapshots")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    read_parser = subparsers.add_parser(
+        "read", help="Snapshot vaults with one JSON-RPC batch per block"
+    )
+    read_parser.add_argument("--rpc-url", help="JSON-RPC url", required=True)
+    read_parser.add_argument(
+        "--vaults", help="Comma separated vault addresses", required=True
+    )
+    read_parser.add_argument(
+        "--block", help="Block number, latest by default", type=int
+    )
+    read_parser.add_argument(
+        "--follow", help="Snapshot every new head", action="store_true"
+    )
+    read_parser.add_argument(
+        "--poll-interval",
+        help="Seconds between eth_blockNumber polls with --follow",
+        type=float,
+        default=0.5,
+    )
+    read_parser.add_argument(
+        "--multicall", help="Multicall3 address", default=MULTICALL3_ADDRESS
+    )
+    read_parser.add_argument(
+        "--batch-size",
+        help="Reads per aggregate3 call",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+    )
+    read_parser.add_argument("--out", help="JSON lines file to append to")
+    read_parser.set_defaults(handler=read)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Multicall3 batching of eth_call reads
+
+Reads are (to, signature, args, return types) tuples. They are packed into
+aggregate3 calls of at most batch_size reads, every aggregate3 call being one
+eth_call of a single JSON-RPC batch, so any number of reads pinned to one
+block cost one round trip. Reads depending on msg.sender, like the lending
+connector getters answering for the calling vault, can not go through the
+multicall contract and are sent as plain eth_call from their sender in the
+same JSON-RPC batch.
+"""
+
+from deploy_utils import abi
+from deploy_utils.rpc import RpcError
+
+# Multicall3, deployed at the same address on most chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+AGGREGATE3_SIGNATURE = "aggregate3((address,bool,bytes)[])"
+AGGREGATE3_RETURN_TYPES = ["(bool,bytes)[]"]
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class CallFailed:
+    """Result of a read which reverted, kept in place of its decoded value"""
+
+    __slots__ = ("to", "signature")
+
+    def __init__(self, to, signature):
+        self.to = to
+        self.signature = signature
+
+    def __repr__(self):
+        return f"CallFailed({self.to}, {self.signature})"
+
+
+def _eth_call(to, data, block, sender=None):
+    call = {"to": to, "data": "0x" + data.hex()}
+    if sender is not None:
+        call["from"] = sender
+    return ("eth_call", [call, block])
+
+
+def _is_direct(read):
+    return len(read) == 5 and read[4] is not None
+
+
+def get_requests(reads, block, multicall=MULTICALL3_ADDRESS, batch_size=None):
+    """
+    JSON-RPC requests of reads, reads being (to, signature, args, return types)
+    or (to, signature, args, return types, sender) tuples
+    """
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    aggregated = [read for read in reads if not _is_direct(read)]
+    requests = []
+    for start in range(0, len(aggregated), batch_size):
+        calls = [
+            (to, True, abi.encode_call(signature, args))
+            for to, signature, args, *_ in aggregated[start : start + batch_size]
+        ]
+        requests.append(
+            _eth_call(multicall, abi.encode_call(AGGREGATE3_SIGNATURE, [calls]), block)
+        )
+    for read in reads:
+        if _is_direct(read):
+            to, signature, args, _, sender = read
+            requests.append(
+                _eth_call(to, abi.encode_call(signature, args), block, sender)
+            )
+    return requests
+
+
+def decode_results(reads, results):
+    """
+    Decoded value of every read, in order, given the results of its requests.
+    Reads returning one value yield it alone, reverted reads a CallFailed.
+    """
+    results = iter(results)
+    aggregated = [index for index, read in enumerate(reads) if not _is_direct(read)]
+    direct = [index for index, read in enumerate(reads) if _is_direct(read)]
+
+    returned = []
+    while len(returned) < len(aggregated):
+        result = next(results)
+        if isinstance(result, RpcError):
+            raise result
+        # an empty return data means no multicall contract at this block
+        if result in ("", "0x"):
+            raise RpcError("aggregate3 returned no data, multicall not deployed")
+        returned += abi.decode(AGGREGATE3_RETURN_TYPES, result)[0]
+    outcomes = dict(zip(aggregated, returned))
+    for index in direct:
+        result = next(results)
+        outcomes[index] = (not isinstance(result, RpcError), result)
+
+    decoded = []
+    for index, read in enumerate(reads):
+        to, signature, _, return_types = read[:4]
+        success, data = outcomes[index]
+        if isinstance(data, str):
+            data = bytes.fromhex(data.replace("0x", ""))
+        if not success or len(data) < 32 * len(return_types):
+            decoded.append(CallFailed(to, signature))
+            continue
+        value = abi.decode(return_types, data)
+        decoded.append(value[0] if len(value) == 1 else value)
+    return decoded
+
+
+def read_all(client, reads, block, multicall=MULTICALL3_ADDRESS, batch_size=None):
+    """Decoded values of reads at block with one JSON-RPC batch"""
+    requests = get_requests(reads, block, multicall, batch_size)
+    return decode_results(reads, client.batch(requests, return_errors=True))
@@ -0,0 +1,335 @@
+"""
+Fleet wide vault snapshots
+
+A VaultSnapshotter reads everything the vault state readers of
+src/state_reader read, for every vault of a fleet, with one JSON-RPC batch
+per block: vault getters, oracle prices and slippages go through Multicall3,
+the lending connector getters, which answer for msg.sender, are eth_call from
+the vault itself. Connector reads need the connector addresses and getter
+data, which are kept as a VaultConfig per vault; the configuration getters
+are read again with every snapshot and a vault whose configuration changed is
+read a second time with its new connectors.
+
+A VaultSnapshot holds the values of one vault at one block in __slots__ and
+converts into the state structs of ltv_offchain.math. Callers needing more
+vault getters pass them as extra_reads, their values land in
+VaultSnapshot.extra.
+"""
+
+from collections import namedtuple
+
+from ltv_offchain.capacity.surface import VaultState
+from ltv_offchain.math.structs import MaxGrowthFeeState, TotalAssetsState
+from ltv_offchain.snapshot.multicall import MULTICALL3_ADDRESS, CallFailed, read_all
+
+# field: (signature, return types)
+CONFIG_GETTERS = {
+    "collateral_token_decimals": ("collateralTokenDecimals()", ["uint8"]),
+    "borrow_token_decimals": ("borrowTokenDecimals()", ["uint8"]),
+    "oracle_connector": ("oracleConnector()", ["address"]),
+    "oracle_connector_getter_data": ("oracleConnectorGetterData()", ["bytes"]),
+    "lending_connector": ("lendingConnector()", ["address"]),
+    "lending_connector_getter_data": ("lendingConnectorGetterData()", ["bytes"]),
+    "vault_balance_as_lending_connector": (
+        "vaultBalanceAsLendingConnector()",
+        ["address"],
+    ),
+    "vault_balance_as_lending_connector_getter_data": (
+        "vaultBalanceAsLendingConnectorGetterData()",
+        ["bytes"],
+    ),
+    "slippage_connector": ("slippageConnector()", ["address"]),
+    "slippage_connector_getter_data": ("slippageConnectorGetterData()", ["bytes"]),
+    "is_vault_deleveraged": ("isVaultDeleveraged()", ["bool"]),
+}
+
+VaultConfig = namedtuple("VaultConfig", list(CONFIG_GETTERS))
+
+VAULT_GETTERS = {
+    "future_borrow_assets": ("futureBorrowAssets()", ["int256"]),
+    "future_collateral_assets": ("futureCollateralAssets()", ["int256"]),
+    "future_reward_borrow_assets": ("futureRewardBorrowAssets()", ["int256"]),
+    "future_reward_collateral_assets": ("futureRewardCollateralAssets()", ["int256"]),
+    "start_auction": ("startAuction()", ["uint56"]),
+    "auction_duration": ("auctionDuration()", ["uint24"]),
+    "total_supply": ("totalSupply()", ["uint256"]),
+    "base_total_supply": ("baseTotalSupply()", ["uint256"]),
+    "total_assets": ("totalAssets()", ["uint256"]),
+    "last_seen_token_price": ("lastSeenTokenPrice()", ["uint256"]),
+    "max_growth_fee_dividend": ("maxGrowthFeeDividend()", ["uint16"]),
+    "max_growth_fee_divider": ("maxGrowthFeeDivider()", ["uint16"]),
+    "target_ltv_dividend": ("targetLtvDividend()", ["uint16"]),
+    "target_ltv_divider": ("targetLtvDivider()", ["uint16"]),
+    "max_safe_ltv_dividend": ("maxSafeLtvDividend()", ["uint16"]),
+    "max_safe_ltv_divider": ("maxSafeLtvDivider()", ["uint16"]),
+    "min_profit_ltv_dividend": ("minProfitLtvDividend()", ["uint16"]),
+    "min_profit_ltv_divider": ("minProfitLtvDivider()", ["uint16"]),
+    "max_total_assets_in_underlying": ("maxTotalAssetsInUnderlying()", ["uint256"]),
+    "is_protocol_paused": ("isProtocolPaused()", ["bool"]),
+}
+
+# Connector getters taking the connector getter data of the vault
+ORACLE_GETTERS = {
+    "borrow_price": ("getPriceBorrowOracle(bytes)", ["uint256"]),
+    "collateral_price": ("getPriceCollateralOracle(bytes)", ["uint256"]),
+}
+
+SLIPPAGE_GETTERS = {
+    "collateral_slippage": ("collateralSlippage(bytes)", ["uint256"]),
+    "borrow_slippage": ("borrowSlippage(bytes)", ["uint256"]),
+}
+
+# field: (signature, is deposit), called from the vault
+LENDING_GETTERS = {
+    "deposit_real_collateral_assets": ("getRealCollateralAssets(bool,bytes)", True),
+    "deposit_real_borrow_assets": ("getRealBorrowAssets(bool,bytes)", True),
+    "withdraw_real_collateral_assets": ("getRealCollateralAssets(bool,bytes)", False),
+    "withdraw_real_borrow_assets": ("getRealBorrowAssets(bool,bytes)", False),
+}
+
+STATE_FIELDS = (
+    list(VAULT_GETTERS)
+    + list(ORACLE_GETTERS)
+    + list(SLIPPAGE_GETTERS)
+    + list(LENDING_GETTERS)
+)
+
+
+class VaultSnapshot:
+    """
+    Values of one vault at one block. Fields whose read reverted are None and
+    listed in failed.
+    """
+
+    __slots__ = (
+        "vault",
+        "block_number",
+        "collateral_token_decimals",
+        "borrow_token_decimals",
+        "failed",
+        "extra",
+        *STATE_FIELDS,
+    )
+
+    def __init__(self, vault, block_number, config, values, extra=None):
+        self.vault = vault
+        self.block_number = block_number
+        self.collateral_token_decimals = config.collateral_token_decimals
+        self.borrow_token_decimals = config.borrow_token_decimals
+        self.failed = []
+        for field, value in zip(STATE_FIELDS, values):
+            if isinstance(value, CallFailed):
+                self.failed.append(field)
+                value = None
+            setattr(self, field, value)
+        self.extra = {}
+        for field, value in (extra or {}).items():
+            if isinstance(value, CallFailed):
+                self.failed.append(field)
+                value = None
+            self.extra[field] = value
+
+    def __repr__(self):
+        return f"VaultSnapshot({self.vault}, {self.block_number})"
+
+    def __eq__(self, other):
+        return isinstance(other, VaultSnapshot) and all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def _check_complete(self):
+        failed = [field for field in self.failed if field not in self.extra]
+        if failed:
+            raise ValueError(
+                f"{self.vault} reads reverted at block {self.block_number}: "
+                f"{', '.join(failed)}"
+            )
+
+    def to_total_assets_state(self, is_deposit=False):
+        """TotalAssetsState the vault reads in totalAssets(is_deposit)"""
+        self._check_complete()
+        prefix = "deposit" if is_deposit else "withdraw"
+        return TotalAssetsState(
+            real_collateral_assets=getattr(self, f"{prefix}_real_collateral_assets"),
+            real_borrow_assets=getattr(self, f"{prefix}_real_borrow_assets"),
+            future_borrow_assets=self.future_borrow_assets,
+            future_collateral_assets=self.future_collateral_assets,
+            future_reward_borrow_assets=self.future_reward_borrow_assets,
+            future_reward_collateral_assets=self.future_reward_collateral_assets,
+            borrow_price=self.borrow_price,
+            collateral_price=self.collateral_price,
+            borrow_token_decimals=self.borrow_token_decimals,
+            collateral_token_decimals=self.collateral_token_decimals,
+        )
+
+    def to_max_growth_fee_state(self):
+        """MaxGrowthFeeState of MaxGrowthFeeStateReader"""
+        self._check_complete()
+        return MaxGrowthFeeState(
+            future_borrow_assets=self.future_borrow_assets,
+            future_collateral_assets=self.future_collateral_assets,
+            future_reward_borrow_assets=self.future_reward_borrow_assets,
+            future_reward_collateral_assets=self.future_reward_collateral_assets,
+            borrow_price=self.borrow_price,
+            collateral_price=self.collateral_price,
+            borrow_token_decimals=self.borrow_token_decimals,
+            collateral_token_decimals=self.collateral_token_decimals,
+            withdraw_real_collateral_assets=self.withdraw_real_collateral_assets,
+            withdraw_real_borrow_assets=self.withdraw_real_borrow_assets,
+            max_growth_fee_dividend=self.max_growth_fee_dividend,
+            max_growth_fee_divider=self.max_growth_fee_divider,
+            supply=self.base_total_supply,
+            last_seen_token_price=self.last_seen_token_price,
+        )
+
+    def to_vault_state(self, owner_balance=None):
+        """
+        capacity VaultState, the flattened input of the max function state
+        readers; owner_balance defaults to the vault supply
+        """
+        self._check_complete()
+        values = {
+            field: getattr(self, field)
+            for field in VaultState._fields
+            if field not in ("supply", "block_number", "owner_balance")
+        }
+        return VaultState(
+            supply=self.base_total_supply,
+            block_number=self.block_number,
+            owner_balance=(
+                self.base_total_supply if owner_balance is None else owner_balance
+            ),
+            **values,
+        )
+
+
+def get_config_reads(vault):
+    return [
+        (vault, signature, (), return_types)
+        for signature, return_types in CONFIG_GETTERS.values()
+    ]
+
+
+def get_state_reads(vault, config):
+    """Reads of the STATE_FIELDS of a vault, in order"""
+    reads = [
+        (vault, signature, (), return_types)
+        for signature, return_types in VAULT_GETTERS.values()
+    ]
+    reads += [
+        (
+            config.oracle_connector,
+            signature,
+            [config.oracle_connector_getter_data],
+            return_types,
+        )
+        for signature, return_types in ORACLE_GETTERS.values()
+    ]
+    reads += [
+        (
+            config.slippage_connector,
+            signature,
+            [config.slippage_connector_getter_data],
+            return_types,
+        )
+        for signature, return_types in SLIPPAGE_GETTERS.values()
+    ]
+    # GetRealCollateralAndRealBorrowAssetsReader switches connectors once the
+    # vault is deleveraged
+    if config.is_vault_deleveraged:
+        connector = config.vault_balance_as_lending_connector
+        getter_data = config.vault_balance_as_lending_connector_getter_data
+    else:
+        connector = config.lending_connector
+        getter_data = config.lending_connector_getter_data
+    reads += [
+        (connector, signature, [is_deposit, getter_data], ["uint256"], vault)
+        for signature, is_deposit in LENDING_GETTERS.values()
+    ]
+    return reads
+
+
+def _to_config(vault, values):
+    failed = [
+        signature
+        for (signature, _), value in zip(CONFIG_GETTERS.values(), values)
+        if isinstance(value, CallFailed)
+    ]
+    if failed:
+        raise ValueError(f"{vault} configuration reads reverted: {', '.join(failed)}")
+    return VaultConfig(*values)
+
+
+class VaultSnapshotter:
+    """Snapshots of a fleet of vaults, one JSON-RPC batch per block"""
+
+    def __init__(
+        self,
+        client,
+        vaults,
+        multicall=MULTICALL3_ADDRESS,
+        batch_size=None,
+        extra_reads=(),
+    ):
+        self.client = client
+        self.vaults = [vault.lower() for vault in vaults]
+        self.multicall = multicall
+        self.batch_size = batch_size
+        # [(field, signature, args, return types)] of additional vault getters
+        self.extra_reads = list(extra_reads)
+        # {vault: VaultConfig}
+        self.configs = {}
+
+    def _read(self, reads, block):
+        return read_all(self.client, reads, block, self.multicall, self.batch_size)
+
+    def load_configs(self, block="latest", vaults=None):
+        vaults = self.vaults if vaults is None else vaults
+        reads = [read for vault in vaults for read in get_config_reads(vault)]
+        values = iter(self._read(reads, block))
+        for vault in vaults:
+            self.configs[vault] = _to_config(
+                vault, [next(values) for _ in CONFIG_GETTERS]
+            )
+
+    def _read_snapshots(self, vaults, block_number):
+        """
+        ({vault: VaultSnapshot}, vaults whose configuration changed), the
+        snapshots of the changed vaults being read with their old connectors
+        """
+        reads = []
+        for vault in vaults:
+            reads += get_config_reads(vault)
+            reads += get_state_reads(vault, self.configs[vault])
+            reads += [
+                (vault, signature, args, return_types)
+                for _, signature, args, return_types in self.extra_reads
+            ]
+        values = iter(self._read(reads, hex(block_number)))
+        snapshots = {}
+        changed = []
+        for vault in vaults:
+            config = _to_config(vault, [next(values) for _ in CONFIG_GETTERS])
+            state = [next(values) for _ in STATE_FIELDS]
+            extra = {field: next(values) for field, *_ in self.extra_reads}
+            if config != self.configs[vault]:
+                self.configs[vault] = config
+                changed.append(vault)
+                continue
+            snapshots[vault] = VaultSnapshot(vault, block_number, config, state, extra)
+        return snapshots, changed
+
+    def snapshot(self, block_number=None):
+        """VaultSnapshot of every vault at block_number, latest by default"""
+        if block_number is None:
+            block_number = int(self.client.call("eth_blockNumber"), 16)
+        missing = [vault for vault in self.vaults if vault not in self.configs]
+        if missing:
+            self.load_configs(hex(block_number), missing)
+        snapshots, changed = self._read_snapshots(self.vaults, block_number)
+        if changed:
+            snapshots.update(self._read_snapshots(changed, block_number)[0])
+        return [snapshots[vault] for vault in self.vaults]
@@ -0,0 +1 @@
+"""Vault state decoded from raw storage with the LTV storageLayout"""
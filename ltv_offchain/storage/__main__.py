@@ -0,0 +1,106 @@
+"""
+Raw storage state CLI
+
+    python -m ltv_offchain.storage read --rpc-url localhost:8545 --vault 0x...
+    python -m ltv_offchain.storage diff --rpc-url localhost:8545 --vault 0x... --from-block 100
+
+read prints the LTVState of a vault decoded from its storage words, diff the
+variables which changed between two blocks. The layout is read from the
+forge artifact, run forge build first, or from a recorded storage_layout file.
+"""
+
+import argparse
+import json
+import sys
+
+from deploy_utils.rpc import JsonRpcClient, RpcError
+
+from ltv_offchain.storage.reader import (
+    DEFAULT_ARTIFACT_PATH,
+    StorageReader,
+    get_bool_flags,
+    load_layout,
+)
+
+
+def _get_reader(args):
+    try:
+        layout = load_layout(args.layout)
+    except (OSError, ValueError) as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    client = JsonRpcClient(args.rpc_url)
+    return StorageReader(client, args.vault, layout, use_range=args.storage_range)
+
+
+def read(args):
+    reader = _get_reader(args)
+    try:
+        state = reader.read(args.block)
+    except RpcError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    finally:
+        reader.client.close()
+    if "boolSlot" in state:
+        state["boolSlot"] = get_bool_flags(state["boolSlot"])
+    print(json.dumps(state, indent=4))
+
+
+def diff(args):
+    reader = _get_reader(args)
+    try:
+        changes = reader.diff(args.from_block, args.to_block)
+    except RpcError as e:
+        print(f"ERROR {e}")
+        sys.exit(1)
+    finally:
+        reader.client.close()
+    for label, (old, new) in changes.items():
+        print(f"{label}: {old} -> {new}")
+    print(f"{len(changes)} variables changed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV raw storage state")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common_arguments(subparser):
+        subparser.add_argument("--rpc-url", help="JSON-RPC url", required=True)
+        subparser.add_argument("--vault", help="Vault address", required=True)
+        subparser.add_argument(
+            "--layout",
+            help="Forge artifact or storage layout file",
+            default=DEFAULT_ARTIFACT_PATH,
+        )
+        subparser.add_argument(
+            "--storage-range",
+            help="Read storage with debug_storageRangeAt where supported",
+            action="store_true",
+        )
+
+    read_parser = subparsers.add_parser("read", help="Decode the state of a vault")
+    add_common_arguments(read_parser)
+    read_parser.add_argument(
+        "--block", help="Block number, latest by default", type=int
+    )
+    read_parser.set_defaults(handler=read)
+
+    diff_parser = subparsers.add_parser(
+        "diff", help="Variables of a vault which changed between two blocks"
+    )
+    add_common_arguments(diff_parser)
+    diff_parser.add_argument(
+        "--from-block", help="Block number", type=int, required=True
+    )
+    diff_parser.add_argument(
+        "--to-block", help="Block number, latest by default", type=int
+    )
+    diff_parser.set_defaults(handler=diff)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
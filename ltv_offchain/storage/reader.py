@@ -0,0 +1,264 @@
+"""
+Raw storage reads of vault state
+
+The storageLayout of the LTV artifact gives the slot, offset and type of
+every LTVState variable, so the whole state of a vault is the decoding of a
+few dozen storage words instead of one view call per getter. Words are read
+with one JSON-RPC batch of eth_getStorageAt, plus a second one for the data
+slots of the long bytes / string variables. With use_range the words come
+from paginated debug_storageRangeAt instead, which returns the data slots in
+the same pass but pages through the whole storage, mappings included, so it
+pays off for vaults with few holders; nodes not serving it fall back to
+eth_getStorageAt.
+
+Mappings and dynamic arrays are not part of the decoded state.
+"""
+
+import json
+from collections import namedtuple
+
+from deploy_utils.keccak import keccak256
+from deploy_utils.rpc import RpcError
+from deploy_utils.storage_layout import SLOT_SIZE, get_storage_variables
+
+DEFAULT_ARTIFACT_PATH = "out/LTV.sol/LTV.json"
+
+# Bits of LTVState.boolSlot, see src/constants/Constants.sol
+BOOL_SLOT_BITS = {
+    "is_deposit_disabled": 0,
+    "is_withdraw_disabled": 1,
+    "is_whitelist_activated": 2,
+    "is_vault_deleveraged": 3,
+    "is_protocol_paused": 4,
+    "is_soft_liquidation_enabled_for_anyone": 5,
+}
+
+# type_label is the label of the elementary type, e.g. "uint56", "address",
+# "bytes"; long is True for bytes / string variables
+StorageField = namedtuple(
+    "StorageField", ["label", "slot", "offset", "number_of_bytes", "type_label", "long"]
+)
+
+STORAGE_RANGE_PAGE_SIZE = 1024
+
+
+def load_layout(path=DEFAULT_ARTIFACT_PATH):
+    """storageLayout of a forge artifact or of a recorded storage_layout file"""
+    with open(path, "r") as f:
+        data = json.load(f)
+    layout = data.get("storageLayout", data)
+    if "storage" not in layout:
+        raise ValueError(
+            f'{path} has no storageLayout, build with extra_output = ["storageLayout"]'
+        )
+    return layout
+
+
+def get_fields(layout):
+    """StorageField of every decodable variable of a layout, in slot order"""
+    fields = []
+    for label, slot, offset, number_of_bytes, description in get_storage_variables(
+        layout
+    ):
+        if description.startswith("mapping(") or "{" in description:
+            continue
+        # "<label> (<n> bytes)" for elementary types, "<base>[]" for arrays
+        if not description.endswith(" bytes)") or "[" in description:
+            continue
+        type_label = description[: description.rindex(" (")]
+        fields.append(
+            StorageField(
+                label,
+                slot,
+                offset,
+                number_of_bytes,
+                type_label,
+                type_label in ("bytes", "string"),
+            )
+        )
+    return fields
+
+
+def get_bool_flags(bool_slot):
+    """{flag: bool} of a BoolWriter / BoolReader packed boolSlot value"""
+    return {flag: bool(bool_slot >> bit & 1) for flag, bit in BOOL_SLOT_BITS.items()}
+
+
+def get_data_slots(field, word):
+    """Data slots of a bytes / string variable, none for short values"""
+    if not field.long or not word & 1:
+        return []
+    length = (word - 1) // 2
+    start = int.from_bytes(keccak256(field.slot.to_bytes(SLOT_SIZE, "big")), "big")
+    return [start + i for i in range((length + SLOT_SIZE - 1) // SLOT_SIZE)]
+
+
+def _decode_long(field, word, words):
+    if word & 1:
+        length = (word - 1) // 2
+        data = b"".join(
+            words[slot].to_bytes(SLOT_SIZE, "big")
+            for slot in get_data_slots(field, word)
+        )[:length]
+    else:
+        # short values are stored in the high order bytes with length * 2
+        data = word.to_bytes(SLOT_SIZE, "big")[: (word & 0xFF) // 2]
+    if field.type_label == "string":
+        return data.decode(errors="replace")
+    return "0x" + data.hex()
+
+
+def decode_field(field, words):
+    """Value of a variable given {slot: word} holding its slots"""
+    word = words[field.slot]
+    if field.long:
+        return _decode_long(field, word, words)
+    bits = field.number_of_bytes * 8
+    value = (word >> (field.offset * 8)) & ((1 << bits) - 1)
+    if field.type_label == "bool":
+        return value != 0
+    if field.type_label == "address" or field.type_label.startswith("contract "):
+        return f"0x{value:040x}"
+    if field.type_label.startswith("int"):
+        return value - (1 << bits) if value >> (bits - 1) else value
+    if field.type_label.startswith("bytes"):
+        return "0x" + value.to_bytes(field.number_of_bytes, "big").hex()
+    # uint and enum
+    return value
+
+
+def decode_state(fields, words):
+    """{label: value} of every field"""
+    return {field.label: decode_field(field, words) for field in fields}
+
+
+class StorageReader:
+    """Decoded LTVState of one vault read from raw storage"""
+
+    def __init__(self, client, address, layout, use_range=False):
+        self.client = client
+        self.address = address.lower()
+        self.fields = get_fields(layout)
+        self.slots = sorted({field.slot for field in self.fields})
+        self.use_range = use_range
+
+    def _get_storage_at(self, slots_by_block):
+        """{block: {slot: word}} of [(block, slots)] with one JSON-RPC batch"""
+        requests = [
+            ("eth_getStorageAt", [self.address, hex(slot), hex(block)])
+            for block, slots in slots_by_block
+            for slot in slots
+        ]
+        results = iter(self.client.batch(requests))
+        words = {}
+        for block, slots in slots_by_block:
+            block_words = words.setdefault(block, {})
+            for slot in slots:
+                block_words[slot] = int(next(results), 16)
+        return words
+
+    def _get_storage_range(self, block_number):
+        """
+        {hashed slot: word} of the whole storage at the end of block_number, None
+        when the node can not serve debug_storageRangeAt for that block
+        """
+        # storage ranges are taken before a transaction, the state at the end
+        # of a block is the state before the first transaction of the next one
+        next_block = self.client.call(
+            "eth_getBlockByNumber", [hex(block_number + 1), False]
+        )
+        if next_block is None:
+            return None
+        words = {}
+        start = "0x" + "00" * SLOT_SIZE
+        while start is not None:
+            try:
+                result = self.client.call(
+                    "debug_storageRangeAt",
+                    [
+                        next_block["hash"],
+                        0,
+                        self.address,
+                        start,
+                        STORAGE_RANGE_PAGE_SIZE,
+                    ],
+                )
+            except RpcError:
+                return None
+            for hashed_slot, entry in result["storage"].items():
+                words[int(hashed_slot, 16)] = int(entry["value"], 16)
+            start = result.get("nextKey")
+        return words
+
+    def _read_range(self, block_number):
+        hashed_words = self._get_storage_range(block_number)
+        if hashed_words is None:
+            return None
+
+        def get_word(slot):
+            hashed_slot = keccak256(slot.to_bytes(SLOT_SIZE, "big"))
+            return hashed_words.get(int.from_bytes(hashed_slot, "big"), 0)
+
+        words = {slot: get_word(slot) for slot in self.slots}
+        for field in self.fields:
+            for slot in get_data_slots(field, words[field.slot]):
+                words[slot] = get_word(slot)
+        return words
+
+    def _get_data_slots(self, words):
+        return [
+            slot
+            for field in self.fields
+            for slot in get_data_slots(field, words[field.slot])
+        ]
+
+    def read_words(self, blocks):
+        """{block: {slot: word}} with the variable and data slots of blocks"""
+        words = {}
+        if self.use_range:
+            for block in blocks:
+                block_words = self._read_range(block)
+                if block_words is None:
+                    self.use_range = False
+                    break
+                words[block] = block_words
+        pending = [block for block in blocks if block not in words]
+        if not pending:
+            return words
+        words.update(self._get_storage_at([(block, self.slots) for block in pending]))
+        data_slots = [(block, self._get_data_slots(words[block])) for block in pending]
+        if any(slots for _, slots in data_slots):
+            for block, block_words in self._get_storage_at(data_slots).items():
+                words[block].update(block_words)
+        return words
+
+    def _get_block_number(self, block_number):
+        if block_number is None:
+            return int(self.client.call("eth_blockNumber"), 16)
+        return block_number
+
+    def read(self, block_number=None):
+        """{label: value} of the vault state at block_number, latest by default"""
+        block_number = self._get_block_number(block_number)
+        return decode_state(self.fields, self.read_words([block_number])[block_number])
+
+    def diff(self, from_block, to_block=None):
+        """
+        {label: (value at from_block, value at to_block)} of the variables
+        which changed, only the fields of changed words being decoded
+        """
+        to_block = self._get_block_number(to_block)
+        words = self.read_words([from_block, to_block])
+        old, new = words[from_block], words[to_block]
+        changes = {}
+        for field in self.fields:
+            slots = [field.slot]
+            slots += get_data_slots(field, old[field.slot])
+            slots += get_data_slots(field, new[field.slot])
+            if all(old.get(slot) == new.get(slot) for slot in slots):
+                continue
+            old_value = decode_field(field, old)
+            new_value = decode_field(field, new)
+            if old_value != new_value:
+                changes[field.label] = (old_value, new_value)
+        return changes
@@ -0,0 +1 @@
+"""Stress testing of vault configurations along simulated oracle price paths"""
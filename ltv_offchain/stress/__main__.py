@@ -0,0 +1,197 @@
+"""
+Vault configuration stress testing CLI
+
+    python -m ltv_offchain.stress run --chain sepolia --paths 2000 --out stress.json
+
+Every args file of deploy/<chain>/<protocol>/ with a full vault configuration
+is stressed along the same price paths, args files with the same vault
+configuration are simulated once.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from ltv_offchain.stress.config import load_vault_configs
+from ltv_offchain.stress.engine import (
+    SimulationParameters,
+    format_summary_table,
+    run_stress,
+    summarize,
+)
+from ltv_offchain.stress.paths import PathParameters
+
+
+def run(args):
+    configs, skipped = load_vault_configs(args.chain, args.protocol, args.pattern)
+    for args_file, reason in skipped:
+        print(f"Skipping {args_file}: {reason}")
+    if not configs:
+        print(f"ERROR no vault configuration found in deploy/{args.chain}")
+        sys.exit(1)
+
+    path_parameters = PathParameters(
+        steps=args.steps,
+        dt=args.dt,
+        drift=args.drift,
+        volatility=args.volatility,
+        jump_intensity=args.jump_intensity,
+        jump_mean=args.jump_mean,
+        jump_volatility=args.jump_volatility,
+    )
+    parameters = SimulationParameters(
+        collateral_yield=args.collateral_yield,
+        borrow_rate=args.borrow_rate,
+        keeper_availability=args.keeper_availability,
+        liquidator_availability=args.liquidator_availability,
+        reward_fraction=args.reward_fraction,
+        deleverage_ltv=args.deleverage_ltv,
+        lending_liquidation_ltv=args.lending_liquidation_ltv,
+        lending_bonus=args.lending_bonus,
+        close_factor=args.close_factor,
+        rebalance_size=args.rebalance_size,
+    )
+
+    start = time.monotonic()
+    results = run_stress(
+        configs,
+        path_parameters,
+        parameters,
+        args.paths,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    summaries = [
+        summarize(config, config_results)
+        for config, config_results in zip(configs, results)
+    ]
+    print(format_summary_table(summaries))
+    print(
+        f"{len(configs)} configs x {args.paths} paths x {args.steps} steps "
+        f"in {time.monotonic() - start:.2f}s"
+    )
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                {
+                    "path_parameters": path_parameters._asdict(),
+                    "parameters": parameters._asdict(),
+                    "seed": args.seed,
+                    "configs": summaries,
+                },
+                f,
+                indent=4,
+            )
+        print(f"Stress report written to {args.out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LTV vault stress testing")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Stress the vault configurations of a chain along price paths"
+    )
+    run_parser.add_argument(
+        "--chain", help="Directory of deploy/ with the args files", required=True
+    )
+    run_parser.add_argument(
+        "--protocol", help="Only args files of this lending protocol directory"
+    )
+    run_parser.add_argument(
+        "--pattern", help="Args file name pattern", default="*.json"
+    )
+    run_parser.add_argument("--paths", help="Price paths", type=int, default=2000)
+    run_parser.add_argument(
+        "--steps", help="Oracle updates per path", type=int, default=720
+    )
+    run_parser.add_argument(
+        "--dt", help="Years between oracle updates", type=float, default=1 / 8760
+    )
+    run_parser.add_argument(
+        "--drift", help="Annualized price drift", type=float, default=0.0
+    )
+    run_parser.add_argument(
+        "--volatility", help="Annualized price volatility", type=float, default=0.05
+    )
+    run_parser.add_argument(
+        "--jump-intensity", help="Expected price jumps per year", type=float, default=2
+    )
+    run_parser.add_argument(
+        "--jump-mean", help="Mean log size of price jumps", type=float, default=-0.02
+    )
+    run_parser.add_argument(
+        "--jump-volatility",
+        help="Standard deviation of the log size of price jumps",
+        type=float,
+        default=0.03,
+    )
+    run_parser.add_argument(
+        "--collateral-yield", help="Annual collateral yield", type=float, default=0.0
+    )
+    run_parser.add_argument(
+        "--borrow-rate", help="Annual borrow rate", type=float, default=0.0
+    )
+    run_parser.add_argument(
+        "--keeper-availability",
+        help="Probability a keeper rebalances a vault out of its safe range at a step",
+        type=float,
+        default=1.0,
+    )
+    run_parser.add_argument(
+        "--liquidator-availability",
+        help="Probability a soft liquidation happens when possible at a step",
+        type=float,
+        default=1.0,
+    )
+    run_parser.add_argument(
+        "--reward-fraction",
+        help="Fraction of the auction duration executors wait before filling it",
+        type=float,
+        default=0.5,
+    )
+    run_parser.add_argument(
+        "--rebalance-size",
+        help="Fraction of the total assets keepers deposit or withdraw to open "
+        "a rebalancing auction",
+        type=float,
+        default=0.01,
+    )
+    run_parser.add_argument(
+        "--deleverage-ltv",
+        help="LTV at which the vault is deleveraged, defaults to halfway between "
+        "the soft liquidation LTV and the lending liquidation LTV",
+        type=float,
+    )
+    run_parser.add_argument(
+        "--lending-liquidation-ltv",
+        help="Lending protocol liquidation LTV, defaults to the args file LLTV",
+        type=float,
+    )
+    run_parser.add_argument(
+        "--lending-bonus",
+        help="Lending protocol liquidation bonus",
+        type=float,
+        default=0.05,
+    )
+    run_parser.add_argument(
+        "--close-factor",
+        help="Borrow fraction repaid by a lending protocol liquidation",
+        type=float,
+        default=0.5,
+    )
+    run_parser.add_argument("--seed", help="Price paths seed", type=int, default=0)
+    run_parser.add_argument(
+        "--workers", help="Processes simulating path chunks", type=int, default=1
+    )
+    run_parser.add_argument("--out", help="JSON file for the stress report")
+    run_parser.set_defaults(handler=run)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Vault configurations read from the deploy/<chain>/<protocol>/*.json args files
+"""
+
+import glob
+import json
+import os
+from collections import namedtuple
+
+DEPLOY_DIR = "deploy"
+
+# args file values are 18 decimals fixed point
+SLIPPAGE_PRECISION = 10**18
+
+# Ratios are (dividend, divider) pairs and slippages and LLTV 18 decimals
+# integers, as the vault stores them
+VaultConfig = namedtuple(
+    "VaultConfig",
+    [
+        "name",
+        "args_file",
+        "target_ltv",
+        "min_profit_ltv",
+        "max_safe_ltv",
+        "soft_liquidation_ltv",
+        "soft_liquidation_fee",
+        "max_deleverage_fee",
+        "max_growth_fee",
+        "collateral_slippage",
+        "borrow_slippage",
+        "auction_duration",
+        # liquidation LTV of the lending protocol when the args file has one
+        "lending_liquidation_ltv",
+    ],
+)
+
+RATIO_KEYS = {
+    "target_ltv": "TARGET_LTV",
+    "min_profit_ltv": "MIN_PROFIT_LTV",
+    "max_safe_ltv": "MAX_SAFE_LTV",
+    "soft_liquidation_ltv": "SOFT_LIQUIDATION_LTV",
+    "soft_liquidation_fee": "SOFT_LIQUIDATION_FEE",
+    "max_deleverage_fee": "MAX_DELEVERAGE_FEE",
+    "max_growth_fee": "MAX_GROWTH_FEE",
+}
+
+
+def get_required_keys():
+    keys = []
+    for prefix in RATIO_KEYS.values():
+        keys += [f"{prefix}_DIVIDEND", f"{prefix}_DIVIDER"]
+    return keys + ["COLLATERAL_SLIPPAGE", "BORROW_SLIPPAGE", "AUCTION_DURATION"]
+
+
+def vault_config_from_args(args, args_file):
+    """VaultConfig of a parsed args file, raises ValueError if keys are missing"""
+    missing = [key for key in get_required_keys() if key not in args]
+    if missing:
+        raise ValueError(f"{args_file} misses {missing}")
+    ratios = {
+        field: (int(args[f"{prefix}_DIVIDEND"]), int(args[f"{prefix}_DIVIDER"]))
+        for field, prefix in RATIO_KEYS.items()
+    }
+    lending_liquidation_ltv = None
+    if "LLTV" in args:
+        lending_liquidation_ltv = int(args["LLTV"])
+    return VaultConfig(
+        name=args.get("NAME") or os.path.splitext(os.path.basename(args_file))[0],
+        args_file=args_file,
+        collateral_slippage=int(args["COLLATERAL_SLIPPAGE"]),
+        borrow_slippage=int(args["BORROW_SLIPPAGE"]),
+        auction_duration=int(args["AUCTION_DURATION"]),
+        lending_liquidation_ltv=lending_liquidation_ltv,
+        **ratios,
+    )
+
+
+def get_args_files(chain, lending_protocol=None, pattern="*.json"):
+    protocol = lending_protocol or "*"
+    return sorted(glob.glob(os.path.join(DEPLOY_DIR, chain, protocol, pattern)))
+
+
+def load_vault_configs(chain, lending_protocol=None, pattern="*.json"):
+    """
+    Returns ([VaultConfig], [(args file, reason)]) for every args file
+    matching, args files without a full vault configuration are skipped
+    """
+    configs = []
+    skipped = []
+    for args_file in get_args_files(chain, lending_protocol, pattern):
+        with open(args_file, "r") as f:
+            args = json.load(f)
+        try:
+            configs.append(vault_config_from_args(args, args_file))
+        except ValueError as e:
+            skipped.append((args_file, str(e)))
+    return configs, skipped
@@ -0,0 +1,865 @@
+"""
+Monte Carlo stress engine
+
+Advances a vault along every price path of a run. The vault state is the
+integer VaultState of ltv_offchain.capacity and every transition is one of
+the exact ports of ltv_offchain.math, applied at each step in this order:
+
+    accrual: collateral yield and borrow interest grow the lending balances.
+    rebalance: the LTV left [min profit LTV, max safe LTV] and a keeper is
+        around (keeper_availability). The keeper deposits (LTV above max
+        safe) or withdraws (LTV below min profit) rebalance_size of the total
+        assets in borrow assets, which moves the vault to target LTV with an
+        auction, and an executor fills the whole auction reward_fraction of
+        the auction duration later with executeAuctionBorrow, or
+        executeAuctionCollateral when it reverts.
+    soft liquidation: a liquidator is around (liquidator_availability) and
+        softLiquidation accepts an amount, the largest one is liquidated.
+    deleverageAndWithdraw: the LTV is above deleverage_ltv, all borrow is
+        repaid with the max deleverage fee, the vault holds collateral only
+        afterwards. Nothing happens while the vault reverts.
+    lending liquidation: the LTV of the lending balances is above the lending
+        protocol liquidation LTV, close_factor of the borrow is liquidated
+        with lending_bonus.
+    insolvency: collateral is worth no more than borrow, the difference is
+        bad debt and the path stops with a zero share price.
+
+Like on chain, the max growth fee is only minted by vault operations, and
+the share price reported at every step is the one the vault previews, with
+the fee shares it would mint. Floats are only used to generate the paths,
+to skip the steps where no transition can trigger and for the reported
+values, which are relative to the initial total assets.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import random
+
+from ltv_offchain.auction.profitability import (
+    EXECUTE_AUCTION_BORROW,
+    EXECUTE_AUCTION_COLLATERAL,
+    available_delta_user_assets,
+    execute_auction,
+)
+from ltv_offchain.capacity.surface import VaultState, compute_limits
+from ltv_offchain.generated.model import ScenarioError, execute_operation
+from ltv_offchain.math.common_math import (
+    calculate_auction_step,
+    convert_future_borrow,
+    convert_future_collateral,
+    convert_future_reward_borrow,
+    convert_future_reward_collateral,
+    convert_real_borrow,
+    convert_real_collateral,
+)
+from ltv_offchain.math.constants import (
+    LAST_SEEN_PRICE_PRECISION,
+    VIRTUAL_ASSETS_AMOUNT,
+)
+from ltv_offchain.math.max_growth_fee import (
+    apply_max_growth_fee,
+    calculate_total_assets_from_data,
+    calculate_total_supply,
+    preview_supply_after_fee,
+)
+from ltv_offchain.math.mul_div import u_mul_div_down
+from ltv_offchain.math.solidity import MathRevert
+from ltv_offchain.math.structs import DeltaAuctionState, MaxGrowthFeeData
+from ltv_offchain.stress.paths import (
+    generate_price_paths,
+    get_chunk_seed,
+    get_chunks,
+)
+
+WAD = 10**18
+TOKEN_DECIMALS = 18
+# oracle price of the borrow token, path prices are in borrow token units
+BORROW_PRICE = 10**18
+INITIAL_TOTAL_ASSETS = 10**24
+MAX_TOTAL_ASSETS_IN_UNDERLYING = 2**128 - 1
+# softLiquidation amounts tried below the closed form largest one
+SOFT_LIQUIDATION_ATTEMPTS = 16
+# relative margin of the float step filter over the exact checks
+FILTER_MARGIN = 1e-9
+
+SimulationParameters = namedtuple(
+    "SimulationParameters",
+    [
+        "collateral_yield",
+        "borrow_rate",
+        "keeper_availability",
+        "liquidator_availability",
+        # fraction of the auction duration executors wait before filling
+        "reward_fraction",
+        # None for halfway between soft liquidation LTV and the lending
+        # liquidation LTV (1 when unknown)
+        "deleverage_ltv",
+        # None to use the args file LLTV, or insolvency only when absent
+        "lending_liquidation_ltv",
+        "lending_bonus",
+        "close_factor",
+        # fraction of the total assets a keeper deposits or withdraws
+        "rebalance_size",
+    ],
+    defaults=[0.0, 0.0, 1.0, 1.0, 0.5, None, None, 0.05, 0.5, 0.01],
+)
+
+PathResult = namedtuple(
+    "PathResult",
+    [
+        "final_share_price",
+        "min_share_price",
+        "max_drawdown",
+        "bad_debt",
+        "rebalances",
+        # auction rewards taken by executors, paid by the keeper operations
+        "rebalance_cost",
+        "soft_liquidations",
+        "soft_liquidation_cost",
+        "lending_liquidations",
+        # first step of the event, None if it did not happen
+        "deleverage_step",
+        "insolvency_step",
+        # growth fee and protocol reward shares minted to the fee collector
+        "fee_shares",
+    ],
+)
+
+
+def to_wad(value):
+    return round(value * WAD)
+
+
+def get_lending_liquidation_ltv(config, parameters):
+    """(dividend, divider) of the lending liquidation LTV, None if unknown"""
+    if parameters.lending_liquidation_ltv is not None:
+        return to_wad(parameters.lending_liquidation_ltv), WAD
+    if config.lending_liquidation_ltv is not None:
+        return config.lending_liquidation_ltv, WAD
+    return None
+
+
+def get_deleverage_ltv(config, parameters):
+    """(dividend, divider) of the LTV the vault is deleveraged above"""
+    if parameters.deleverage_ltv is not None:
+        return to_wad(parameters.deleverage_ltv), WAD
+    lending_dividend, lending_divider = get_lending_liquidation_ltv(
+        config, parameters
+    ) or (1, 1)
+    soft_dividend, soft_divider = config.soft_liquidation_ltv
+    return (
+        soft_dividend * lending_divider + lending_dividend * soft_divider,
+        2 * soft_divider * lending_divider,
+    )
+
+
+def get_initial_state(config, price):
+    """VaultState at target LTV with INITIAL_TOTAL_ASSETS of total assets"""
+    collateral_price = max(1, round(price * BORROW_PRICE))
+    target_dividend, target_divider = config.target_ltv
+    borrow = (
+        INITIAL_TOTAL_ASSETS * target_dividend // (target_divider - target_dividend)
+    )
+    collateral = u_mul_div_down(
+        INITIAL_TOTAL_ASSETS + borrow, 10**TOKEN_DECIMALS, collateral_price
+    )
+    state = VaultState(
+        deposit_real_collateral_assets=collateral,
+        deposit_real_borrow_assets=borrow,
+        withdraw_real_collateral_assets=collateral,
+        withdraw_real_borrow_assets=borrow,
+        future_borrow_assets=0,
+        future_collateral_assets=0,
+        future_reward_borrow_assets=0,
+        future_reward_collateral_assets=0,
+        borrow_price=BORROW_PRICE,
+        collateral_price=collateral_price,
+        borrow_token_decimals=TOKEN_DECIMALS,
+        collateral_token_decimals=TOKEN_DECIMALS,
+        max_growth_fee_dividend=config.max_growth_fee[0],
+        max_growth_fee_divider=config.max_growth_fee[1],
+        supply=0,
+        last_seen_token_price=LAST_SEEN_PRICE_PRECISION,
+        target_ltv_dividend=target_dividend,
+        target_ltv_divider=target_divider,
+        start_auction=0,
+        auction_duration=config.auction_duration,
+        block_number=0,
+        collateral_slippage=config.collateral_slippage,
+        borrow_slippage=config.borrow_slippage,
+        max_total_assets_in_underlying=MAX_TOTAL_ASSETS_IN_UNDERLYING,
+        min_profit_ltv_dividend=config.min_profit_ltv[0],
+        min_profit_ltv_divider=config.min_profit_ltv[1],
+        max_safe_ltv_dividend=config.max_safe_ltv[0],
+        max_safe_ltv_divider=config.max_safe_ltv[1],
+        owner_balance=0,
+    )
+    supply = get_total_assets(state) - VIRTUAL_ASSETS_AMOUNT
+    return state._replace(supply=supply, owner_balance=supply)
+
+
+def with_real_assets(state, collateral, borrow):
+    return state._replace(
+        deposit_real_collateral_assets=collateral,
+        deposit_real_borrow_assets=borrow,
+        withdraw_real_collateral_assets=collateral,
+        withdraw_real_borrow_assets=borrow,
+    )
+
+
+def get_collateral_and_borrow(state):
+    """Collateral and borrow in underlying _totalAssets(false) sums up"""
+    collateral = (
+        convert_real_collateral(
+            state.withdraw_real_collateral_assets,
+            state.collateral_price,
+            state.collateral_token_decimals,
+            False,
+        )
+        + convert_future_collateral(
+            state.future_collateral_assets,
+            state.collateral_price,
+            state.collateral_token_decimals,
+            False,
+        )
+        + convert_future_reward_collateral(
+            state.future_reward_collateral_assets,
+            state.collateral_price,
+            state.collateral_token_decimals,
+            False,
+        )
+    )
+    borrow = (
+        convert_real_borrow(
+            state.withdraw_real_borrow_assets,
+            state.borrow_price,
+            state.borrow_token_decimals,
+            False,
+        )
+        + convert_future_borrow(
+            state.future_borrow_assets,
+            state.borrow_price,
+            state.borrow_token_decimals,
+            False,
+        )
+        + convert_future_reward_borrow(
+            state.future_reward_borrow_assets,
+            state.borrow_price,
+            state.borrow_token_decimals,
+            False,
+        )
+    )
+    return collateral, borrow
+
+
+def get_total_assets(state):
+    """_totalAssets(false), virtual assets included"""
+    collateral, borrow = get_collateral_and_borrow(state)
+    return calculate_total_assets_from_data(
+        False, collateral, borrow, state.borrow_price, state.borrow_token_decimals
+    )
+
+
+def is_ltv_above(collateral, borrow, ltv):
+    dividend, divider = ltv
+    return borrow * divider > collateral * dividend
+
+
+def get_underlying(state, collateral_assets, borrow_assets):
+    """Value in underlying of collateral assets received and borrow assets paid"""
+    return (
+        collateral_assets
+        * state.collateral_price
+        // 10**state.collateral_token_decimals
+        - borrow_assets * state.borrow_price // 10**state.borrow_token_decimals
+    )
+
+
+def open_rebalance_auction(state, is_deposit, rebalance_size):
+    """
+    (VaultState, shares minted to the fee collector) after the keeper deposit
+    or withdraw of borrow assets, None if the vault accepts none
+    """
+    operation = "deposit" if is_deposit else "withdraw"
+    max_function = "max_" + operation
+    state = state._replace(owner_balance=state.supply)
+    limit = compute_limits(state, [max_function])[max_function] or 0
+    amount = u_mul_div_down(
+        u_mul_div_down(get_total_assets(state), to_wad(rebalance_size), WAD),
+        10**state.borrow_token_decimals,
+        state.borrow_price,
+    )
+    # a deposit too small to pay the future payment gets no shares
+    for amount in (min(amount, limit), limit):
+        if amount == 0:
+            continue
+        try:
+            shares, next_state = execute_operation(state, "borrow", operation, amount)
+        except (ScenarioError, MathRevert):
+            return None
+        if shares:
+            delta_shares = shares if is_deposit else -shares
+            return next_state, next_state.supply - state.supply - delta_shares
+    return None
+
+
+def execute_whole_auction(state):
+    """
+    (VaultState, executor profit in underlying) after the whole auction is
+    filled at state.block_number, AuctionApplyDeltaState.applyDeltaState
+    """
+    data = (
+        state.future_borrow_assets,
+        state.future_collateral_assets,
+        state.future_reward_borrow_assets,
+        state.future_reward_collateral_assets,
+        calculate_auction_step(
+            state.start_auction, state.block_number, state.auction_duration
+        ),
+        state.auction_duration,
+    )
+    for function in (EXECUTE_AUCTION_BORROW, EXECUTE_AUCTION_COLLATERAL):
+        available = available_delta_user_assets(function, data)
+        if available == 0:
+            continue
+        delta = execute_auction(function, -available, data)
+        if delta is not None:
+            break
+    else:
+        return state, 0
+    delta = DeltaAuctionState._make(delta)
+
+    collateral = state.withdraw_real_collateral_assets
+    borrow = state.withdraw_real_borrow_assets
+    supply_amount = -(
+        delta.delta_user_collateral_assets
+        + delta.delta_protocol_future_reward_collateral_assets
+    )
+    if supply_amount > 0:
+        collateral += supply_amount
+    if delta.delta_user_collateral_assets > 0:
+        collateral -= delta.delta_user_collateral_assets
+    if delta.delta_user_borrow_assets < 0:
+        borrow -= delta.delta_user_borrow_assets
+    repay_amount = (
+        delta.delta_user_borrow_assets
+        + delta.delta_protocol_future_reward_borrow_assets
+    )
+    if repay_amount > 0:
+        borrow -= repay_amount
+
+    state = with_real_assets(state, collateral, borrow)._replace(
+        future_borrow_assets=state.future_borrow_assets
+        + delta.delta_future_borrow_assets,
+        future_collateral_assets=state.future_collateral_assets
+        + delta.delta_future_collateral_assets,
+        future_reward_borrow_assets=state.future_reward_borrow_assets
+        + delta.delta_protocol_future_reward_borrow_assets
+        + delta.delta_user_future_reward_borrow_assets,
+        future_reward_collateral_assets=state.future_reward_collateral_assets
+        + delta.delta_protocol_future_reward_collateral_assets
+        + delta.delta_user_future_reward_collateral_assets,
+    )
+    profit = get_underlying(
+        state, delta.delta_user_collateral_assets, delta.delta_user_borrow_assets
+    )
+    return state, profit
+
+
+def liquidate(
+    state,
+    liquidation_amount_borrow,
+    bonus_dividend,
+    bonus_divider,
+    soft_liquidation_ltv=None,
+):
+    """
+    Port of OnlyEmergencyDeleverager._liquidate, a soft liquidation when
+    soft_liquidation_ltv is given, a deleverage otherwise. Returns (VaultState,
+    growth fee shares, liquidator bonus in underlying), raises MathRevert
+    where the vault reverts
+    """
+    state = state._replace(
+        future_borrow_assets=0,
+        future_collateral_assets=0,
+        future_reward_borrow_assets=0,
+        future_reward_collateral_assets=0,
+        start_auction=0,
+    )
+    if soft_liquidation_ltv is None:
+        if liquidation_amount_borrow < state.withdraw_real_borrow_assets:
+            raise MathRevert("ImpossibleToCoverDeleverage")
+        liquidation_amount_borrow = state.withdraw_real_borrow_assets
+
+    collateral, borrow = get_collateral_and_borrow(state)
+    withdraw_total_assets = calculate_total_assets_from_data(
+        False, collateral, borrow, state.borrow_price, state.borrow_token_decimals
+    )
+    total_supply = calculate_total_supply(state.supply)
+    growth_fee_shares, last_seen_token_price = apply_max_growth_fee(
+        preview_supply_after_fee(
+            MaxGrowthFeeData(
+                withdraw_total_assets=withdraw_total_assets,
+                max_growth_fee_dividend=state.max_growth_fee_dividend,
+                max_growth_fee_divider=state.max_growth_fee_divider,
+                supply=total_supply,
+                last_seen_token_price=state.last_seen_token_price,
+            )
+        ),
+        withdraw_total_assets,
+        total_supply,
+    )
+
+    liquidation_amount_borrow_in_underlying = u_mul_div_down(
+        liquidation_amount_borrow,
+        state.borrow_price,
+        10**state.borrow_token_decimals,
+    )
+    liquidation_amount_collateral_in_underlying = (
+        liquidation_amount_borrow_in_underlying
+        + u_mul_div_down(
+            liquidation_amount_borrow_in_underlying, bonus_dividend, bonus_divider
+        )
+    )
+    liquidation_amount_collateral = u_mul_div_down(
+        liquidation_amount_collateral_in_underlying,
+        10**state.collateral_token_decimals,
+        state.collateral_price,
+    )
+    if liquidation_amount_collateral_in_underlying > collateral:
+        raise MathRevert("SoftLiquidationIncorrectAmount")
+    if soft_liquidation_ltv is not None:
+        expected_collateral = collateral - liquidation_amount_collateral_in_underlying
+        expected_borrow = borrow - liquidation_amount_borrow_in_underlying
+        if expected_borrow < 0:
+            raise MathRevert("uint256 underflow")
+        if not is_ltv_above(expected_collateral, expected_borrow, soft_liquidation_ltv):
+            raise MathRevert("SoftLiquidationResultBelowSoftLiquidationLtv")
+        if borrow * expected_collateral <= collateral * expected_borrow:
+            raise MathRevert("SoftLiquidationFeeTooHigh")
+
+    real_borrow = state.withdraw_real_borrow_assets - liquidation_amount_borrow
+    real_collateral = state.withdraw_real_collateral_assets - (
+        liquidation_amount_collateral
+    )
+    if real_borrow < 0 or real_collateral < 0:
+        raise MathRevert("lending balance underflow")
+    state = with_real_assets(state, real_collateral, real_borrow)._replace(
+        supply=state.supply + growth_fee_shares,
+        last_seen_token_price=(
+            last_seen_token_price
+            if last_seen_token_price is not None
+            else state.last_seen_token_price
+        ),
+    )
+    bonus = (
+        liquidation_amount_collateral_in_underlying
+        - liquidation_amount_borrow_in_underlying
+    )
+    return state, growth_fee_shares, bonus
+
+
+def soft_liquidate(state, config):
+    """
+    liquidate() result of the largest amount softLiquidation accepts, found
+    in closed form and lowered until the vault accepts it, None if none
+    """
+    collateral, borrow = get_collateral_and_borrow(
+        state._replace(
+            future_borrow_assets=0,
+            future_collateral_assets=0,
+            future_reward_borrow_assets=0,
+            future_reward_collateral_assets=0,
+        )
+    )
+    ltv_dividend, ltv_divider = config.soft_liquidation_ltv
+    fee_dividend, fee_divider = config.soft_liquidation_fee
+    # (borrow - x) / (collateral - x * (1 + fee)) stays above the soft LTV
+    numerator = (borrow * ltv_divider - collateral * ltv_dividend) * fee_divider
+    denominator = ltv_divider * fee_divider - ltv_dividend * (
+        fee_divider + fee_dividend
+    )
+    if numerator <= 0 or denominator <= 0:
+        return None
+    amount = u_mul_div_down(
+        (numerator - 1) // denominator,
+        10**state.borrow_token_decimals,
+        state.borrow_price,
+    )
+    for _ in range(SOFT_LIQUIDATION_ATTEMPTS):
+        if amount <= 0:
+            return None
+        try:
+            return liquidate(
+                state, amount, fee_dividend, fee_divider, config.soft_liquidation_ltv
+            )
+        except MathRevert:
+            amount -= max(1, amount // 10**12)
+    return None
+
+
+def lending_liquidate(state, close_factor, bonus):
+    """(VaultState, liquidator bonus in underlying) of a lending liquidation"""
+    repaid = u_mul_div_down(state.withdraw_real_borrow_assets, close_factor, WAD)
+    repaid_in_underlying = u_mul_div_down(
+        repaid, state.borrow_price, 10**state.borrow_token_decimals
+    )
+    seized = min(
+        u_mul_div_down(
+            repaid_in_underlying + u_mul_div_down(repaid_in_underlying, bonus, WAD),
+            10**state.collateral_token_decimals,
+            state.collateral_price,
+        ),
+        state.withdraw_real_collateral_assets,
+    )
+    state = with_real_assets(
+        state,
+        state.withdraw_real_collateral_assets - seized,
+        state.withdraw_real_borrow_assets - repaid,
+    )
+    return state, get_underlying(state, seized, repaid)
+
+
+def accrue(state, collateral_growth, borrow_growth):
+    return with_real_assets(
+        state,
+        u_mul_div_down(state.withdraw_real_collateral_assets, collateral_growth, WAD),
+        u_mul_div_down(state.withdraw_real_borrow_assets, borrow_growth, WAD),
+    )
+
+
+def get_share_price_terms(state):
+    """
+    Float (collateral assets, borrow, total supply, last seen token price) of
+    a state, relative to the initial total assets, for the reported share price
+    """
+    collateral = (
+        state.withdraw_real_collateral_assets
+        + state.future_collateral_assets
+        + state.future_reward_collateral_assets
+    ) / 10**state.collateral_token_decimals
+    borrow = (
+        state.withdraw_real_borrow_assets
+        + state.future_borrow_assets
+        + state.future_reward_borrow_assets
+    ) / 10**state.borrow_token_decimals
+    scale = INITIAL_TOTAL_ASSETS / 10**state.borrow_token_decimals
+    return (
+        collateral / scale,
+        borrow / scale,
+        calculate_total_supply(state.supply) / INITIAL_TOTAL_ASSETS,
+        state.last_seen_token_price / LAST_SEEN_PRICE_PRECISION,
+    )
+
+
+def simulate_path(config, parameters, path, dt, rng):
+    """PathResult of one vault along one price path"""
+    deleverage_ltv = get_deleverage_ltv(config, parameters)
+    lending_ltv = get_lending_liquidation_ltv(config, parameters)
+    collateral_growth = to_wad(1 + parameters.collateral_yield * dt)
+    borrow_growth = to_wad(1 + parameters.borrow_rate * dt)
+    accrues = collateral_growth != WAD or borrow_growth != WAD
+    close_factor = to_wad(parameters.close_factor)
+    lending_bonus = to_wad(parameters.lending_bonus)
+    execution_delay = round(parameters.reward_fraction * config.auction_duration)
+    random_value = rng.random
+    growth_fee = config.max_growth_fee[0] / config.max_growth_fee[1]
+    min_profit_ltv = config.min_profit_ltv[0] / config.min_profit_ltv[1]
+    # lowest LTV any transition but the min profit rebalance triggers above
+    trigger_ltv = min(
+        ltv[0] / ltv[1]
+        for ltv in (
+            config.max_safe_ltv,
+            config.soft_liquidation_ltv,
+            deleverage_ltv,
+            lending_ltv or (1, 1),
+            (1, 1),
+        )
+    )
+
+    state = get_initial_state(config, path[0])
+    rebalances = 0
+    rebalance_cost = 0
+    soft_liquidations = 0
+    soft_liquidation_cost = 0
+    lending_liquidations = 0
+    deleverage_step = None
+    fee_shares = 0
+    min_share_price = 1.0
+    peak_share_price = 1.0
+    max_drawdown = 0.0
+    share_price = 1.0
+    changed = True
+
+    for step in range(1, len(path)):
+        price = path[step]
+        if accrues:
+            state = accrue(state, collateral_growth, borrow_growth)
+            changed = True
+        if changed:
+            collateral, borrow, supply, last_seen_price = get_share_price_terms(state)
+            if deleverage_step is not None or borrow <= 0:
+                low_price, high_price = -1.0, float("inf")
+            else:
+                low_price = borrow / (collateral * trigger_ltv) * (1 + FILTER_MARGIN)
+                high_price = (
+                    borrow / (collateral * min_profit_ltv) * (1 - FILTER_MARGIN)
+                    if min_profit_ltv > 0
+                    else float("inf")
+                )
+            changed = False
+
+        if price < low_price or price > high_price:
+            state = state._replace(
+                collateral_price=max(1, round(price * BORROW_PRICE)),
+                block_number=step * (config.auction_duration + 1),
+            )
+            vault_collateral, vault_borrow = get_collateral_and_borrow(state)
+            is_above = is_ltv_above(vault_collateral, vault_borrow, config.max_safe_ltv)
+            if (
+                is_above
+                or not is_ltv_above(
+                    vault_collateral, vault_borrow, config.min_profit_ltv
+                )
+            ) and random_value() < parameters.keeper_availability:
+                opened = open_rebalance_auction(
+                    state, is_above, parameters.rebalance_size
+                )
+                if opened is not None:
+                    state, minted = opened
+                    state, profit = execute_whole_auction(
+                        state._replace(
+                            block_number=state.block_number + execution_delay
+                        )
+                    )
+                    fee_shares += minted
+                    rebalance_cost += profit
+                    rebalances += 1
+                    changed = True
+
+            if is_ltv_above(
+                *get_collateral_and_borrow(state), config.soft_liquidation_ltv
+            ) and (random_value() < parameters.liquidator_availability):
+                liquidated = soft_liquidate(state, config)
+                if liquidated is not None:
+                    state, minted, bonus = liquidated
+                    fee_shares += minted
+                    soft_liquidation_cost += bonus
+                    soft_liquidations += 1
+                    changed = True
+
+            if is_ltv_above(*get_collateral_and_borrow(state), deleverage_ltv):
+                try:
+                    state, minted, _ = liquidate(
+                        state,
+                        state.withdraw_real_borrow_assets,
+                        *config.max_deleverage_fee,
+                    )
+                    fee_shares += minted
+                    deleverage_step = step
+                    changed = True
+                except MathRevert:
+                    pass
+
+            lending_collateral, lending_borrow = get_collateral_and_borrow(
+                state._replace(
+                    future_borrow_assets=0,
+                    future_collateral_assets=0,
+                    future_reward_borrow_assets=0,
+                    future_reward_collateral_assets=0,
+                )
+            )
+            if lending_ltv is not None and is_ltv_above(
+                lending_collateral, lending_borrow, lending_ltv
+            ):
+                state, _ = lending_liquidate(state, close_factor, lending_bonus)
+                lending_liquidations += 1
+                changed = True
+
+            vault_collateral, vault_borrow = get_collateral_and_borrow(state)
+            if vault_borrow > 0 and vault_collateral <= vault_borrow:
+                return PathResult(
+                    final_share_price=0.0,
+                    min_share_price=0.0,
+                    max_drawdown=1.0,
+                    bad_debt=(vault_borrow - vault_collateral) / INITIAL_TOTAL_ASSETS,
+                    rebalances=rebalances,
+                    rebalance_cost=rebalance_cost / INITIAL_TOTAL_ASSETS,
+                    soft_liquidations=soft_liquidations,
+                    soft_liquidation_cost=soft_liquidation_cost / INITIAL_TOTAL_ASSETS,
+                    lending_liquidations=lending_liquidations,
+                    deleverage_step=deleverage_step,
+                    insolvency_step=step,
+                    fee_shares=fee_shares / INITIAL_TOTAL_ASSETS,
+                )
+            if changed:
+                collateral, borrow, supply, last_seen_price = get_share_price_terms(
+                    state
+                )
+
+        share_price = (collateral * price - borrow) / supply
+        # _previewSupplyAfterFee in share price terms
+        if share_price > last_seen_price:
+            share_price = growth_fee * last_seen_price + (1 - growth_fee) * share_price
+        if share_price < min_share_price:
+            min_share_price = share_price
+        if share_price > peak_share_price:
+            peak_share_price = share_price
+        drawdown = 1 - share_price / peak_share_price
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+
+    return PathResult(
+        final_share_price=share_price,
+        min_share_price=min_share_price,
+        max_drawdown=max_drawdown,
+        bad_debt=0.0,
+        rebalances=rebalances,
+        rebalance_cost=rebalance_cost / INITIAL_TOTAL_ASSETS,
+        soft_liquidations=soft_liquidations,
+        soft_liquidation_cost=soft_liquidation_cost / INITIAL_TOTAL_ASSETS,
+        lending_liquidations=lending_liquidations,
+        deleverage_step=deleverage_step,
+        insolvency_step=None,
+        fee_shares=fee_shares / INITIAL_TOTAL_ASSETS,
+    )
+
+
+def simulate_chunk(configs, path_parameters, parameters, seed, chunk):
+    """
+    Generates the paths of one chunk and runs every config along them,
+    returns {config index: [PathResult]}
+    """
+    chunk_index, count = chunk
+    chunk_seed = get_chunk_seed(seed, chunk_index)
+    paths = generate_price_paths(path_parameters, count, chunk_seed)
+    results = {}
+    for index, config in enumerate(configs):
+        # keeper and liquidator availability draws are common to every config too
+        rng = random.Random(chunk_seed)
+        results[index] = [
+            simulate_path(config, parameters, path, path_parameters.dt, rng)
+            for path in paths
+        ]
+    return results
+
+
+def get_vault_key(config):
+    """Everything of a VaultConfig the simulation depends on"""
+    return config._replace(name=None, args_file=None)
+
+
+def run_stress(configs, path_parameters, parameters, paths, seed=0, workers=1):
+    """
+    Returns [[PathResult] per path] per config, in config order. Configs
+    only differing by name share the results of one simulation
+    """
+    keys = [get_vault_key(config) for config in configs]
+    distinct = list(dict.fromkeys(keys))
+    chunks = get_chunks(paths)
+    simulate = partial(simulate_chunk, distinct, path_parameters, parameters, seed)
+    workers = max(1, min(workers, len(chunks)))
+    if workers == 1:
+        chunk_results = [simulate(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_results = list(executor.map(simulate, chunks))
+    results = [[] for _ in distinct]
+    for chunk_result in chunk_results:
+        for index, path_results in chunk_result.items():
+            results[index].extend(path_results)
+    return [results[distinct.index(key)] for key in keys]
+
+
+def get_percentile(sorted_values, percentile):
+    """Linear interpolation percentile of already sorted values"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def get_distribution(values, percentiles=(1, 5, 25, 50, 75, 95, 99)):
+    values = sorted(values)
+    count = len(values)
+    mean = sum(values) / count
+    variance = sum((value - mean) ** 2 for value in values) / count
+    distribution = {"mean": mean, "std": variance**0.5}
+    for percentile in percentiles:
+        distribution[f"p{percentile}"] = get_percentile(values, percentile)
+    return distribution
+
+
+def summarize(config, results):
+    """JSON friendly report of the PathResults of one config"""
+    count = len(results)
+    share_prices = [result.final_share_price for result in results]
+    # expected shortfall of the worst 5% of final share prices
+    worst = sorted(share_prices)[: max(1, count // 20)]
+    bad_debts = [result.bad_debt for result in results]
+    deleverage_steps = [
+        result.deleverage_step
+        for result in results
+        if result.deleverage_step is not None
+    ]
+    insolvency_steps = [
+        result.insolvency_step
+        for result in results
+        if result.insolvency_step is not None
+    ]
+    return {
+        "name": config.name,
+        "args_file": config.args_file,
+        "paths": count,
+        "final_share_price": get_distribution(share_prices),
+        "final_share_price_expected_shortfall_5": sum(worst) / len(worst),
+        "min_share_price": get_distribution(
+            [result.min_share_price for result in results]
+        ),
+        "max_drawdown": get_distribution([result.max_drawdown for result in results]),
+        "bad_debt_probability": len(insolvency_steps) / count,
+        "bad_debt": get_distribution(bad_debts),
+        "deleverage_probability": len(deleverage_steps) / count,
+        "mean_deleverage_step": (
+            sum(deleverage_steps) / len(deleverage_steps) if deleverage_steps else None
+        ),
+        "mean_rebalances": sum(result.rebalances for result in results) / count,
+        "mean_rebalance_cost": sum(result.rebalance_cost for result in results) / count,
+        "soft_liquidation_probability": sum(
+            1 for result in results if result.soft_liquidations
+        )
+        / count,
+        "mean_soft_liquidations": sum(result.soft_liquidations for result in results)
+        / count,
+        "mean_soft_liquidation_cost": sum(
+            result.soft_liquidation_cost for result in results
+        )
+        / count,
+        "lending_liquidation_probability": sum(
+            1 for result in results if result.lending_liquidations
+        )
+        / count,
+        "mean_fee_shares": sum(result.fee_shares for result in results) / count,
+    }
+
+
+def format_summary_table(summaries):
+    lines = [
+        f"{'CONFIG':<40} {'P5 PRICE':>9} {'P50 PRICE':>9} {'ES5':>8} {'P(BAD DEBT)':>11} {'P99 BAD DEBT':>12} {'P(SOFT LIQ)':>11} {'P(DELEVERAGE)':>13}"
+    ]
+    for summary in summaries:
+        lines.append(
+            f"{summary['name'][:40]:<40} "
+            f"{summary['final_share_price']['p5']:>9.4f} "
+            f"{summary['final_share_price']['p50']:>9.4f} "
+            f"{summary['final_share_price_expected_shortfall_5']:>8.4f} "
+            f"{summary['bad_debt_probability']:>11.4f} "
+            f"{summary['bad_debt']['p99']:>12.6f} "
+            f"{summary['soft_liquidation_probability']:>11.4f} "
+            f"{summary['deleverage_probability']:>13.4f}"
+        )
+    return "\n".join(lines)
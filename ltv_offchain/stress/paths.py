@@ -0,0 +1,77 @@
+"""
+Oracle price paths
+
+Paths are the collateral price in borrow token units, normalized to start at
+1: geometric Brownian motion with Poisson jumps of lognormal size, which
+stresses the tails that drive soft liquidations and bad debt. Paths are
+generated in chunks of CHUNK_SIZE, each with its own seed derived from the
+run seed, so a run gives the same paths whatever the number of workers and
+every vault config can be stressed along the very same paths.
+"""
+
+import math
+import random
+from collections import namedtuple
+from itertools import accumulate
+
+CHUNK_SIZE = 250
+
+PathParameters = namedtuple(
+    "PathParameters",
+    [
+        "steps",
+        # length of a step in years
+        "dt",
+        # annualized drift and volatility of the collateral / borrow price
+        "drift",
+        "volatility",
+        # expected jumps per year, mean and standard deviation of log jump size
+        "jump_intensity",
+        "jump_mean",
+        "jump_volatility",
+    ],
+)
+
+
+def get_chunk_seed(seed, chunk_index):
+    return seed * 1_000_003 + chunk_index
+
+
+def generate_price_paths(parameters, count, seed):
+    """count paths of parameters.steps + 1 prices each, starting at 1"""
+    rng = random.Random(seed)
+    gauss = rng.gauss
+    rand = rng.random
+    steps = parameters.steps
+    dt = parameters.dt
+    drift_term = (parameters.drift - parameters.volatility**2 / 2) * dt
+    diffusion = parameters.volatility * math.sqrt(dt)
+    jump_probability = 1 - math.exp(-parameters.jump_intensity * dt)
+    # jump steps are geometric gaps rather than one draw per step
+    log_no_jump = math.log1p(-jump_probability) if jump_probability < 1 else None
+
+    paths = []
+    for _ in range(count):
+        increments = [drift_term + diffusion * gauss(0.0, 1.0) for _ in range(steps)]
+        if jump_probability:
+            step = -1
+            while True:
+                if log_no_jump is None:
+                    step += 1
+                else:
+                    step += 1 + int(math.log(1.0 - rand()) / log_no_jump)
+                if step >= steps:
+                    break
+                increments[step] += gauss(
+                    parameters.jump_mean, parameters.jump_volatility
+                )
+        paths.append(list(map(math.exp, accumulate(increments, initial=0.0))))
+    return paths
+
+
+def get_chunks(count):
+    """[(chunk index, paths in chunk)] covering count paths"""
+    return [
+        (index, min(CHUNK_SIZE, count - start))
+        for index, start in enumerate(range(0, count, CHUNK_SIZE))
+    ]
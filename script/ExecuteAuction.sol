@@ -21,7 +21,7 @@ contract ExecuteAuction is Script {
             IERC20 collateral = IERC20(collateralToken);
 
             int256 futureBorrowAssets = ltv.futureBorrowAssets();
-            int256 futureCollateralAssets = ltv.futureBorrowAssets();
+            int256 futureCollateralAssets = ltv.futureCollateralAssets();
 
             uint256 collateralBalance = collateral.balanceOf(msg.sender);
 
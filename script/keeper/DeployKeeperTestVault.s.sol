@@ -0,0 +1,182 @@
+// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {Script} from "forge-std/Script.sol";
+import {console} from "forge-std/console.sol";
+import {IERC20} from "openzeppelin-contracts/contracts/interfaces/IERC20.sol";
+import {UpgradeableBeacon} from "openzeppelin-contracts/contracts/proxy/beacon/UpgradeableBeacon.sol";
+import {TransparentUpgradeableBeaconProxy} from
+    "transparent_upgradeable_beacon_proxy/TransparentUpgradeableBeaconProxy.sol";
+import {ILTV} from "src/interfaces/ILTV.sol";
+import {IAuctionModule} from "src/interfaces/reads/IAuctionModule.sol";
+import {IERC20Module} from "src/interfaces/reads/IERC20Module.sol";
+import {ICollateralVaultModule} from "src/interfaces/reads/ICollateralVaultModule.sol";
+import {IBorrowVaultModule} from "src/interfaces/reads/IBorrowVaultModule.sol";
+import {ILowLevelRebalanceModule} from "src/interfaces/reads/ILowLevelRebalanceModule.sol";
+import {IInitializeModule} from "src/interfaces/writes/IInitializeModule.sol";
+import {IAdministrationModule} from "src/interfaces/reads/IAdministrationModule.sol";
+import {StateInitData} from "src/structs/state/initialize/StateInitData.sol";
+import {ModulesState} from "src/structs/state/common/ModulesState.sol";
+import {AuctionModule} from "src/elements/modules/AuctionModule.sol";
+import {ERC20Module} from "src/elements/modules/ERC20Module.sol";
+import {CollateralVaultModule} from "src/elements/modules/CollateralVaultModule.sol";
+import {BorrowVaultModule} from "src/elements/modules/BorrowVaultModule.sol";
+import {LowLevelRebalanceModule} from "src/elements/modules/LowLevelRebalanceModule.sol";
+import {AdministrationModule} from "src/elements/modules/AdministrationModule.sol";
+import {InitializeModule} from "src/elements/modules/InitializeModule.sol";
+import {ModulesProvider} from "src/elements/ModulesProvider.sol";
+import {VaultBalanceAsLendingConnector} from "src/connectors/lending_connectors/VaultBalanceAsLendingConnector.sol";
+import {DummyLending} from "src/dummy/DummyLending.sol";
+import {DummyOracle} from "src/dummy/DummyOracle.sol";
+import {DummyLendingConnector} from "src/dummy/DummyLendingConnector.sol";
+import {DummyOracleConnector} from "src/dummy/DummyOracleConnector.sol";
+import {DummySlippageConnector} from "src/dummy/DummySlippageConnector.sol";
+import {WETH} from "src/dummy/weth/WETH.sol";
+import {LTV} from "src/elements/LTV.sol";
+
+/**
+ * Deploys a dummy vault with an open auction for the auction keeper end to end
+ * test (python3 -m ltv_offchain.auction keeper-e2e). The auction is opened
+ * at the current block by writing the future position directly, defaults
+ * describe a deposit auction where the executor provides collateral and
+ * receives borrow.
+ *
+ * forge script script/keeper/DeployKeeperTestVault.s.sol --rpc-url localhost:8545 --private-key <key> --broadcast
+ */
+contract KeeperTestLTV is LTV {
+    constructor(address modules) LTV(modules) {}
+
+    function openAuction(int256 borrowAssets, int256 collateralAssets, int256 rewardAssets) external {
+        // casting to uint56 is safe because block numbers fit in 56 bits
+        // forge-lint: disable-next-line(unsafe-typecast)
+        startAuction = uint56(block.number);
+        futureBorrowAssets = borrowAssets;
+        futureCollateralAssets = collateralAssets;
+        if (borrowAssets < 0) {
+            futureRewardBorrowAssets = rewardAssets;
+        } else {
+            futureRewardCollateralAssets = rewardAssets;
+        }
+    }
+}
+
+contract DeployKeeperTestVault is Script {
+    WETH public collateralToken;
+    WETH public borrowToken;
+    DummyLending public lending;
+    DummyOracle public oracle;
+    ModulesProvider public modulesProvider;
+    ILTV public ltv;
+
+    function run() external {
+        vm.startBroadcast();
+        _deployEnvironment();
+        _deployVault();
+        _openAuction();
+        vm.stopBroadcast();
+
+        console.log("Collateral token: ", address(collateralToken));
+        console.log("Borrow token: ", address(borrowToken));
+        console.log("LTV: ", address(ltv));
+    }
+
+    function _deployEnvironment() internal {
+        (, address deployer,) = vm.readCallers();
+
+        collateralToken = new WETH();
+        collateralToken.initialize(deployer);
+        borrowToken = new WETH();
+        borrowToken.initialize(deployer);
+
+        lending = new DummyLending(deployer);
+        uint256 lendingLiquidity = vm.envOr("LENDING_LIQUIDITY", uint256(1000 * 10 ** 18));
+        borrowToken.deposit{value: lendingLiquidity}();
+        // forge-lint: disable-next-line
+        IERC20(address(borrowToken)).transfer(address(lending), lendingLiquidity);
+
+        oracle = new DummyOracle();
+        oracle.setAssetPrice(address(collateralToken), vm.envOr("COLLATERAL_PRICE", uint256(10 ** 18)));
+        oracle.setAssetPrice(address(borrowToken), vm.envOr("BORROW_PRICE", uint256(10 ** 18)));
+
+        ModulesState memory modulesState = ModulesState({
+            administrationModule: IAdministrationModule(address(new AdministrationModule())),
+            auctionModule: IAuctionModule(address(new AuctionModule())),
+            erc20Module: IERC20Module(address(new ERC20Module())),
+            collateralVaultModule: ICollateralVaultModule(address(new CollateralVaultModule())),
+            borrowVaultModule: IBorrowVaultModule(address(new BorrowVaultModule())),
+            lowLevelRebalanceModule: ILowLevelRebalanceModule(address(new LowLevelRebalanceModule())),
+            initializeModule: IInitializeModule(address(new InitializeModule()))
+        });
+        modulesProvider = new ModulesProvider(modulesState);
+    }
+
+    function _deployVault() internal {
+        (, address deployer,) = vm.readCallers();
+
+        StateInitData memory initData = StateInitData({
+            name: "Keeper Test LTV",
+            symbol: "KLTV",
+            collateralToken: address(collateralToken),
+            borrowToken: address(borrowToken),
+            feeCollector: deployer,
+            maxSafeLtvDividend: 9,
+            maxSafeLtvDivider: 10,
+            minProfitLtvDividend: 5,
+            minProfitLtvDivider: 10,
+            targetLtvDividend: 75,
+            targetLtvDivider: 100,
+            lendingConnector: new DummyLendingConnector(
+                IERC20(address(collateralToken)), IERC20(address(borrowToken)), lending
+            ),
+            oracleConnector: new DummyOracleConnector(oracle),
+            maxGrowthFeeDividend: 1,
+            maxGrowthFeeDivider: 5,
+            maxTotalAssetsInUnderlying: type(uint128).max,
+            slippageConnector: new DummySlippageConnector(),
+            maxDeleverageFeeDividend: 1,
+            maxDeleverageFeeDivider: 50,
+            vaultBalanceAsLendingConnector: new VaultBalanceAsLendingConnector(),
+            owner: deployer,
+            guardian: deployer,
+            governor: deployer,
+            emergencyDeleverager: deployer,
+            // casting to uint24 is safe because auction durations are a few thousand blocks
+            // forge-lint: disable-next-line(unsafe-typecast)
+            auctionDuration: uint24(vm.envOr("AUCTION_DURATION", uint256(1000))),
+            lendingConnectorData: "",
+            oracleConnectorData: "",
+            slippageConnectorData: abi.encode(10 ** 16, 10 ** 16),
+            vaultBalanceAsLendingConnectorData: "",
+            softLiquidationFeeDividend: 1,
+            softLiquidationFeeDivider: 100,
+            softLiquidationLtvDividend: 97,
+            softLiquidationLtvDivider: 100,
+            whitelistRegistry: address(0),
+            isWhitelistActivated: false
+        });
+
+        // The LTV constructor disables initializers, so the vault lives behind a beacon proxy
+        // like production vaults. The proxy admin is not the deployer, otherwise the
+        // transparent proxy would not forward the deployer's calls to the vault.
+        UpgradeableBeacon beacon =
+            new UpgradeableBeacon(address(new KeeperTestLTV(address(modulesProvider))), deployer);
+        ltv = ILTV(
+            address(
+                new TransparentUpgradeableBeaconProxy(
+                    address(beacon),
+                    vm.envOr("PROXY_ADMIN", address(0xdEaD)),
+                    abi.encodeCall(ILTV.initialize, (initData))
+                )
+            )
+        );
+        ltv.setIsProtocolPaused(false);
+    }
+
+    function _openAuction() internal {
+        KeeperTestLTV(address(ltv)).openAuction(
+            vm.envOr("FUTURE_BORROW_ASSETS", int256(10 * 10 ** 18)),
+            vm.envOr("FUTURE_COLLATERAL_ASSETS", int256(10 * 10 ** 18)),
+            vm.envOr("FUTURE_REWARD_ASSETS", int256(-10 ** 17))
+        );
+    }
+}
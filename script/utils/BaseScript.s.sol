@@ -15,6 +15,7 @@ abstract contract BaseScript is Script {
                 return;
             }
 
+            _useExplicitNonceIfSet();
             vm.startBroadcast();
             deploy();
             vm.stopBroadcast();
@@ -25,6 +26,19 @@ abstract contract BaseScript is Script {
 
     function deploy() internal virtual;
 
+    /// @dev Lets deploy.py hand concurrent broadcasts of the same deployer their own nonces
+    function _useExplicitNonceIfSet() internal {
+        uint256 nonce = vm.envOr("DEPLOY_NONCE", type(uint256).max);
+        if (nonce == type(uint256).max) {
+            return;
+        }
+        address deployer = vm.envAddress("DEPLOYER");
+        if (vm.getNonce(deployer) < nonce) {
+            // forge-lint: disable-next-line(unsafe-typecast)
+            vm.setNonce(deployer, uint64(nonce));
+        }
+    }
+
     function hashedCreationCode() internal view virtual returns (bytes32);
 
     function expectedAddress(bytes32 _hashedCreationCode) internal view virtual returns (address) {
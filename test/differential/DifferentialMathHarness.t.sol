@@ -0,0 +1,173 @@
+// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {DepositWithdrawData} from "src/structs/data/vault/common/DepositWithdrawData.sol";
+import {MintRedeemData} from "src/structs/data/vault/common/MintRedeemData.sol";
+import {AuctionData} from "src/structs/data/auction/AuctionData.sol";
+import {LowLevelRebalanceData} from "src/structs/data/low_level/LowLevelRebalanceData.sol";
+import {DeltaFuture} from "src/structs/state_transition/DeltaFuture.sol";
+import {DeltaAuctionState} from "src/structs/state_transition/DeltaAuctionState.sol";
+import {DepositWithdraw} from "src/math/libraries/DepositWithdraw.sol";
+import {MintRedeem} from "src/math/libraries/MintRedeem.sol";
+import {AuctionMath} from "src/math/libraries/AuctionMath.sol";
+import {LowLevelRebalanceMath} from "src/math/libraries/LowLevelRebalanceMath.sol";
+
+/**
+ * @notice Calls the math libraries with inputs and outputs flattened to int256 words
+ * in the order of ltv_offchain/differential/models.py. External so that reverts of the
+ * internal libraries can be caught by the replaying test.
+ */
+contract DifferentialMathHarness {
+    uint8 internal constant DEPOSIT_WITHDRAW = 0;
+    uint8 internal constant MINT_REDEEM = 1;
+    uint8 internal constant AUCTION_COLLATERAL = 2;
+    uint8 internal constant AUCTION_BORROW = 3;
+    uint8 internal constant LOW_LEVEL_SHARES = 4;
+    uint8 internal constant LOW_LEVEL_BORROW = 5;
+    uint8 internal constant LOW_LEVEL_COLLATERAL = 6;
+
+    function calculate(uint8 kind, int256[] calldata inputs) external pure returns (int256[] memory) {
+        if (kind == DEPOSIT_WITHDRAW) {
+            (int256 sharesAsAssets, DeltaFuture memory deltaFuture) =
+                DepositWithdraw.calculateDepositWithdraw(_depositWithdrawData(inputs));
+            return _deltaFutureOutputs(sharesAsAssets, deltaFuture);
+        }
+        if (kind == MINT_REDEEM) {
+            (int256 assets, DeltaFuture memory deltaFuture) = MintRedeem.calculateMintRedeem(_mintRedeemData(inputs));
+            return _deltaFutureOutputs(assets, deltaFuture);
+        }
+        if (kind == AUCTION_COLLATERAL) {
+            return _deltaAuctionStateOutputs(
+                AuctionMath.calculateExecuteAuctionCollateral(inputs[0], _auctionData(inputs))
+            );
+        }
+        if (kind == AUCTION_BORROW) {
+            return _deltaAuctionStateOutputs(
+                AuctionMath.calculateExecuteAuctionBorrow(inputs[0], _auctionData(inputs))
+            );
+        }
+
+        int256[] memory outputs = new int256[](3);
+        if (kind == LOW_LEVEL_SHARES) {
+            (outputs[0], outputs[1], outputs[2]) =
+                LowLevelRebalanceMath.calculateLowLevelRebalanceShares(inputs[0], _lowLevelRebalanceData(inputs));
+        } else if (kind == LOW_LEVEL_BORROW) {
+            (outputs[0], outputs[1], outputs[2]) =
+                LowLevelRebalanceMath.calculateLowLevelRebalanceBorrow(inputs[0], _lowLevelRebalanceData(inputs));
+        } else if (kind == LOW_LEVEL_COLLATERAL) {
+            (outputs[0], outputs[1], outputs[2]) =
+                LowLevelRebalanceMath.calculateLowLevelRebalanceCollateral(inputs[0], _lowLevelRebalanceData(inputs));
+        } else {
+            revert("unknown kind");
+        }
+        return outputs;
+    }
+
+    function _depositWithdrawData(int256[] calldata inputs) private pure returns (DepositWithdrawData memory) {
+        // forge-lint: disable-start(unsafe-typecast)
+        return DepositWithdrawData({
+            collateral: inputs[0],
+            borrow: inputs[1],
+            futureBorrow: inputs[2],
+            futureCollateral: inputs[3],
+            userFutureRewardBorrow: inputs[4],
+            userFutureRewardCollateral: inputs[5],
+            protocolFutureRewardBorrow: inputs[6],
+            protocolFutureRewardCollateral: inputs[7],
+            collateralSlippage: uint256(inputs[8]),
+            borrowSlippage: uint256(inputs[9]),
+            targetLtvDividend: uint16(uint256(inputs[10])),
+            targetLtvDivider: uint16(uint256(inputs[11])),
+            deltaRealCollateral: inputs[12],
+            deltaRealBorrow: inputs[13]
+        });
+        // forge-lint: disable-end(unsafe-typecast)
+    }
+
+    function _mintRedeemData(int256[] calldata inputs) private pure returns (MintRedeemData memory) {
+        // forge-lint: disable-start(unsafe-typecast)
+        return MintRedeemData({
+            collateral: inputs[0],
+            borrow: inputs[1],
+            futureBorrow: inputs[2],
+            futureCollateral: inputs[3],
+            userFutureRewardBorrow: inputs[4],
+            userFutureRewardCollateral: inputs[5],
+            protocolFutureRewardBorrow: inputs[6],
+            protocolFutureRewardCollateral: inputs[7],
+            collateralSlippage: uint256(inputs[8]),
+            borrowSlippage: uint256(inputs[9]),
+            targetLtvDividend: uint16(uint256(inputs[10])),
+            targetLtvDivider: uint16(uint256(inputs[11])),
+            deltaShares: inputs[12],
+            isBorrow: inputs[13] != 0
+        });
+        // forge-lint: disable-end(unsafe-typecast)
+    }
+
+    function _auctionData(int256[] calldata inputs) private pure returns (AuctionData memory) {
+        // forge-lint: disable-start(unsafe-typecast)
+        return AuctionData({
+            futureBorrowAssets: inputs[1],
+            futureCollateralAssets: inputs[2],
+            futureRewardBorrowAssets: inputs[3],
+            futureRewardCollateralAssets: inputs[4],
+            auctionStep: uint24(uint256(inputs[5])),
+            auctionDuration: uint24(uint256(inputs[6]))
+        });
+        // forge-lint: disable-end(unsafe-typecast)
+    }
+
+    function _lowLevelRebalanceData(int256[] calldata inputs) private pure returns (LowLevelRebalanceData memory) {
+        // forge-lint: disable-start(unsafe-typecast)
+        return LowLevelRebalanceData({
+            futureCollateral: inputs[1],
+            futureBorrow: inputs[2],
+            realCollateral: inputs[3],
+            realBorrow: inputs[4],
+            userFutureRewardCollateral: inputs[5],
+            userFutureRewardBorrow: inputs[6],
+            protocolFutureRewardCollateral: inputs[7],
+            protocolFutureRewardBorrow: inputs[8],
+            collateralPrice: uint256(inputs[9]),
+            collateralTokenDecimals: uint8(uint256(inputs[10])),
+            borrowPrice: uint256(inputs[11]),
+            borrowTokenDecimals: uint8(uint256(inputs[12])),
+            supplyAfterFee: uint256(inputs[13]),
+            totalAssets: uint256(inputs[14]),
+            targetLtvDividend: uint16(uint256(inputs[15])),
+            targetLtvDivider: uint16(uint256(inputs[16])),
+            withdrawTotalAssets: uint256(inputs[17])
+        });
+        // forge-lint: disable-end(unsafe-typecast)
+    }
+
+    function _deltaFutureOutputs(int256 value, DeltaFuture memory deltaFuture) private pure returns (int256[] memory) {
+        int256[] memory outputs = new int256[](10);
+        outputs[0] = value;
+        outputs[1] = deltaFuture.deltaFutureCollateral;
+        outputs[2] = deltaFuture.deltaFutureBorrow;
+        outputs[3] = deltaFuture.deltaProtocolFutureRewardCollateral;
+        outputs[4] = deltaFuture.deltaUserFutureRewardCollateral;
+        outputs[5] = deltaFuture.deltaFuturePaymentCollateral;
+        outputs[6] = deltaFuture.deltaProtocolFutureRewardBorrow;
+        outputs[7] = deltaFuture.deltaUserFutureRewardBorrow;
+        outputs[8] = deltaFuture.deltaFuturePaymentBorrow;
+        // forge-lint: disable-next-line(unsafe-typecast)
+        outputs[9] = int256(uint256(deltaFuture.cases.ncase));
+        return outputs;
+    }
+
+    function _deltaAuctionStateOutputs(DeltaAuctionState memory state) private pure returns (int256[] memory) {
+        int256[] memory outputs = new int256[](8);
+        outputs[0] = state.deltaFutureBorrowAssets;
+        outputs[1] = state.deltaFutureCollateralAssets;
+        outputs[2] = state.deltaUserCollateralAssets;
+        outputs[3] = state.deltaUserBorrowAssets;
+        outputs[4] = state.deltaUserFutureRewardCollateralAssets;
+        outputs[5] = state.deltaUserFutureRewardBorrowAssets;
+        outputs[6] = state.deltaProtocolFutureRewardCollateralAssets;
+        outputs[7] = state.deltaProtocolFutureRewardBorrowAssets;
+        return outputs;
+    }
+}
@@ -0,0 +1,116 @@
+// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {Test} from "forge-std/Test.sol";
+import {DifferentialMathHarness} from "test/differential/DifferentialMathHarness.t.sol";
+
+/**
+ * @notice Replays the vector file written by `python -m ltv_offchain.differential`
+ * (format in ltv_offchain/differential/vectors.py) through the math libraries and
+ * fails on every vector where Solidity and the Python model disagree.
+ *
+ * @dev The file is taken from LTV_DIFFERENTIAL_VECTORS, which must be inside
+ * test/differential/vectors for fs_permissions. Without it the test is skipped,
+ * `python -m ltv_offchain.differential --forge` writes the file and sets it.
+ */
+contract DifferentialMathTest is Test {
+    bytes8 internal constant MAGIC = "LTVDIFF1";
+    uint256 internal constant MAX_LOGGED_MISMATCHES = 20;
+
+    DifferentialMathHarness internal harness;
+
+    function setUp() public {
+        harness = new DifferentialMathHarness();
+    }
+
+    function test_replayDifferentialVectors() public {
+        string memory path = vm.envOr("LTV_DIFFERENTIAL_VECTORS", string(""));
+        if (bytes(path).length == 0) {
+            vm.skip(true);
+        }
+
+        bytes memory vectors = vm.readFileBinary(path);
+        require(vectors.length >= 32 && bytes8(bytes32(_word(vectors, 0))) == MAGIC, "not a differential vector file");
+
+        // forge-lint: disable-next-line(unsafe-typecast)
+        uint256 count = uint64(_word(vectors, 0));
+        uint256 offset = 32;
+        uint256 mismatches;
+        for (uint256 i = 0; i < count; ++i) {
+            uint256 header = _word(vectors, offset);
+            // forge-lint: disable-start(unsafe-typecast)
+            uint8 kind = uint8(header >> 248);
+            bool expectRevert = uint8(header >> 240) != 0;
+            uint256 inputCount = uint8(header >> 232);
+            uint256 outputCount = uint8(header >> 224);
+            uint64 vectorId = uint64(header);
+            // forge-lint: disable-end(unsafe-typecast)
+            offset += 32;
+
+            int256[] memory inputs = _words(vectors, offset, inputCount);
+            offset += 32 * inputCount;
+            int256[] memory expected = _words(vectors, offset, outputCount);
+            offset += 32 * outputCount;
+
+            if (!_matches(kind, inputs, expected, expectRevert)) {
+                if (mismatches < MAX_LOGGED_MISMATCHES) {
+                    emit log_named_uint("mismatch, kind", kind);
+                    emit log_named_uint("vector id", vectorId);
+                    emit log_named_array("inputs", inputs);
+                    emit log_named_array("python outputs", expected);
+                }
+                ++mismatches;
+            }
+        }
+        require(offset == vectors.length, "trailing bytes in vector file");
+
+        emit log_named_uint("replayed vectors", count);
+        assertEq(mismatches, 0, "Solidity and Python math disagree");
+    }
+
+    function _matches(uint8 kind, int256[] memory inputs, int256[] memory expected, bool expectRevert)
+        internal
+        returns (bool)
+    {
+        try harness.calculate(kind, inputs) returns (int256[] memory outputs) {
+            if (expectRevert) {
+                emit log_named_array("solidity outputs", outputs);
+                return false;
+            }
+            if (!_equal(outputs, expected)) {
+                emit log_named_array("solidity outputs", outputs);
+                return false;
+            }
+            return true;
+        } catch {
+            return expectRevert;
+        }
+    }
+
+    function _equal(int256[] memory left, int256[] memory right) internal pure returns (bool) {
+        if (left.length != right.length) {
+            return false;
+        }
+        for (uint256 i = 0; i < left.length; ++i) {
+            if (left[i] != right[i]) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    function _word(bytes memory data, uint256 offset) internal pure returns (uint256 value) {
+        require(offset + 32 <= data.length, "truncated vector file");
+        assembly {
+            value := mload(add(add(data, 32), offset))
+        }
+    }
+
+    function _words(bytes memory data, uint256 offset, uint256 count) internal pure returns (int256[] memory words) {
+        words = new int256[](count);
+        for (uint256 i = 0; i < count; ++i) {
+            // forge-lint: disable-next-line(unsafe-typecast)
+            words[i] = int256(_word(data, offset + 32 * i));
+        }
+    }
+}
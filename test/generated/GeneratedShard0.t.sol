@@ -0,0 +1,422 @@
+// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {GeneratedBaseTest} from "test/utils/GeneratedBaseTest.t.sol";
+
+contract GeneratedTestsShard0 is GeneratedBaseTest {
+    function test_borrow_cna_deposit() public initializeGeneratedTest(56000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewDeposit(1000);
+        uint256 deltaShares = dummyLtv.deposit(1000, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 55000);
+        assertEq(dummyLtv.futureBorrowAssets(), 5000);
+        assertEq(dummyLtv.futureCollateralAssets(), 5000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cna_mint() public initializeGeneratedTest(56000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewMint(1000);
+        uint256 deltaBorrow = dummyLtv.mint(1000, address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 55000);
+        assertEq(dummyLtv.futureBorrowAssets(), 5000);
+        assertEq(dummyLtv.futureCollateralAssets(), 5000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cna_withdraw() public initializeGeneratedTest(54000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewWithdraw(1000);
+        uint256 deltaShares = dummyLtv.withdraw(1000, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 55000);
+        assertEq(dummyLtv.futureBorrowAssets(), 5000);
+        assertEq(dummyLtv.futureCollateralAssets(), 5000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cna_redeem() public initializeGeneratedTest(54000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewRedeem(1000);
+        uint256 deltaBorrow = dummyLtv.redeem(1000, address(this), address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 55000);
+        assertEq(dummyLtv.futureBorrowAssets(), 5000);
+        assertEq(dummyLtv.futureCollateralAssets(), 5000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cmbc_deposit() public initializeGeneratedTest(55000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewDeposit(2060);
+        uint256 deltaShares = dummyLtv.deposit(2060, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1980);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 52940);
+        assertEq(dummyLtv.futureBorrowAssets(), 13000);
+        assertEq(dummyLtv.futureCollateralAssets(), 13000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cmbc_mint() public initializeGeneratedTest(55000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewMint(1980);
+        uint256 deltaBorrow = dummyLtv.mint(1980, address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 2060);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 52940);
+        assertEq(dummyLtv.futureBorrowAssets(), 13000);
+        assertEq(dummyLtv.futureCollateralAssets(), 13000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cmbc_withdraw() public initializeGeneratedTest(35000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewWithdraw(9700);
+        uint256 deltaShares = dummyLtv.withdraw(9700, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 10100);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 44700);
+        assertEq(dummyLtv.futureBorrowAssets(), 45000);
+        assertEq(dummyLtv.futureCollateralAssets(), 45000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cmbc_redeem() public initializeGeneratedTest(35000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewRedeem(10100);
+        uint256 deltaBorrow = dummyLtv.redeem(10100, address(this), address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 9700);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 44700);
+        assertEq(dummyLtv.futureBorrowAssets(), 45000);
+        assertEq(dummyLtv.futureCollateralAssets(), 45000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cmcb_deposit() public initializeGeneratedTest(74950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewDeposit(9040);
+        uint256 deltaShares = dummyLtv.deposit(9040, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 9000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 65910);
+        assertEq(dummyLtv.futureBorrowAssets(), -9000);
+        assertEq(dummyLtv.futureCollateralAssets(), -9000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cmcb_mint() public initializeGeneratedTest(74950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewMint(9000);
+        uint256 deltaBorrow = dummyLtv.mint(9000, address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 9040);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 65910);
+        assertEq(dummyLtv.futureBorrowAssets(), -9000);
+        assertEq(dummyLtv.futureCollateralAssets(), -9000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cmcb_withdraw() public initializeGeneratedTest(64950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewWithdraw(960);
+        uint256 deltaShares = dummyLtv.withdraw(960, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 65910);
+        assertEq(dummyLtv.futureBorrowAssets(), -9000);
+        assertEq(dummyLtv.futureCollateralAssets(), -9000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cmcb_redeem() public initializeGeneratedTest(64950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewRedeem(1000);
+        uint256 deltaBorrow = dummyLtv.redeem(1000, address(this), address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 960);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 65910);
+        assertEq(dummyLtv.futureBorrowAssets(), -9000);
+        assertEq(dummyLtv.futureCollateralAssets(), -9000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cebc_deposit() public initializeGeneratedTest(64950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewDeposit(960);
+        uint256 deltaShares = dummyLtv.deposit(960, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 976);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 63990);
+        assertEq(dummyLtv.futureBorrowAssets(), -1000);
+        assertEq(dummyLtv.futureCollateralAssets(), -1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cebc_mint() public initializeGeneratedTest(64950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewMint(976);
+        uint256 deltaBorrow = dummyLtv.mint(976, address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 960);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 63990);
+        assertEq(dummyLtv.futureBorrowAssets(), -1000);
+        assertEq(dummyLtv.futureCollateralAssets(), -1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cebc_withdraw() public initializeGeneratedTest(54950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewWithdraw(9040);
+        uint256 deltaShares = dummyLtv.withdraw(9040, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 9024);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 63990);
+        assertEq(dummyLtv.futureBorrowAssets(), -1000);
+        assertEq(dummyLtv.futureCollateralAssets(), -1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cebc_redeem() public initializeGeneratedTest(54950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewRedeem(9024);
+        uint256 deltaBorrow = dummyLtv.redeem(9024, address(this), address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 9040);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 63990);
+        assertEq(dummyLtv.futureBorrowAssets(), -1000);
+        assertEq(dummyLtv.futureCollateralAssets(), -1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+}
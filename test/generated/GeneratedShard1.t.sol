@@ -0,0 +1,422 @@
+// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {GeneratedBaseTest} from "test/utils/GeneratedBaseTest.t.sol";
+
+contract GeneratedTestsShard1 is GeneratedBaseTest {
+    function test_borrow_cecb_deposit() public initializeGeneratedTest(65000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewDeposit(8970);
+        uint256 deltaShares = dummyLtv.deposit(8970, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 8986);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56030);
+        assertEq(dummyLtv.futureBorrowAssets(), 1000);
+        assertEq(dummyLtv.futureCollateralAssets(), 1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cecb_mint() public initializeGeneratedTest(65000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewMint(8986);
+        uint256 deltaBorrow = dummyLtv.mint(8986, address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 8970);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56030);
+        assertEq(dummyLtv.futureBorrowAssets(), 1000);
+        assertEq(dummyLtv.futureCollateralAssets(), 1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cecb_withdraw() public initializeGeneratedTest(55000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewWithdraw(1030);
+        uint256 deltaShares = dummyLtv.withdraw(1030, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1014);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56030);
+        assertEq(dummyLtv.futureBorrowAssets(), 1000);
+        assertEq(dummyLtv.futureCollateralAssets(), 1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cecb_redeem() public initializeGeneratedTest(55000, 75050, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewRedeem(1014);
+        uint256 deltaBorrow = dummyLtv.redeem(1014, address(this), address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 1030);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56030);
+        assertEq(dummyLtv.futureBorrowAssets(), 1000);
+        assertEq(dummyLtv.futureCollateralAssets(), 1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_ceccb_deposit() public initializeGeneratedTest(66000, 76040, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewDeposit(8010);
+        uint256 deltaShares = dummyLtv.deposit(8010, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 7986);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 57990);
+        assertEq(dummyLtv.futureBorrowAssets(), -4000);
+        assertEq(dummyLtv.futureCollateralAssets(), -4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_ceccb_mint() public initializeGeneratedTest(66000, 76040, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewMint(7986);
+        uint256 deltaBorrow = dummyLtv.mint(7986, address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 8010);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 57990);
+        assertEq(dummyLtv.futureBorrowAssets(), -4000);
+        assertEq(dummyLtv.futureCollateralAssets(), -4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_ceccb_withdraw() public initializeGeneratedTest(56000, 76040, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewWithdraw(1990);
+        uint256 deltaShares = dummyLtv.withdraw(1990, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 2014);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 57990);
+        assertEq(dummyLtv.futureBorrowAssets(), -4000);
+        assertEq(dummyLtv.futureCollateralAssets(), -4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_ceccb_redeem() public initializeGeneratedTest(56000, 76040, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewRedeem(2014);
+        uint256 deltaBorrow = dummyLtv.redeem(2014, address(this), address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 1990);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 57990);
+        assertEq(dummyLtv.futureBorrowAssets(), -4000);
+        assertEq(dummyLtv.futureCollateralAssets(), -4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cecbc_deposit() public initializeGeneratedTest(64950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewDeposit(2230);
+        uint256 deltaShares = dummyLtv.deposit(2230, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 2210);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 62720);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cecbc_mint() public initializeGeneratedTest(64950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewMint(2210);
+        uint256 deltaBorrow = dummyLtv.mint(2210, address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 2230);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 62720);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cecbc_withdraw() public initializeGeneratedTest(54950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewWithdraw(7770);
+        uint256 deltaShares = dummyLtv.withdraw(7770, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 7790);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 62720);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_borrow_cecbc_redeem() public initializeGeneratedTest(54950, 85000, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewRedeem(7790);
+        uint256 deltaBorrow = dummyLtv.redeem(7790, address(this), address(this));
+
+        assertEq(deltaBorrow, preview);
+        assertEq(deltaBorrow, 7770);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 62720);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cna_deposit() public initializeGeneratedTest(56000, 75040, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewDepositCollateral(1000);
+        uint256 deltaShares = dummyLtv.depositCollateral(1000, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56000);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cna_mint() public initializeGeneratedTest(56000, 75040, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewMintCollateral(1000);
+        uint256 deltaCollateral = dummyLtv.mintCollateral(1000, address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56000);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cna_withdraw() public initializeGeneratedTest(56000, 77040, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewWithdrawCollateral(1000);
+        uint256 deltaShares = dummyLtv.withdrawCollateral(1000, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56000);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cna_redeem() public initializeGeneratedTest(56000, 77040, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewRedeemCollateral(1000);
+        uint256 deltaCollateral = dummyLtv.redeemCollateral(1000, address(this), address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56000);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+}
@@ -0,0 +1,422 @@
+// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {GeneratedBaseTest} from "test/utils/GeneratedBaseTest.t.sol";
+
+contract GeneratedTestsShard2 is GeneratedBaseTest {
+    function test_collateral_cmbc_deposit() public initializeGeneratedTest(52940, 72990, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewDepositCollateral(2060);
+        uint256 deltaShares = dummyLtv.depositCollateral(2060, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1980);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 52940);
+        assertEq(dummyLtv.futureBorrowAssets(), 13000);
+        assertEq(dummyLtv.futureCollateralAssets(), 13000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cmbc_mint() public initializeGeneratedTest(52940, 72990, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewMintCollateral(1980);
+        uint256 deltaCollateral = dummyLtv.mintCollateral(1980, address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 2060);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 52940);
+        assertEq(dummyLtv.futureBorrowAssets(), 13000);
+        assertEq(dummyLtv.futureCollateralAssets(), 13000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cmbc_withdraw() public initializeGeneratedTest(44700, 84750, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewWithdrawCollateral(9700);
+        uint256 deltaShares = dummyLtv.withdrawCollateral(9700, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 10100);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 44700);
+        assertEq(dummyLtv.futureBorrowAssets(), 45000);
+        assertEq(dummyLtv.futureCollateralAssets(), 45000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cmbc_redeem() public initializeGeneratedTest(44700, 84750, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewRedeemCollateral(10100);
+        uint256 deltaCollateral = dummyLtv.redeemCollateral(10100, address(this), address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 9700);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 44700);
+        assertEq(dummyLtv.futureBorrowAssets(), 45000);
+        assertEq(dummyLtv.futureCollateralAssets(), 45000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cmcb_deposit() public initializeGeneratedTest(65910, 75960, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewDepositCollateral(9040);
+        uint256 deltaShares = dummyLtv.depositCollateral(9040, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 9000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 65910);
+        assertEq(dummyLtv.futureBorrowAssets(), -9000);
+        assertEq(dummyLtv.futureCollateralAssets(), -9000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cmcb_mint() public initializeGeneratedTest(65910, 75960, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewMintCollateral(9000);
+        uint256 deltaCollateral = dummyLtv.mintCollateral(9000, address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 9040);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 65910);
+        assertEq(dummyLtv.futureBorrowAssets(), -9000);
+        assertEq(dummyLtv.futureCollateralAssets(), -9000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cmcb_withdraw() public initializeGeneratedTest(65910, 85960, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewWithdrawCollateral(960);
+        uint256 deltaShares = dummyLtv.withdrawCollateral(960, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1000);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 65910);
+        assertEq(dummyLtv.futureBorrowAssets(), -9000);
+        assertEq(dummyLtv.futureCollateralAssets(), -9000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cmcb_redeem() public initializeGeneratedTest(65910, 85960, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewRedeemCollateral(1000);
+        uint256 deltaCollateral = dummyLtv.redeemCollateral(1000, address(this), address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 960);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 65910);
+        assertEq(dummyLtv.futureBorrowAssets(), -9000);
+        assertEq(dummyLtv.futureCollateralAssets(), -9000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cebc_deposit() public initializeGeneratedTest(63990, 84040, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewDepositCollateral(960);
+        uint256 deltaShares = dummyLtv.depositCollateral(960, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 976);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 63990);
+        assertEq(dummyLtv.futureBorrowAssets(), -1000);
+        assertEq(dummyLtv.futureCollateralAssets(), -1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cebc_mint() public initializeGeneratedTest(63990, 84040, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewMintCollateral(976);
+        uint256 deltaCollateral = dummyLtv.mintCollateral(976, address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 960);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 63990);
+        assertEq(dummyLtv.futureBorrowAssets(), -1000);
+        assertEq(dummyLtv.futureCollateralAssets(), -1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cebc_withdraw() public initializeGeneratedTest(63990, 94040, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewWithdrawCollateral(9040);
+        uint256 deltaShares = dummyLtv.withdrawCollateral(9040, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 9024);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 63990);
+        assertEq(dummyLtv.futureBorrowAssets(), -1000);
+        assertEq(dummyLtv.futureCollateralAssets(), -1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cebc_redeem() public initializeGeneratedTest(63990, 94040, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewRedeemCollateral(9024);
+        uint256 deltaCollateral = dummyLtv.redeemCollateral(9024, address(this), address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 9040);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 63990);
+        assertEq(dummyLtv.futureBorrowAssets(), -1000);
+        assertEq(dummyLtv.futureCollateralAssets(), -1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cecb_deposit() public initializeGeneratedTest(56030, 66080, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewDepositCollateral(8970);
+        uint256 deltaShares = dummyLtv.depositCollateral(8970, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 8986);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56030);
+        assertEq(dummyLtv.futureBorrowAssets(), 1000);
+        assertEq(dummyLtv.futureCollateralAssets(), 1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cecb_mint() public initializeGeneratedTest(56030, 66080, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewMintCollateral(8986);
+        uint256 deltaCollateral = dummyLtv.mintCollateral(8986, address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 8970);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56030);
+        assertEq(dummyLtv.futureBorrowAssets(), 1000);
+        assertEq(dummyLtv.futureCollateralAssets(), 1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cecb_withdraw() public initializeGeneratedTest(56030, 76080, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewWithdrawCollateral(1030);
+        uint256 deltaShares = dummyLtv.withdrawCollateral(1030, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 1014);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56030);
+        assertEq(dummyLtv.futureBorrowAssets(), 1000);
+        assertEq(dummyLtv.futureCollateralAssets(), 1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cecb_redeem() public initializeGeneratedTest(56030, 76080, 5000, 5000, -50, 600) {
+        uint256 preview = dummyLtv.previewRedeemCollateral(1014);
+        uint256 deltaCollateral = dummyLtv.redeemCollateral(1014, address(this), address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 1030);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 75050);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 56030);
+        assertEq(dummyLtv.futureBorrowAssets(), 1000);
+        assertEq(dummyLtv.futureCollateralAssets(), 1000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+}
@@ -0,0 +1,214 @@
+// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {GeneratedBaseTest} from "test/utils/GeneratedBaseTest.t.sol";
+
+contract GeneratedTestsShard3 is GeneratedBaseTest {
+    function test_collateral_ceccb_deposit() public initializeGeneratedTest(57990, 68030, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewDepositCollateral(8010);
+        uint256 deltaShares = dummyLtv.depositCollateral(8010, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 7986);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 57990);
+        assertEq(dummyLtv.futureBorrowAssets(), -4000);
+        assertEq(dummyLtv.futureCollateralAssets(), -4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_ceccb_mint() public initializeGeneratedTest(57990, 68030, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewMintCollateral(7986);
+        uint256 deltaCollateral = dummyLtv.mintCollateral(7986, address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 8010);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 57990);
+        assertEq(dummyLtv.futureBorrowAssets(), -4000);
+        assertEq(dummyLtv.futureCollateralAssets(), -4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_ceccb_withdraw() public initializeGeneratedTest(57990, 78030, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewWithdrawCollateral(1990);
+        uint256 deltaShares = dummyLtv.withdrawCollateral(1990, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 2014);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 57990);
+        assertEq(dummyLtv.futureBorrowAssets(), -4000);
+        assertEq(dummyLtv.futureCollateralAssets(), -4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_ceccb_redeem() public initializeGeneratedTest(57990, 78030, 4000, 4000, -40, 600) {
+        uint256 preview = dummyLtv.previewRedeemCollateral(2014);
+        uint256 deltaCollateral = dummyLtv.redeemCollateral(2014, address(this), address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 1990);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 76040);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 57990);
+        assertEq(dummyLtv.futureBorrowAssets(), -4000);
+        assertEq(dummyLtv.futureCollateralAssets(), -4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cecbc_deposit() public initializeGeneratedTest(62720, 82770, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewDepositCollateral(2230);
+        uint256 deltaShares = dummyLtv.depositCollateral(2230, address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 2210);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 62720);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cecbc_mint() public initializeGeneratedTest(62720, 82770, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewMintCollateral(2210);
+        uint256 deltaCollateral = dummyLtv.mintCollateral(2210, address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 2230);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 62720);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cecbc_withdraw() public initializeGeneratedTest(62720, 92770, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewWithdrawCollateral(7770);
+        uint256 deltaShares = dummyLtv.withdrawCollateral(7770, address(this), address(this));
+
+        assertEq(deltaShares, preview);
+        assertEq(deltaShares, 7790);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 62720);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+
+    function test_collateral_cecbc_redeem() public initializeGeneratedTest(62720, 92770, -5000, -5000, 50, 600) {
+        uint256 preview = dummyLtv.previewRedeemCollateral(7790);
+        uint256 deltaCollateral = dummyLtv.redeemCollateral(7790, address(this), address(this));
+
+        assertEq(deltaCollateral, preview);
+        assertEq(deltaCollateral, 7770);
+        assertEq(lendingProtocol.supplyBalance(address(collateralToken)), 85000);
+        assertEq(lendingProtocol.borrowBalance(address(borrowToken)), 62720);
+        assertEq(dummyLtv.futureBorrowAssets(), 4000);
+        assertEq(dummyLtv.futureCollateralAssets(), 4000);
+        assertEq(dummyLtv.convertToShares(10 ** 18), 10 ** 18);
+        assertApproxEqAbs(
+            (
+                dummyLtv.futureBorrowAssets() + dummyLtv.futureRewardBorrowAssets()
+                    + int256(dummyLtv.getRealBorrowAssets(true))
+            ) * 4
+                - 3
+                    * (
+                        dummyLtv.futureCollateralAssets() + dummyLtv.futureRewardCollateralAssets()
+                            + int256(dummyLtv.getRealCollateralAssets(true))
+                    ),
+            0,
+            3
+        );
+    }
+}
@@ -126,6 +126,25 @@ abstract contract BaseInvariantTest is BaseTest {
         assertTrue(BaseInvariantWrapper(wrapper()).maxGrowthFeeReceived());
     }
 
+    /**
+     * @dev Replays one call of a failing invariant sequence on the wrapper, used by
+     * the regression tests of test/invariant/findings
+     *
+     * Reverts with the revert data of the wrapper call, so invariant violations
+     * detected inside the wrapper fail the regression test the same way they failed the run.
+     * @param sender Address the fuzzer called the wrapper from
+     * @param data Calldata of the wrapper call
+     */
+    function replay(address sender, bytes memory data) internal {
+        vm.prank(sender);
+        (bool success, bytes memory result) = wrapper().call(data);
+        if (!success) {
+            assembly ("memory-safe") {
+                revert(add(result, 32), mload(result))
+            }
+        }
+    }
+
     /**
      * @dev Abstract function to return the wrapper contract address
      * @return Address of the invariant wrapper contract
@@ -0,0 +1,9 @@
+"""Makes deploy_utils and ltv_offchain importable when pytest runs from any directory"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
@@ -0,0 +1,75 @@
+import pytest
+
+from deploy_utils.abi import decode, encode, encode_call
+
+
+def _words(*words):
+    return bytes.fromhex("".join(words))
+
+
+def test_encode_static_words():
+    assert encode(
+        ["uint256", "int256", "bool", "address"],
+        [1, -1, True, "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed"],
+    ) == _words(
+        "0000000000000000000000000000000000000000000000000000000000000001",
+        "ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff",
+        "0000000000000000000000000000000000000000000000000000000000000001",
+        "0000000000000000000000005aaeb6053f3e94c9b9a09f33669435e7ef1beaed",
+    )
+
+
+def test_encode_call_solidity_docs_dynamic_example():
+    # f(uint256,uint32[],bytes10,bytes) of the Solidity ABI specification
+    assert encode_call(
+        "f(uint256,uint32[],bytes10,bytes)",
+        [0x123, [0x456, 0x789], b"1234567890", b"Hello, world!"],
+    ) == bytes.fromhex("8be65246") + _words(
+        "0000000000000000000000000000000000000000000000000000000000000123",
+        "0000000000000000000000000000000000000000000000000000000000000080",
+        "3132333435363738393000000000000000000000000000000000000000000000",
+        "00000000000000000000000000000000000000000000000000000000000000e0",
+        "0000000000000000000000000000000000000000000000000000000000000002",
+        "0000000000000000000000000000000000000000000000000000000000000456",
+        "0000000000000000000000000000000000000000000000000000000000000789",
+        "000000000000000000000000000000000000000000000000000000000000000d",
+        "48656c6c6f2c20776f726c642100000000000000000000000000000000000000",
+    )
+
+
+def test_encode_call_solidity_docs_sam_example():
+    assert encode_call(
+        "sam(bytes,bool,uint256[])", [b"dave", True, [1, 2, 3]]
+    ) == bytes.fromhex("a5643bf2") + _words(
+        "0000000000000000000000000000000000000000000000000000000000000060",
+        "0000000000000000000000000000000000000000000000000000000000000001",
+        "00000000000000000000000000000000000000000000000000000000000000a0",
+        "0000000000000000000000000000000000000000000000000000000000000004",
+        "6461766500000000000000000000000000000000000000000000000000000000",
+        "0000000000000000000000000000000000000000000000000000000000000003",
+        "0000000000000000000000000000000000000000000000000000000000000001",
+        "0000000000000000000000000000000000000000000000000000000000000002",
+        "0000000000000000000000000000000000000000000000000000000000000003",
+    )
+
+
+def test_encode_tuple_with_dynamic_fields():
+    # a dynamic tuple is encoded as an offset to its own head and tail
+    assert encode(["(string,uint16)"], [("ab", 7)]) == _words(
+        "0000000000000000000000000000000000000000000000000000000000000020",
+        "0000000000000000000000000000000000000000000000000000000000000040",
+        "0000000000000000000000000000000000000000000000000000000000000007",
+        "0000000000000000000000000000000000000000000000000000000000000002",
+        "6162000000000000000000000000000000000000000000000000000000000000",
+    )
+
+
+def test_encode_rejects_value_count_mismatch():
+    with pytest.raises(ValueError):
+        encode(["uint256", "uint256"], [1])
+
+
+def test_decode_round_trip():
+    types = ["uint256", "int256", "bool", "bytes", "string"]
+    values = [2**200, -5, True, b"\x01\x02", "ltv"]
+    assert list(decode(types, encode(types, values))) == values
@@ -0,0 +1,53 @@
+import json
+
+from deploy_utils.batch import (
+    get_receipt_libraries,
+    get_receipt_transactions_by_address,
+)
+
+BATCH_LIBRARIES = [
+    "src/math/libraries/DepositWithdraw.sol:DepositWithdraw:0x00000000000000000000000000000000000000A1",
+    "src/math/libraries/MintRedeem.sol:MintRedeem:0x00000000000000000000000000000000000000a2",
+    "src/math/libraries/NextStep.sol:NextStep:0x00000000000000000000000000000000000000A3",
+]
+
+
+def test_receipt_libraries_without_link_references_keeps_all():
+    assert get_receipt_libraries(BATCH_LIBRARIES) == {
+        "DepositWithdraw": "0x00000000000000000000000000000000000000A1",
+        "MintRedeem": "0x00000000000000000000000000000000000000a2",
+        "NextStep": "0x00000000000000000000000000000000000000A3",
+    }
+
+
+def test_receipt_libraries_keeps_only_linked_ones():
+    linked = [
+        "0x00000000000000000000000000000000000000a1",
+        "0x00000000000000000000000000000000000000A2",
+    ]
+    assert get_receipt_libraries(BATCH_LIBRARIES, linked) == {
+        "DepositWithdraw": "0x00000000000000000000000000000000000000A1",
+        "MintRedeem": "0x00000000000000000000000000000000000000a2",
+    }
+    assert get_receipt_libraries(BATCH_LIBRARIES, []) == {}
+
+
+def test_receipt_transactions_by_address(tmp_path):
+    receipt_file = tmp_path / "run-latest.json"
+    receipt_file.write_text(
+        json.dumps(
+            {
+                "transactions": [
+                    {
+                        "hash": "0x01",
+                        "contractAddress": "0x00000000000000000000000000000000000000AB",
+                    },
+                    {"hash": "0x02", "contractAddress": None},
+                ],
+                "libraries": [],
+            }
+        )
+    )
+    transactions = get_receipt_transactions_by_address(str(receipt_file))
+    assert list(transactions) == ["0x00000000000000000000000000000000000000ab"]
+    assert transactions["0x00000000000000000000000000000000000000ab"]["hash"] == "0x01"
@@ -0,0 +1,125 @@
+import json
+import os
+
+import pytest
+
+from deploy_utils.create2 import (
+    Create2AddressEngine,
+    are_artifacts_up_to_date,
+    compute_create2_address,
+)
+from deploy_utils.keccak import keccak256
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def _salt(value):
+    return bytes.fromhex(value.rjust(64, "0"))
+
+
+# examples of EIP-1014
+@pytest.mark.parametrize(
+    "deployer, salt, init_code, address",
+    [
+        (ZERO_ADDRESS, "00", "00", "0x4D1A2e2bB4F88F0250f26Ffff098B0b30B26BF38"),
+        (
+            "0xdeadbeef00000000000000000000000000000000",
+            "00",
+            "00",
+            "0xB928f69Bb1D91Cd65274e3c79d8986362984fDA3",
+        ),
+        (
+            "0xdeadbeef00000000000000000000000000000000",
+            "feed000000000000000000000000000000000000",
+            "00",
+            "0xD04116cDd17beBE565EB2422F2497E06cC1C9833",
+        ),
+        (ZERO_ADDRESS, "00", "deadbeef", "0x70f2b2914A2a4b783FaEFb75f459A580616Fcb5e"),
+        (
+            "0x00000000000000000000000000000000deadbeef",
+            "cafebabe",
+            "deadbeef" * 11,
+            "0x1d8bfDC5D46DC4f61D6b6115972536eBE6A8854C",
+        ),
+        (ZERO_ADDRESS, "00", "", "0xE33C0C7F7df4809055C3ebA6c09CFe4BaF1BD9e0"),
+    ],
+)
+def test_compute_create2_address_eip1014_examples(deployer, salt, init_code, address):
+    init_code_hash = keccak256(bytes.fromhex(init_code))
+    assert compute_create2_address(init_code_hash, _salt(salt), deployer) == address
+
+
+LIBRARY_CODE = "6001600055"
+PLACEHOLDER = "__$" + "0" * 34 + "$__"
+
+
+def _write_artifact(out_dir, file_name, contract_name, bytecode, link_references):
+    os.makedirs(os.path.join(out_dir, file_name), exist_ok=True)
+    with open(os.path.join(out_dir, file_name, f"{contract_name}.json"), "w") as f:
+        json.dump(
+            {
+                "bytecode": {
+                    "object": "0x" + bytecode,
+                    "linkReferences": link_references,
+                }
+            },
+            f,
+        )
+
+
+@pytest.fixture
+def engine(tmp_path):
+    out_dir = str(tmp_path / "out")
+    _write_artifact(out_dir, "Library.sol", "Library", LIBRARY_CODE, {})
+    # ERC20Module links Library right after its first PUSH20 opcode
+    _write_artifact(
+        out_dir,
+        "ERC20Module.sol",
+        "ERC20Module",
+        "73" + PLACEHOLDER + "00",
+        {"src/Library.sol": {"Library": [{"start": 1, "length": 20}]}},
+    )
+    return Create2AddressEngine(
+        out_dir=out_dir, cache_file=str(tmp_path / "cache.json")
+    )
+
+
+def test_library_is_linked_at_its_create2_address(engine):
+    library = compute_create2_address(keccak256(bytes.fromhex(LIBRARY_CODE)))
+    creation_code = engine.get_linked_creation_code(
+        "src/elements/modules/ERC20Module.sol", "ERC20Module"
+    )
+    assert creation_code == bytes.fromhex("73" + library[2:].lower() + "00")
+    assert engine.get_linked_libraries(
+        "src/elements/modules/ERC20Module.sol", "ERC20Module"
+    ) == {"src/Library.sol:Library": library}
+    assert engine.expected_address("ERC20_MODULE", "aave", 1, {}) == (
+        compute_create2_address(keccak256(creation_code))
+    )
+
+
+def test_cached_hashes_survive_a_new_engine(engine):
+    address = engine.expected_address("ERC20_MODULE", "aave", 1, {})
+    engine.save_cache()
+    reloaded = Create2AddressEngine(engine.out_dir, engine.cache_file)
+    assert reloaded.expected_address("ERC20_MODULE", "aave", 1, {}) == address
+
+
+def test_artifacts_up_to_date_only_after_every_source_change(tmp_path):
+    out_dir = tmp_path / "out"
+    source_dir = tmp_path / "src"
+    out_dir.mkdir()
+    source_dir.mkdir()
+    assert not are_artifacts_up_to_date(str(out_dir), [str(source_dir)])
+
+    (source_dir / "A.sol").write_text("")
+    (out_dir / "A.json").write_text("")
+    os.utime(source_dir / "A.sol", ns=(1, 1_000))
+    os.utime(out_dir / "A.json", ns=(1, 2_000))
+    assert are_artifacts_up_to_date(
+        str(out_dir), [str(source_dir), str(tmp_path / "missing")]
+    )
+
+    (source_dir / "B.sol").write_text("")
+    os.utime(source_dir / "B.sol", ns=(1, 3_000))
+    assert not are_artifacts_up_to_date(str(out_dir), [str(source_dir)])
@@ -0,0 +1,51 @@
+import json
+
+from deploy_utils.journal import DeploymentJournal
+
+
+def get_journal(tmp_path):
+    return DeploymentJournal(str(tmp_path / "journal.jsonl"))
+
+
+def test_append_and_get_contracts(tmp_path):
+    journal = get_journal(tmp_path)
+    journal.append({"step": "A", "address": "0x1"})
+    journal.append({"step": "B", "address": "0x2", "libraries": {"L": "0x3"}})
+    assert journal.get_contracts() == {"A": "0x1", "B": "0x2", "L": "0x3"}
+
+
+def test_append_after_torn_line(tmp_path):
+    journal = get_journal(tmp_path)
+    journal.append({"step": "A", "address": "0x1"})
+    with open(journal.journal_path, "a") as f:
+        f.write('{"step": "B", "addr')
+    journal.append({"step": "C", "address": "0x3"})
+
+    assert journal.get_contracts() == {"A": "0x1", "C": "0x3"}
+    with open(journal.journal_path, "r") as f:
+        assert [json.loads(line)["step"] for line in f] == ["A", "C"]
+
+
+def test_append_after_torn_first_line(tmp_path):
+    journal = get_journal(tmp_path)
+    with open(journal.journal_path, "w") as f:
+        f.write('{"step": "A", "addr')
+    journal.append({"step": "B", "address": "0x2"})
+    assert journal.get_contracts() == {"B": "0x2"}
+
+
+def test_import_existing_only_seeds_empty_journal(tmp_path):
+    journal = get_journal(tmp_path)
+    journal.import_existing({"A": "0x1"})
+    journal.import_existing({"A": "0x2"})
+    journal.append({"step": "B", "address": "0x3"})
+    assert journal.get_contracts() == {"A": "0x1", "B": "0x3"}
+
+
+def test_append_after_torn_line_longer_than_scan_block(tmp_path):
+    journal = get_journal(tmp_path)
+    journal.append({"step": "A", "address": "0x1"})
+    with open(journal.journal_path, "a") as f:
+        f.write('{"step": "B", "libraries": "' + "0" * 10000)
+    journal.append({"step": "C", "address": "0x3"})
+    assert journal.get_contracts() == {"A": "0x1", "C": "0x3"}
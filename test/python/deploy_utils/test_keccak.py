@@ -0,0 +1,53 @@
+import pytest
+
+from deploy_utils.keccak import (
+    _keccak256_pure,
+    function_selector,
+    keccak256,
+    to_checksum_address,
+)
+
+VECTORS = [
+    (b"", "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"),
+    (b"abc", "4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45"),
+    (
+        b"The quick brown fox jumps over the lazy dog",
+        "4d741b6f1eb29cb2a9b9911c82f56fa8d73b04959d3d9d222895df6c0b28aa15",
+    ),
+]
+
+
+@pytest.mark.parametrize("data, digest", VECTORS)
+def test_keccak256_known_digests(data, digest):
+    assert keccak256(data).hex() == digest
+    assert _keccak256_pure(data).hex() == digest
+
+
+# lengths around the 136 byte rate, where the padding changes
+@pytest.mark.parametrize("length", [0, 1, 135, 136, 137, 272, 1000])
+def test_pure_keccak256_matches_backend(length):
+    data = bytes(range(256)) * 4
+    assert _keccak256_pure(data[:length]) == keccak256(data[:length])
+
+
+def test_keccak256_hashes_strings_as_utf8():
+    assert keccak256("abc") == keccak256(b"abc")
+
+
+def test_function_selector():
+    assert function_selector("transfer(address,uint256)").hex() == "a9059cbb"
+    assert function_selector("owner()").hex() == "8da5cb5b"
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+        "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359",
+        "0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB",
+        "0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb",
+    ],
+)
+def test_to_checksum_address_eip55_examples(address):
+    assert to_checksum_address(address.lower()) == address
+    assert to_checksum_address(address[2:].upper()) == address
@@ -0,0 +1,46 @@
+from deploy_utils.probe import DeploymentStatus, find_drift
+
+A = "0x00000000000000000000000000000000000000aa"
+B = "0x00000000000000000000000000000000000000bb"
+LIBRARY = "0x00000000000000000000000000000000000000cc"
+
+
+class FakeClient:
+    def __init__(self, codes):
+        self.codes = codes
+        self.batches = []
+
+    def batch(self, calls):
+        self.batches.append([params[0] for _, params in calls])
+        return [self.codes.get(params[0], "0x") for _, params in calls]
+
+
+def test_probe_is_one_batch_and_is_reused():
+    client = FakeClient({A: "0x60"})
+    status = DeploymentStatus(client)
+    assert status.probe([A, "0x" + B[2:].upper(), A]) == {A: True, B: False}
+    assert status.is_deployed(A)
+    assert not status.is_deployed(B)
+    assert client.batches == [[A, B]]
+
+
+def test_missing_code_is_probed_again_after_a_deployment():
+    client = FakeClient({})
+    status = DeploymentStatus(client)
+    status.probe([A, LIBRARY])
+    # the broadcast of A also deployed its library
+    client.codes = {A: "0x60", LIBRARY: "0x60"}
+    status.mark_deployed(A)
+
+    assert status.is_deployed(A)
+    assert status.is_deployed(LIBRARY)
+    assert client.batches == [[A, LIBRARY], [LIBRARY]]
+
+
+def test_find_drift():
+    status = DeploymentStatus(FakeClient({A: "0x60"}))
+    assert find_drift({"X": A, "Y": B, "Z": A}, {"Y": B, "Z": B}, status) == [
+        ("X", "deployed on chain but not recorded"),
+        ("Y", "recorded but has no code on chain"),
+        ("Z", f"recorded at {B}, expected {A}"),
+    ]
@@ -0,0 +1,163 @@
+import threading
+import time
+
+import pytest
+
+from deploy_utils.rpc import RpcError
+from deploy_utils.scheduler import (
+    DeploymentScheduler,
+    NonceManager,
+    StepFailedError,
+    topological_order,
+)
+
+
+class FakeChain:
+    """Mines transactions of one account in nonce order, keeping later ones queued"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.mined = []
+        self.queued = {}
+
+    def send(self, nonce, label):
+        with self.lock:
+            self.queued[nonce] = label
+            while len(self.mined) in self.queued:
+                self.mined.append(self.queued.pop(len(self.mined)))
+
+    def wait_mined(self, nonce, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self.get_mined_nonce() <= nonce:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"nonce {nonce} not mined")
+            time.sleep(0.01)
+
+    def get_mined_nonce(self):
+        with self.lock:
+            return len(self.mined)
+
+    def get_pending_nonce(self):
+        with self.lock:
+            return len(self.mined) + len(self.queued)
+
+    def get_nonce_manager(self, cancelled):
+        def cancel(nonce):
+            cancelled.append(nonce)
+            self.send(nonce, "cancel")
+
+        return NonceManager(
+            self.get_pending_nonce,
+            get_mined_nonce=self.get_mined_nonce,
+            cancel_nonce=cancel,
+            settle_timeout=5,
+            poll_interval=0.01,
+        )
+
+
+GRAPH = {"a": [], "b": [], "c": [], "d": [], "top": ["a", "b", "c", "d"]}
+
+
+def test_topological_order_detects_cycles():
+    assert topological_order({"a": ["b"], "b": []}) == ["b", "a"]
+    with pytest.raises(ValueError):
+        topological_order({"a": ["b"], "b": ["a"]})
+
+
+def test_concurrent_steps_get_consecutive_nonces():
+    chain = FakeChain()
+    nonces = {}
+
+    def run_step(step, nonce):
+        nonces[step] = nonce
+        if nonce is None:
+            nonce = chain.get_pending_nonce()
+        chain.send(nonce, step)
+        chain.wait_mined(nonce)
+
+    completed = DeploymentScheduler(
+        GRAPH, run_step, chain.get_nonce_manager([]), max_workers=4
+    ).run()
+    assert completed == set(GRAPH)
+    assert sorted(nonces[step] for step in "abcd") == [0, 1, 2, 3]
+    assert chain.mined[-1] == "top"
+
+
+@pytest.mark.parametrize(
+    "error",
+    [SystemExit(1), RpcError("connection reset"), OSError(5, "EIO"), KeyError("hash")],
+    ids=lambda error: type(error).__name__,
+)
+def test_failed_step_nonce_is_filled_and_retried_serially(error):
+    chain = FakeChain()
+    started = threading.Barrier(4)
+    failures = []
+
+    def run_step(step, nonce):
+        if nonce is not None:
+            started.wait(timeout=5)
+        if step == "a" and not failures:
+            failures.append(nonce)
+            raise error
+        if nonce is None:
+            nonce = chain.get_pending_nonce()
+        chain.send(nonce, step)
+        # without the filled nonce the steps queued after "a" never get mined
+        chain.wait_mined(nonce)
+
+    cancelled = []
+    completed = DeploymentScheduler(
+        GRAPH, run_step, chain.get_nonce_manager(cancelled), max_workers=4
+    ).run()
+
+    assert completed == set(GRAPH)
+    assert cancelled == failures == [0]
+    assert chain.mined[0] == "cancel"
+    assert sorted(chain.mined[1:4]) == ["b", "c", "d"]
+    assert chain.mined[4:] == ["a", "top"]
+    assert chain.get_pending_nonce() == chain.get_mined_nonce()
+
+
+def test_release_keeps_mined_nonce():
+    chain = FakeChain()
+    cancelled = []
+    nonce_manager = chain.get_nonce_manager(cancelled)
+    chain.send(0, "step")
+    nonce_manager.release(0)
+    assert cancelled == []
+
+
+def test_settle_times_out_on_stuck_transactions():
+    chain = FakeChain()
+    nonce_manager = chain.get_nonce_manager([])
+    nonce_manager.settle_timeout = 0.05
+    chain.send(1, "stuck behind a gap")
+    with pytest.raises(StepFailedError):
+        nonce_manager.settle()
+
+
+def test_is_done_and_is_exclusive_are_checked_once_per_step():
+    chain = FakeChain()
+    checks = []
+
+    def run_step(step, nonce):
+        time.sleep(0.01)
+
+    def is_done(step):
+        checks.append(("done", step))
+        return step == "b"
+
+    def is_exclusive(step):
+        checks.append(("exclusive", step))
+        return step == "c"
+
+    DeploymentScheduler(
+        GRAPH,
+        run_step,
+        chain.get_nonce_manager([]),
+        max_workers=2,
+        is_done=is_done,
+        is_exclusive=is_exclusive,
+    ).run()
+    assert len(checks) == len(set(checks))
+    assert {step for _, step in checks} == set(GRAPH)
@@ -0,0 +1,79 @@
+from ltv_offchain.differential.generators import InputGenerator
+from ltv_offchain.differential.models import KIND_NAMES, evaluate, is_revert
+from ltv_offchain.differential.vectors import MAGIC, write_vectors
+from ltv_offchain.math.solidity import UINT256_MAX
+
+SEED = 20240611
+ROWS_PER_KIND = 200
+
+# (inputs, outputs) words DifferentialMathHarness.calculate reads and returns
+HARNESS_LAYOUT = {
+    0: (14, 10),
+    1: (14, 10),
+    2: (7, 8),
+    3: (7, 8),
+    4: (18, 3),
+    5: (18, 3),
+    6: (18, 3),
+}
+
+
+def _word(data, offset):
+    return int.from_bytes(data[offset : offset + 32], "big")
+
+
+def _words(values):
+    """uint256 words of int256 and uint256 values, as the harness receives them"""
+    return [value & UINT256_MAX for value in values]
+
+
+def read_vectors(data):
+    """Walks the file like DifferentialMathTest, yields (kind, id, revert, inputs, outputs)"""
+    assert data[:8] == MAGIC and data[8:24] == bytes(16)
+    count = int.from_bytes(data[24:32], "big")
+    offset = 32
+    for _ in range(count):
+        header = data[offset : offset + 32]
+        kind, expect_revert, input_count, output_count = header[:4]
+        assert header[4:24] == bytes(20)
+        vector_id = int.from_bytes(header[24:], "big")
+        offset += 32
+        inputs = [_word(data, offset + 32 * i) for i in range(input_count)]
+        offset += 32 * input_count
+        outputs = [_word(data, offset + 32 * i) for i in range(output_count)]
+        offset += 32 * output_count
+        yield kind, vector_id, bool(expect_revert), inputs, outputs
+    # DifferentialMathTest requires the file to end with the last vector
+    assert offset == len(data)
+
+
+def test_vectors_round_trip_in_the_harness_layout(tmp_path):
+    generator = InputGenerator(SEED)
+    vectors = []
+    for kind in KIND_NAMES:
+        rows = generator.generate(kind, ROWS_PER_KIND)
+        for index, (row, result) in enumerate(zip(rows, evaluate(kind, rows))):
+            vectors.append((kind, kind * ROWS_PER_KIND + index, row, result))
+    path = tmp_path / "vectors.bin"
+    write_vectors(str(path), vectors)
+
+    replayed = list(read_vectors(path.read_bytes()))
+    assert len(replayed) == len(vectors)
+    reverts = 0
+    for (kind, vector_id, row, result), read in zip(vectors, replayed):
+        input_count, output_count = HARNESS_LAYOUT[kind]
+        assert len(row) == input_count
+        if is_revert(result):
+            reverts += 1
+            assert read == (kind, vector_id, True, _words(row), [])
+        else:
+            assert len(result) == output_count
+            assert read == (
+                kind,
+                vector_id,
+                False,
+                _words(row),
+                _words(result),
+            )
+    # both branches of the replay are covered
+    assert 0 < reverts < len(vectors)
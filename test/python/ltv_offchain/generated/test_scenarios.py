@@ -0,0 +1,64 @@
+import os
+import re
+
+import pytest
+
+from ltv_offchain.generated.model import compute_expected_state
+from ltv_offchain.generated.table import read_scenarios
+
+GENERATED_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "test", "generated"
+)
+TABLE_PATH = os.path.join(GENERATED_DIR, "scenarios.csv")
+
+TEST_PATTERN = re.compile(r"function test_(\w+)\(\).*?\n    }\n", re.S)
+ASSERT_EQ_PATTERN = re.compile(r"assertEq\(\s*([^,]+?),\s*([^;]+?)\s*\);")
+
+# assertEq checks of a rendered test after assertEq(result, preview)
+CHECKED_FIELDS = [
+    "delta",
+    "supply_balance",
+    "borrow_balance",
+    "future_borrow_assets",
+    "future_collateral_assets",
+    "convert_to_shares",
+]
+
+
+def _parse_value(value):
+    if value == "10 ** 18":
+        return 10**18
+    return int(value)
+
+
+def read_shard_assertions():
+    """{test name: {field: asserted value}} of the committed shards"""
+    assertions = {}
+    for file_name in sorted(os.listdir(GENERATED_DIR)):
+        if not file_name.endswith(".t.sol"):
+            continue
+        with open(os.path.join(GENERATED_DIR, file_name), "r") as f:
+            source = f.read()
+        for match in TEST_PATTERN.finditer(source):
+            checks = ASSERT_EQ_PATTERN.findall(match.group(0))[1:]
+            assertions[match.group(1)] = {
+                field: _parse_value(value)
+                for field, (_, value) in zip(CHECKED_FIELDS, checks)
+            }
+    return assertions
+
+
+SCENARIOS = list(read_scenarios(TABLE_PATH))
+SHARD_ASSERTIONS = read_shard_assertions()
+
+
+def test_every_scenario_has_a_shard_test():
+    assert sorted(SHARD_ASSERTIONS) == sorted(scenario.name for scenario in SCENARIOS)
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda scenario: scenario.name)
+def test_scenario_matches_shard_assertions(scenario):
+    expected = compute_expected_state(scenario)._asdict()
+    assert SHARD_ASSERTIONS[scenario.name] == {
+        field: expected[field] for field in CHECKED_FIELDS
+    }
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+
+import pytest
+
+from deploy_utils import abi
+from deploy_utils.rpc import RpcError
+from ltv_offchain.indexer.events import get_events, get_topic_table
+from ltv_offchain.indexer.indexer import EventIndexer
+from ltv_offchain.indexer.store import SCHEMA, get_auction_history, get_cursors
+
+EVENTS_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "src", "events"
+)
+TOPIC_TABLE = get_topic_table(get_events(EVENTS_DIR))
+AUCTION_TOPIC = next(
+    topic for topic, event in TOPIC_TABLE.items() if event.name == "AuctionExecuted"
+)
+
+VAULT_A = "0x00000000000000000000000000000000000000aa"
+VAULT_B = "0x00000000000000000000000000000000000000bb"
+EXECUTOR = "0x00000000000000000000000000000000000000ee"
+
+
+def auction_log(vault, block_number, log_index, delta_collateral):
+    return {
+        "address": vault,
+        "blockNumber": hex(block_number),
+        "logIndex": hex(log_index),
+        "transactionHash": "0x" + f"{block_number:064x}",
+        "topics": [AUCTION_TOPIC],
+        "data": "0x"
+        + abi.encode(
+            ["address", "int256", "int256"], [EXECUTOR, delta_collateral, 0]
+        ).hex(),
+    }
+
+
+class FakeNode:
+    """eth_getLogs over a fixed log list, rejecting queries over max_results logs"""
+
+    def __init__(self, logs, head, max_results=None):
+        self.logs = logs
+        self.head = head
+        self.max_results = max_results
+        self.requests = []
+
+    def call(self, method, params=()):
+        if method == "eth_blockNumber":
+            return hex(self.head)
+        assert method == "eth_getLogs"
+        (log_filter,) = params
+        from_block = int(log_filter["fromBlock"], 16)
+        to_block = int(log_filter["toBlock"], 16)
+        self.requests.append((sorted(log_filter["address"]), from_block, to_block))
+        logs = [
+            log
+            for log in self.logs
+            if log["address"] in log_filter["address"]
+            and from_block <= int(log["blockNumber"], 16) <= to_block
+        ]
+        if self.max_results is not None and len(logs) > self.max_results:
+            raise RpcError(f"query returned more than {self.max_results} results")
+        return logs
+
+
+def connect_memory():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def get_indexer(node, connection, vaults, **kwargs):
+    return EventIndexer(
+        node, connection, vaults, TOPIC_TABLE, log=lambda message: None, **kwargs
+    )
+
+
+def test_sync_without_vaults_indexes_nothing():
+    node = FakeNode([], head=100)
+    assert get_indexer(node, connect_memory(), []).sync() == 0
+    assert node.requests == []
+
+
+def test_range_is_halved_until_the_node_accepts_it():
+    logs = [auction_log(VAULT_A, block, 0, block) for block in range(1, 17)]
+    node = FakeNode(logs, head=16, max_results=4)
+    connection = connect_memory()
+    indexer = get_indexer(node, connection, [VAULT_A], start_block=1, initial_range=16)
+
+    assert indexer.sync() == 16
+    # 16 and 8 blocks hold too many logs, 4 blocks are accepted
+    assert node.requests[:3] == [
+        ([VAULT_A], 1, 16),
+        ([VAULT_A], 1, 8),
+        ([VAULT_A], 1, 4),
+    ]
+    assert [
+        record.delta_real_collateral_assets
+        for record in get_auction_history(connection)
+    ] == list(range(1, 17))
+    assert get_cursors(connection) == {VAULT_A: 16}
+
+
+def test_single_block_over_the_node_limit_fails():
+    logs = [auction_log(VAULT_A, 5, index, 1) for index in range(3)]
+    node = FakeNode(logs, head=10, max_results=2)
+    indexer = get_indexer(node, connect_memory(), [VAULT_A], initial_range=4)
+    with pytest.raises(RpcError, match="block 5"):
+        indexer.sync()
+
+
+def test_lagging_group_stops_at_the_next_cursor_and_merges():
+    connection = connect_memory()
+    # VAULT_B was indexed up to block 10 by an earlier run
+    get_indexer(FakeNode([], head=10), connection, [VAULT_B]).sync()
+    logs = [
+        auction_log(VAULT_A, 3, 0, 1),
+        auction_log(VAULT_B, 12, 0, 2),
+        auction_log(VAULT_A, 15, 0, 3),
+    ]
+    node = FakeNode(logs, head=20)
+    indexer = get_indexer(node, connection, [VAULT_A, VAULT_B], initial_range=100)
+
+    assert indexer.sync() == 3
+    assert node.requests == [
+        ([VAULT_A], 0, 10),
+        ([VAULT_A, VAULT_B], 11, 20),
+    ]
+    assert get_cursors(connection) == {VAULT_A: 20, VAULT_B: 20}
+    assert [
+        (record.block_number, record.vault)
+        for record in get_auction_history(connection)
+    ] == [(3, VAULT_A), (12, VAULT_B), (15, VAULT_A)]
+
+
+def test_sync_resumes_from_the_cursors():
+    connection = connect_memory()
+    logs = [auction_log(VAULT_A, block, 0, block) for block in (2, 8)]
+    node = FakeNode(logs, head=5)
+    indexer = get_indexer(node, connection, [VAULT_A], start_block=1)
+    assert indexer.sync() == 1
+    node.head = 9
+    assert indexer.sync() == 1
+    assert node.requests == [([VAULT_A], 1, 5), ([VAULT_A], 6, 9)]
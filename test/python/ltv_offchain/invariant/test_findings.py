@@ -0,0 +1,173 @@
+import json
+
+from ltv_offchain.invariant.findings import (
+    Call,
+    Finding,
+    deduplicate,
+    get_finding_contract_name,
+    normalize_reason,
+    parse_results,
+    render_regression,
+    write_regression,
+)
+from ltv_offchain.invariant.suites import Suite, discover_suites, get_suite_source
+
+SUITE_SOURCE = """// SPDX-License-Identifier: BUSL-1.1
+pragma solidity ^0.8.28;
+
+import {BaseInvariantTest} from "test/invariant/utils/BaseInvariantTest.t.sol";
+
+contract VaultInvariantTest is BaseInvariantTest {
+    function setUp() public override {
+        super.setUp();
+    }
+
+    // checks the vault stays solvent
+    function invariant_solvent() public view {
+        assertTrue(true);
+    }
+
+    function invariant_price() public view {
+        if (true) {
+            assertTrue(true);
+        }
+    }
+}
+"""
+
+SENDER = "0x00000000000000000000000000000000000000aa"
+TARGET = "0x00000000000000000000000000000000000000bb"
+
+
+def forge_call(calldata, warp=None, roll=None):
+    return {
+        "sender": SENDER,
+        "addr": TARGET,
+        "calldata": calldata,
+        "func_name": "deposit",
+        "args": "1",
+        "warp": warp,
+        "roll": roll,
+    }
+
+
+def forge_output(counterexample, reason="price dropped by 12 at 0x1234"):
+    return json.dumps(
+        {
+            "test/invariant/VaultInvariantTest.t.sol:VaultInvariantTest": {
+                "test_results": {
+                    "invariant_price()": {
+                        "status": "Failure",
+                        "reason": reason,
+                        "counterexample": counterexample,
+                        "kind": {"Invariant": {"runs": 3, "calls": 90}},
+                    },
+                    "invariant_solvent()": {
+                        "status": "Success",
+                        "kind": {"Invariant": {"runs": 256, "calls": 7680}},
+                    },
+                }
+            },
+            "test/Other.t.sol:Other": {"test_results": {}},
+        }
+    )
+
+
+def get_suite(tmp_path):
+    path = tmp_path / "VaultInvariantTest.t.sol"
+    path.write_text(SUITE_SOURCE)
+    return discover_suites(str(tmp_path))[0]
+
+
+def test_discover_suites_lists_invariants(tmp_path):
+    assert get_suite(tmp_path) == Suite(
+        str(tmp_path / "VaultInvariantTest.t.sol"),
+        "VaultInvariantTest",
+        ["invariant_solvent", "invariant_price"],
+    )
+
+
+def test_suite_source_drops_invariants_and_their_comments(tmp_path):
+    source = get_suite_source(get_suite(tmp_path))
+    assert source.parents == "BaseInvariantTest"
+    assert source.imports == [
+        'import {BaseInvariantTest} from "test/invariant/utils/BaseInvariantTest.t.sol";'
+    ]
+    assert "invariant_" not in source.body
+    assert "solvent" not in source.body
+    assert "function setUp() public override" in source.body
+
+
+def test_parse_results_of_both_sequence_formats(tmp_path):
+    suite = get_suite(tmp_path)
+    calls = [forge_call("0x01", warp="0x10"), forge_call("0x02", roll=3)]
+    for counterexample, original_length in (
+        ({"Sequence": calls}, 2),
+        ({"Sequence": [5, calls]}, 5),
+    ):
+        results, findings = parse_results(forge_output(counterexample), suite, 7)
+        assert results == {
+            "invariant_price()": ("Failure", 3, 90),
+            "invariant_solvent()": ("Success", 256, 7680),
+        }
+        (finding,) = findings
+        assert finding.invariant == "invariant_price"
+        assert finding.seed == 7
+        assert finding.original_length == original_length
+        assert finding.calls == [
+            Call(SENDER, TARGET, "0x01", "deposit", "1", 16, None),
+            Call(SENDER, TARGET, "0x02", "deposit", "1", None, 3),
+        ]
+
+
+def test_deduplicate_keeps_the_shortest_sequence_per_reason(tmp_path):
+    suite = get_suite(tmp_path)
+    call = Call(SENDER, TARGET, "0x01", None, None, None, None)
+    long = Finding(suite, "invariant_price", "dropped by 12", 1, [call] * 3, 3)
+    short = long._replace(
+        reason="dropped by 40", seed=2, calls=[call], original_length=9
+    )
+    other = long._replace(invariant="invariant_solvent")
+    assert normalize_reason(long.reason) == normalize_reason(short.reason)
+    assert deduplicate([long, other, short]) == [short, other]
+    assert get_finding_contract_name(long) == get_finding_contract_name(short)
+
+
+def test_regression_replays_the_call_sequence(tmp_path):
+    suite = get_suite(tmp_path)
+    _, (finding,) = parse_results(
+        forge_output({"Sequence": [4, [forge_call("0xabcd", warp=5, roll=2)]]}),
+        suite,
+        11,
+    )
+    contract = get_finding_contract_name(finding)
+    regression = render_regression(finding, get_suite_source(suite))
+
+    assert f"contract {contract} is BaseInvariantTest {{" in regression
+    assert "seed 11, shrunk from 4 to 1 calls." in regression
+    assert "invariant_" not in regression.split(" */")[1]
+    assert (
+        "    function test_priceRegression() public {\n"
+        "        // deposit(1)\n"
+        "        vm.warp(block.timestamp + 5);\n"
+        "        vm.roll(block.number + 2);\n"
+        f'        replay(address(uint160({SENDER})), hex"abcd");\n'
+        "    }\n"
+        "}\n"
+    ) in regression
+
+
+def test_write_regression_only_writes_new_findings(tmp_path):
+    suite = get_suite(tmp_path)
+    _, (finding,) = parse_results(
+        forge_output({"Sequence": [forge_call("0x01")]}), suite, 1
+    )
+    findings_dir = str(tmp_path / "findings")
+    source = get_suite_source(suite)
+
+    path = write_regression(finding, source, findings_dir)
+    assert path.endswith(f"{get_finding_contract_name(finding)}.t.sol")
+    with open(path, "r") as f:
+        assert f.read() == render_regression(finding, source)
+    # another seed of the same failure is already covered
+    assert write_regression(finding._replace(seed=2), source, findings_dir) is None
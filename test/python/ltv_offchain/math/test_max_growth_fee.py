@@ -0,0 +1,45 @@
+import pytest
+
+from ltv_offchain.math.constants import LAST_SEEN_PRICE_PRECISION
+from ltv_offchain.math.max_growth_fee import preview_supply_after_fee
+from ltv_offchain.math.solidity import UINT256_MAX, MathRevert
+from ltv_offchain.math.structs import MaxGrowthFeeData
+
+# share price doubled since the last seen price
+GROWN = MaxGrowthFeeData(
+    withdraw_total_assets=2 * 10**18,
+    max_growth_fee_dividend=1,
+    max_growth_fee_divider=5,
+    supply=10**18,
+    last_seen_token_price=LAST_SEEN_PRICE_PRECISION,
+)
+
+
+def test_supply_after_fee_mints_a_fifth_of_the_growth():
+    # 2 / (1 * 1 / 5 + 2 * 4 / 5) = 1.111... shares per share
+    assert preview_supply_after_fee(GROWN) == 2 * 10**18 * 10**18 // (
+        10**18 // 5 + 2 * 10**18 * 4 // 5
+    )
+
+
+def test_supply_without_growth_is_unchanged():
+    data = GROWN._replace(withdraw_total_assets=10**18)
+    assert preview_supply_after_fee(data) == 10**18
+
+
+def test_fee_product_overflow_reverts():
+    data = GROWN._replace(
+        max_growth_fee_dividend=2,
+        last_seen_token_price=2**255,
+        # passes the growth check without overflowing its own mulDiv
+        withdraw_total_assets=UINT256_MAX // 10**18,
+        supply=1,
+    )
+    with pytest.raises(MathRevert, match="uint256"):
+        preview_supply_after_fee(data)
+
+
+def test_dividend_above_divider_underflows_uint16():
+    data = GROWN._replace(max_growth_fee_dividend=6)
+    with pytest.raises(MathRevert, match="uint16"):
+        preview_supply_after_fee(data)
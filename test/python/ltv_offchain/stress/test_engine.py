@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from ltv_offchain.math.solidity import MathRevert
+from ltv_offchain.stress.config import VaultConfig
+from ltv_offchain.stress.engine import (
+    SimulationParameters,
+    execute_whole_auction,
+    get_collateral_and_borrow,
+    get_initial_state,
+    is_ltv_above,
+    liquidate,
+    open_rebalance_auction,
+    run_stress,
+    simulate_path,
+    soft_liquidate,
+)
+from ltv_offchain.stress.paths import PathParameters
+
+CONFIG = VaultConfig(
+    name="weth/wbtc x4",
+    args_file="deploy/test/aave/args.json",
+    target_ltv=(3, 4),
+    min_profit_ltv=(11, 15),
+    max_safe_ltv=(7, 9),
+    soft_liquidation_ltv=(92, 100),
+    soft_liquidation_fee=(1, 100),
+    max_deleverage_fee=(1, 50),
+    max_growth_fee=(1, 5),
+    collateral_slippage=5 * 10**15,
+    borrow_slippage=5 * 10**15,
+    auction_duration=1024,
+    lending_liquidation_ltv=None,
+)
+
+PATH_PARAMETERS = PathParameters(
+    steps=48,
+    dt=1 / 8760,
+    drift=0.0,
+    volatility=0.8,
+    jump_intensity=200,
+    jump_mean=-0.05,
+    jump_volatility=0.05,
+)
+
+
+def get_state_at(price):
+    return get_initial_state(CONFIG, 1.0)._replace(
+        collateral_price=int(price * 10**18), block_number=2000
+    )
+
+
+def get_ltv_error(state):
+    """borrow * 4 - collateral * 3 in underlying, 0 at target LTV"""
+    collateral, borrow = get_collateral_and_borrow(state)
+    return borrow * 4 - collateral * 3
+
+
+@pytest.mark.parametrize("price", [0.9, 1.1])
+def test_rebalance_auction_returns_to_target_ltv(price):
+    state = get_state_at(price)
+    state, _ = open_rebalance_auction(state, price < 1, 0.01)
+    # the deposit / withdraw moves real and future position to target LTV
+    assert abs(get_ltv_error(state)) <= 4
+    assert state.future_borrow_assets != 0
+
+    state, profit = execute_whole_auction(state._replace(block_number=2512))
+    assert state.future_borrow_assets == 0
+    assert state.future_collateral_assets == 0
+    assert state.future_reward_borrow_assets == 0
+    assert state.future_reward_collateral_assets == 0
+    assert abs(get_ltv_error(state)) <= 4
+    assert profit > 0
+
+
+def test_soft_liquidation_stops_above_soft_liquidation_ltv():
+    state = get_state_at(0.8)
+    collateral, borrow = get_collateral_and_borrow(state)
+    assert is_ltv_above(collateral, borrow, CONFIG.soft_liquidation_ltv)
+
+    liquidated, _, bonus = soft_liquidate(state, CONFIG)
+    collateral, borrow = get_collateral_and_borrow(liquidated)
+    assert is_ltv_above(collateral, borrow, CONFIG.soft_liquidation_ltv)
+    assert bonus > 0
+    # the largest amount: a slightly larger one ends below the soft LTV
+    repaid = state.withdraw_real_borrow_assets - liquidated.withdraw_real_borrow_assets
+    with pytest.raises(MathRevert):
+        liquidate(state, repaid * 1001 // 1000, 1, 100, CONFIG.soft_liquidation_ltv)
+
+
+def test_deleverage_repays_all_borrow_or_reverts():
+    state = get_state_at(0.8)
+    deleveraged, _, _ = liquidate(state, state.withdraw_real_borrow_assets, 1, 50)
+    assert deleveraged.withdraw_real_borrow_assets == 0
+    assert deleveraged.withdraw_real_collateral_assets > 0
+    with pytest.raises(MathRevert):
+        liquidate(state, state.withdraw_real_borrow_assets - 1, 1, 50)
+    # collateral does not cover borrow and the fee
+    with pytest.raises(MathRevert):
+        liquidate(get_state_at(0.74), 2**128, 1, 50)
+
+
+def test_flat_path_keeps_the_share_price():
+    result = simulate_path(
+        CONFIG, SimulationParameters(), [1.0] * 10, 1 / 8760, random.Random(0)
+    )
+    assert result.final_share_price == 1.0
+    assert result.max_drawdown == 0.0
+    assert result.rebalances == 0
+    assert result.fee_shares == 0.0
+
+
+def test_run_is_deterministic_and_shares_identical_configs():
+    soft = CONFIG._replace(name="soft", soft_liquidation_ltv=(39, 50))
+    configs = [CONFIG, soft, CONFIG._replace(name="copy")]
+    parameters = SimulationParameters(keeper_availability=0.5)
+    first = run_stress(configs, PATH_PARAMETERS, parameters, 20, seed=3)
+    assert first == run_stress(configs, PATH_PARAMETERS, parameters, 20, seed=3)
+    assert first[0] is first[2]
+    assert sum(result.rebalances for result in first[0]) > 0
+    assert sum(result.soft_liquidations for result in first[1]) > sum(
+        result.soft_liquidations for result in first[0]
+    )
@@ -0,0 +1,108 @@
+"""
+Concurrent LTV implementation deployment on anvil with forge broadcasts at
+explicit nonces, one of them failing before it sends its transaction
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import threading
+
+import pytest
+
+from deploy_utils.anvil import AnvilError, AnvilNode
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+LENDING_PROTOCOL = "aave"
+
+# set by the CI job installing Foundry, so a missing tool fails instead of skipping
+REQUIRE_FOUNDRY = bool(os.environ.get("LTV_REQUIRE_FOUNDRY"))
+
+pytestmark = pytest.mark.skipif(
+    not REQUIRE_FOUNDRY
+    and any(shutil.which(tool) is None for tool in ("anvil", "forge", "cast")),
+    reason="needs anvil, forge and cast",
+)
+
+
+@pytest.fixture
+def deploy(monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    import deploy
+
+    return deploy
+
+
+@pytest.fixture
+def local_args(deploy):
+    node = AnvilNode(deploy.ANVIL_PORT)
+    try:
+        node.start()
+    except AnvilError as e:
+        if REQUIRE_FOUNDRY:
+            raise
+        pytest.skip(str(e))
+
+    args_filename = f"concurrent_e2e_{os.getpid()}.json"
+    args_path = deploy.get_args_file_path("local", LENDING_PROTOCOL, args_filename)
+    os.makedirs(os.path.dirname(args_path), exist_ok=True)
+    with open(args_path, "w") as f:
+        f.write("{}")
+    try:
+        yield argparse.Namespace(
+            chain="local",
+            lending_protocol=LENDING_PROTOCOL,
+            args_filename=args_filename,
+            private_key=deploy.TEST_USER_PRIVATE_KEY,
+            max_workers=4,
+        )
+    finally:
+        node.stop()
+        os.remove(args_path)
+        stem = args_filename.replace(".json", "")
+        for path in glob.glob(f"deploy_out/local/{LENDING_PROTOCOL}/*{stem}*"):
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+
+def test_failed_concurrent_step_does_not_block_later_nonces(
+    deploy, local_args, monkeypatch
+):
+    process_deployment = deploy.process_deployment
+    failed = []
+
+    def fail_first_broadcast(*arguments, nonce=None, **kwargs):
+        if nonce is not None and not failed:
+            failed.append((arguments[4], nonce))
+            raise SystemExit(1)
+        process_deployment(*arguments, nonce=nonce, **kwargs)
+
+    monkeypatch.setattr(deploy, "process_deployment", fail_first_broadcast)
+
+    # a broadcast stuck behind the nonce gap would keep forge waiting for it
+    thread = threading.Thread(
+        target=deploy.deploy_ltv_implementation_concurrently,
+        args=(local_args,),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=900)
+    assert not thread.is_alive(), "deployment is stuck"
+
+    assert failed, "no step was broadcast with an explicit nonce"
+    data = deploy.read_data(
+        local_args.chain, local_args.lending_protocol, local_args.args_filename
+    )
+    client = deploy.get_rpc_client(local_args.chain)
+    for contract in deploy.LTV_IMPLEMENTATION_GRAPH:
+        code = client.call("eth_getCode", [data[contract.value], "latest"])
+        assert code not in ("0x", None), f"{contract.value} is not deployed"
+    deployer = deploy.get_deployer_address(local_args.private_key)
+    assert deploy.get_chain_nonce(
+        "local", deployer, "latest"
+    ) == deploy.get_chain_nonce("local", deployer)
+    client.close()